@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos pontos críticos do pipeline de Delta Hedge.
+
+Mede, sobre bancos sintéticos de vários tamanhos (GeradorDadosSinteticos),
+o tempo das consultas do TradeHelper, do processar() de cada estratégia,
+da varredura completa de cenários (*Todos), do rgbm e dos parsers Analisar*.
+Os resultados são gravados em JSON (um arquivo por commit) e comparados com
+o resultado anterior, para que regressões de desempenho fiquem visíveis.
+
+Uso:
+    python src/benchmark/BenchmarkPipeline.py [--tamanhos 500 2000 8000] [--repeticoes 5]
+                                              [--filtro processar] [--saida dados/benchmark]
+"""
+
+import sys
+import os
+
+# Adiciona os diretórios do projeto ao path
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(SRC)
+sys.path.append(os.path.join(SRC, 'delta-hedge'))
+sys.path.append(os.path.join(SRC, 'delta-hedge-analise'))
+
+import io
+import json
+import glob
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import numpy as np
+
+from helper.TradeHelper import TradeHelper
+from GeradorDadosSinteticos import GeradorDadosSinteticos
+from DeltaHedgeAjustePeloDelta import DeltaHedgeAjustePeloDelta
+from DeltaHedgeAjustePeloDia import DeltaHedgeAjustePeloDia
+from DeltaHedgeAjustePeloLote import DeltaHedgeAjustePeloLote
+import CenariosDeltaHedgeAjustePeloDeltaTodos
+import CenariosDeltaHedgeAjustePeloDiaTodos
+import CenariosDeltaHedgeAjustePeloLoteTodos
+import AnalisarSimulacaoPeloDelta
+import AnalisarSimulacaoPeloDia
+import AnalisarSimulacaoPeloLote
+
+# Tamanhos padrão do histórico sintético (pregões)
+TAMANHOS_PADRAO = [500, 2000, 8000]
+
+# Estratégia -> (classe, parâmetro de ajuste, módulo da varredura, módulo do parser)
+ESTRATEGIAS = {
+    'delta': (DeltaHedgeAjustePeloDelta, {'limite_delta': 0.1},
+              CenariosDeltaHedgeAjustePeloDeltaTodos, AnalisarSimulacaoPeloDelta),
+    'dia': (DeltaHedgeAjustePeloDia, {'frequencia_ajuste': 3},
+            CenariosDeltaHedgeAjustePeloDiaTodos, AnalisarSimulacaoPeloDia),
+    'lote': (DeltaHedgeAjustePeloLote, {'limite_lote': 100},
+             CenariosDeltaHedgeAjustePeloLoteTodos, AnalisarSimulacaoPeloLote),
+}
+
+def medir(funcao, repeticoes: int = 5, tempo_minimo: float = 0.05) -> dict:
+    """
+    Mede o tempo de uma função (estilo asv: aquecimento, depois várias amostras).
+
+    Cada amostra executa a função quantas vezes forem necessárias para durar pelo
+    menos `tempo_minimo` segundos, e o tempo registrado é o de uma chamada.
+
+    Returns:
+        dict: minimo, mediana, media (segundos por chamada), amostras e chamadas por amostra
+    """
+    with redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        funcao()
+        duracao = time.perf_counter() - inicio
+
+        chamadas = max(1, int(tempo_minimo / duracao)) if duracao > 0 else 1000
+        amostras = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            for _ in range(chamadas):
+                funcao()
+            amostras.append((time.perf_counter() - inicio) / chamadas)
+
+    return {
+        'minimo': min(amostras),
+        'mediana': statistics.median(amostras),
+        'media': statistics.fmean(amostras),
+        'amostras': len(amostras),
+        'chamadas_por_amostra': chamadas,
+    }
+
+def montar_benchmarks(conn, diretorio_temporario: str) -> dict:
+    """
+    Monta os benchmarks para um banco sintético.
+
+    Returns:
+        dict: {nome do benchmark: função sem argumentos}
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT s.id, o.vencimento, s.data_inicio
+        FROM SIMULACAO s
+        JOIN OPCAO o ON o.id = s.id_opcao
+        ORDER BY s.id
+    """)
+    simulacoes = cursor.fetchall()
+    id_simulacao, vencimento, data_inicio = simulacoes[-1]
+    ids_simulacao = [sim[0] for sim in simulacoes]
+
+    benchmarks = {
+        'trade_helper.volatilidade_30': lambda: TradeHelper.recuperaVolatilidadeAnualPara_x_Pregoes(
+            conn, 30, 'PETR4', data_inicio),
+        'trade_helper.volatilidade_252': lambda: TradeHelper.recuperaVolatilidadeAnualPara_x_Pregoes(
+            conn, 252, 'PETR4', data_inicio),
+        'trade_helper.dias_uteis': lambda: TradeHelper.calcular_dias_uteis(conn, 1, data_inicio, vencimento),
+        'trade_helper.calcular_delta': lambda: TradeHelper.calcular_delta('call', 30.0, 31.0, 0.08, 0.15, 0.35),
+        'trade_helper.rgbm_252': lambda: TradeHelper.rgbm(252, 30.0, 0.1, 0.35, seed=42),
+    }
+
+    for estrategia, (classe, parametro, modulo_varredura, modulo_parser) in ESTRATEGIAS.items():
+        def processar(classe=classe, parametro=parametro):
+            delta_hedge = classe(conn, id_simulacao, pregoes_volatilidade=30, **parametro)
+            delta_hedge.processar()
+            delta_hedge.listar_dados()
+
+        def varredura(modulo=modulo_varredura):
+            saida = io.StringIO()
+            for id_sim in ids_simulacao:
+                modulo.executar_cenarios_para_simulacao(conn, id_sim, saida)
+            return saida.getvalue()
+
+        # O parser lê o texto gerado pela própria varredura
+        arquivo_texto = os.path.join(diretorio_temporario, f'Simulacao_{estrategia}.txt')
+        with redirect_stdout(io.StringIO()):
+            texto = varredura()
+        with open(arquivo_texto, 'w', encoding='utf-8') as f:
+            f.write(texto)
+
+        benchmarks[f'{estrategia}.processar'] = processar
+        benchmarks[f'{estrategia}.varredura_todos'] = varredura
+        benchmarks[f'{estrategia}.parser_analisar'] = \
+            lambda modulo=modulo_parser, arquivo=arquivo_texto: modulo.extrair_dados_simulacao(arquivo)
+
+    return benchmarks
+
+def commit_atual() -> str:
+    """Retorna o hash curto do commit atual (ou 'sem-git')."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True, cwd=SRC).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'sem-git'
+
+def carregar_anterior(diretorio_saida: str, arquivo_atual: str):
+    """Carrega o resultado de benchmark mais recente diferente do atual."""
+    arquivos = sorted(glob.glob(os.path.join(diretorio_saida, 'benchmark_*.json')), key=os.path.getmtime)
+    arquivos = [a for a in arquivos if os.path.abspath(a) != os.path.abspath(arquivo_atual)]
+    if not arquivos:
+        return None
+    with open(arquivos[-1], 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline de Delta Hedge.")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=TAMANHOS_PADRAO,
+                        help="Tamanhos do histórico sintético em pregões (padrão: 500 2000 8000)")
+    parser.add_argument('--repeticoes', type=int, default=5, help="Amostras por benchmark (padrão: 5)")
+    parser.add_argument('--filtro', default=None, help="Executa apenas benchmarks cujo nome contém o texto")
+    parser.add_argument('--saida', default='dados/benchmark', help="Diretório dos resultados JSON")
+    args = parser.parse_args()
+
+    commit = commit_atual()
+    resultado = {
+        'commit': commit,
+        'data_execucao': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'tamanhos': args.tamanhos,
+        'resultados': [],
+    }
+
+    print("=" * 80)
+    print(f"BENCHMARK DO PIPELINE DE DELTA HEDGE (commit {commit})")
+    print("=" * 80)
+
+    for tamanho in args.tamanhos:
+        conn = GeradorDadosSinteticos(pregoes=tamanho).criar_banco()
+        with tempfile.TemporaryDirectory() as diretorio_temporario:
+            benchmarks = montar_benchmarks(conn, diretorio_temporario)
+            print(f"\nHistórico sintético com {tamanho} pregões:")
+            for nome, funcao in benchmarks.items():
+                if args.filtro and args.filtro not in nome:
+                    continue
+                medida = medir(funcao, args.repeticoes)
+                resultado['resultados'].append({'benchmark': nome, 'tamanho': tamanho, **medida})
+                print(f"  {nome:<32} {medida['mediana'] * 1000:>12.3f} ms (mín {medida['minimo'] * 1000:.3f} ms)")
+        conn.close()
+
+    os.makedirs(args.saida, exist_ok=True)
+    arquivo_saida = os.path.join(args.saida, f'benchmark_{commit}.json')
+    anterior = carregar_anterior(args.saida, arquivo_saida)
+
+    with open(arquivo_saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+
+    # Comparação com a execução anterior (razão entre as medianas)
+    if anterior:
+        medianas_anteriores = {(r['benchmark'], r['tamanho']): r['mediana'] for r in anterior['resultados']}
+        print(f"\nComparação com o commit {anterior['commit']} (atual / anterior):")
+        for r in resultado['resultados']:
+            chave = (r['benchmark'], r['tamanho'])
+            if chave in medianas_anteriores and medianas_anteriores[chave] > 0:
+                razao = r['mediana'] / medianas_anteriores[chave]
+                alerta = "  ⚠️  regressão" if razao > 1.2 else ""
+                print(f"  {r['benchmark']:<32} {r['tamanho']:>6} {razao:>8.2f}x{alerta}")
+
+    print(f"\nResultados salvos em: {arquivo_saida}")
+
+if __name__ == "__main__":
+    main()
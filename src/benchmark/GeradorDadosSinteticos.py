@@ -0,0 +1,213 @@
+import sys
+import os
+import sqlite3
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório 'src' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from helper.TradeHelper import TradeHelper
+
+# Esquema do banco (o mesmo de cargas/criar_banco.py com a coluna ticker de cargas/alterar_tabela_opcao.py)
+ESQUEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS ATIVO (
+        id INTEGER PRIMARY KEY,
+        ticker VARCHAR NOT NULL,
+        empresa VARCHAR NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS HIST_ATIVO (
+        id INTEGER PRIMARY KEY,
+        id_ativo INTEGER NOT NULL,
+        data DATE NOT NULL,
+        abertura FLOAT NOT NULL,
+        fechamento FLOAT NOT NULL,
+        maximo FLOAT NOT NULL,
+        minimo FLOAT NOT NULL,
+        FOREIGN KEY (id_ativo) REFERENCES ATIVO(id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS OPCAO (
+        id INTEGER PRIMARY KEY,
+        id_ativo INTEGER NOT NULL,
+        tipo VARCHAR NOT NULL,
+        strike FLOAT NOT NULL,
+        vencimento DATE NOT NULL,
+        ticker VARCHAR NOT NULL,
+        FOREIGN KEY (id_ativo) REFERENCES ATIVO(id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS HIST_OPCAO (
+        id INTEGER PRIMARY KEY,
+        id_opcao INTEGER NOT NULL,
+        data DATE NOT NULL,
+        abertura FLOAT NOT NULL,
+        fechamento FLOAT NOT NULL,
+        maximo FLOAT NOT NULL,
+        minimo FLOAT NOT NULL,
+        FOREIGN KEY (id_opcao) REFERENCES OPCAO(id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS SIMULACAO (
+        id INTEGER PRIMARY KEY,
+        id_opcao INTEGER NOT NULL,
+        data_inicio DATE NOT NULL,
+        data_termino DATE NOT NULL,
+        quantidade FLOAT NOT NULL,
+        cenario TEXT NOT NULL,
+        FOREIGN KEY (id_opcao) REFERENCES OPCAO(id)
+    )
+    """,
+]
+
+# Pregões reservados antes da primeira simulação (cobre a maior janela de volatilidade, 252)
+PREGOES_AQUECIMENTO = 260
+
+class GeradorDadosSinteticos:
+    """
+    Gera um banco SQLite sintético e reprodutível com o esquema do projeto.
+
+    O histórico do ativo (PETR4, id 1) segue um movimento browniano geométrico
+    e os preços das opções são os de Black-Scholes com um ruído de mercado.
+    Cada simulação cobre os `dias_simulacao` pregões anteriores ao vencimento,
+    como as simulações do banco real.
+    """
+
+    def __init__(self, pregoes: int = 750, opcoes: int = 4, dias_simulacao: int = 20,
+                 semente: int = 42, preco_inicial: float = 30.0, mu: float = 0.10,
+                 sigma: float = 0.35, taxa_juros: float = 0.15, data_inicial: str = '2015-01-02',
+                 puts: bool = False):
+        """
+        Inicializa o gerador.
+
+        Args:
+            pregoes: Número de pregões do histórico do ativo (padrão: 750)
+            opcoes: Número de opções (e de simulações) geradas (padrão: 4)
+            dias_simulacao: Pregões de cada simulação (padrão: 20)
+            semente: Semente do gerador aleatório (padrão: 42)
+            preco_inicial: Preço inicial do ativo (padrão: 30,00)
+            mu: Retorno médio anual (padrão: 10%)
+            sigma: Volatilidade anual (padrão: 35%)
+            taxa_juros: Taxa de juros usada no preço das opções (padrão: 15%)
+            data_inicial: Primeira data do histórico (padrão: 2015-01-02)
+            puts: Se True, cada vencimento ganha também uma put de mesmo strike, com
+                  IDs após os das calls (padrão: False)
+        """
+        if pregoes < PREGOES_AQUECIMENTO + dias_simulacao + 1:
+            raise ValueError(f"São necessários pelo menos {PREGOES_AQUECIMENTO + dias_simulacao + 1} pregões.")
+
+        self.pregoes = pregoes
+        self.opcoes = opcoes
+        self.dias_simulacao = dias_simulacao
+        self.semente = semente
+        self.preco_inicial = preco_inicial
+        self.mu = mu
+        self.sigma = sigma
+        self.taxa_juros = taxa_juros
+        self.data_inicial = data_inicial
+        self.puts = puts
+
+    def criar_banco(self, caminho: str = ':memory:') -> sqlite3.Connection:
+        """
+        Cria e popula o banco sintético.
+
+        Args:
+            caminho: Caminho do arquivo SQLite (padrão: banco em memória)
+
+        Returns:
+            sqlite3.Connection: Conexão com o banco populado
+        """
+        rng = np.random.default_rng(self.semente)
+        conn = sqlite3.connect(caminho)
+        cursor = conn.cursor()
+        for comando in ESQUEMA:
+            cursor.execute(comando)
+
+        cursor.execute("INSERT INTO ATIVO (id, ticker, empresa) VALUES (1, 'PETR4', 'Petrobras')")
+
+        # Histórico do ativo
+        datas = pd.bdate_range(self.data_inicial, periods=self.pregoes)
+        datas_str = datas.strftime('%Y-%m-%d').tolist()
+        dt = 1 / 252
+        choques = rng.standard_normal(self.pregoes)
+        fechamento = self.preco_inicial * np.exp(np.cumsum((self.mu - 0.5 * self.sigma ** 2) * dt
+                                                           + self.sigma * np.sqrt(dt) * choques))
+        anterior = np.r_[self.preco_inicial, fechamento[:-1]]
+        abertura = anterior * np.exp(0.3 * self.sigma * np.sqrt(dt) * rng.standard_normal(self.pregoes))
+        amplitude = np.abs(rng.standard_normal(self.pregoes)) * self.sigma * np.sqrt(dt) * 0.5
+        maximo = np.maximum(abertura, fechamento) * (1 + amplitude)
+        minimo = np.minimum(abertura, fechamento) * (1 - amplitude)
+
+        cursor.executemany("""
+            INSERT INTO HIST_ATIVO (id_ativo, data, abertura, fechamento, maximo, minimo)
+            VALUES (1, ?, ?, ?, ?, ?)
+        """, zip(datas_str, *(np.round(serie, 2).tolist() for serie in (abertura, fechamento, maximo, minimo))))
+
+        # Vencimentos distribuídos entre o fim do aquecimento e o fim do histórico
+        posicoes_vencimento = np.linspace(PREGOES_AQUECIMENTO + self.dias_simulacao, self.pregoes - 1,
+                                          self.opcoes).astype(int)
+
+        for id_opcao, posicao_vencimento in enumerate(posicoes_vencimento, 1):
+            inicio = posicao_vencimento - self.dias_simulacao
+            strike = round(float(abertura[inicio]) * rng.uniform(0.95, 1.05), 2)
+            vencimento = datas_str[posicao_vencimento]
+            tipos = [('CALL', id_opcao, f"PETRS{id_opcao:03d}")]
+            if self.puts:
+                tipos.append(('PUT', self.opcoes + id_opcao, f"PETRQ{id_opcao:03d}"))
+
+            for tipo, id_serie, ticker in tipos:
+                cursor.execute("""
+                    INSERT INTO OPCAO (id, id_ativo, tipo, strike, vencimento, ticker)
+                    VALUES (?, 1, ?, ?, ?, ?)
+                """, (id_serie, tipo, strike, vencimento, ticker))
+
+                # Preços da opção do início da simulação até o vencimento (puts pela paridade put-call)
+                dias = np.arange(inicio, posicao_vencimento + 1)
+                prazo = np.maximum(posicao_vencimento - dias, 0) / 252
+                ruido = np.exp(0.05 * rng.standard_normal((2, len(dias))))
+                precos = []
+                for k, (dia, t) in enumerate(zip(dias, prazo)):
+                    valores = []
+                    for preco_ativo, fator in ((abertura[dia], ruido[0, k]), (fechamento[dia], ruido[1, k])):
+                        if t > 0:
+                            valor = TradeHelper.calcular_preco_call_black_scholes(
+                                preco_ativo, strike, t, self.taxa_juros, self.sigma)
+                            if tipo == 'PUT':
+                                valor += strike * np.exp(-self.taxa_juros * t) - preco_ativo
+                            valor *= fator
+                        elif tipo == 'PUT':
+                            valor = max(strike - preco_ativo, 0.0)
+                        else:
+                            valor = max(preco_ativo - strike, 0.0)
+                        valores.append(max(round(valor, 2), 0.01))
+                    precos.append((id_serie, datas_str[dia], valores[0], valores[1],
+                                   max(valores) * 1.02, min(valores) * 0.98))
+
+                cursor.executemany("""
+                    INSERT INTO HIST_OPCAO (id_opcao, data, abertura, fechamento, maximo, minimo)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, precos)
+
+                # Simulação termina no pregão anterior ao vencimento
+                cursor.execute("""
+                    INSERT INTO SIMULACAO (id_opcao, data_inicio, data_termino, quantidade, cenario)
+                    VALUES (?, ?, ?, 1000, 'DH')
+                """, (id_serie, datas_str[inicio], datas_str[posicao_vencimento - 1]))
+
+        conn.commit()
+        return conn
+
+if __name__ == "__main__":
+    gerador = GeradorDadosSinteticos()
+    conn = gerador.criar_banco()
+    cursor = conn.cursor()
+    for tabela in ['ATIVO', 'HIST_ATIVO', 'OPCAO', 'HIST_OPCAO', 'SIMULACAO']:
+        cursor.execute(f"SELECT COUNT(*) FROM {tabela}")
+        print(f"{tabela}: {cursor.fetchone()[0]} registros")
+    conn.close()
@@ -0,0 +1,165 @@
+import sys
+import os
+import threading
+import time
+import zlib
+import argparse
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório 'src' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from helper.DownloaderMercado import COLUNAS_PREGOES
+
+class ServidorDadosLocal:
+    """
+    Serviço HTTP local que imita um provedor de cotações, para testar o
+    DownloaderMercado (helper/DownloaderMercado.py) sem rede.
+
+    GET /{ticker}?inicio=YYYY-MM-DD&fim=YYYY-MM-DD devolve um CSV com os pregões
+    (dias úteis) do período, de um movimento browniano geométrico determinístico
+    por ticker: a mesma consulta devolve sempre os mesmos preços.
+
+    Simula também as condições de um provedor real:
+    - atraso: latência de cada resposta em segundos;
+    - falhas_por_ticker: as primeiras N requisições de cada ticker respondem HTTP 503;
+    - desconhecidos: tickers que respondem HTTP 404.
+
+    Conta as requisições por ticker e o maior número de requisições simultâneas.
+    """
+
+    def __init__(self, atraso: float = 0.0, falhas_por_ticker: int = 0, desconhecidos=(), porta: int = 0):
+        """
+        Args:
+            atraso: Latência de cada resposta em segundos (padrão: 0)
+            falhas_por_ticker: Requisições iniciais de cada ticker que falham com HTTP 503 (padrão: 0)
+            desconhecidos: Tickers que respondem HTTP 404 (padrão: nenhum)
+            porta: Porta local (padrão: 0, uma porta livre qualquer)
+        """
+        self.atraso = atraso
+        self.falhas_por_ticker = falhas_por_ticker
+        self.desconhecidos = set(desconhecidos)
+        self.requisicoes = {}
+        self.simultaneas = 0
+        self.simultaneas_maximo = 0
+        self._trava = threading.Lock()
+        self._thread = None
+
+        servidor = self
+
+        class Manipulador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                servidor._atender(self)
+
+            def log_message(self, formato, *args):
+                pass
+
+        self._http = ThreadingHTTPServer(('127.0.0.1', porta), Manipulador)
+        self._http.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, porta = self._http.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._http.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self._http.shutdown()
+        self._http.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *args):
+        self.parar()
+
+    @staticmethod
+    def gerar_pregoes(ticker: str, inicio, fim) -> pd.DataFrame:
+        """
+        Pregões sintéticos do ticker entre inicio e fim (dias úteis), com semente
+        derivada do ticker e preços ancorados em 2000-01-03, para que períodos
+        sobrepostos tenham os mesmos preços.
+        """
+        base = np.datetime64('2000-01-03')
+        inicio, fim = np.datetime64(str(inicio)[:10], 'D'), np.datetime64(str(fim)[:10], 'D')
+        n = int(np.busday_count(base, fim + 1))
+        rng = np.random.default_rng(zlib.crc32(ticker.encode('utf-8')))
+        preco_inicial = rng.uniform(5, 100)
+        retornos = rng.normal(0.0, 0.02, n)
+        fechamento = preco_inicial * np.exp(np.cumsum(retornos))
+        abertura = np.r_[preco_inicial, fechamento[:-1]] * np.exp(rng.normal(0.0, 0.005, n))
+        amplitude = np.abs(rng.normal(0.0, 0.01, n))
+
+        datas = np.busday_offset(base, np.arange(n), roll='forward')
+        selecao = datas >= inicio
+        df = pd.DataFrame({
+            'data': datas[selecao].astype(str),
+            'abertura': abertura[selecao],
+            'fechamento': fechamento[selecao],
+            'maximo': np.maximum(abertura, fechamento)[selecao] * (1 + amplitude[selecao]),
+            'minimo': np.minimum(abertura, fechamento)[selecao] * (1 - amplitude[selecao]),
+        }, columns=COLUNAS_PREGOES)
+        return df.round(2)
+
+    def _atender(self, manipulador: BaseHTTPRequestHandler):
+        url = urllib.parse.urlsplit(manipulador.path)
+        ticker = urllib.parse.unquote(url.path.strip('/'))
+        consulta = urllib.parse.parse_qs(url.query)
+
+        with self._trava:
+            self.requisicoes[ticker] = self.requisicoes.get(ticker, 0) + 1
+            numero = self.requisicoes[ticker]
+            self.simultaneas += 1
+            self.simultaneas_maximo = max(self.simultaneas_maximo, self.simultaneas)
+        try:
+            if self.atraso:
+                time.sleep(self.atraso)
+            if not ticker or ticker in self.desconhecidos:
+                manipulador.send_error(404, f"Ticker desconhecido: {ticker}")
+                return
+            if numero <= self.falhas_por_ticker:
+                manipulador.send_error(503, "Serviço indisponível")
+                return
+            try:
+                inicio, fim = consulta['inicio'][0], consulta['fim'][0]
+                corpo = self.gerar_pregoes(ticker, inicio, fim).to_csv(index=False).encode('utf-8')
+            except (KeyError, ValueError):
+                manipulador.send_error(400, "Informe inicio e fim no formato YYYY-MM-DD")
+                return
+            manipulador.send_response(200)
+            manipulador.send_header('Content-Type', 'text/csv; charset=utf-8')
+            manipulador.send_header('Content-Length', str(len(corpo)))
+            manipulador.end_headers()
+            manipulador.wfile.write(corpo)
+        finally:
+            with self._trava:
+                self.simultaneas -= 1
+
+def main():
+    parser = argparse.ArgumentParser(description='Serviço local de cotações sintéticas para testar o download em lote')
+    parser.add_argument('--porta', type=int, default=8765, help='Porta local (padrão: 8765)')
+    parser.add_argument('--atraso', type=float, default=0.0, help='Latência de cada resposta em segundos (padrão: 0)')
+    parser.add_argument('--falhas', type=int, default=0,
+                        help='Requisições iniciais de cada ticker que falham com HTTP 503 (padrão: 0)')
+    args = parser.parse_args()
+
+    servidor = ServidorDadosLocal(atraso=args.atraso, falhas_por_ticker=args.falhas, porta=args.porta)
+    print(f"Servindo cotações sintéticas em {servidor.url} (Ctrl+C para encerrar)")
+    try:
+        servidor._http.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor._http.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import sys
+import os
+import time
+import argparse
+import sqlite3
+
+# Adiciona o diretório 'src' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from helper.VolatilidadeGarch import VolatilidadeGarch, JANELA_AJUSTE
+
+def conectar_banco():
+    return sqlite3.connect('banco/mercado_opcoes.db')
+
+def ajustar_garch(ticker: str, data_inicio: str = None, data_fim: str = None, janela: int = JANELA_AJUSTE):
+    """
+    Ajusta o GARCH(1,1) em cada pregão do período e grava os parâmetros na tabela PARAMETROS_GARCH.
+
+    Args:
+        ticker: Ticker do ativo (ex: PETR4)
+        data_inicio: Primeiro pregão ajustado (padrão: início do histórico)
+        data_fim: Último pregão ajustado (padrão: fim do histórico)
+        janela: Retornos usados em cada ajuste (padrão: 500)
+    """
+    conn = conectar_banco()
+
+    try:
+        garch = VolatilidadeGarch(conn, ticker, janela)
+        data_inicio = data_inicio or str(garch.dados.datas[0])
+        data_fim = data_fim or str(garch.dados.datas[-1])
+
+        inicio = time.perf_counter()
+        ajustes = garch.ajustar_periodo(data_inicio, data_fim)
+        print(f"{len(ajustes)} ajustes GARCH(1,1) de {ticker} entre {data_inicio} e {data_fim} "
+              f"({time.perf_counter() - inicio:.2f}s).")
+
+        if ajustes:
+            data = max(ajustes)
+            omega, alpha, beta, _ = ajustes[data]
+            previsoes = VolatilidadeGarch.previsao(*ajustes[data], [1, 21, 63, 252])
+            print(f"Último ajuste ({data}): omega={omega:.3e} alpha={alpha:.4f} beta={beta:.4f}")
+            print("Volatilidade prevista (1, 21, 63 e 252 pregões): "
+                  + ", ".join(f"{v*100:.1f}%" for v in previsoes))
+
+    except Exception as e:
+        print(f"Erro ao ajustar o GARCH: {str(e)}")
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Ajusta o GARCH(1,1) diário de um ativo e guarda os parâmetros.")
+    parser.add_argument('ticker', nargs='?', default='PETR4', help="Ticker do ativo (padrão: PETR4)")
+    parser.add_argument('--inicio', default=None, help="Primeiro pregão ajustado (YYYY-MM-DD)")
+    parser.add_argument('--fim', default=None, help="Último pregão ajustado (YYYY-MM-DD)")
+    parser.add_argument('--janela', type=int, default=JANELA_AJUSTE,
+                        help=f"Retornos usados em cada ajuste (padrão: {JANELA_AJUSTE})")
+    args = parser.parse_args()
+
+    ajustar_garch(args.ticker, args.inicio, args.fim, args.janela)
@@ -0,0 +1,50 @@
+import sys
+import os
+import time
+import argparse
+import sqlite3
+
+# Adiciona o diretório 'src' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from helper.SnapshotMercado import SnapshotMercado, DIRETORIO_SNAPSHOT
+
+def conectar_banco():
+    return sqlite3.connect('banco/mercado_opcoes.db')
+
+def gerar_snapshot(ticker: str, diretorio: str = DIRETORIO_SNAPSHOT, forcar: bool = False):
+    """
+    Gera o snapshot .npy do histórico de mercado de um ativo.
+
+    Args:
+        ticker: Ticker do ativo (ex: PETR4)
+        diretorio: Diretório base dos snapshots (padrão: banco/snapshot)
+        forcar: Gera de novo mesmo se o snapshot já corresponder ao banco
+    """
+    conn = conectar_banco()
+
+    try:
+        if not forcar and SnapshotMercado.esta_atualizado(conn, diretorio, ticker):
+            print(f"Snapshot de {ticker} já está atualizado em {os.path.join(diretorio, ticker)}.")
+            return
+
+        inicio = time.perf_counter()
+        destino = SnapshotMercado.exportar(conn, diretorio, ticker)
+        tamanho = sum(os.path.getsize(os.path.join(destino, nome)) for nome in os.listdir(destino))
+        print(f"Snapshot de {ticker} gravado em {destino} "
+              f"({tamanho / 1024:.0f} KB, {time.perf_counter() - inicio:.2f}s).")
+
+    except Exception as e:
+        print(f"Erro ao gerar o snapshot: {str(e)}")
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Gera o snapshot .npy (memory-mapped) do histórico de um ativo.")
+    parser.add_argument('ticker', nargs='?', default='PETR4', help="Ticker do ativo (padrão: PETR4)")
+    parser.add_argument('--diretorio', default=DIRETORIO_SNAPSHOT,
+                        help=f"Diretório base dos snapshots (padrão: {DIRETORIO_SNAPSHOT})")
+    parser.add_argument('--forcar', action='store_true', help="Gera de novo mesmo se estiver atualizado")
+    args = parser.parse_args()
+
+    gerar_snapshot(args.ticker, args.diretorio, args.forcar)
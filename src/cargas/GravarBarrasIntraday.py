@@ -0,0 +1,83 @@
+import sys
+import os
+import argparse
+import sqlite3
+import pandas as pd
+
+# Adiciona o diretório 'src' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from helper.BarrasIntraday import BarrasIntraday
+
+# Linhas do CSV lidas por vez
+LINHAS_POR_BLOCO = 200000
+
+# Colunas esperadas no CSV (volume é opcional)
+COLUNAS_CSV = ['data_hora', 'abertura', 'fechamento', 'maximo', 'minimo']
+
+def conectar_banco():
+    return sqlite3.connect('banco/mercado_opcoes.db')
+
+def gravar_barras(arquivo: str, ticker: str, linhas_por_bloco: int = LINHAS_POR_BLOCO):
+    """
+    Grava barras intradiárias de um CSV nas tabelas BARRA_ATIVO ou BARRA_OPCAO.
+
+    O ticker é procurado primeiro em ATIVO e depois em OPCAO. O arquivo é lido em
+    blocos, então arquivos com anos de barras de 1 minuto não precisam caber na memória.
+
+    Args:
+        arquivo: CSV com as colunas data_hora, abertura, fechamento, maximo, minimo e volume (opcional)
+        ticker: Ticker do ativo (ex: PETR4) ou da opção (ex: PETRI313)
+        linhas_por_bloco: Linhas do CSV lidas e gravadas por vez
+    """
+    conn = conectar_banco()
+    cursor = conn.cursor()
+
+    try:
+        BarrasIntraday.criar_tabelas(conn)
+
+        cursor.execute("SELECT id FROM ATIVO WHERE ticker = ?", (ticker,))
+        resultado = cursor.fetchone()
+        tabela = 'BARRA_ATIVO'
+        if resultado is None:
+            cursor.execute("SELECT id FROM OPCAO WHERE ticker = ?", (ticker,))
+            resultado = cursor.fetchone()
+            tabela = 'BARRA_OPCAO'
+        if resultado is None:
+            print(f"Erro: ticker {ticker} não encontrado nas tabelas ATIVO e OPCAO.")
+            return
+        id_instrumento = resultado[0]
+
+        total = 0
+        for bloco in pd.read_csv(arquivo, chunksize=linhas_por_bloco):
+            faltantes = [coluna for coluna in COLUNAS_CSV if coluna not in bloco.columns]
+            if faltantes:
+                print(f"Erro: colunas ausentes no arquivo: {', '.join(faltantes)}")
+                return
+
+            total += BarrasIntraday.gravar(
+                conn, tabela, id_instrumento,
+                pd.to_datetime(bloco['data_hora']).to_numpy(dtype='datetime64[s]'),
+                bloco['abertura'], bloco['fechamento'], bloco['maximo'], bloco['minimo'],
+                bloco['volume'] if 'volume' in bloco.columns else None
+            )
+            print(f"  {total} barras gravadas...")
+
+        print(f"Dados gravados com sucesso! {total} barras de {ticker} em {tabela}.")
+
+    except FileNotFoundError:
+        print(f"Erro: Arquivo '{arquivo}' não encontrado.")
+    except Exception as e:
+        print(f"Erro ao processar o arquivo: {str(e)}")
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Grava barras intradiárias de um CSV no banco.")
+    parser.add_argument('arquivo', help="CSV com data_hora, abertura, fechamento, maximo, minimo e volume")
+    parser.add_argument('ticker', help="Ticker do ativo ou da opção")
+    parser.add_argument('--linhas-por-bloco', type=int, default=LINHAS_POR_BLOCO,
+                        help=f"Linhas lidas por vez (padrão: {LINHAS_POR_BLOCO})")
+    args = parser.parse_args()
+
+    gravar_barras(args.arquivo, args.ticker, args.linhas_por_bloco)
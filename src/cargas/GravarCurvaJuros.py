@@ -0,0 +1,56 @@
+import sys
+import os
+import argparse
+import sqlite3
+import pandas as pd
+
+# Adiciona o diretório 'src' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from helper.CurvaJuros import CurvaJuros
+
+# Colunas esperadas no CSV (prazo é opcional: sem ele, cada linha é um fixing de 1 dia útil)
+COLUNAS_CSV = ['data', 'taxa']
+
+def conectar_banco():
+    return sqlite3.connect('banco/mercado_opcoes.db')
+
+def gravar_curva(arquivo: str, percentual: bool = False):
+    """
+    Grava taxas de juros de um CSV na tabela CURVA_JUROS.
+
+    Args:
+        arquivo: CSV com as colunas data (YYYY-MM-DD), taxa (anual, base 252 dias úteis)
+                 e prazo (opcional, em dias úteis; padrão 1, como o CDI e a Selic diários)
+        percentual: Se True, a taxa do arquivo está em % (ex: 14.90) e é dividida por 100
+    """
+    conn = conectar_banco()
+
+    try:
+        CurvaJuros.criar_tabela(conn)
+
+        df = pd.read_csv(arquivo)
+        faltantes = [coluna for coluna in COLUNAS_CSV if coluna not in df.columns]
+        if faltantes:
+            print(f"Erro: colunas ausentes no arquivo: {', '.join(faltantes)}")
+            return
+
+        taxas = df['taxa'] / 100 if percentual else df['taxa']
+        prazos = df['prazo'] if 'prazo' in df.columns else [1] * len(df)
+        total = CurvaJuros.gravar(conn, pd.to_datetime(df['data']).to_numpy(dtype='datetime64[D]'), prazos, taxas)
+        print(f"Dados gravados com sucesso! {total} vértices na tabela CURVA_JUROS.")
+
+    except FileNotFoundError:
+        print(f"Erro: Arquivo '{arquivo}' não encontrado.")
+    except Exception as e:
+        print(f"Erro ao processar o arquivo: {str(e)}")
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Grava a curva de juros (ou fixings diários) de um CSV no banco.")
+    parser.add_argument('arquivo', help="CSV com data, taxa e prazo (opcional, dias úteis)")
+    parser.add_argument('--percentual', action='store_true', help="Taxas do arquivo em % (ex: 14.90)")
+    args = parser.parse_args()
+
+    gravar_curva(args.arquivo, args.percentual)
@@ -29,6 +29,16 @@ def extrair_info_arquivo(nome_arquivo):
     
     return ticker, strike, vencimento
 
+def tipo_opcao(ticker):
+    # Na B3 a letra da série indica o tipo e o mês de vencimento: A a L são calls
+    # (janeiro a dezembro) e M a X são puts (ex: PETRE301 é call de maio, PETRQ301 é put de maio)
+    serie = ticker[4].upper()
+    if 'A' <= serie <= 'L':
+        return 'CALL'
+    if 'M' <= serie <= 'X':
+        return 'PUT'
+    raise ValueError(f"Série de opção inválida no ticker {ticker}")
+
 def ler_dados_csv(caminho_arquivo):
     dados = []
     try:
@@ -72,8 +82,10 @@ def gravar_dados_opcao():
         cursor.execute('DELETE FROM SIMULACAO')
         print("Tabelas limpas com sucesso!")
         
-        # Listar todos os arquivos CSV que começam com PETRE, PETRF, PETRG, PETRH, PETRI ou PETRJ
-        arquivos = [f for f in os.listdir(diretorio) if (f.startswith('PETRE') or f.startswith('PETRF') or f.startswith('PETRG') or f.startswith('PETRH') or f.startswith('PETRI') or f.startswith('PETRJ')) and f.endswith('.csv')]
+        # Listar todos os arquivos CSV das calls (PETRE a PETRJ) e das puts (PETRQ a PETRV) de maio a outubro
+        prefixos = ('PETRE', 'PETRF', 'PETRG', 'PETRH', 'PETRI', 'PETRJ',
+                    'PETRQ', 'PETRR', 'PETRS', 'PETRT', 'PETRU', 'PETRV')
+        arquivos = [f for f in os.listdir(diretorio) if f.startswith(prefixos) and f.endswith('.csv')]
         
         for arquivo in arquivos:
             # Extrair informações do nome do arquivo
@@ -83,7 +95,7 @@ def gravar_dados_opcao():
             cursor.execute('''
                 INSERT INTO OPCAO (id_ativo, tipo, ticker, strike, vencimento)
                 VALUES (?, ?, ?, ?, ?)
-            ''', (1, 'CALL', ticker, strike, vencimento))
+            ''', (1, tipo_opcao(ticker), ticker, strike, vencimento))
             
             # Obter o ID da opção recém-inserida
             id_opcao = cursor.lastrowid
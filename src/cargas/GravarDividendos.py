@@ -0,0 +1,67 @@
+import sys
+import os
+import argparse
+import sqlite3
+import pandas as pd
+
+# Adiciona o diretório 'src' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from helper.Dividendos import Dividendos
+
+# Colunas esperadas no CSV (tipo é opcional)
+COLUNAS_CSV = ['data_ex', 'valor']
+
+def conectar_banco():
+    return sqlite3.connect('banco/mercado_opcoes.db')
+
+def gravar_dividendos(arquivo: str, ticker: str):
+    """
+    Grava os dividendos de um CSV na tabela DIVIDENDO.
+
+    Args:
+        arquivo: CSV com as colunas data_ex (YYYY-MM-DD), valor (R$ por ação) e tipo
+                 (opcional, ex: DIVIDENDO ou JCP)
+        ticker: Ticker do ativo (ex: PETR4)
+    """
+    conn = conectar_banco()
+    cursor = conn.cursor()
+
+    try:
+        Dividendos.criar_tabela(conn)
+
+        cursor.execute("SELECT id FROM ATIVO WHERE ticker = ?", (ticker,))
+        resultado = cursor.fetchone()
+        if resultado is None:
+            print(f"Erro: ativo {ticker} não encontrado na tabela ATIVO.")
+            return
+        id_ativo = resultado[0]
+
+        df = pd.read_csv(arquivo)
+        faltantes = [coluna for coluna in COLUNAS_CSV if coluna not in df.columns]
+        if faltantes:
+            print(f"Erro: colunas ausentes no arquivo: {', '.join(faltantes)}")
+            return
+
+        total = Dividendos.gravar(
+            conn, id_ativo,
+            pd.to_datetime(df['data_ex']).to_numpy(dtype='datetime64[D]'),
+            df['valor'],
+            df['tipo'] if 'tipo' in df.columns else None
+        )
+        print(f"Dados gravados com sucesso! {total} dividendos de {ticker} na tabela DIVIDENDO.")
+
+    except FileNotFoundError:
+        print(f"Erro: Arquivo '{arquivo}' não encontrado.")
+    except Exception as e:
+        print(f"Erro ao processar o arquivo: {str(e)}")
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Grava dividendos de um CSV no banco.")
+    parser.add_argument('arquivo', help="CSV com data_ex, valor e tipo (opcional)")
+    parser.add_argument('ticker', nargs='?', default='PETR4', help="Ticker do ativo (padrão: PETR4)")
+    args = parser.parse_args()
+
+    gravar_dividendos(args.arquivo, args.ticker)
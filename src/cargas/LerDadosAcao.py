@@ -1,23 +1,92 @@
-import yfinance as yf
+import sys
+import os
+import argparse
+import sqlite3
+import time
 import pandas as pd
 
-# Define o ticker da Petrobras negociado na B3
-ticker = "PETR4.SA"
+# Adiciona o diretório 'src' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-# Baixa os dados históricos dos últimos 3 anos
-dados = yf.download(ticker, period="3y", interval="1d")
+from helper.DownloaderMercado import DownloaderMercado, ProvedorYahoo, ProvedorHttp, ProvedorArquivo
 
-# Filtra apenas as colunas desejadas
-dados_filtrados = dados[["Open", "High", "Low", "Close"]]
+# Planilha lida por cargas/GravarDadosAcao.py
+ARQUIVO_EXCEL = os.path.join('dados', 'dados_petrobras_3anos.xlsx')
 
-# Renomeia as colunas para português (opcional)
-dados_filtrados.columns = ["Abertura", "Máxima", "Mínima", "Fechamento"]
+def conectar_banco():
+    return sqlite3.connect('banco/mercado_opcoes.db')
 
-# Arredonda para duas casas decimais
-dados_filtrados = dados_filtrados.round(2)
+def criar_provedor(args):
+    if args.provedor == 'http':
+        return ProvedorHttp(args.url)
+    if args.provedor == 'arquivo':
+        return ProvedorArquivo(args.diretorio)
+    return ProvedorYahoo()
 
-# Salva em uma planilha Excel
-arquivo_excel = ".\\dados\\dados_petrobras_3anos.xlsx"
-dados_filtrados.to_excel(arquivo_excel, sheet_name="PETR4", engine="openpyxl")
+def gravar_excel(arquivo: str, dados: dict):
+    """
+    Grava uma aba por ticker no formato da planilha antiga (Date, Abertura, Máxima, Mínima, Fechamento).
+    """
+    with pd.ExcelWriter(arquivo, engine='openpyxl') as escritor:
+        for ticker, df in dados.items():
+            pd.DataFrame({
+                'Date': pd.to_datetime(df['data']),
+                'Abertura': df['abertura'].to_numpy(),
+                'Máxima': df['maximo'].to_numpy(),
+                'Mínima': df['minimo'].to_numpy(),
+                'Fechamento': df['fechamento'].to_numpy(),
+            }).to_excel(escritor, sheet_name=ticker, index=False)
 
-print(f"Dados dos últimos 3 anos salvos em: {arquivo_excel}")
\ No newline at end of file
+def main():
+    parser = argparse.ArgumentParser(description='Baixa os pregões diários de vários ativos em um lote concorrente')
+    parser.add_argument('--tickers', nargs='+', default=['PETR4'], help='Tickers da B3 (padrão: PETR4)')
+    parser.add_argument('--anos', type=int, default=3, help='Anos de histórico (padrão: 3)')
+    parser.add_argument('--provedor', choices=['yahoo', 'http', 'arquivo'], default='yahoo',
+                        help='Fonte dos dados (padrão: yahoo)')
+    parser.add_argument('--url', default='http://127.0.0.1:8765',
+                        help='URL do provedor http, ex: benchmark/ServidorDadosLocal.py (padrão: http://127.0.0.1:8765)')
+    parser.add_argument('--diretorio', default='dados', help='Diretório dos CSVs do provedor arquivo (padrão: dados)')
+    parser.add_argument('--destino', choices=['banco', 'parquet', 'excel'], default='excel',
+                        help=f'Onde gravar: HIST_ATIVO, um .parquet por ticker ou {ARQUIVO_EXCEL} (padrão: excel)')
+    parser.add_argument('--saida-parquet', default=os.path.join('dados', 'pregoes'),
+                        help='Diretório dos arquivos .parquet (padrão: dados/pregoes)')
+    parser.add_argument('--concorrencia', type=int, default=8, help='Requisições simultâneas (padrão: 8)')
+    parser.add_argument('--tentativas', type=int, default=3, help='Tentativas por ticker (padrão: 3)')
+    parser.add_argument('--limite-taxa', type=float, default=None,
+                        help='Máximo de requisições por segundo (padrão: sem limite)')
+    args = parser.parse_args()
+
+    fim = pd.Timestamp.today().normalize()
+    inicio = fim - pd.DateOffset(years=args.anos)
+    downloader = DownloaderMercado(criar_provedor(args), concorrencia=args.concorrencia,
+                                   tentativas=args.tentativas, requisicoes_por_segundo=args.limite_taxa)
+
+    conn = None
+    try:
+        tempo_inicial = time.perf_counter()
+        dados, erros = downloader.baixar(args.tickers, inicio.date(), fim.date())
+        print(f"{len(dados)} de {len(args.tickers)} tickers baixados em {time.perf_counter() - tempo_inicial:.2f}s")
+        for ticker, erro in erros.items():
+            print(f"Erro: {ticker}: {erro}")
+        if not dados:
+            return
+
+        if args.destino == 'banco':
+            conn = conectar_banco()
+            total = DownloaderMercado.gravar_banco(conn, dados)
+            print(f"Dados gravados com sucesso! {total} pregões na tabela HIST_ATIVO.")
+        elif args.destino == 'parquet':
+            caminhos = DownloaderMercado.gravar_parquet(args.saida_parquet, dados)
+            print(f"Dados gravados com sucesso! {len(caminhos)} arquivos em {args.saida_parquet}")
+        else:
+            gravar_excel(ARQUIVO_EXCEL, dados)
+            print(f"Dados dos últimos {args.anos} anos salvos em: {ARQUIVO_EXCEL}")
+
+    except Exception as e:
+        print(f"\nErro durante a execução: {str(e)}")
+    finally:
+        if conn is not None:
+            conn.close()
+
+if __name__ == "__main__":
+    main()
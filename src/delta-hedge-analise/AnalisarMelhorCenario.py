@@ -3,7 +3,22 @@ import os
 import pandas as pd
 from datetime import datetime
 import sqlite3
-from openpyxl.utils import get_column_letter
+
+# Adiciona o diretório 'src' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from helper.ExportadorExcel import ExportadorExcel, FORMATO_MONETARIO, FORMATO_DELTA
+
+# Formatos numéricos das colunas na planilha (os valores permanecem numéricos)
+FORMATOS_COLUNAS = {
+    'Strike': FORMATO_MONETARIO,
+    'PETR-Início': FORMATO_MONETARIO,
+    'PETR-Término': FORMATO_MONETARIO,
+    'Saldo Final': FORMATO_MONETARIO,
+    'Melhor Saldo': FORMATO_MONETARIO,
+    'Δ Inicio': FORMATO_DELTA,
+    'Δ Fim': FORMATO_DELTA,
+}
 
 def carregar_dados_excel(arquivo_excel):
     """
@@ -161,34 +176,14 @@ def main():
         # Cria DataFrame final
         df_final = pd.DataFrame(dados_melhor_cenario)
         
-        # Formatação das colunas
+        # Converte valores (planilhas antigas podem conter texto 'R$ ...') para números
         for col in ['Strike', 'PETR-Início', 'PETR-Término', 'Melhor Saldo', 'Saldo Final']:
-            df_final[col] = df_final[col].apply(lambda x: 
-                f'R$ {float(x):.2f}' if pd.notnull(x) and x != 'N/A' and not isinstance(x, str) else 
-                x if isinstance(x, str) and x.startswith('R$') else 
-                f'R$ {x:.2f}' if pd.notnull(x) and x != 'N/A' else 'N/A'
-            )
+            df_final[col] = df_final[col].apply(limpar_valores_monetarios).astype(float)
         for col in ['Δ Inicio', 'Δ Fim']:
-            df_final[col] = df_final[col].apply(lambda x: 
-                f'{float(x):.4f}' if pd.notnull(x) and x != 'N/A' and not isinstance(x, str) else 
-                x if isinstance(x, str) and not x.startswith('R$') else 
-                f'{x:.4f}' if pd.notnull(x) and x != 'N/A' else 'N/A'
-            )
-        
-        # Salva no Excel
-        with pd.ExcelWriter(arquivo_saida, engine='openpyxl') as writer:
-            df_final.to_excel(writer, sheet_name='MelhorCenario', index=False)
-            worksheet = writer.sheets['MelhorCenario']
-            
-            # Ajusta a largura das colunas
-            for col_idx, col_name in enumerate(df_final.columns, 1):
-                try:
-                    max_len = df_final[col_name].astype(str).map(len).max()
-                    header_len = len(col_name)
-                    column_width = max(max_len, header_len) + 2
-                    worksheet.column_dimensions[get_column_letter(col_idx)].width = column_width
-                except (ValueError, TypeError):
-                    worksheet.column_dimensions[get_column_letter(col_idx)].width = 15
+            df_final[col] = df_final[col].apply(limpar_valores_delta).astype(float)
+        
+        # Salva no Excel (valores numéricos com formato monetário do Excel)
+        ExportadorExcel.exportar(arquivo_saida, {'MelhorCenario': df_final}, formatos=FORMATOS_COLUNAS)
 
         print(f"\nArquivo consolidado salvo em: {arquivo_saida}")
         print(f"Total de simulações processadas: {len(dados_melhor_cenario)}")
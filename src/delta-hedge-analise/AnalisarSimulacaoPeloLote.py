@@ -4,7 +4,23 @@ import re
 import pandas as pd
 from datetime import datetime
 import sqlite3
-from openpyxl.utils import get_column_letter
+
+# Adiciona o diretório 'src' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from helper.ExportadorExcel import ExportadorExcel, FORMATO_MONETARIO, FORMATO_DELTA
+
+# Formatos numéricos das colunas na planilha (os valores permanecem numéricos)
+FORMATOS_COLUNAS = {
+    'Strike': FORMATO_MONETARIO,
+    'Preço': FORMATO_MONETARIO,
+    'PETR-Início': FORMATO_MONETARIO,
+    'PETR-Término': FORMATO_MONETARIO,
+    'Saldo Final': FORMATO_MONETARIO,
+    'Melhor Saldo': FORMATO_MONETARIO,
+    'Δ Inicio': FORMATO_DELTA,
+    'Δ Fim': FORMATO_DELTA,
+}
 
 def extrair_dados_simulacao(arquivo_txt):
     """
@@ -300,12 +316,6 @@ def main():
         # Cria DataFrame
         df = pd.DataFrame(dados)
         
-        # Formatação das colunas
-        for col in ['Strike', 'Preço', 'PETR-Início', 'PETR-Término', 'Melhor Saldo', 'Saldo Final']:
-            df[col] = df[col].apply(lambda x: f'R$ {x:.2f}' if pd.notnull(x) else 'N/A')
-        for col in ['Δ Inicio', 'Δ Fim']:
-            df[col] = df[col].apply(lambda x: f'{x:.4f}' if pd.notnull(x) else 'N/A')
-        
         # Cria DataFrame para todos os cenários
         dados_todos = []
         
@@ -355,49 +365,12 @@ def main():
         # Cria DataFrame para todos os cenários
         df_todos = pd.DataFrame(dados_todos)
         
-        # Formatação das colunas para todos os cenários
-        for col in ['Strike', 'Preço', 'PETR-Início', 'PETR-Término', 'Melhor Saldo', 'Saldo Final']:
-            df_todos[col] = df_todos[col].apply(lambda x: f'R$ {x:.2f}' if pd.notnull(x) else 'N/A')
-        for col in ['Δ Inicio', 'Δ Fim']:
-            df_todos[col] = df_todos[col].apply(lambda x: f'{x:.4f}' if pd.notnull(x) else 'N/A')
-        
-        # Salva no Excel
-        with pd.ExcelWriter(arquivo_excel, engine='openpyxl') as writer:
-            # Aba principal (melhor cenário de cada opção)
-            df.to_excel(writer, sheet_name='SimulacaoPeloLote', index=False)
-            worksheet = writer.sheets['SimulacaoPeloLote']
-            
-            # Ajusta a largura das colunas de forma mais robusta
-            for col_idx, col_name in enumerate(df.columns, 1):
-                try:
-                    # Calcula o tamanho máximo do conteúdo da coluna
-                    max_len = df[col_name].astype(str).map(len).max()
-                    # Compara com o tamanho do cabeçalho
-                    header_len = len(col_name)
-                    # Usa o maior valor + 2 de buffer
-                    column_width = max(max_len, header_len) + 2
-                    worksheet.column_dimensions[get_column_letter(col_idx)].width = column_width
-                except (ValueError, TypeError):
-                    # Se houver erro (ex: coluna vazia), usa um valor padrão
-                    worksheet.column_dimensions[get_column_letter(col_idx)].width = 15
-            
-            # Aba "Todos" (todas as combinações)
-            df_todos.to_excel(writer, sheet_name='Todos', index=False)
-            worksheet_todos = writer.sheets['Todos']
-            
-            # Ajusta a largura das colunas para a aba "Todos"
-            for col_idx, col_name in enumerate(df_todos.columns, 1):
-                try:
-                    # Calcula o tamanho máximo do conteúdo da coluna
-                    max_len = df_todos[col_name].astype(str).map(len).max()
-                    # Compara com o tamanho do cabeçalho
-                    header_len = len(col_name)
-                    # Usa o maior valor + 2 de buffer
-                    column_width = max(max_len, header_len) + 2
-                    worksheet_todos.column_dimensions[get_column_letter(col_idx)].width = column_width
-                except (ValueError, TypeError):
-                    # Se houver erro (ex: coluna vazia), usa um valor padrão
-                    worksheet_todos.column_dimensions[get_column_letter(col_idx)].width = 15
+        # Salva no Excel (valores numéricos com formato monetário do Excel)
+        ExportadorExcel.exportar(
+            arquivo_excel,
+            {'SimulacaoPeloLote': df, 'Todos': df_todos},
+            formatos=FORMATOS_COLUNAS
+        )
 
         print(f"Tabela salva em: {arquivo_excel}")
         print(f"Total de simulações processadas: {len(simulacoes)}")
@@ -8,9 +8,13 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import sqlite3
 from datetime import datetime
 from DeltaHedgeAjustePeloDia import DeltaHedgeAjustePeloDia
+from helper.TradeHelper import TradeHelper
+from helper.CacheResultados import CacheResultados
+from helper.Instrumentacao import Instrumentacao
 
 def executar_cenario(conn: sqlite3.Connection, id_simulacao: int, frequencia_ajuste: int = 1,
-                    taxa_juros: float = 0.15, pregoes_volatilidade: int = 30, arquivo_saida=None):
+                    taxa_juros: float = 0.15, pregoes_volatilidade: int = 30, arquivo_saida=None,
+                    cache=None):
     """
     Executa um cenário de simulação de delta hedge.
     
@@ -21,8 +25,24 @@ def executar_cenario(conn: sqlite3.Connection, id_simulacao: int, frequencia_aju
         taxa_juros: Taxa de juros anual (padrão: 6%)
         pregoes_volatilidade: Número de pregões para cálculo da volatilidade (padrão: 30)
         arquivo_saida: Arquivo para gravar os resultados
+        cache: Cache de resultados (CacheResultados); se None, o cenário é sempre calculado
     """
     try:
+        # Parâmetros que identificam o cenário no cache
+        parametros = {'frequencia_ajuste': frequencia_ajuste, 'taxa_juros': taxa_juros,
+                      'pregoes_volatilidade': pregoes_volatilidade}
+        
+        # Reaproveita o resultado se o cenário já foi calculado com os mesmos dados
+        if cache is not None:
+            with Instrumentacao.etapa('cache.obter'):
+                resultado_cache = cache.obter(conn, id_simulacao, 'dia', parametros)
+            if resultado_cache is not None:
+                print(resultado_cache)
+                if arquivo_saida:
+                    arquivo_saida.write(resultado_cache)
+                    arquivo_saida.flush()
+                return
+        
         # Busca os dados da simulação
         cursor = conn.cursor()
         cursor.execute("""
@@ -62,30 +82,37 @@ def executar_cenario(conn: sqlite3.Connection, id_simulacao: int, frequencia_aju
             arquivo_saida.write(resultado)
         
         # Cria e processa a simulação
-        delta_hedge = DeltaHedgeAjustePeloDia(
-            conn=conn,
-            id_simulacao=id_simulacao,
-            frequencia_ajuste=frequencia_ajuste,
-            taxa_juros=taxa_juros,
-            pregoes_volatilidade=pregoes_volatilidade
-        )
-        
-        # Processa os dados
-        delta_hedge.processar()
+        with Instrumentacao.etapa('processar'):
+            delta_hedge = DeltaHedgeAjustePeloDia(
+                conn=conn,
+                id_simulacao=id_simulacao,
+                frequencia_ajuste=frequencia_ajuste,
+                taxa_juros=taxa_juros,
+                pregoes_volatilidade=pregoes_volatilidade
+            )
+            
+            # Processa os dados
+            delta_hedge.processar()
         
         # Captura a saída da impressão
         import io
         from contextlib import redirect_stdout
         
         f = io.StringIO()
-        with redirect_stdout(f):
+        with Instrumentacao.etapa('imprimir_dados'), redirect_stdout(f):
             delta_hedge.imprimir_dados()
         
         resultado_simulacao = f.getvalue()
         print(resultado_simulacao)
         if arquivo_saida:
-            arquivo_saida.write(resultado_simulacao)
-            arquivo_saida.flush()  # Força a escrita no arquivo
+            with Instrumentacao.etapa('io.arquivo'):
+                arquivo_saida.write(resultado_simulacao)
+                arquivo_saida.flush()  # Força a escrita no arquivo
+        
+        # Guarda o resultado completo do cenário no cache
+        if cache is not None:
+            with Instrumentacao.etapa('cache.gravar'):
+                cache.gravar(conn, id_simulacao, 'dia', parametros, resultado + resultado_simulacao)
         
     except Exception as e:
         erro = f"\nErro durante a execução: {str(e)}\n"
@@ -93,7 +120,8 @@ def executar_cenario(conn: sqlite3.Connection, id_simulacao: int, frequencia_aju
         if arquivo_saida:
             arquivo_saida.write(erro)
 
-def executar_cenarios_para_simulacao(conn: sqlite3.Connection, id_simulacao: int, arquivo_saida=None):
+def executar_cenarios_para_simulacao(conn: sqlite3.Connection, id_simulacao: int, arquivo_saida=None,
+                                     cache=None):
     """
     Executa múltiplos cenários para uma simulação específica.
     
@@ -101,6 +129,7 @@ def executar_cenarios_para_simulacao(conn: sqlite3.Connection, id_simulacao: int
         conn: Conexão com o banco de dados SQLite
         id_simulacao: ID da simulação na tabela SIMULACAO
         arquivo_saida: Arquivo para gravar os resultados
+        cache: Cache de resultados (CacheResultados) opcional
     """
     cabecalho = f"\n{'='*100}\n"
     cabecalho += f"EXECUTANDO CENÁRIOS PARA SIMULAÇÃO ID {id_simulacao}\n"
@@ -127,20 +156,31 @@ def executar_cenarios_para_simulacao(conn: sqlite3.Connection, id_simulacao: int
             if arquivo_saida:
                 arquivo_saida.write(separador)
             
-            executar_cenario(
-                conn=conn,
-                id_simulacao=id_simulacao,
-                frequencia_ajuste=frequencia,
-                taxa_juros=0.15,
-                pregoes_volatilidade=pregoes,
-                arquivo_saida=arquivo_saida
-            )
+            with Instrumentacao.etapa('cenario'):
+                executar_cenario(
+                    conn=conn,
+                    id_simulacao=id_simulacao,
+                    frequencia_ajuste=frequencia,
+                    taxa_juros=0.15,
+                    pregoes_volatilidade=pregoes,
+                    arquivo_saida=arquivo_saida,
+                    cache=cache
+                )
 
 def main():
     # Conecta ao banco de dados
     caminho_banco = 'banco/mercado_opcoes.db'
     conn = sqlite3.connect(caminho_banco)
     
+    # Instrumentação por etapa (--instrumentar, --perfil <arquivo> ou DELTA_HEDGE_INSTRUMENTACAO=1)
+    Instrumentacao.configurar_por_argumentos(sys.argv)
+    Instrumentacao.monitorar_conexao(conn)
+    
+    # Cache de resultados: só calcula cenários novos ou com dados/código alterados
+    cache = None
+    if '--sem-cache' not in sys.argv:
+        cache = CacheResultados(classes=[DeltaHedgeAjustePeloDia, TradeHelper], arquivos=[__file__])
+    
     # Abre arquivo para gravar resultados
     caminho_arquivo = 'dados/SimulacaoPeloDia.txt'
     with open(caminho_arquivo, 'w', encoding='utf-8') as arquivo_saida:
@@ -189,7 +229,7 @@ def main():
                 arquivo_saida.write(progresso)
                 
                 try:
-                    executar_cenarios_para_simulacao(conn, id_simulacao, arquivo_saida)
+                    executar_cenarios_para_simulacao(conn, id_simulacao, arquivo_saida, cache)
                 except Exception as e:
                     erro = f"\nErro ao processar simulação ID {id_simulacao}: {str(e)}\n"
                     print(erro)
@@ -212,6 +252,12 @@ def main():
         finally:
             # Fecha a conexão com o banco de dados
             conn.close()
+            
+            if cache is not None:
+                print(f"\nCache de cenários: {cache.acertos} reaproveitado(s), {cache.faltas} fora do cache")
+                cache.fechar()
+            
+            Instrumentacao.finalizar()
     
     print(f"\nResultados salvos em: {caminho_arquivo}")
 
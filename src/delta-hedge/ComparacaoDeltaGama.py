@@ -0,0 +1,136 @@
+import sys
+import os
+import argparse
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório 'src' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import sqlite3
+from helper.DadosMercado import DadosMercado
+from helper.HedgeDeltaGama import HedgeDeltaGama
+from helper.HedgeVetorizado import ESTRATEGIAS
+from helper.ExportadorExcel import ExportadorExcel, FORMATO_MONETARIO
+
+class ComparacaoDeltaGama:
+    """
+    Compara, simulação a simulação, o delta hedge só com ações e o hedge
+    delta-gamma com uma segunda opção do mesmo vencimento (HedgeDeltaGama):
+    número de ajustes, variância do resultado diário e saldo final.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, estrategia: str = 'delta', limite: float = 0.1,
+                 taxa_juros: float = 0.15, pregoes_volatilidade: int = 30, ticker: str = 'PETR4'):
+        """
+        Args:
+            conn: Conexão com o banco de dados SQLite
+            estrategia: 'delta', 'dia' ou 'lote' (padrão: 'delta')
+            limite: Parâmetro de ajuste da estratégia (padrão: 0.1)
+            taxa_juros: Taxa de juros anual (padrão: 15%)
+            pregoes_volatilidade: Número de pregões para cálculo da volatilidade (padrão: 30)
+            ticker: Ticker do ativo (padrão: PETR4)
+        """
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(f"Estratégia inválida: {estrategia}. Use uma de {ESTRATEGIAS}.")
+
+        self.estrategia = estrategia
+        self.limite = limite
+        self.taxa_juros = taxa_juros
+        self.pregoes_volatilidade = pregoes_volatilidade
+        self.dados = DadosMercado(conn, ticker)
+        self.erros = {}
+
+    def comparar(self, ids_simulacao: list = None) -> pd.DataFrame:
+        """
+        Compara as duas formas de hedge em cada simulação (todas do ativo, se ids_simulacao for None).
+
+        Returns:
+            pd.DataFrame: Uma linha por simulação; as que não têm opção de hedge
+                          ou volatilidade ficam em self.erros
+        """
+        simulacoes, self.erros = self.dados.carregar_simulacoes(ids_simulacao)
+        volatilidade = self.dados.volatilidade_anual(self.pregoes_volatilidade)
+
+        linhas = []
+        for simulacao in simulacoes:
+            try:
+                volatilidade_simulacao = volatilidade[simulacao['indices']]
+                if np.isnan(volatilidade_simulacao).any():
+                    raise ValueError(f"Dados insuficientes para calcular a volatilidade de "
+                                     f"{self.pregoes_volatilidade} pregões.")
+                hedge = HedgeDeltaGama.carregar_opcao_hedge(self.dados, simulacao)
+            except ValueError as e:
+                self.erros[simulacao['id_simulacao']] = str(e)
+                continue
+
+            resultado = HedgeDeltaGama.comparar(simulacao, hedge, volatilidade_simulacao, self.estrategia,
+                                                self.limite, self.taxa_juros)
+            linhas.append({
+                'Simulação': simulacao['id_simulacao'],
+                'Opção': simulacao['ticker_opcao'],
+                'Strike': simulacao['strike'],
+                'Opção Hedge': hedge['ticker_opcao'],
+                'Strike Hedge': hedge['strike'],
+                '# Ajustes Delta': resultado['ajustes_delta'],
+                '# Ajustes Delta-Gama': resultado['ajustes_delta_gama'],
+                'Desvio P&L Delta': np.sqrt(resultado['variancia_delta']),
+                'Desvio P&L Delta-Gama': np.sqrt(resultado['variancia_delta_gama']),
+                'Saldo Final Delta': resultado['saldo_delta'],
+                'Saldo Final Delta-Gama': resultado['saldo_delta_gama'],
+            })
+        return pd.DataFrame(linhas)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara o delta hedge com o hedge delta-gamma.")
+    parser.add_argument('--simulacoes', type=int, nargs='+', default=None,
+                        help="IDs das simulações (padrão: todas)")
+    parser.add_argument('--estrategia', choices=ESTRATEGIAS, default='delta',
+                        help="Estratégia de ajuste (padrão: delta)")
+    parser.add_argument('--limite', type=float, default=0.1,
+                        help="Parâmetro de ajuste da estratégia (padrão: 0.1)")
+    parser.add_argument('--pregoes', type=int, default=30,
+                        help="Pregões para cálculo da volatilidade (padrão: 30)")
+    parser.add_argument('--taxa-juros', type=float, default=0.15,
+                        help="Taxa de juros anual (padrão: 0.15)")
+    args = parser.parse_args()
+
+    # Conecta ao banco de dados
+    caminho_banco = 'banco/mercado_opcoes.db'
+    conn = sqlite3.connect(caminho_banco)
+
+    try:
+        limite = int(args.limite) if args.estrategia == 'dia' else args.limite
+        comparacao = ComparacaoDeltaGama(conn, args.estrategia, limite, args.taxa_juros, args.pregoes)
+        df = comparacao.comparar(args.simulacoes)
+        for id_simulacao, erro in comparacao.erros.items():
+            print(f"  Simulação {id_simulacao} ignorada: {erro}")
+        if df.empty:
+            raise ValueError("Nenhuma simulação com opção de hedge disponível.")
+
+        print("\nDelta hedge x hedge delta-gamma (desvio padrão do resultado diário em R$):")
+        print("=" * 80)
+        print(df.to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+        print("=" * 80)
+
+        reducao = 1 - (df['Desvio P&L Delta-Gama'] ** 2).mean() / (df['Desvio P&L Delta'] ** 2).mean()
+        print(f"\nSimulações comparadas: {len(df)}")
+        print(f"Ajustes médios: {df['# Ajustes Delta'].mean():.2f} (delta) x "
+              f"{df['# Ajustes Delta-Gama'].mean():.2f} (delta-gama)")
+        print(f"Redução da variância média do resultado diário: {reducao*100:.1f}%")
+
+        caminho_saida = 'dados/ComparacaoDeltaGama.xlsx'
+        monetarias = [coluna for coluna in df.columns if coluna.startswith(('Desvio', 'Saldo', 'Strike'))]
+        ExportadorExcel.exportar(caminho_saida, {'Comparação': df},
+                                 {coluna: FORMATO_MONETARIO for coluna in monetarias})
+        print(f"\nComparação salva em: {caminho_saida}")
+
+    except Exception as e:
+        print(f"\nErro durante a execução: {str(e)}")
+
+    finally:
+        # Fecha a conexão com o banco de dados
+        conn.close()
+
+if __name__ == "__main__":
+    main()
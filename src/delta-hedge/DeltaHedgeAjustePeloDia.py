@@ -9,10 +9,23 @@ import sqlite3
 from datetime import datetime
 import pandas as pd
 from helper.TradeHelper import TradeHelper
+from helper.Instrumentacao import Instrumentacao
+from helper.FormatadorDados import FormatadorDados
+from helper.VolatilidadeImplicita import VolatilidadeImplicita
+from helper.DadosMercado import DadosMercado
+from helper.VolatilidadeGarch import VolatilidadeGarch
+from helper.EstimadoresVolatilidade import ESTIMADORES
+from helper.HedgeVetorizado import HedgeVetorizado
+from helper.BlackScholesVetorizado import BlackScholesVetorizado
+from helper.Dividendos import Dividendos, MODELOS_DIVIDENDOS
+from helper.CurvaJuros import CurvaJuros
 
 class DeltaHedgeAjustePeloDia:
     def __init__(self, conn: sqlite3.Connection, id_simulacao: int, frequencia_ajuste: int = 1, 
-                 taxa_juros: float = 0.15, pregoes_volatilidade: int = 30):
+                 taxa_juros: float = 0.15, pregoes_volatilidade: int = 30,
+                 modo_volatilidade: str = 'historica', carrego_juros: bool = False,
+                 estimador_volatilidade: str = 'historica', modelo_dividendos: str = None,
+                 curva_juros: bool = False):
         """
         Inicializa a classe DeltaHedge.
         
@@ -22,12 +35,39 @@ class DeltaHedgeAjustePeloDia:
             frequencia_ajuste: Frequência de ajuste em dias (padrão: 1 dia)
             taxa_juros: Taxa de juros anual (padrão: 15%)
             pregoes_volatilidade: Número de pregões para cálculo da volatilidade (padrão: 30)
+            modo_volatilidade: 'historica' (volatilidade dos últimos pregões), 'implicita'
+                               (volatilidade implícita no preço da opção) ou 'garch' (previsão
+                               GARCH(1,1) até o vencimento) (padrão: 'historica')
+            carrego_juros: Se True, o saldo de caixa rende (ou paga, quando financia as ações)
+                           a taxa de juros a cada pregão (padrão: False)
+            estimador_volatilidade: Estimador da volatilidade histórica (EstimadoresVolatilidade):
+                                    'historica', 'ewma', 'ewma_riskmetrics' (lambda 0,94), 'parkinson',
+                                    'garman_klass', 'rogers_satchell' ou 'yang_zhang' (padrão: 'historica')
+            modelo_dividendos: Ajuste do delta pelos dividendos da tabela DIVIDENDO: 'discreto'
+                               (preço menos o valor presente dos dividendos) ou 'continuo'
+                               (yield equivalente de Merton) (padrão: None, sem dividendos)
+            curva_juros: Se True, o delta usa a taxa da tabela CURVA_JUROS para o prazo até o
+                         vencimento em cada data e o carrego usa a taxa de 1 dia útil; taxa_juros
+                         continua valendo para a volatilidade implícita e os dividendos (padrão: False)
         """
         self.conn = conn
         self.id_simulacao = id_simulacao
         self.frequencia_ajuste = frequencia_ajuste
         self.taxa_juros = taxa_juros
         self.pregoes_volatilidade = pregoes_volatilidade
+        self.modo_volatilidade = modo_volatilidade
+        self.carrego_juros = carrego_juros
+        self.estimador_volatilidade = estimador_volatilidade
+        self.modelo_dividendos = modelo_dividendos
+        self.curva_juros = curva_juros
+        
+        if modo_volatilidade not in ('historica', 'implicita', 'garch'):
+            raise ValueError(f"Modo de volatilidade inválido: {modo_volatilidade}. "
+                             "Use 'historica', 'implicita' ou 'garch'.")
+        if estimador_volatilidade not in ESTIMADORES:
+            raise ValueError(f"Estimador de volatilidade inválido: {estimador_volatilidade}. Use um de {ESTIMADORES}.")
+        if modelo_dividendos is not None and modelo_dividendos not in MODELOS_DIVIDENDOS:
+            raise ValueError(f"Modelo de dividendos inválido: {modelo_dividendos}. Use um de {MODELOS_DIVIDENDOS}.")
         
         # Recupera os dados da simulação
         cursor = self.conn.cursor()
@@ -48,7 +88,7 @@ class DeltaHedgeAjustePeloDia:
         
         # Recupera o preço de exercício, ID do ativo, ticker do ativo, ticker da opção e data de vencimento da opção
         cursor.execute("""
-            SELECT o.strike, o.id_ativo, a.ticker, o.ticker, o.vencimento
+            SELECT o.strike, o.id_ativo, a.ticker, o.ticker, o.vencimento, o.tipo
             FROM OPCAO o
             JOIN ATIVO a ON a.id = o.id_ativo
             WHERE o.id = ?
@@ -63,6 +103,7 @@ class DeltaHedgeAjustePeloDia:
         self.ticker_ativo = opcao[2]
         self.ticker_opcao = opcao[3]  # Ticker da opção (ex: PETRI201)
         self.data_vencimento = datetime.strptime(opcao[4], "%Y-%m-%d").date()
+        self.tipo_opcao = 'put' if str(opcao[5]).upper() == 'PUT' else 'call'
         
         # Inicializa as listas de preços e datas
         self.precos_opcao = []
@@ -78,6 +119,50 @@ class DeltaHedgeAjustePeloDia:
         
         # Recupera os dados históricos
         self._recuperar_dados_historicos()
+        
+        # Volatilidade implícita por data (calculada uma vez e guardada na tabela VOL_IMPLICITA)
+        self.volatilidades_implicitas = {}
+        self.dias_sem_volatilidade_implicita = 0
+        if self.modo_volatilidade == 'implicita':
+            self.volatilidades_implicitas = VolatilidadeImplicita.recuperar(
+                self.conn, self.id_opcao, self.data_inicio, self.data_termino, self.taxa_juros)
+
+        # Volatilidade por data dos estimadores que usam abertura, máximo e mínimo (ou EWMA)
+        self.volatilidades_estimador = {}
+        if self.estimador_volatilidade != 'historica':
+            dados = DadosMercado(self.conn, self.ticker_ativo)
+            volatilidades = dados.volatilidade_anual(self.pregoes_volatilidade, self.estimador_volatilidade)
+            self.volatilidades_estimador = dict(zip(dados.datas.astype(str), volatilidades.tolist()))
+
+        # Previsão GARCH(1,1) da volatilidade média até o vencimento (ajustes guardados na tabela PARAMETROS_GARCH)
+        self.volatilidades_garch = {}
+        self.dias_sem_previsao_garch = 0
+        if self.modo_volatilidade == 'garch':
+            garch = VolatilidadeGarch(self.conn, self.ticker_ativo)
+            datas = [data for data, _, _ in self.precos_ativo]
+            previsoes = garch.volatilidades(datas, garch.dados.dias_uteis(datas, self.data_vencimento))
+            self.volatilidades_garch = dict(zip(datas, previsoes.tolist()))
+
+        # Valor presente dos dividendos até o vencimento por data (tabela DIVIDENDO)
+        self.dividendos = {}
+        if self.modelo_dividendos is not None:
+            dados = DadosMercado(self.conn, self.ticker_ativo)
+            datas = [data for data, _, _ in self.precos_ativo]
+            valores = dados.valor_presente_dividendos(datas, self.data_vencimento, self.taxa_juros)
+            self.dividendos = dict(zip(datas, valores.tolist()))
+
+        # Taxas da curva por data: prazo até o vencimento (delta) e 1 dia útil (carrego)
+        self.taxas_curva = {}
+        self.taxas_overnight = {}
+        if self.curva_juros:
+            curva = CurvaJuros(self.conn)
+            datas = [data for data, _, _ in self.precos_ativo]
+            taxas = curva.taxas(datas, TradeHelper.calcular_dias_uteis_para_datas(
+                self.conn, self.id_ativo, datas, self.data_vencimento))
+            if np.isnan(taxas).any():
+                raise ValueError(f"A curva de juros não cobre o período da simulação (início em {datas[0]}).")
+            self.taxas_curva = dict(zip(datas, taxas.tolist()))
+            self.taxas_overnight = dict(zip(datas, curva.taxas_overnight(datas).tolist()))
     
     def _recuperar_dados_historicos(self):
         """
@@ -85,30 +170,30 @@ class DeltaHedgeAjustePeloDia:
         Também define as datas de ajuste baseado na frequência especificada.
         """
         cursor = self.conn.cursor()
-        
-        # Recupera preços da opção (abertura e fechamento)
-        cursor.execute("""
-            SELECT h.data, h.abertura, h.fechamento
-            FROM HIST_OPCAO h
-            JOIN OPCAO o ON h.id_opcao = o.id
-            WHERE o.id = ?
-              AND h.data BETWEEN ? AND ?
-            ORDER BY h.data ASC
-        """, (self.id_opcao, self.data_inicio, self.data_termino))
-        
-        self.precos_opcao = cursor.fetchall()
-        
-        # Recupera preços do ativo (abertura e fechamento)
-        cursor.execute("""
-            SELECT h.data, h.abertura, h.fechamento
-            FROM HIST_ATIVO h
-            JOIN ATIVO a ON h.id_ativo = a.id
-            WHERE a.id = ?
-              AND h.data BETWEEN ? AND ?
-            ORDER BY h.data ASC
-        """, (self.id_ativo, self.data_inicio, self.data_termino))
-        
-        self.precos_ativo = cursor.fetchall()
+        with Instrumentacao.etapa('sql.historico'):
+            # Recupera preços da opção (abertura e fechamento)
+            cursor.execute("""
+                SELECT h.data, h.abertura, h.fechamento
+                FROM HIST_OPCAO h
+                JOIN OPCAO o ON h.id_opcao = o.id
+                WHERE o.id = ?
+                  AND h.data BETWEEN ? AND ?
+                ORDER BY h.data ASC
+            """, (self.id_opcao, self.data_inicio, self.data_termino))
+        
+            self.precos_opcao = cursor.fetchall()
+        
+            # Recupera preços do ativo (abertura e fechamento)
+            cursor.execute("""
+                SELECT h.data, h.abertura, h.fechamento
+                FROM HIST_ATIVO h
+                JOIN ATIVO a ON h.id_ativo = a.id
+                WHERE a.id = ?
+                  AND h.data BETWEEN ? AND ?
+                ORDER BY h.data ASC
+            """, (self.id_ativo, self.data_inicio, self.data_termino))
+        
+            self.precos_ativo = cursor.fetchall()
         
         # Verifica se os dados foram recuperados corretamente
         if not self.precos_opcao or not self.precos_ativo:
@@ -168,11 +253,49 @@ class DeltaHedgeAjustePeloDia:
         if self.datas_ajuste[-1] != datas_ativo[-1]:
             self.datas_ajuste.append(datas_ativo[-1])
 
+    def _recuperar_volatilidade(self, data_str: str, eh_ultimo_dia: bool) -> float:
+        """
+        Recupera a volatilidade usada no delta da data.
+        
+        No modo 'implicita' usa a volatilidade implícita da abertura (ou do fechamento
+        no último dia); se ela não existir para a data (ex: prêmio abaixo do valor
+        intrínseco), usa a volatilidade histórica. No modo 'garch' usa a previsão
+        até o vencimento, ou a histórica enquanto não há retornos para o ajuste.
+        """
+        if self.modo_volatilidade == 'implicita':
+            iv_abertura, iv_fechamento = self.volatilidades_implicitas.get(data_str, (None, None))
+            sigma = iv_fechamento if eh_ultimo_dia else iv_abertura
+            if sigma is not None:
+                return sigma
+            self.dias_sem_volatilidade_implicita += 1
+        
+        if self.modo_volatilidade == 'garch':
+            sigma = self.volatilidades_garch.get(data_str, np.nan)
+            if not np.isnan(sigma):
+                return sigma
+            self.dias_sem_previsao_garch += 1
+        
+        if self.estimador_volatilidade != 'historica':
+            sigma = self.volatilidades_estimador.get(data_str, np.nan)
+            if np.isnan(sigma):
+                raise ValueError(f"Dados insuficientes para calcular a volatilidade ({self.estimador_volatilidade}) "
+                                 f"de {self.pregoes_volatilidade} pregões para {self.ticker_ativo}")
+            return sigma
+        
+        return TradeHelper.recuperaVolatilidadeAnualPara_x_Pregoes(
+            self.conn,
+            self.pregoes_volatilidade,
+            self.ticker_ativo,  # Usa o ticker do ativo
+            data_str
+        )
+
     def processar(self):
         """
         Processa o cálculo dos deltas e implementa a estratégia de delta hedge.
         """
         self.deltas = []
+        self.dias_sem_volatilidade_implicita = 0
+        self.dias_sem_previsao_garch = 0
         self.diferenca_delta = []
         self.ajuste_saldo = []
         self.saldo_diario = []
@@ -201,27 +324,30 @@ class DeltaHedgeAjustePeloDia:
             tempo_anualizado = dias_ate_vencimento / 252  # Considerando 252 dias úteis
             
             # Calcula a volatilidade para a data atual
-            sigma = TradeHelper.recuperaVolatilidadeAnualPara_x_Pregoes(
-                self.conn,
-                self.pregoes_volatilidade,
-                self.ticker_ativo,  # Usa o ticker do ativo
-                data_str
-            )
+            sigma = self._recuperar_volatilidade(data_str, data == self.data_termino)
+            taxa_juros = self.taxas_curva.get(data_str, self.taxa_juros)
             
             # No último dia, usa preço de fechamento para calcular o delta
             # Nos demais dias, usa preço de abertura
             eh_ultimo_dia = (data == self.data_termino)
             preco_para_delta = preco_ativo_fechamento if eh_ultimo_dia else preco_ativo_abertura
             
-            # Calcula o delta da call
-            delta = TradeHelper.calcular_delta(
-                opcao='call',
-                S=preco_para_delta,
-                K=self.preco_exercicio,
-                T=tempo_anualizado,
-                r=self.taxa_juros,
-                sigma=sigma
-            )
+            # Calcula o delta da opção (call ou put)
+            with Instrumentacao.etapa('calculo.delta'):
+                if self.modelo_dividendos is None:
+                    delta = TradeHelper.calcular_delta(
+                        opcao=self.tipo_opcao,
+                        S=preco_para_delta,
+                        K=self.preco_exercicio,
+                        T=tempo_anualizado,
+                        r=taxa_juros,
+                        sigma=sigma
+                    )
+                else:
+                    S, q = Dividendos.ajustar(self.modelo_dividendos, preco_para_delta,
+                                              self.dividendos[data_str], tempo_anualizado)
+                    delta = float(BlackScholesVetorizado.delta(self.tipo_opcao, S, self.preco_exercicio,
+                                                               tempo_anualizado, taxa_juros, sigma, q))
             
             self.deltas.append(delta)
             
@@ -284,61 +410,71 @@ class DeltaHedgeAjustePeloDia:
         # Verifica se o tamanho das listas corresponde ao número de datas
         if len(self.deltas) != len(self.precos_ativo):
             raise ValueError("Erro no cálculo dos deltas: número de valores não corresponde ao número de datas.")
+        
+        # Juros sobre o saldo de caixa: recalcula o saldo acumulado de uma vez sobre as datas
+        if self.carrego_juros:
+            dias_uteis = TradeHelper.calcular_dias_uteis_para_datas(
+                self.conn,
+                self.id_ativo,
+                [row[0] for row in self.precos_ativo],
+                self.data_vencimento
+            )
+            taxa_carrego = self.taxa_juros
+            if self.curva_juros:
+                taxa_carrego = np.array([self.taxas_overnight[row[0]] for row in self.precos_ativo])
+            fator = HedgeVetorizado.fator_carrego(dias_uteis, taxa_carrego)
+            self.saldo_diario = HedgeVetorizado.acumular_com_carrego(
+                np.array(self.ajuste_saldo, dtype=float), fator).tolist()
     
     def listar_dados(self) -> pd.DataFrame:
         """
         Lista os dados em formato de tabela.
         
+        Os valores ficam numéricos (a formatação em texto é feita por
+        FormatadorDados apenas na hora de imprimir).
+        
         Returns:
             pd.DataFrame: DataFrame com as colunas:
-                - Data
+                - Data (datetime)
                 - Ativo
                 - Opção
                 - Delta
-                - PregõesVencimento
+                - PregõesVencimento (int)
                 - Ajuste Ações
                 - Qtd Ações
                 - Ajuste Saldo
                 - Saldo Acumulado
+                - Ajuste (bool)
                 - Saldo Real
-                - Ajuste
         """
+        datas = np.array([row[0] for row in self.precos_ativo], dtype='datetime64[D]')
+        datas_ajuste = set(self.datas_ajuste_real)
+        
         # Cria um DataFrame com os dados
         df = pd.DataFrame({
-            'Data': [row[0] for row in self.precos_ativo],
-            'Ativo': [row[1] for row in self.precos_ativo],  # Preço de abertura
-            'Opção': [row[1] for row in self.precos_opcao],  # Preço de abertura
-            'Delta': self.deltas,
-            'PregõesVencimento': [TradeHelper.calcular_dias_uteis(
+            'Data': pd.to_datetime(datas),
+            'Ativo': np.array([row[1] for row in self.precos_ativo], dtype=float),  # Preço de abertura
+            'Opção': np.array([row[1] for row in self.precos_opcao], dtype=float),  # Preço de abertura
+            'Delta': np.array(self.deltas, dtype=float),
+            'PregõesVencimento': TradeHelper.calcular_dias_uteis_para_datas(
                 self.conn,
                 self.id_ativo,
-                datetime.strptime(x, "%Y-%m-%d").date(),
+                datas,
                 self.data_vencimento
-            ) for x in [row[0] for row in self.precos_ativo]],
-            'Ajuste Ações': self.diferenca_delta,
-            'Qtd Ações': self.qtd_acoes,
-            'Ajuste Saldo': self.ajuste_saldo,
-            'Saldo Acumulado': self.saldo_diario,
-            'Ajuste': [datetime.strptime(data, "%Y-%m-%d").date() in self.datas_ajuste_real for data in [row[0] for row in self.precos_ativo]]
+            ),
+            'Ajuste Ações': np.array(self.diferenca_delta, dtype=float),
+            'Qtd Ações': np.array(self.qtd_acoes, dtype=float),
+            'Ajuste Saldo': np.array(self.ajuste_saldo, dtype=float),
+            'Saldo Acumulado': np.array(self.saldo_diario, dtype=float),
+            'Ajuste': np.array([data in datas_ajuste for data in datas.astype(object)], dtype=bool)
         })
-        
-        # Calcula o saldo real usando preços de fechamento (com float)
+
+        # Calcula o saldo real usando preços de fechamento
         precos_fechamento_ativo = np.array([float(row[2]) for row in self.precos_ativo])
         precos_fechamento_opcao = np.array([float(row[2]) for row in self.precos_opcao])
-        qtd_acoes = np.array(df['Qtd Ações'], dtype=float)
-        saldo_acumulado = np.array(df['Saldo Acumulado'], dtype=float)
-        df['Saldo Real'] = saldo_acumulado + (qtd_acoes * precos_fechamento_ativo) - (self.quantidade_opcoes * precos_fechamento_opcao)
-        
-        # Só depois formate as colunas numéricas
-        df['Ativo'] = df['Ativo'].map('R$ {:.2f}'.format)
-        df['Opção'] = df['Opção'].map('R$ {:.2f}'.format)
-        df['Delta'] = df['Delta'].map('{:.4f}'.format)
-        df['Ajuste Ações'] = df['Ajuste Ações'].map('{:.2f}'.format)
-        df['Qtd Ações'] = df['Qtd Ações'].map('{:.2f}'.format)
-        df['Ajuste Saldo'] = df['Ajuste Saldo'].map('R$ {:.2f}'.format)
-        df['Saldo Acumulado'] = df['Saldo Acumulado'].map('R$ {:.2f}'.format)
-        df['Saldo Real'] = df['Saldo Real'].map('R$ {:.2f}'.format)
-        
+        df['Saldo Real'] = (df['Saldo Acumulado'].to_numpy() + (df['Qtd Ações'].to_numpy() * precos_fechamento_ativo)
+                            - (self.quantidade_opcoes * precos_fechamento_opcao))
+
         return df
     
     def imprimir_dados(self):
@@ -373,14 +509,34 @@ class DeltaHedgeAjustePeloDia:
         print("Dados da Simulação de Delta Hedge:")
         print("================================================================================")
         
-        df = self.listar_dados()
-        print(df.to_string(index=False))
+        with Instrumentacao.etapa('formatacao.listar_dados'):
+            df = self.listar_dados()
+        with Instrumentacao.etapa('formatacao.tabela_texto'):
+            print(FormatadorDados.tabela_texto(df))
         print("================================================================================")
         
         print(f"\nTotal de dias: {len(df)}")
         print(f"Total de ajustes: {len(self.datas_ajuste_real)}")
         print(f"Taxa de juros: {self.taxa_juros*100:.1f}%")
+        if self.curva_juros:
+            taxas = np.array(list(self.taxas_curva.values()))
+            print(f"Curva de juros: taxa contínua de {taxas.min()*100:.2f}% a {taxas.max()*100:.2f}% até o vencimento")
         print(f"Pregões de Volatilidade: {self.pregoes_volatilidade}")
+        if self.modo_volatilidade == 'implicita':
+            print(f"Volatilidade: implícita ({self.dias_sem_volatilidade_implicita} dia(s) com a histórica)")
+        if self.modo_volatilidade == 'garch':
+            print(f"Volatilidade: GARCH(1,1) até o vencimento ({self.dias_sem_previsao_garch} dia(s) com a histórica)")
+        if self.estimador_volatilidade != 'historica':
+            print(f"Estimador de volatilidade: {self.estimador_volatilidade}")
+        if self.modelo_dividendos is not None:
+            valor_inicial = self.dividendos[self.precos_ativo[0][0]]
+            print(f"Dividendos: modelo {self.modelo_dividendos} (valor presente de R$ {valor_inicial:.2f} no início)")
+        if self.carrego_juros:
+            juros = self.saldo_diario[-1] - sum(self.ajuste_saldo)
+            if self.curva_juros:
+                print(f"Carrego: juros da curva (1 dia útil) sobre o saldo (R$ {juros:.2f})")
+            else:
+                print(f"Carrego: juros de {self.taxa_juros*100:.1f}% a.a. sobre o saldo (R$ {juros:.2f})")
 
 if __name__ == "__main__":
     # Conecta ao banco de dados
@@ -0,0 +1,234 @@
+import sys
+import os
+import argparse
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório 'src' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import sqlite3
+from helper.DadosMercado import DadosMercado
+from helper.HedgeCarteira import HedgeCarteira
+from helper.HedgeVetorizado import HedgeVetorizado, ESTRATEGIAS
+from helper.EstimadoresVolatilidade import ESTIMADORES
+from helper.ModeloCustos import ModeloCustos
+from helper.FormatadorDados import FormatadorDados, FORMATOS_DELTA_HEDGE, TEXTO_QUANTIDADE
+
+# Nome do parâmetro de ajuste de cada estratégia (o mesmo das classes DeltaHedgeAjustePelo*)
+DESCRICAO_LIMITE = {
+    'delta': 'Limite de Delta para Ajuste',
+    'dia': 'Frequência de Ajuste',
+    'lote': 'Limite de Lote para Ajuste',
+}
+
+# Formatos de texto da tabela diária da carteira
+FORMATOS_CARTEIRA = {**FORMATOS_DELTA_HEDGE, 'Delta Líquido': TEXTO_QUANTIDADE, 'Opções Ativas': '{:.0f}'}
+
+class DeltaHedgeCarteira:
+    """
+    Delta hedge de uma carteira de calls e puts sobre o mesmo ativo.
+
+    Uma única posição em ações protege a carteira inteira, ajustada pelo delta
+    líquido (HedgeCarteira) com as regras das classes DeltaHedgeAjustePelo*.
+    Na estratégia 'delta' o limite vale para o delta líquido por opção da
+    carteira; na 'lote', para a diferença em ações.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, posicoes: dict, data_inicio, data_fim=None,
+                 estrategia: str = 'delta', limite: float = 0.1, taxa_juros: float = 0.15,
+                 pregoes_volatilidade: int = 30, estimador_volatilidade: str = 'historica',
+                 custos: ModeloCustos = None, carrego_juros: bool = False, ticker: str = 'PETR4'):
+        """
+        Inicializa a simulação da carteira.
+
+        Args:
+            conn: Conexão com o banco de dados SQLite
+            posicoes: {id_opcao: quantidade}; positiva para opção vendida, negativa para comprada
+            data_inicio: Primeiro pregão da carteira
+            data_fim: Último pregão (padrão: o último antes do vencimento mais distante)
+            estrategia: 'delta', 'dia' ou 'lote' (padrão: 'delta')
+            limite: Parâmetro de ajuste da estratégia (padrão: 0.1)
+            taxa_juros: Taxa de juros anual (padrão: 15%)
+            pregoes_volatilidade: Número de pregões para cálculo da volatilidade (padrão: 30)
+            estimador_volatilidade: Um de EstimadoresVolatilidade (padrão: 'historica')
+            custos: Modelo de custos de transação (padrão: None, sem custos)
+            carrego_juros: Se True, aplica a taxa de juros ao saldo de caixa (padrão: False)
+            ticker: Ticker do ativo (padrão: PETR4)
+        """
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(f"Estratégia inválida: {estrategia}. Use uma de {ESTRATEGIAS}.")
+
+        self.conn = conn
+        self.estrategia = estrategia
+        self.limite = limite
+        self.taxa_juros = taxa_juros
+        self.pregoes_volatilidade = pregoes_volatilidade
+        self.estimador_volatilidade = estimador_volatilidade
+        self.custos = custos
+        self.carrego_juros = carrego_juros
+
+        self.dados = DadosMercado(conn, ticker)
+        self.carteira = HedgeCarteira.carregar(self.dados, posicoes, data_inicio, data_fim)
+        self.deltas = None
+        self.resultado = None
+
+    @staticmethod
+    def posicoes_por_ticker(conn: sqlite3.Connection, especificacoes: list) -> dict:
+        """
+        Converte especificações 'TICKER=QUANTIDADE' (ex: PETRI341=1000, PETRU300=-500) em posições.
+        """
+        posicoes = {}
+        for especificacao in especificacoes:
+            ticker_opcao, _, quantidade = especificacao.partition('=')
+            cursor = conn.cursor()
+            cursor.execute("SELECT id FROM OPCAO WHERE ticker = ?", (ticker_opcao,))
+            linha = cursor.fetchone()
+            if not linha:
+                raise ValueError(f"Opção {ticker_opcao} não encontrada.")
+            posicoes[linha[0]] = posicoes.get(linha[0], 0.0) + float(quantidade or 0)
+        return posicoes
+
+    @staticmethod
+    def posicoes_da_cadeia(conn: sqlite3.Connection, vencimento: str, quantidade: float,
+                           ticker: str = 'PETR4') -> dict:
+        """
+        Todas as opções do ativo com o vencimento informado, com a mesma quantidade.
+        """
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT o.id
+            FROM OPCAO o
+            JOIN ATIVO a ON a.id = o.id_ativo
+            WHERE a.ticker = ? AND o.vencimento = ?
+        """, (ticker, vencimento))
+        posicoes = {linha[0]: quantidade for linha in cursor.fetchall()}
+        if not posicoes:
+            raise ValueError(f"Nenhuma opção de {ticker} com vencimento em {vencimento}.")
+        return posicoes
+
+    def processar(self):
+        """
+        Calcula o delta líquido diário e simula a estratégia de ajuste.
+        """
+        volatilidade = self.dados.volatilidade_anual(self.pregoes_volatilidade,
+                                                     self.estimador_volatilidade)[self.carteira['indices']]
+        if np.isnan(volatilidade).any():
+            raise ValueError(f"Dados insuficientes para calcular a volatilidade de {self.pregoes_volatilidade} pregões.")
+
+        self.deltas = HedgeCarteira.calcular_deltas(self.carteira, volatilidade, self.taxa_juros)
+        self.resultado = HedgeVetorizado.simular(self.deltas[None, :], self.carteira, self.estrategia,
+                                                 [self.limite], self.custos,
+                                                 self.taxa_juros if self.carrego_juros else None)
+
+    def listar_dados(self) -> pd.DataFrame:
+        """
+        Lista os dados por pregão. Opção é o valor da carteira por opção e Delta,
+        o delta líquido por opção; Delta Líquido é o delta em ações.
+        """
+        carteira = self.carteira
+        resultado = self.resultado
+        df = pd.DataFrame({
+            'Data': pd.to_datetime(carteira['datas']),
+            'Ativo': carteira['ativo_abertura'],
+            'Opção': carteira['opcao_fechamento'],
+            'Delta': self.deltas,
+            'Delta Líquido': self.deltas * carteira['quantidade'],
+            'Opções Ativas': carteira['ativa'].sum(axis=1),
+            'Ajuste Ações': resultado['ajuste_acoes'][0],
+            'Qtd Ações': resultado['qtd_acoes'][0],
+            'Ajuste Saldo': resultado['ajuste_saldo'][0],
+            'Saldo Acumulado': resultado['saldo_acumulado'][0],
+            'Ajuste': resultado['ajustou'][0],
+            'Saldo Real': resultado['saldo_real'][0],
+        })
+        if self.custos is not None:
+            df['Saldo Líquido'] = resultado['saldo_real_liquido'].reshape(-1, len(df))[0]
+        return df
+
+    def imprimir_dados(self):
+        """
+        Imprime os dados da carteira e da simulação em formato de tabela.
+        """
+        carteira = self.carteira
+        print("\nDados da Carteira:")
+        print("==================================================")
+        for i, ticker_opcao in enumerate(carteira['tickers']):
+            tipo = 'PUT' if carteira['put'][i] else 'CALL'
+            print(f"{ticker_opcao:<10} {tipo:<4} Strike R$ {carteira['strike'][i]:.2f}  "
+                  f"Vencimento {carteira['vencimento'][i]}  Quantidade {carteira['quantidades'][i]:+.0f}")
+        print(f"Total de opções: {carteira['quantidade']:.0f}")
+        print(f"{DESCRICAO_LIMITE[self.estrategia]}: {self.limite}")
+        print("==================================================\n")
+
+        print("Dados da Simulação de Delta Hedge da Carteira:")
+        print("================================================================================")
+        df = self.listar_dados()
+        formatos = {**FORMATOS_CARTEIRA, 'Saldo Líquido': FORMATOS_DELTA_HEDGE['Saldo Real']}
+        print(FormatadorDados.tabela_texto(df, formatos))
+        print("================================================================================")
+
+        print(f"\nTotal de dias: {len(df)}")
+        print(f"Total de ajustes: {int(self.resultado['num_ajustes'][0])}")
+        print(f"Taxa de juros: {self.taxa_juros*100:.1f}%")
+        print(f"Pregões de Volatilidade: {self.pregoes_volatilidade}")
+        if self.estimador_volatilidade != 'historica':
+            print(f"Estimador de volatilidade: {self.estimador_volatilidade}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Delta hedge de uma carteira de calls e puts.")
+    parser.add_argument('--opcoes', nargs='+', default=[],
+                        help="Posições TICKER=QUANTIDADE (positiva vendida, negativa comprada)")
+    parser.add_argument('--vencimento', default=None,
+                        help="Inclui todas as opções com esse vencimento (YYYY-MM-DD)")
+    parser.add_argument('--quantidade', type=float, default=1000,
+                        help="Quantidade de cada opção do vencimento (padrão: 1000 vendidas)")
+    parser.add_argument('--inicio', required=True, help="Primeiro pregão da carteira (YYYY-MM-DD)")
+    parser.add_argument('--fim', default=None, help="Último pregão da carteira (YYYY-MM-DD)")
+    parser.add_argument('--estrategia', choices=ESTRATEGIAS, default='delta',
+                        help="Estratégia de ajuste (padrão: delta)")
+    parser.add_argument('--limite', type=float, default=0.1,
+                        help="Parâmetro de ajuste da estratégia (padrão: 0.1)")
+    parser.add_argument('--pregoes', type=int, default=30,
+                        help="Pregões para cálculo da volatilidade (padrão: 30)")
+    parser.add_argument('--estimador', choices=ESTIMADORES, default='historica',
+                        help="Estimador de volatilidade (padrão: historica)")
+    parser.add_argument('--taxa-juros', type=float, default=0.15,
+                        help="Taxa de juros anual (padrão: 0.15)")
+    args = parser.parse_args()
+
+    # Conecta ao banco de dados
+    caminho_banco = 'banco/mercado_opcoes.db'
+    conn = sqlite3.connect(caminho_banco)
+
+    try:
+        posicoes = {}
+        if args.vencimento:
+            posicoes.update(DeltaHedgeCarteira.posicoes_da_cadeia(conn, args.vencimento, args.quantidade))
+        for id_opcao, quantidade in DeltaHedgeCarteira.posicoes_por_ticker(conn, args.opcoes).items():
+            posicoes[id_opcao] = posicoes.get(id_opcao, 0.0) + quantidade
+
+        limite = int(args.limite) if args.estrategia == 'dia' else args.limite
+        delta_hedge = DeltaHedgeCarteira(
+            conn=conn,
+            posicoes=posicoes,
+            data_inicio=args.inicio,
+            data_fim=args.fim,
+            estrategia=args.estrategia,
+            limite=limite,
+            taxa_juros=args.taxa_juros,
+            pregoes_volatilidade=args.pregoes,
+            estimador_volatilidade=args.estimador
+        )
+        delta_hedge.processar()
+        delta_hedge.imprimir_dados()
+
+    except Exception as e:
+        print(f"\nErro durante a execução: {str(e)}")
+
+    finally:
+        # Fecha a conexão com o banco de dados
+        conn.close()
+
+if __name__ == "__main__":
+    main()
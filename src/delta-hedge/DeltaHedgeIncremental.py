@@ -0,0 +1,539 @@
+import sys
+import os
+import argparse
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório 'src' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import sqlite3
+from helper.TradeHelper import TradeHelper
+from helper.BlackScholesVetorizado import BlackScholesVetorizado
+from helper.AcumuladorVolatilidade import AcumuladorVolatilidade
+from helper.HedgeVetorizado import ESTRATEGIAS
+from helper.FormatadorDados import FormatadorDados, FORMATOS_DELTA_HEDGE
+
+# Estado das posições do livro (uma linha por simulação). Os dados fixos da posição
+# (opção, strike, quantidade, datas) continuam em SIMULACAO e OPCAO.
+ESQUEMA_POSICAO = """
+    CREATE TABLE IF NOT EXISTS POSICAO_HEDGE (
+        id_simulacao INTEGER PRIMARY KEY,
+        estrategia TEXT NOT NULL,
+        limite FLOAT NOT NULL,
+        pregoes_volatilidade INTEGER NOT NULL,
+        taxa_juros FLOAT NOT NULL,
+        carrego_juros INTEGER NOT NULL,
+        passos INTEGER NOT NULL,
+        data_ultima DATE,
+        dias_uteis INTEGER NOT NULL,
+        delta FLOAT,
+        qtd_acoes FLOAT NOT NULL,
+        saldo FLOAT NOT NULL,
+        saldo_real FLOAT,
+        num_ajustes INTEGER NOT NULL,
+        encerrada INTEGER NOT NULL,
+        FOREIGN KEY (id_simulacao) REFERENCES SIMULACAO(id)
+    )
+"""
+
+# Colunas de estado gravadas em POSICAO_HEDGE (na ordem da tabela)
+COLUNAS_ESTADO = ('id_simulacao', 'estrategia', 'limite', 'pregoes_volatilidade', 'taxa_juros', 'carrego_juros',
+                  'passos', 'data_ultima', 'dias_uteis', 'delta', 'qtd_acoes', 'saldo', 'saldo_real',
+                  'num_ajustes', 'encerrada')
+
+class DeltaHedgeIncremental:
+    """
+    Livro de opções vendidas sobre um ativo, atualizado um pregão por vez.
+
+    Em vez de refazer a simulação desde data_inicio a cada execução, guarda
+    o estado de cada posição (último delta, ações, saldo de caixa, pregões
+    até o vencimento e número de passos) e aplica só o pregão novo com
+    passo(). As posições ficam em arrays, então um passo atualiza o livro
+    inteiro de uma vez (O(1) por posição). As regras são as mesmas das
+    classes DeltaHedgeAjustePelo* e de HedgeVetorizado, e o estado é
+    gravado e restaurado da tabela POSICAO_HEDGE.
+
+    Os pregões até o vencimento são calculados uma vez na abertura da
+    posição (TradeHelper.calcular_dias_uteis) e decrementados a cada passo;
+    uma posição que ficou sem algum pregão tem o prazo recalculado pela data.
+
+    Uma posição sem cotação da opção ou sem volatilidade em um pregão fica
+    com o estado anterior e é registrada em `erros`; as demais seguem
+    normalmente, e ela volta a ser atualizada no primeiro pregão com dados.
+    A volatilidade vem de um AcumuladorVolatilidade com as janelas das
+    posições, atualizado em O(1) a cada fechamento.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, ticker: str = 'PETR4'):
+        """
+        Inicializa um livro vazio.
+
+        Args:
+            conn: Conexão com o banco de dados SQLite
+            ticker: Ticker do ativo (padrão: PETR4)
+        """
+        self.conn = conn
+        self.ticker = ticker
+
+        cursor = conn.cursor()
+        cursor.execute("SELECT id FROM ATIVO WHERE ticker = ?", (ticker,))
+        ativo = cursor.fetchone()
+        if not ativo:
+            raise ValueError(f"Ativo {ticker} não encontrado.")
+        self.id_ativo = ativo[0]
+
+        DeltaHedgeIncremental.criar_tabela(conn)
+
+        self.data_ultima = None  # Último pregão aplicado ao livro
+        self._acumulador = None   # Volatilidade móvel das janelas das posições
+        self.erros = {}           # {id_simulacao: motivo} das posições que ficaram sem atualizar em um pregão
+
+        # Estado das posições: um array por campo, uma posição por simulação
+        self.posicoes = {
+            'id_simulacao': np.empty(0, dtype=int),
+            'id_opcao': np.empty(0, dtype=int),
+            'strike': np.empty(0),
+            'put': np.empty(0, dtype=bool),
+            'quantidade': np.empty(0),
+            'data_inicio': np.empty(0, dtype='datetime64[D]'),
+            'data_termino': np.empty(0, dtype='datetime64[D]'),
+            'vencimento': np.empty(0, dtype='datetime64[D]'),
+            'estrategia': np.empty(0, dtype=object),
+            'limite': np.empty(0),
+            'pregoes_volatilidade': np.empty(0, dtype=int),
+            'taxa_juros': np.empty(0),
+            'carrego_juros': np.empty(0, dtype=bool),
+            'passos': np.empty(0, dtype=int),
+            'data_ultima': np.empty(0, dtype='datetime64[D]'),
+            'dias_uteis': np.empty(0, dtype=int),
+            'delta': np.empty(0),
+            'qtd_acoes': np.empty(0),
+            'saldo': np.empty(0),
+            'saldo_real': np.empty(0),
+            'num_ajustes': np.empty(0, dtype=int),
+            'encerrada': np.empty(0, dtype=bool),
+        }
+
+    @staticmethod
+    def criar_tabela(conn: sqlite3.Connection):
+        """
+        Cria a tabela POSICAO_HEDGE, se ainda não existir.
+        """
+        conn.execute(ESQUEMA_POSICAO)
+        conn.commit()
+
+    def abrir(self, id_simulacao: int, estrategia: str = 'delta', limite: float = 0.1,
+              pregoes_volatilidade: int = 30, taxa_juros: float = 0.15, carrego_juros: bool = False):
+        """
+        Inclui no livro a posição de uma simulação (ainda sem nenhum pregão aplicado).
+
+        Args:
+            id_simulacao: ID da simulação na tabela SIMULACAO
+            estrategia: 'delta', 'dia' ou 'lote' (padrão: 'delta')
+            limite: Parâmetro de ajuste da estratégia (padrão: 0.1)
+            pregoes_volatilidade: Número de pregões para cálculo da volatilidade (padrão: 30)
+            taxa_juros: Taxa de juros anual (padrão: 15%)
+            carrego_juros: Se True, o saldo de caixa rende a taxa de juros a cada pregão (padrão: False)
+
+        Raises:
+            ValueError: Se a simulação não existir, já estiver no livro ou começar antes
+                        do último pregão já aplicado
+        """
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(f"Estratégia inválida: {estrategia}. Use uma de {ESTRATEGIAS}.")
+        if id_simulacao in self.posicoes['id_simulacao']:
+            raise ValueError(f"A simulação {id_simulacao} já está no livro.")
+
+        registro = self._ler_simulacoes([id_simulacao]).get(id_simulacao)
+        if registro is None:
+            raise ValueError(f"Simulação com ID {id_simulacao} não encontrada.")
+        id_opcao, put, strike, quantidade, data_inicio, data_termino, vencimento = registro
+
+        if self.data_ultima is not None and data_inicio <= self.data_ultima:
+            raise ValueError(f"A simulação {id_simulacao} começa em {data_inicio}, antes do último "
+                             f"pregão aplicado ao livro ({self.data_ultima}).")
+
+        dias_uteis = TradeHelper.calcular_dias_uteis(self.conn, self.id_ativo, str(data_inicio), str(vencimento))
+        self._incluir({
+            'id_simulacao': id_simulacao, 'id_opcao': id_opcao, 'put': put, 'strike': strike,
+            'quantidade': quantidade,
+            'data_inicio': data_inicio, 'data_termino': data_termino, 'vencimento': vencimento,
+            'estrategia': estrategia,
+            'limite': limite, 'pregoes_volatilidade': pregoes_volatilidade, 'taxa_juros': taxa_juros,
+            'carrego_juros': carrego_juros, 'passos': 0, 'data_ultima': np.datetime64('NaT'),
+            'dias_uteis': dias_uteis, 'delta': np.nan, 'qtd_acoes': 0.0, 'saldo': 0.0,
+            'saldo_real': np.nan, 'num_ajustes': 0, 'encerrada': False,
+        })
+        self._preparar_volatilidade()
+
+    def passo(self, data, ativo_abertura: float, ativo_fechamento: float, opcoes: dict) -> pd.DataFrame:
+        """
+        Aplica um pregão ao livro.
+
+        Só entram as posições abertas cujo período contém a data. Os pregões
+        devem ser aplicados em ordem crescente, sem repetir datas. Posições sem
+        o preço da opção ou sem pregões suficientes para a volatilidade ficam
+        como estavam e são registradas em self.erros.
+
+        Args:
+            data: Data do pregão
+            ativo_abertura: Preço de abertura do ativo
+            ativo_fechamento: Preço de fechamento do ativo
+            opcoes: Dicionário {id_opcao: (abertura, fechamento)} das opções do livro
+
+        Returns:
+            pd.DataFrame: Uma linha por posição atualizada, com a coluna Simulação e as
+                          colunas de DeltaHedgeAjustePelo*.listar_dados()
+
+        Raises:
+            ValueError: Se a data não for posterior ao último pregão aplicado
+        """
+        data = np.datetime64(data, 'D')
+        if self.data_ultima is not None and data <= self.data_ultima:
+            raise ValueError(f"O pregão {data} não é posterior ao último pregão aplicado ({self.data_ultima}).")
+
+        if self._acumulador is not None:
+            self._acumulador.adicionar(ativo_fechamento, data)
+        data_anterior = self.data_ultima
+        self.data_ultima = data
+
+        p = self.posicoes
+        ativas = np.flatnonzero(~p['encerrada'] & (p['data_inicio'] <= data) & (p['data_termino'] >= data))
+        if len(ativas):
+            # Posições sem cotação da opção ou sem volatilidade ficam para o próximo pregão
+            com_preco = np.array([int(id_opcao) in opcoes for id_opcao in p['id_opcao'][ativas]], dtype=bool)
+            volatilidade = self._acumulador.volatilidades()[
+                np.searchsorted(self._acumulador.janelas, p['pregoes_volatilidade'][ativas])]
+            for id_simulacao in p['id_simulacao'][ativas][~com_preco].tolist():
+                self.erros[id_simulacao] = f"Sem preço da opção no pregão {data}."
+            for id_simulacao in p['id_simulacao'][ativas][com_preco & np.isnan(volatilidade)].tolist():
+                self.erros[id_simulacao] = f"Dados insuficientes para calcular a volatilidade em {data}."
+            validas = com_preco & ~np.isnan(volatilidade)
+            ativas, volatilidade = ativas[validas], volatilidade[validas]
+
+        if len(ativas) == 0:
+            return self._linhas(ativas, data, ativo_abertura, np.empty(0), np.empty(0), np.empty(0),
+                                np.empty(0), np.empty(0, dtype=bool))
+
+        precos_opcao = np.array([opcoes[int(id_opcao)] for id_opcao in p['id_opcao'][ativas]], dtype=float)
+        opcao_abertura, opcao_fechamento = precos_opcao[:, 0], precos_opcao[:, 1]
+
+        primeiro = p['passos'][ativas] == 0
+        ultimo = p['data_termino'][ativas] == data
+        quantidade = p['quantidade'][ativas]
+
+        # Pregões até o vencimento: calculados na abertura da posição e decrementados a cada passo;
+        # recalculados pela data nas posições que ficaram sem algum pregão
+        dias_anteriores = p['dias_uteis'][ativas]
+        dias_uteis = np.where(primeiro, dias_anteriores, np.maximum(dias_anteriores - 1, 0))
+        atrasadas = np.where(primeiro, p['data_inicio'][ativas] != data, p['data_ultima'][ativas] != data_anterior)
+        if atrasadas.any():
+            dias_uteis[atrasadas] = self._dias_uteis(data, p['vencimento'][ativas][atrasadas])
+
+        # Mesmas regras de HedgeVetorizado.simular, um dia de cada vez
+        preco_delta = np.where(ultimo, ativo_fechamento, ativo_abertura)
+        taxa_juros = p['taxa_juros'][ativas]
+        delta = BlackScholesVetorizado.delta_por_tipo(p['put'][ativas], preco_delta, p['strike'][ativas],
+                                                      dias_uteis / 252, taxa_juros, volatilidade)
+        alvo = delta * quantidade
+        anterior = p['qtd_acoes'][ativas]
+        limite = p['limite'][ativas]
+        estrategia = p['estrategia'][ativas]
+
+        gatilho = np.where(estrategia == 'delta', np.abs(delta - p['delta'][ativas]) > limite,
+                  np.where(estrategia == 'lote', np.abs(alvo - anterior) > limite,
+                           p['passos'][ativas] % np.where(estrategia == 'dia', limite, 1) == 0))
+        gatilho = gatilho | ultimo | primeiro
+
+        qtd_acoes = np.where(gatilho, alvo, anterior)
+        ajuste_acoes = np.where(gatilho, alvo - anterior, 0.0)
+        preco_ajuste = np.where(ultimo & ~primeiro, ativo_fechamento, ativo_abertura)
+        ajuste_saldo = -ajuste_acoes * preco_ajuste + np.where(primeiro, quantidade * opcao_abertura, 0.0)
+
+        # Carrego: o saldo rende exp(r x pregões decorridos / 252) desde o passo anterior
+        fator = np.where(p['carrego_juros'][ativas] & ~primeiro,
+                         np.exp(taxa_juros * (dias_anteriores - dias_uteis) / 252), 1.0)
+        saldo = p['saldo'][ativas] * fator + ajuste_saldo
+        saldo_real = saldo + qtd_acoes * ativo_fechamento - quantidade * opcao_fechamento
+
+        p['passos'][ativas] += 1
+        p['data_ultima'][ativas] = data
+        p['dias_uteis'][ativas] = dias_uteis
+        p['delta'][ativas] = delta
+        p['qtd_acoes'][ativas] = qtd_acoes
+        p['saldo'][ativas] = saldo
+        p['saldo_real'][ativas] = saldo_real
+        p['num_ajustes'][ativas] += gatilho
+        p['encerrada'][ativas] = ultimo
+
+        return self._linhas(ativas, data, ativo_abertura, opcao_abertura, ajuste_acoes, ajuste_saldo,
+                            dias_uteis, gatilho)
+
+    def atualizar(self, data_fim=None) -> pd.DataFrame:
+        """
+        Aplica os pregões do banco posteriores ao último pregão do livro (até data_fim).
+
+        Lê o ativo e todas as opções do livro com uma consulta cada e chama passo() por pregão.
+
+        Returns:
+            pd.DataFrame: Linhas de todos os passos aplicados
+        """
+        abertas = ~self.posicoes['encerrada']
+        if not abertas.any():
+            return self._linhas(np.empty(0, dtype=int), None, 0.0, *([np.empty(0)] * 4),
+                                np.empty(0, dtype=bool))
+
+        data_inicio = (self.data_ultima + 1 if self.data_ultima is not None
+                       else self.posicoes['data_inicio'][abertas].min())
+        data_fim = self.posicoes['data_termino'][abertas].max() if data_fim is None else np.datetime64(data_fim, 'D')
+
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT DISTINCT data, abertura, fechamento
+            FROM HIST_ATIVO
+            WHERE id_ativo = ?
+              AND data BETWEEN ? AND ?
+            ORDER BY data ASC
+        """, (self.id_ativo, str(data_inicio), str(data_fim)))
+        pregoes = cursor.fetchall()
+
+        ids_opcao = sorted(set(self.posicoes['id_opcao'][abertas].tolist()))
+        cursor.execute(f"""
+            SELECT data, id_opcao, abertura, fechamento
+            FROM HIST_OPCAO
+            WHERE id_opcao IN ({', '.join('?' * len(ids_opcao))})
+              AND data BETWEEN ? AND ?
+        """, (*ids_opcao, str(data_inicio), str(data_fim)))
+        opcoes_por_data = {}
+        for data, id_opcao, abertura, fechamento in cursor.fetchall():
+            opcoes_por_data.setdefault(data, {})[id_opcao] = (abertura, fechamento)
+
+        linhas = [self.passo(data, abertura, fechamento, opcoes_por_data.get(data, {}))
+                  for data, abertura, fechamento in pregoes]
+        if not linhas:
+            return self._linhas(np.empty(0, dtype=int), None, 0.0, *([np.empty(0)] * 4),
+                                np.empty(0, dtype=bool))
+        return pd.concat(linhas, ignore_index=True)
+
+    def volatilidade(self, pregoes: int) -> float:
+        """
+        Volatilidade anual atual de uma das janelas das posições do livro
+        (mesma regra de DadosMercado.volatilidade_anual).
+        """
+        if self._acumulador is None:
+            return np.nan
+        return self._acumulador.volatilidade(pregoes)
+
+    def salvar(self):
+        """
+        Grava o estado de todas as posições do livro em POSICAO_HEDGE.
+        """
+        p = self.posicoes
+        linhas = []
+        for i in range(len(p['id_simulacao'])):
+            linha = []
+            for coluna in COLUNAS_ESTADO:
+                valor = p[coluna][i]
+                if coluna == 'data_ultima':
+                    valor = None if np.isnat(valor) else str(valor)
+                elif isinstance(valor, np.generic):
+                    valor = valor.item()
+                if isinstance(valor, float) and np.isnan(valor):
+                    valor = None
+                linha.append(valor)
+            linhas.append(linha)
+
+        self.conn.executemany(f"""
+            INSERT OR REPLACE INTO POSICAO_HEDGE ({', '.join(COLUNAS_ESTADO)})
+            VALUES ({', '.join('?' * len(COLUNAS_ESTADO))})
+        """, linhas)
+        self.conn.commit()
+
+    @classmethod
+    def restaurar(cls, conn: sqlite3.Connection, ticker: str = 'PETR4',
+                  incluir_encerradas: bool = False) -> 'DeltaHedgeIncremental':
+        """
+        Recria o livro a partir de POSICAO_HEDGE.
+
+        Os fechamentos usados na volatilidade são lidos de HIST_ATIVO até o último
+        pregão aplicado (uma consulta para o livro inteiro).
+
+        Args:
+            conn: Conexão com o banco de dados SQLite
+            ticker: Ticker do ativo (padrão: PETR4)
+            incluir_encerradas: Se True, carrega também as posições que já venceram
+        """
+        livro = cls(conn, ticker)
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT {', '.join('p.' + coluna for coluna in COLUNAS_ESTADO)}
+            FROM POSICAO_HEDGE p
+            JOIN SIMULACAO s ON s.id = p.id_simulacao
+            JOIN OPCAO o ON o.id = s.id_opcao
+            WHERE o.id_ativo = ?
+              AND (? OR p.encerrada = 0)
+            ORDER BY p.id_simulacao ASC
+        """, (livro.id_ativo, int(incluir_encerradas)))
+        estados = [dict(zip(COLUNAS_ESTADO, linha)) for linha in cursor.fetchall()]
+
+        registros = livro._ler_simulacoes([estado['id_simulacao'] for estado in estados])
+        for estado in estados:
+            id_opcao, put, strike, quantidade, data_inicio, data_termino, vencimento = registros[estado['id_simulacao']]
+            estado.update({
+                'id_opcao': id_opcao, 'put': put, 'strike': strike, 'quantidade': quantidade,
+                'data_inicio': data_inicio, 'data_termino': data_termino, 'vencimento': vencimento,
+                'data_ultima': np.datetime64(estado['data_ultima'] or 'NaT', 'D'),
+                'delta': np.nan if estado['delta'] is None else estado['delta'],
+                'saldo_real': np.nan if estado['saldo_real'] is None else estado['saldo_real'],
+            })
+            livro._incluir(estado)
+
+        datas_ultimas = livro.posicoes['data_ultima']
+        if len(datas_ultimas) and not np.isnat(datas_ultimas).all():
+            livro.data_ultima = datas_ultimas[~np.isnat(datas_ultimas)].max()
+        livro._preparar_volatilidade()
+        return livro
+
+    def _incluir(self, valores: dict):
+        """Acrescenta uma posição aos arrays de estado."""
+        for campo, array in self.posicoes.items():
+            self.posicoes[campo] = np.append(array, np.array([valores[campo]], dtype=array.dtype))
+
+    def _preparar_volatilidade(self):
+        """
+        Cria o acumulador de volatilidade quando o livro ganha uma janela nova,
+        passando por ele os fechamentos de HIST_ATIVO que a maior janela precisa:
+        até o último pregão aplicado ou, com o livro ainda sem pregões, antes da
+        primeira posição.
+        """
+        janelas = np.unique(self.posicoes['pregoes_volatilidade'])
+        if len(janelas) == 0:
+            return
+        if self._acumulador is not None and np.isin(janelas, self._acumulador.janelas).all():
+            return
+
+        if self.data_ultima is not None:
+            condicao, limite = 'data <= ?', self.data_ultima
+        else:
+            condicao, limite = 'data < ?', self.posicoes['data_inicio'].min()
+
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            SELECT DISTINCT data, fechamento
+            FROM HIST_ATIVO
+            WHERE id_ativo = ?
+              AND {condicao}
+            ORDER BY data DESC
+            LIMIT ?
+        """, (self.id_ativo, str(limite), int(janelas.max())))
+
+        self._acumulador = AcumuladorVolatilidade(janelas)
+        for data, fechamento in reversed(cursor.fetchall()):
+            self._acumulador.adicionar(fechamento, data)
+
+    def _dias_uteis(self, data, vencimentos: np.ndarray) -> np.ndarray:
+        """
+        Pregões do HIST_ATIVO depois da data e até cada vencimento (a regra de
+        TradeHelper.calcular_dias_uteis), com uma única consulta.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT DISTINCT data
+            FROM HIST_ATIVO
+            WHERE id_ativo = ?
+              AND data > ? AND data <= ?
+            ORDER BY data ASC
+        """, (self.id_ativo, str(data), str(vencimentos.max())))
+        pregoes = np.array([linha[0] for linha in cursor.fetchall()], dtype='datetime64[D]')
+        return np.searchsorted(pregoes, vencimentos, side='right')
+
+    def _ler_simulacoes(self, ids_simulacao: list) -> dict:
+        """
+        Lê os dados fixos das simulações do ativo.
+
+        Returns:
+            dict: {id_simulacao: (id_opcao, put, strike, quantidade, data_inicio, data_termino, vencimento)}
+        """
+        if not ids_simulacao:
+            return {}
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            SELECT s.id, s.id_opcao, o.tipo, o.strike, s.quantidade, s.data_inicio, s.data_termino, o.vencimento
+            FROM SIMULACAO s
+            JOIN OPCAO o ON o.id = s.id_opcao
+            WHERE o.id_ativo = ?
+              AND s.id IN ({', '.join('?' * len(ids_simulacao))})
+        """, (self.id_ativo, *ids_simulacao))
+        return {linha[0]: (linha[1], str(linha[2]).upper() == 'PUT', float(linha[3]), float(linha[4]),
+                           np.datetime64(linha[5], 'D'), np.datetime64(linha[6], 'D'), np.datetime64(linha[7], 'D'))
+                for linha in cursor.fetchall()}
+
+    def _linhas(self, posicoes: np.ndarray, data, ativo_abertura: float, opcao_abertura, ajuste_acoes,
+                ajuste_saldo, dias_uteis, gatilho) -> pd.DataFrame:
+        """Tabela do passo (uma linha por posição atualizada)."""
+        p = self.posicoes
+        return pd.DataFrame({
+            'Simulação': p['id_simulacao'][posicoes],
+            'Data': pd.to_datetime(np.full(len(posicoes), data, dtype='datetime64[D]')),
+            'Ativo': np.full(len(posicoes), float(ativo_abertura)),
+            'Opção': np.asarray(opcao_abertura, dtype=float),
+            'Delta': p['delta'][posicoes],
+            'PregõesVencimento': np.asarray(dias_uteis, dtype=int),
+            'Ajuste Ações': np.asarray(ajuste_acoes, dtype=float),
+            'Qtd Ações': p['qtd_acoes'][posicoes],
+            'Ajuste Saldo': np.asarray(ajuste_saldo, dtype=float),
+            'Saldo Acumulado': p['saldo'][posicoes],
+            'Ajuste': np.asarray(gatilho, dtype=bool),
+            'Saldo Real': p['saldo_real'][posicoes],
+        })
+
+def main():
+    parser = argparse.ArgumentParser(description="Atualiza o livro de delta hedge um pregão por vez.")
+    parser.add_argument('--abrir', type=int, nargs='+', default=[],
+                        help="IDs de simulações a incluir no livro")
+    parser.add_argument('--estrategia', choices=ESTRATEGIAS, default='delta',
+                        help="Estratégia das posições abertas com --abrir (padrão: delta)")
+    parser.add_argument('--limite', type=float, default=0.1,
+                        help="Parâmetro de ajuste das posições abertas com --abrir (padrão: 0.1)")
+    parser.add_argument('--pregoes', type=int, default=30,
+                        help="Pregões para cálculo da volatilidade (padrão: 30)")
+    parser.add_argument('--taxa-juros', type=float, default=0.15,
+                        help="Taxa de juros anual (padrão: 0.15)")
+    parser.add_argument('--carrego', action='store_true',
+                        help="Aplica a taxa de juros ao saldo de caixa a cada pregão")
+    parser.add_argument('--ate', default=None,
+                        help="Aplica os pregões até essa data (padrão: até o fim das posições)")
+    args = parser.parse_args()
+
+    # Conecta ao banco de dados
+    caminho_banco = 'banco/mercado_opcoes.db'
+    conn = sqlite3.connect(caminho_banco)
+
+    try:
+        livro = DeltaHedgeIncremental.restaurar(conn)
+        limite = int(args.limite) if args.estrategia == 'dia' else args.limite
+        for id_simulacao in args.abrir:
+            livro.abrir(id_simulacao, args.estrategia, limite, args.pregoes, args.taxa_juros, args.carrego)
+
+        passos = livro.atualizar(args.ate)
+        livro.salvar()
+
+        print(f"\nPosições no livro: {len(livro.posicoes['id_simulacao'])}")
+        print(f"Último pregão aplicado: {livro.data_ultima}")
+        for id_simulacao, motivo in sorted(livro.erros.items()):
+            print(f"Simulação {id_simulacao} não atualizada: {motivo}")
+        if len(passos):
+            print("================================================================================")
+            print(FormatadorDados.tabela_texto(passos, FORMATOS_DELTA_HEDGE))
+            print("================================================================================")
+
+    except Exception as e:
+        print(f"\nErro durante a execução: {str(e)}")
+
+    finally:
+        # Fecha a conexão com o banco de dados
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import sys
+import os
+import argparse
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório 'src' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import sqlite3
+from helper.DadosMercado import DadosMercado
+from helper.BarrasIntraday import BarrasIntraday
+from helper.HedgeVetorizado import HedgeVetorizado, ESTRATEGIAS
+from helper.ModeloCustos import ModeloCustos
+from helper.FormatadorDados import FormatadorDados, FORMATOS_DELTA_HEDGE, TEXTO_QUANTIDADE
+
+# Nome do parâmetro de ajuste de cada estratégia (o mesmo das classes DeltaHedgeAjustePelo*)
+DESCRICAO_LIMITE = {
+    'delta': 'Limite de Delta para Ajuste',
+    'dia': 'Frequência de Ajuste (barras)',
+    'lote': 'Limite de Lote para Ajuste',
+}
+
+# Formatos de texto da tabela por barra
+FORMATOS_INTRADAY = {**FORMATOS_DELTA_HEDGE, 'PregõesVencimento': TEXTO_QUANTIDADE}
+
+class DeltaHedgeIntraday:
+    """
+    Delta hedge sobre barras intradiárias (BARRA_ATIVO e BARRA_OPCAO).
+
+    Aplica as mesmas regras das classes DeltaHedgeAjustePelo* em cada barra,
+    em vez de em cada pregão: o gatilho é avaliado na abertura da barra e a
+    última barra da simulação ajusta pelo fechamento. A estratégia 'dia'
+    passa a contar barras. Todo o cálculo é feito sobre arrays (HedgeVetorizado).
+    """
+
+    def __init__(self, conn: sqlite3.Connection, id_simulacao: int, estrategia: str = 'delta',
+                 limite: float = 0.1, taxa_juros: float = 0.15, pregoes_volatilidade: int = 30,
+                 intervalo_minutos: int = None, custos: ModeloCustos = None, carrego_juros: bool = False,
+                 ticker: str = 'PETR4'):
+        """
+        Inicializa a simulação intradiária.
+
+        Args:
+            conn: Conexão com o banco de dados SQLite
+            id_simulacao: ID da simulação na tabela SIMULACAO
+            estrategia: 'delta', 'dia' ou 'lote' (padrão: 'delta')
+            limite: Parâmetro de ajuste da estratégia (padrão: 0.1)
+            taxa_juros: Taxa de juros anual (padrão: 15%)
+            pregoes_volatilidade: Número de pregões para cálculo da volatilidade (padrão: 30)
+            intervalo_minutos: Reamostra as barras para esse intervalo (padrão: barras gravadas)
+            custos: Modelo de custos de transação (padrão: None, sem custos)
+            carrego_juros: Se True, aplica a taxa de juros ao saldo de caixa (padrão: False)
+            ticker: Ticker do ativo (padrão: PETR4)
+        """
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(f"Estratégia inválida: {estrategia}. Use uma de {ESTRATEGIAS}.")
+
+        self.conn = conn
+        self.id_simulacao = id_simulacao
+        self.estrategia = estrategia
+        self.limite = limite
+        self.taxa_juros = taxa_juros
+        self.pregoes_volatilidade = pregoes_volatilidade
+        self.intervalo_minutos = intervalo_minutos
+        self.custos = custos
+        self.carrego_juros = carrego_juros
+
+        self.dados = DadosMercado(conn, ticker)
+        self.simulacao = BarrasIntraday.carregar_simulacao(self.dados, id_simulacao, intervalo_minutos)
+        self.deltas = None
+        self.resultado = None
+
+    def processar(self):
+        """
+        Calcula os deltas por barra e simula a estratégia de ajuste.
+        """
+        volatilidade = self.dados.volatilidade_anual(self.pregoes_volatilidade)[self.simulacao['indices']]
+        if np.isnan(volatilidade).any():
+            raise ValueError(f"Dados insuficientes para calcular a volatilidade de {self.pregoes_volatilidade} pregões.")
+
+        self.deltas = HedgeVetorizado.calcular_deltas(self.simulacao, volatilidade, self.taxa_juros)
+        self.resultado = HedgeVetorizado.simular(self.deltas[None, :], self.simulacao, self.estrategia,
+                                                 [self.limite], self.custos,
+                                                 self.taxa_juros if self.carrego_juros else None)
+
+    def listar_dados(self) -> pd.DataFrame:
+        """
+        Lista os dados por barra, com as colunas de DeltaHedgeAjustePelo*.listar_dados()
+        (Data é o horário da barra e PregõesVencimento é fracionário).
+        """
+        simulacao = self.simulacao
+        resultado = self.resultado
+        df = pd.DataFrame({
+            'Data': pd.to_datetime(simulacao['datas']),
+            'Ativo': simulacao['ativo_abertura'],
+            'Opção': simulacao['opcao_abertura'],
+            'Delta': self.deltas,
+            'PregõesVencimento': simulacao['dias_uteis'],
+            'Ajuste Ações': resultado['ajuste_acoes'][0],
+            'Qtd Ações': resultado['qtd_acoes'][0],
+            'Ajuste Saldo': resultado['ajuste_saldo'][0],
+            'Saldo Acumulado': resultado['saldo_acumulado'][0],
+            'Ajuste': resultado['ajustou'][0],
+            'Saldo Real': resultado['saldo_real'][0],
+        })
+        if self.custos is not None:
+            df['Saldo Líquido'] = resultado['saldo_real_liquido'].reshape(-1, len(df))[0]
+        return df
+
+    def imprimir_dados(self):
+        """
+        Imprime os dados da simulação em formato de tabela.
+        """
+        simulacao = self.simulacao
+        print("\nDados da Opção:")
+        print("==================================================")
+        print(f"Ticker: {simulacao['ticker_opcao']}")
+        print(f"Strike: R$ {simulacao['strike']:.2f}")
+        print(f"Vencimento: {simulacao['vencimento']}")
+        print(f"Quantidade Vendida: {simulacao['quantidade']}")
+        print(f"{DESCRICAO_LIMITE[self.estrategia]}: {self.limite}")
+        print(f"Barras: {len(simulacao['datas'])}"
+              + (f" de {self.intervalo_minutos} minutos" if self.intervalo_minutos else ""))
+        print("==================================================\n")
+
+        print("Dados da Simulação de Delta Hedge (intradiária):")
+        print("================================================================================")
+        df = self.listar_dados()
+        formatos = {**FORMATOS_INTRADAY, 'Saldo Líquido': FORMATOS_DELTA_HEDGE['Saldo Real']}
+        print(FormatadorDados.tabela_texto(df, formatos, formato_data='%Y-%m-%d %H:%M'))
+        print("================================================================================")
+
+        print(f"\nTotal de barras: {len(df)}")
+        print(f"Total de ajustes: {int(self.resultado['num_ajustes'][0])}")
+        print(f"Taxa de juros: {self.taxa_juros*100:.1f}%")
+        print(f"Pregões de Volatilidade: {self.pregoes_volatilidade}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Delta hedge sobre barras intradiárias.")
+    parser.add_argument('--simulacao', type=int, required=True, help="ID da simulação")
+    parser.add_argument('--estrategia', choices=ESTRATEGIAS, default='delta',
+                        help="Estratégia de ajuste (padrão: delta)")
+    parser.add_argument('--limite', type=float, default=0.1,
+                        help="Parâmetro de ajuste da estratégia (padrão: 0.1)")
+    parser.add_argument('--intervalo', type=int, default=None,
+                        help="Reamostra as barras para esse intervalo em minutos (ex: 60)")
+    parser.add_argument('--pregoes', type=int, default=30,
+                        help="Pregões para cálculo da volatilidade (padrão: 30)")
+    parser.add_argument('--taxa-juros', type=float, default=0.15,
+                        help="Taxa de juros anual (padrão: 0.15)")
+    args = parser.parse_args()
+
+    # Conecta ao banco de dados
+    caminho_banco = 'banco/mercado_opcoes.db'
+    conn = sqlite3.connect(caminho_banco)
+
+    try:
+        BarrasIntraday.criar_tabelas(conn)
+        limite = int(args.limite) if args.estrategia == 'dia' else args.limite
+        delta_hedge = DeltaHedgeIntraday(
+            conn=conn,
+            id_simulacao=args.simulacao,
+            estrategia=args.estrategia,
+            limite=limite,
+            taxa_juros=args.taxa_juros,
+            pregoes_volatilidade=args.pregoes,
+            intervalo_minutos=args.intervalo
+        )
+        delta_hedge.processar()
+        delta_hedge.imprimir_dados()
+
+    except Exception as e:
+        print(f"\nErro durante a execução: {str(e)}")
+
+    finally:
+        # Fecha a conexão com o banco de dados
+        conn.close()
+
+if __name__ == "__main__":
+    main()
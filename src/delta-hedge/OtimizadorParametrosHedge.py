@@ -0,0 +1,478 @@
+import sys
+import os
+import math
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório 'src' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import sqlite3
+from helper.DadosMercado import DadosMercado
+from helper.SnapshotMercado import SnapshotMercado
+from helper.EstimadoresVolatilidade import ESTIMADORES
+from helper.HedgeVetorizado import HedgeVetorizado
+from helper.ModeloCustos import ModeloCustos, EMOLUMENTOS_B3_BPS
+from helper.MemoriaCompartilhada import MemoriaCompartilhada
+from helper.ExportadorExcel import ExportadorExcel, FORMATO_MONETARIO
+
+# Nome da coluna do parâmetro de ajuste de cada estratégia (o mesmo das planilhas de análise)
+COLUNAS_PARAMETRO = {
+    'delta': 'Ajuste.Delta',
+    'dia': 'Freq.Ajuste',
+    'lote': 'Limite Lote',
+}
+
+# Espaço de busca padrão: bem mais denso que a grade fixa dos cenários *Todos
+LIMITES_PADRAO = {
+    'delta': np.round(np.arange(0.01, 0.5001, 0.01), 2),
+    'dia': np.arange(1, 21),
+    'lote': np.arange(10, 1001, 10),
+}
+JANELAS_PADRAO = np.arange(5, 253)
+
+# Quantidade máxima de políticas simuladas por chamada do kernel (limita a memória)
+POLITICAS_POR_BLOCO = 20000
+
+# Estado de cada processo do pool: views da memória compartilhada e configuração da busca
+_WORKER = {}
+
+def _inicializar_worker(descritor: dict, metadados: list, configuracao: dict):
+    """Anexa a memória compartilhada publicada pelo processo principal (uma vez por processo)."""
+    memoria, arrays = MemoriaCompartilhada.anexar(descritor)
+    _WORKER.update(
+        memoria=memoria,
+        arrays=arrays,
+        simulacoes=MemoriaCompartilhada.desempacotar_simulacoes(arrays, metadados),
+        linha_serie={(ESTIMADORES[int(codigo)], int(janela)): i
+                     for i, (codigo, janela) in enumerate(arrays['series'])},
+        configuracao=configuracao,
+    )
+
+def _avaliar_no_worker(posicao: int, sobreviventes: np.ndarray) -> tuple:
+    """Avalia as configurações sobreviventes em uma simulação, dentro de um processo do pool."""
+    arrays = _WORKER['arrays']
+    linha_serie = _WORKER['linha_serie']
+    return OtimizadorParametrosHedge.avaliar_configuracoes(
+        _WORKER['simulacoes'][posicao],
+        lambda janela, estimador: arrays['volatilidades'][linha_serie[(estimador, janela)]],
+        arrays['limites'][sobreviventes], arrays['janelas'][sobreviventes],
+        estimadores=arrays['estimadores'][sobreviventes], **_WORKER['configuracao']
+    )
+
+class OtimizadorParametrosHedge:
+    """
+    Busca os melhores parâmetros de delta hedge em uma grade densa.
+
+    Cada configuração é uma tupla (parâmetro de ajuste, pregões de volatilidade,
+    estimador de volatilidade).
+    As configurações são avaliadas pelo kernel vetorizado (HedgeVetorizado) e
+    podadas por successive halving: começam com poucas simulações, e a cada
+    rodada só a fração 1/eta mais bem colocada no ranking de Pareto (saldo
+    médio x número médio de ajustes) segue para uma amostra eta vezes maior.
+    A busca respeita um orçamento de tempo e devolve a fronteira de Pareto.
+
+    Com um ModeloCustos, o saldo usado no ranking é o líquido dos custos de
+    transação, o que premia as políticas com menos ajustes.
+
+    Com processos > 1, as simulações de cada rodada são avaliadas em um pool
+    de processos. Volatilidades, grade e simulações são publicadas uma única
+    vez em memória compartilhada (MemoriaCompartilhada) e os processos
+    trabalham sobre views desses arrays, sem cópia.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, estrategia: str = 'delta', limites=None, janelas=None,
+                 taxa_juros: float = 0.15, orcamento_segundos: float = 60.0, eta: int = 3,
+                 tamanho_minimo: int = 20, semente: int = 42, ticker: str = 'PETR4',
+                 custos: ModeloCustos = None, carrego_juros: bool = False, snapshot: str = None,
+                 processos: int = 1, estimadores=None):
+        """
+        Inicializa o otimizador.
+
+        Args:
+            conn: Conexão com o banco de dados SQLite
+            estrategia: 'delta', 'dia' ou 'lote'
+            limites: Valores do parâmetro de ajuste (padrão: LIMITES_PADRAO da estratégia)
+            janelas: Pregões de volatilidade (padrão: 5 a 252)
+            taxa_juros: Taxa de juros anual (padrão: 15%)
+            orcamento_segundos: Tempo máximo da busca em segundos (padrão: 60)
+            eta: Fator de redução do successive halving (padrão: 3)
+            tamanho_minimo: Número mínimo de configurações mantidas em cada poda (padrão: 20)
+            semente: Semente da ordem de amostragem das simulações (padrão: 42)
+            ticker: Ticker do ativo (padrão: PETR4)
+            custos: Modelo de custos de transação com um único nível (padrão: None, sem custos)
+            carrego_juros: Se True, o saldo de caixa rende a taxa de juros a cada pregão (padrão: False)
+            snapshot: Diretório base de um snapshot (SnapshotMercado) lido no lugar do banco; precisa
+                      corresponder ao banco atual, senão ValueError (padrão: None)
+            processos: Processos usados para avaliar as simulações de cada rodada (padrão: 1)
+            estimadores: Estimadores de volatilidade (EstimadoresVolatilidade) da grade (padrão: ['historica'])
+        """
+        if estrategia not in COLUNAS_PARAMETRO:
+            raise ValueError(f"Estratégia inválida: {estrategia}. Use 'delta', 'dia' ou 'lote'.")
+
+        self.estrategia = estrategia
+        self.taxa_juros = taxa_juros
+        self.orcamento_segundos = orcamento_segundos
+        self.eta = eta
+        self.tamanho_minimo = tamanho_minimo
+        if custos is not None and custos.niveis != 1:
+            raise ValueError("O otimizador aceita um único nível de custos.")
+        self.custos = custos
+        self.carrego_juros = carrego_juros
+        self.processos = max(1, processos)
+
+        limites = np.asarray(LIMITES_PADRAO[estrategia] if limites is None else limites)
+        janelas = np.asarray(JANELAS_PADRAO if janelas is None else janelas, dtype=int)
+        estimadores = ['historica'] if estimadores is None else list(estimadores)
+        for estimador in estimadores:
+            if estimador not in ESTIMADORES:
+                raise ValueError(f"Estimador de volatilidade inválido: {estimador}. Use um de {ESTIMADORES}.")
+        codigos = np.array([ESTIMADORES.index(estimador) for estimador in estimadores])
+        grade_limites, grade_janelas, grade_estimadores = np.meshgrid(limites, janelas, codigos, indexing='ij')
+        self.limites = grade_limites.ravel()
+        self.janelas = grade_janelas.ravel()
+        self.estimadores = grade_estimadores.ravel()  # Posição do estimador em ESTIMADORES
+
+        if snapshot is None:
+            self.dados = DadosMercado(conn, ticker)
+        else:
+            self.dados = SnapshotMercado.carregar(snapshot, ticker, conn)
+        simulacoes, self.erros = self.dados.carregar_simulacoes()
+        if not simulacoes:
+            raise ValueError("Nenhuma simulação válida encontrada no banco de dados.")
+
+        # Ordem aleatória (reprodutível) em que as simulações entram nas rodadas
+        ordem = np.random.default_rng(semente).permutation(len(simulacoes))
+        self.simulacoes = [simulacoes[i] for i in ordem]
+
+        self.rodadas = []  # Resumo de cada rodada do successive halving
+
+    def avaliar(self, simulacao: dict, limites: np.ndarray, janelas: np.ndarray,
+                estimadores: np.ndarray = None) -> tuple:
+        """
+        Avalia um conjunto de configurações em uma simulação.
+
+        Returns:
+            tuple: (saldo final líquido, número de ajustes, custo total), arrays com uma
+                   posição por configuração; sem modelo de custos o custo é zero e o saldo
+                   é o bruto. O saldo é NaN quando não há pregões suficientes para a volatilidade
+        """
+        return OtimizadorParametrosHedge.avaliar_configuracoes(simulacao, self.dados.volatilidade_anual,
+                                                               limites, janelas, estimadores=estimadores,
+                                                               **self._configuracao())
+
+    @staticmethod
+    def avaliar_configuracoes(simulacao: dict, volatilidade_anual, limites: np.ndarray, janelas: np.ndarray,
+                              estrategia: str, taxa_juros: float, custos: ModeloCustos = None,
+                              taxa_carrego: float = None, estimadores: np.ndarray = None) -> tuple:
+        """
+        Avalia configurações em uma simulação (usado no processo principal e nos processos do pool).
+
+        Args:
+            simulacao: Dados de DadosMercado.carregar_simulacao
+            volatilidade_anual: Função (janela, estimador) -> volatilidade anual alinhada com o histórico do ativo
+            limites, janelas: Parâmetro de ajuste e pregões de volatilidade de cada configuração
+            estrategia, taxa_juros, custos, taxa_carrego: Como em HedgeVetorizado.simular
+            estimadores: Posição em ESTIMADORES do estimador de cada configuração (padrão: todas 'historica')
+
+        Returns:
+            tuple: (saldo final líquido, número de ajustes, custo total), como em avaliar()
+        """
+        if estimadores is None:
+            estimadores = np.zeros(len(janelas), dtype=int)
+        # Uma série de volatilidade por par (estimador, janela) distinto
+        series, posicao_janela = np.unique(np.column_stack([estimadores, janelas]), axis=0, return_inverse=True)
+        posicao_janela = posicao_janela.reshape(-1)
+        volatilidades = np.vstack([volatilidade_anual(int(j), ESTIMADORES[int(c)])[simulacao['indices']]
+                                   for c, j in series])
+        deltas_janela = HedgeVetorizado.calcular_deltas(simulacao, volatilidades, taxa_juros)
+
+        saldo = np.empty(len(limites))
+        ajustes = np.empty(len(limites))
+        custo = np.zeros(len(limites))
+        for inicio in range(0, len(limites), POLITICAS_POR_BLOCO):
+            bloco = slice(inicio, inicio + POLITICAS_POR_BLOCO)
+            resultado = HedgeVetorizado.simular(deltas_janela[posicao_janela[bloco]], simulacao,
+                                                estrategia, limites[bloco], custos, taxa_carrego)
+            ajustes[bloco] = resultado['num_ajustes']
+            if custos is None:
+                saldo[bloco] = resultado['saldo_final']
+            else:
+                saldo[bloco] = resultado['saldo_final_liquido'].reshape(-1)
+                custo[bloco] = resultado['custo_total'].reshape(-1)
+        return saldo, ajustes, custo
+
+    def _configuracao(self) -> dict:
+        """Parâmetros de avaliar_configuracoes que não dependem da simulação."""
+        return {
+            'estrategia': self.estrategia,
+            'taxa_juros': self.taxa_juros,
+            'custos': self.custos,
+            'taxa_carrego': self.taxa_juros if self.carrego_juros else None,
+        }
+
+    def _publicar(self) -> tuple:
+        """
+        Publica volatilidades, grade e simulações em memória compartilhada.
+
+        Returns:
+            tuple: (MemoriaCompartilhada, metadados das simulações)
+        """
+        series = np.unique(np.column_stack([self.estimadores, self.janelas]), axis=0)
+        arrays, metadados = MemoriaCompartilhada.empacotar_simulacoes(self.simulacoes)
+        arrays.update({
+            'series': series,
+            'volatilidades': np.vstack([self.dados.volatilidade_anual(int(j), ESTIMADORES[int(c)])
+                                        for c, j in series]),
+            'limites': self.limites,
+            'janelas': self.janelas,
+            'estimadores': self.estimadores,
+        })
+        return MemoriaCompartilhada(arrays), metadados
+
+    @staticmethod
+    def fronteira_pareto(saldo: np.ndarray, ajustes: np.ndarray) -> np.ndarray:
+        """
+        Indica as configurações não dominadas (maior saldo com menos ajustes).
+        Configurações empatadas em ambos os critérios ficam todas na fronteira.
+
+        Returns:
+            np.ndarray: Máscara booleana das configurações da fronteira
+        """
+        n = len(saldo)
+        ordem = np.lexsort((-saldo, ajustes))
+        saldo_ord = saldo[ordem]
+        ajustes_ord = ajustes[ordem]
+
+        # Primeiro elemento de cada grupo de mesmo número de ajustes (o de maior saldo)
+        inicio_grupo = np.r_[True, ajustes_ord[1:] != ajustes_ord[:-1]]
+        primeiro = np.maximum.accumulate(np.where(inicio_grupo, np.arange(n), 0))
+
+        # Maior saldo entre as configurações com estritamente menos ajustes
+        maximo_acumulado = np.maximum.accumulate(saldo_ord)
+        maximo_anterior = np.where(primeiro > 0, maximo_acumulado[np.maximum(primeiro - 1, 0)], -np.inf)
+
+        nao_dominada = (saldo_ord == saldo_ord[primeiro]) & (saldo_ord > maximo_anterior)
+        mascara = np.zeros(n, dtype=bool)
+        mascara[ordem] = nao_dominada
+        return mascara
+
+    @staticmethod
+    def ranking_pareto(saldo: np.ndarray, ajustes: np.ndarray, quantidade: int = None) -> np.ndarray:
+        """
+        Calcula o nível de Pareto de cada configuração (0 = fronteira, 1 = fronteira
+        após remover a anterior, ...).
+
+        Args:
+            saldo: Saldo médio por configuração
+            ajustes: Número médio de ajustes por configuração
+            quantidade: Se informado, para assim que ao menos essa quantidade de
+                        configurações tiver nível; as demais ficam com o nível seguinte
+        """
+        nivel = np.full(len(saldo), -1)
+        restantes = np.arange(len(saldo))
+        atual = 0
+        while restantes.size:
+            if quantidade is not None and len(saldo) - restantes.size >= quantidade:
+                nivel[restantes] = atual
+                break
+            fronteira = OtimizadorParametrosHedge.fronteira_pareto(saldo[restantes], ajustes[restantes])
+            nivel[restantes[fronteira]] = atual
+            restantes = restantes[~fronteira]
+            atual += 1
+        return nivel
+
+    def _podar(self, sobreviventes: np.ndarray, saldo_medio: np.ndarray, ajustes_medios: np.ndarray) -> np.ndarray:
+        """
+        Mantém a fração 1/eta das configurações mais bem colocadas (nível de Pareto, depois saldo).
+        """
+        validas = np.isfinite(saldo_medio)
+        if validas.any():
+            sobreviventes, saldo_medio, ajustes_medios = \
+                sobreviventes[validas], saldo_medio[validas], ajustes_medios[validas]
+
+        manter = max(self.tamanho_minimo, math.ceil(len(sobreviventes) / self.eta))
+        if manter >= len(sobreviventes):
+            return sobreviventes
+
+        nivel = OtimizadorParametrosHedge.ranking_pareto(saldo_medio, ajustes_medios, manter)
+        ordem = np.lexsort((-saldo_medio, nivel))
+        return np.sort(sobreviventes[ordem[:manter]])
+
+    def otimizar(self) -> pd.DataFrame:
+        """
+        Executa a busca por successive halving dentro do orçamento de tempo.
+
+        Returns:
+            pd.DataFrame: Fronteira de Pareto (saldo médio x número médio de ajustes)
+                          ordenada pelo número de ajustes; com modelo de custos, o
+                          'Saldo Final Médio' é o líquido e há também as colunas
+                          'Saldo Bruto Médio' e 'Custo Médio'
+        """
+        inicio = time.perf_counter()
+        total_simulacoes = len(self.simulacoes)
+
+        # Número de rodadas para reduzir a grade até o tamanho mínimo
+        rodadas = max(0, math.ceil(math.log(max(1, len(self.limites) / self.tamanho_minimo), self.eta)))
+        simulacoes_rodada = max(1, math.ceil(total_simulacoes / self.eta ** rodadas))
+
+        sobreviventes = np.arange(len(self.limites))
+        soma_saldo = np.zeros(len(self.limites))
+        soma_ajustes = np.zeros(len(self.limites))
+        soma_custo = np.zeros(len(self.limites))
+        avaliadas = 0
+        esgotado = False
+
+        memoria = executor = None
+        if self.processos > 1:
+            memoria, metadados = self._publicar()
+            executor = ProcessPoolExecutor(max_workers=self.processos, initializer=_inicializar_worker,
+                                           initargs=(memoria.descritor, metadados, self._configuracao()))
+
+        try:
+            while True:
+                # Avalia os sobreviventes apenas nas simulações novas desta rodada
+                # (um lote de `processos` simulações por vez)
+                while avaliadas < simulacoes_rodada:
+                    if time.perf_counter() - inicio > self.orcamento_segundos and avaliadas > 0:
+                        esgotado = True
+                        break
+                    lote = range(avaliadas, min(simulacoes_rodada, avaliadas + self.processos))
+                    if executor is None:
+                        resultados = [self.avaliar(self.simulacoes[i], self.limites[sobreviventes],
+                                                   self.janelas[sobreviventes], self.estimadores[sobreviventes])
+                                      for i in lote]
+                    else:
+                        resultados = executor.map(_avaliar_no_worker, lote, [sobreviventes] * len(lote))
+                    for saldo, ajustes, custo in resultados:
+                        soma_saldo[sobreviventes] += saldo
+                        soma_ajustes[sobreviventes] += ajustes
+                        soma_custo[sobreviventes] += custo
+                    avaliadas += len(lote)
+
+                saldo_medio = soma_saldo[sobreviventes] / avaliadas
+                ajustes_medios = soma_ajustes[sobreviventes] / avaliadas
+                self.rodadas.append({
+                    'configuracoes': len(sobreviventes),
+                    'simulacoes': avaliadas,
+                    'segundos': time.perf_counter() - inicio,
+                })
+
+                if esgotado or avaliadas >= total_simulacoes:
+                    break
+
+                sobreviventes = self._podar(sobreviventes, saldo_medio, ajustes_medios)
+                simulacoes_rodada = min(total_simulacoes, simulacoes_rodada * self.eta)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+                memoria.fechar()
+
+        validas = np.isfinite(saldo_medio)
+        fronteira = np.zeros(len(sobreviventes), dtype=bool)
+        fronteira[validas] = OtimizadorParametrosHedge.fronteira_pareto(saldo_medio[validas], ajustes_medios[validas])
+
+        escolhidas = sobreviventes[fronteira]
+        df = pd.DataFrame({
+            'Estratégia': self.estrategia,
+            COLUNAS_PARAMETRO[self.estrategia]: self.limites[escolhidas],
+            '# Pregões Vol.': self.janelas[escolhidas],
+            'Estimador Vol.': np.array(ESTIMADORES)[self.estimadores[escolhidas]],
+            '# Ajustes Médio': ajustes_medios[fronteira],
+            'Saldo Final Médio': saldo_medio[fronteira],
+            'Simulações Avaliadas': avaliadas,
+        })
+        if self.custos is not None:
+            custo_medio = soma_custo[escolhidas] / avaliadas
+            df.insert(df.columns.get_loc('Saldo Final Médio'), 'Saldo Bruto Médio',
+                      saldo_medio[fronteira] + custo_medio)
+            df.insert(df.columns.get_loc('Saldo Final Médio'), 'Custo Médio', custo_medio)
+        return df.sort_values(['# Ajustes Médio', 'Saldo Final Médio'],
+                              ascending=[True, False]).reset_index(drop=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Otimiza os parâmetros de delta hedge em uma grade densa.")
+    parser.add_argument('--estrategia', choices=sorted(COLUNAS_PARAMETRO), default='delta',
+                        help="Estratégia de ajuste (padrão: delta)")
+    parser.add_argument('--orcamento', type=float, default=60.0,
+                        help="Orçamento de tempo em segundos (padrão: 60)")
+    parser.add_argument('--eta', type=int, default=3,
+                        help="Fator de redução do successive halving (padrão: 3)")
+    parser.add_argument('--taxa-juros', type=float, default=0.15,
+                        help="Taxa de juros anual (padrão: 0.15)")
+    parser.add_argument('--corretagem', type=float, default=0.0,
+                        help="Corretagem por ordem em R$ (padrão: 0)")
+    parser.add_argument('--emolumentos-bps', type=float, default=0.0,
+                        help=f"Emolumentos em pontos-base do volume (padrão: 0; B3: {EMOLUMENTOS_B3_BPS})")
+    parser.add_argument('--meio-spread', type=float, default=0.0,
+                        help="Metade do spread de compra e venda em R$ por ação (padrão: 0)")
+    parser.add_argument('--lote', type=int, default=None,
+                        help="Arredonda as ações para múltiplos do lote (padrão: fracionário)")
+    parser.add_argument('--carrego', action='store_true',
+                        help="Aplica a taxa de juros ao saldo de caixa a cada pregão")
+    parser.add_argument('--snapshot', default=None,
+                        help="Lê o histórico do snapshot nesse diretório (ex: banco/snapshot)")
+    parser.add_argument('--processos', type=int, default=1,
+                        help="Processos que avaliam as simulações em paralelo (padrão: 1)")
+    parser.add_argument('--estimadores', nargs='+', choices=ESTIMADORES, default=['historica'],
+                        help="Estimadores de volatilidade incluídos na grade (padrão: historica)")
+    args = parser.parse_args()
+
+    custos = None
+    if args.corretagem or args.emolumentos_bps or args.meio_spread or args.lote:
+        custos = ModeloCustos(args.corretagem, args.emolumentos_bps, args.meio_spread, args.lote)
+
+    # Conecta ao banco de dados
+    caminho_banco = 'banco/mercado_opcoes.db'
+    conn = sqlite3.connect(caminho_banco)
+
+    try:
+        otimizador = OtimizadorParametrosHedge(
+            conn=conn,
+            estrategia=args.estrategia,
+            taxa_juros=args.taxa_juros,
+            orcamento_segundos=args.orcamento,
+            eta=args.eta,
+            custos=custos,
+            carrego_juros=args.carrego,
+            snapshot=args.snapshot,
+            processos=args.processos,
+            estimadores=args.estimadores
+        )
+
+        print(f"\nOtimizando a estratégia '{args.estrategia}': {len(otimizador.limites)} configurações, "
+              f"{len(otimizador.simulacoes)} simulações")
+        for id_simulacao, erro in otimizador.erros.items():
+            print(f"  Simulação {id_simulacao} ignorada: {erro}")
+
+        fronteira = otimizador.otimizar()
+
+        print("\nRodadas do successive halving:")
+        for i, rodada in enumerate(otimizador.rodadas, 1):
+            print(f"  {i}: {rodada['configuracoes']} configurações em {rodada['simulacoes']} simulações "
+                  f"({rodada['segundos']:.1f}s)")
+
+        print("\nFronteira de Pareto (saldo médio x número médio de ajustes):")
+        print("=" * 80)
+        print(fronteira.to_string(index=False))
+        print("=" * 80)
+
+        caminho_saida = f'dados/FronteiraPareto{args.estrategia.capitalize()}.xlsx'
+        ExportadorExcel.exportar(caminho_saida, {'Fronteira': fronteira},
+                                 {'Saldo Final Médio': FORMATO_MONETARIO,
+                                  'Saldo Bruto Médio': FORMATO_MONETARIO,
+                                  'Custo Médio': FORMATO_MONETARIO})
+        print(f"\nFronteira salva em: {caminho_saida}")
+
+    except Exception as e:
+        print(f"\nErro durante a execução: {str(e)}")
+
+    finally:
+        # Fecha a conexão com o banco de dados
+        conn.close()
+
+if __name__ == "__main__":
+    main()
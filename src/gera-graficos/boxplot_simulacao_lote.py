@@ -6,6 +6,8 @@ from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+from estatisticas_descritivas import gerar_estatisticas
+
 def configurar_estilo():
     """Configura o estilo dos gráficos para melhor visualização."""
     try:
@@ -38,7 +40,10 @@ def carregar_dados(arquivo_excel):
 def preparar_dados(df):
     """Prepara os dados para análise, convertendo colunas numéricas."""
     # Converter coluna 'Saldo Final' para numérico
-    df['Saldo Final'] = df['Saldo Final'].str.replace('R$ ', '').str.replace(',', '.').astype(float)
+    # (planilhas novas já trazem números; as antigas trazem texto 'R$ ...')
+    if not pd.api.types.is_numeric_dtype(df['Saldo Final']):
+        df['Saldo Final'] = df['Saldo Final'].str.replace('R$ ', '').str.replace(',', '.')
+    df['Saldo Final'] = pd.to_numeric(df['Saldo Final'], errors='coerce')
     
     # Converter coluna 'Limite Lote' para numérico
     df['Limite Lote'] = pd.to_numeric(df['Limite Lote'], errors='coerce')
@@ -272,54 +277,15 @@ def gerar_heatmap_correlacao(df, output_dir):
     plt.show()
 
 def gerar_estatisticas_descritivas(df, output_dir):
-    """Gera estatísticas descritivas e salva em arquivo."""
-    stats_file = output_dir / 'estatisticas_descritivas_lote.txt'
-    
-    with open(stats_file, 'w', encoding='utf-8') as f:
-        f.write("ESTATÍSTICAS DESCRITIVAS - DELTA HEDGE AJUSTE POR LOTE\n")
-        f.write("=" * 60 + "\n\n")
-        
-        # Estatísticas gerais
-        f.write("ESTATÍSTICAS GERAIS:\n")
-        f.write(f"Total de observações: {len(df)}\n")
-        f.write(f"Saldo Final - Média: R$ {df['Saldo Final'].mean():.2f}\n")
-        f.write(f"Saldo Final - Mediana: R$ {df['Saldo Final'].median():.2f}\n")
-        f.write(f"Saldo Final - Desvio Padrão: R$ {df['Saldo Final'].std():.2f}\n")
-        f.write(f"Saldo Final - Mínimo: R$ {df['Saldo Final'].min():.2f}\n")
-        f.write(f"Saldo Final - Máximo: R$ {df['Saldo Final'].max():.2f}\n\n")
-        
-        # Por categoria de simulação
-        f.write("POR CATEGORIA DE SIMULAÇÃO:\n")
-        f.write("-" * 40 + "\n")
-        for categoria in df['Simulação'].unique():
-            subset = df[df['Simulação'] == categoria]
-            f.write(f"\n{categoria}:\n")
-            f.write(f"  Observações: {len(subset)}\n")
-            f.write(f"  Média: R$ {subset['Saldo Final'].mean():.2f}\n")
-            f.write(f"  Mediana: R$ {subset['Saldo Final'].median():.2f}\n")
-            f.write(f"  Desvio Padrão: R$ {subset['Saldo Final'].std():.2f}\n")
-        
-        # Por limite de lote
-        f.write("\n\nPOR LIMITE DE LOTE:\n")
-        f.write("-" * 40 + "\n")
-        for limite in sorted(df['Limite Lote'].unique()):
-            subset = df[df['Limite Lote'] == limite]
-            f.write(f"\nLimite {limite} ações:\n")
-            f.write(f"  Observações: {len(subset)}\n")
-            f.write(f"  Média: R$ {subset['Saldo Final'].mean():.2f}\n")
-            f.write(f"  Mediana: R$ {subset['Saldo Final'].median():.2f}\n")
-            f.write(f"  Desvio Padrão: R$ {subset['Saldo Final'].std():.2f}\n")
-        
-        # Por período de volatilidade
-        f.write("\n\nPOR PERÍODO DE VOLATILIDADE:\n")
-        f.write("-" * 40 + "\n")
-        for periodo in sorted(df['# Pregões Vol.'].unique()):
-            subset = df[df['# Pregões Vol.'] == periodo]
-            f.write(f"\n{periodo} pregões:\n")
-            f.write(f"  Observações: {len(subset)}\n")
-            f.write(f"  Média: R$ {subset['Saldo Final'].mean():.2f}\n")
-            f.write(f"  Mediana: R$ {subset['Saldo Final'].median():.2f}\n")
-            f.write(f"  Desvio Padrão: R$ {subset['Saldo Final'].std():.2f}\n")
+    """Gera estatísticas descritivas (texto e tabela CSV/Parquet) em uma única agregação."""
+    stats_file = gerar_estatisticas(
+        df, output_dir, 'lote', 'DELTA HEDGE AJUSTE POR LOTE',
+        secoes=[
+            ('Simulação', 'POR CATEGORIA DE SIMULAÇÃO:', '{}'),
+            ('Limite Lote', 'POR LIMITE DE LOTE:', 'Limite {} ações'),
+            ('# Pregões Vol.', 'POR PERÍODO DE VOLATILIDADE:', '{} pregões'),
+        ]
+    )
     
     print(f"Estatísticas descritivas salvas em: {stats_file}")
 
@@ -0,0 +1,172 @@
+"""
+Motor de estatísticas descritivas das simulações de Delta Hedge.
+
+Calcula, em uma única agregação agrupada, as estatísticas do 'Saldo Final'
+para o conjunto geral e para cada dimensão da grade de cenários (categoria
+de simulação, parâmetro de ajuste e período de volatilidade). O resultado é
+uma tabela no formato longo (uma linha por dimensão/valor), gravada em CSV
+(e Parquet, se o pyarrow estiver instalado) e também renderizada no texto
+estatisticas_descritivas_*.txt.
+"""
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Dimensão usada para as estatísticas do conjunto completo
+DIMENSAO_GERAL = 'Geral'
+
+def calcular_estatisticas(df, dimensoes, coluna_valor='Saldo Final'):
+    """
+    Calcula as estatísticas descritivas de todas as dimensões em uma única passada.
+
+    Args:
+        df: DataFrame com as simulações
+        dimensoes: Lista de (coluna, ordenar); ordenar=False mantém a ordem de aparição
+        coluna_valor: Coluna numérica a ser resumida (padrão: 'Saldo Final')
+
+    Returns:
+        pd.DataFrame: Tabela com as colunas dimensao, valor, observacoes, media,
+                      desvio_padrao, minimo, q25, mediana, q75, maximo e taxa_acerto
+                      (fração de cenários com valor positivo)
+    """
+    valores = df[coluna_valor].to_numpy(dtype=float)
+    n = len(valores)
+
+    # Cada dimensão vira um bloco (id da dimensão, código do valor) no formato longo
+    nomes_dimensoes = [DIMENSAO_GERAL]
+    rotulos = [np.array(['Total'], dtype=object)]
+    blocos_dimensao = [np.zeros(n, dtype=np.int64)]
+    blocos_codigo = [np.zeros(n, dtype=np.int64)]
+
+    for id_dimensao, (coluna, ordenar) in enumerate(dimensoes, 1):
+        codigos, unicos = pd.factorize(df[coluna], sort=ordenar)
+        nomes_dimensoes.append(coluna)
+        rotulos.append(np.asarray(unicos, dtype=object))
+        blocos_dimensao.append(np.full(n, id_dimensao, dtype=np.int64))
+        blocos_codigo.append(codigos)
+
+    longo = pd.DataFrame({
+        'id_dimensao': np.concatenate(blocos_dimensao),
+        'codigo': np.concatenate(blocos_codigo),
+        'valor': np.tile(valores, len(nomes_dimensoes)),
+    })
+    longo = longo[longo['codigo'] >= 0]  # descarta valores nulos da dimensão
+    longo['positivo'] = longo['valor'] > 0
+
+    # Uma única agregação agrupada sobre todas as dimensões
+    grupos = longo.groupby(['id_dimensao', 'codigo'], sort=True)
+    tabela = grupos['valor'].agg(['count', 'mean', 'std', 'min', 'median', 'max'])
+    quantis = grupos['valor'].quantile([0.25, 0.75]).unstack()
+    tabela['q25'] = quantis[0.25]
+    tabela['q75'] = quantis[0.75]
+    tabela['taxa_acerto'] = grupos['positivo'].mean()
+    tabela = tabela.reset_index()
+
+    tabela.insert(0, 'dimensao', [nomes_dimensoes[i] for i in tabela['id_dimensao']])
+    tabela.insert(1, 'rotulo', [rotulos[i][c] for i, c in zip(tabela['id_dimensao'], tabela['codigo'])])
+    tabela = tabela.rename(columns={
+        'count': 'observacoes',
+        'mean': 'media',
+        'std': 'desvio_padrao',
+        'min': 'minimo',
+        'median': 'mediana',
+        'max': 'maximo',
+    })
+
+    return tabela[['dimensao', 'rotulo', 'observacoes', 'media', 'desvio_padrao', 'minimo',
+                   'q25', 'mediana', 'q75', 'maximo', 'taxa_acerto']]
+
+def renderizar_texto(tabela, titulo, secoes):
+    """
+    Renderiza a tabela de estatísticas no formato texto dos arquivos estatisticas_descritivas_*.txt.
+
+    Args:
+        tabela: Resultado de calcular_estatisticas
+        titulo: Título do relatório (ex: 'DELTA HEDGE AJUSTE POR DELTA')
+        secoes: Lista de (coluna, título da seção, modelo do rótulo), ex:
+                ('Ajuste.Delta', 'POR LIMITE DE DELTA:', 'Limite {}')
+
+    Returns:
+        str: Texto do relatório
+    """
+    geral = tabela[tabela['dimensao'] == DIMENSAO_GERAL].iloc[0]
+
+    texto = f"ESTATÍSTICAS DESCRITIVAS - {titulo}\n"
+    texto += "=" * 60 + "\n\n"
+
+    # Estatísticas gerais
+    texto += "ESTATÍSTICAS GERAIS:\n"
+    texto += f"Total de observações: {geral['observacoes']}\n"
+    texto += f"Saldo Final - Média: R$ {geral['media']:.2f}\n"
+    texto += f"Saldo Final - Mediana: R$ {geral['mediana']:.2f}\n"
+    texto += f"Saldo Final - Desvio Padrão: R$ {geral['desvio_padrao']:.2f}\n"
+    texto += f"Saldo Final - Mínimo: R$ {geral['minimo']:.2f}\n"
+    texto += f"Saldo Final - Máximo: R$ {geral['maximo']:.2f}\n\n"
+
+    for i, (coluna, titulo_secao, modelo_rotulo) in enumerate(secoes):
+        texto += ("\n\n" if i > 0 else "") + f"{titulo_secao}\n"
+        texto += "-" * 40 + "\n"
+        for linha in tabela[tabela['dimensao'] == coluna].itertuples(index=False):
+            texto += f"\n{modelo_rotulo.format(linha.rotulo)}:\n"
+            texto += f"  Observações: {linha.observacoes}\n"
+            texto += f"  Média: R$ {linha.media:.2f}\n"
+            texto += f"  Mediana: R$ {linha.mediana:.2f}\n"
+            texto += f"  Desvio Padrão: R$ {linha.desvio_padrao:.2f}\n"
+
+    return texto
+
+def gravar_tabela(tabela, caminho_base):
+    """
+    Grava a tabela de estatísticas em CSV e, se o pyarrow estiver disponível, em Parquet.
+
+    Args:
+        tabela: Resultado de calcular_estatisticas
+        caminho_base: Caminho sem extensão (ex: graficos/estatisticas_descritivas_delta)
+
+    Returns:
+        list: Arquivos gravados
+    """
+    caminho_base = Path(caminho_base)
+    saida = tabela.assign(rotulo=tabela['rotulo'].astype(str))
+
+    arquivos = [caminho_base.with_suffix('.csv')]
+    saida.to_csv(arquivos[0], index=False, encoding='utf-8')
+
+    try:
+        saida.to_parquet(caminho_base.with_suffix('.parquet'), index=False)
+        arquivos.append(caminho_base.with_suffix('.parquet'))
+    except ImportError:
+        # Parquet é opcional (requer pyarrow ou fastparquet)
+        pass
+
+    return arquivos
+
+def gerar_estatisticas(df, output_dir, sufixo, titulo, secoes, ordenar_primeira=False):
+    """
+    Gera o relatório texto e a tabela de estatísticas de uma estratégia.
+
+    Args:
+        df: DataFrame preparado da aba 'Todos'
+        output_dir: Diretório de saída
+        sufixo: Sufixo dos arquivos (ex: 'delta' -> estatisticas_descritivas_delta.txt)
+        titulo: Título do relatório
+        secoes: Lista de (coluna, título da seção, modelo do rótulo); a primeira seção
+                mantém a ordem de aparição e as demais são ordenadas
+        ordenar_primeira: Se True, ordena também os valores da primeira seção
+
+    Returns:
+        Path: Caminho do arquivo texto gerado
+    """
+    output_dir = Path(output_dir)
+    dimensoes = [(coluna, ordenar_primeira if i == 0 else True) for i, (coluna, _, _) in enumerate(secoes)]
+
+    tabela = calcular_estatisticas(df, dimensoes)
+
+    stats_file = output_dir / f'estatisticas_descritivas_{sufixo}.txt'
+    with open(stats_file, 'w', encoding='utf-8') as f:
+        f.write(renderizar_texto(tabela, titulo, secoes))
+
+    gravar_tabela(tabela, output_dir / f'estatisticas_descritivas_{sufixo}')
+
+    return stats_file
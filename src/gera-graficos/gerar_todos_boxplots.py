@@ -1,106 +1,212 @@
 #!/usr/bin/env python3
 """
 Programa principal para gerar todos os boxplots das estratégias de Delta Hedge.
-Executa os três programas de análise: Delta, Dia e Lote.
+Carrega as planilhas das três estratégias (Delta, Dia e Lote) uma única vez e
+renderiza as figuras em paralelo com o backend não interativo Agg.
+Figuras cujos dados de entrada não mudaram desde a última execução são puladas.
+
+Uso:
+    python src/gera-graficos/gerar_todos_boxplots.py [--forcar] [--processos N]
 """
 
-import subprocess
+import matplotlib
+matplotlib.use('Agg')
+
+import argparse
+import hashlib
+import importlib
+import inspect
+import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
-def executar_programa(programa):
-    """Executa um programa Python e retorna True se bem-sucedido."""
+import pandas as pd
+
+# Garante que os módulos boxplot_simulacao_* sejam importáveis (inclusive nos workers)
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+# Obter o diretório raiz do projeto (onde está o requirements.txt)
+PROJETO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Arquivo com o hash dos dados usados em cada figura já gerada
+ARQUIVO_HASHES = '.hash_graficos.json'
+
+# Estratégia -> (módulo de gráficos, planilha de entrada, figuras [(função, arquivo gerado)])
+ESTRATEGIAS = {
+    'Delta': ('boxplot_simulacao_delta', 'dados/SimulacaoPeloDelta.xlsx', [
+        ('gerar_boxplot_categorias_detalhado', 'boxplot_estados_delta_detalhado.png'),
+        ('gerar_heatmap_correlacao', 'heatmap_correlacao_delta.png'),
+    ]),
+    'Dia': ('boxplot_simulacao_dia', 'dados/SimulacaoPeloDia.xlsx', [
+        ('gerar_boxplot_estados_delta_detalhado', 'boxplot_estados_delta_detalhado_dia.png'),
+        ('gerar_heatmap_correlacao', 'heatmap_correlacao_dia.png'),
+    ]),
+    'Lote': ('boxplot_simulacao_lote', 'dados/SimulacaoPeloLote.xlsx', [
+        ('gerar_boxplot_estados_delta_detalhado', 'boxplot_estados_delta_detalhado_lote.png'),
+        ('gerar_heatmap_correlacao', 'heatmap_correlacao_lote.png'),
+    ]),
+}
+
+def _inicializar_worker():
+    """Configura o estilo dos gráficos uma única vez em cada processo do pool."""
+    import boxplot_simulacao_delta
+    boxplot_simulacao_delta.configurar_estilo()
+
+def renderizar_figura(nome_modulo, nome_funcao, df, output_dir):
+    """
+    Renderiza uma figura em um processo do pool.
+
+    Args:
+        nome_modulo: Módulo que contém a função de gráfico (ex: 'boxplot_simulacao_delta')
+        nome_funcao: Nome da função de gráfico
+        df: DataFrame já preparado
+        output_dir: Diretório de saída dos gráficos
+
+    Returns:
+        tuple: (nome_modulo, nome_funcao)
+    """
+    import matplotlib.pyplot as plt
+
+    modulo = importlib.import_module(nome_modulo)
+    try:
+        getattr(modulo, nome_funcao)(df, Path(output_dir))
+    finally:
+        # Com o backend Agg o plt.show() não faz nada; libera as figuras abertas
+        plt.close('all')
+
+    return nome_modulo, nome_funcao
+
+def calcular_hash_figura(df, funcao):
+    """
+    Calcula o hash dos dados de entrada de uma figura.
+    Considera o conteúdo do DataFrame e o código da função que desenha a figura.
+    """
+    hash_figura = hashlib.sha256()
+    hash_figura.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    hash_figura.update('|'.join(map(str, df.columns)).encode('utf-8'))
+    hash_figura.update(inspect.getsource(funcao).encode('utf-8'))
+    return hash_figura.hexdigest()
+
+def carregar_hashes(output_dir):
+    """Carrega os hashes das figuras geradas anteriormente."""
+    caminho = output_dir / ARQUIVO_HASHES
+    if not caminho.exists():
+        return {}
     try:
-        print(f"\n{'='*60}")
-        print(f"EXECUTANDO: {programa}")
-        print(f"{'='*60}")
-        
-        # Obter o diretório raiz do projeto (onde está o requirements.txt)
-        projeto_root = Path(__file__).parent.parent.parent
-        print(f"Diretório de trabalho: {projeto_root}")
-        
-        resultado = subprocess.run([sys.executable, programa], 
-                                 cwd=projeto_root,
-                                 check=True)
-        
-        print(f"✓ {programa} executado com sucesso!")
-        return True
-        
-    except subprocess.CalledProcessError as e:
-        print(f"✗ Erro ao executar {programa}:")
-        print(f"Código de saída: {e.returncode}")
-        print(f"STDOUT: {e.stdout}")
-        print(f"STDERR: {e.stderr}")
-        return False
-    except Exception as e:
-        print(f"✗ Erro inesperado ao executar {programa}: {str(e)}")
-        return False
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def salvar_hashes(output_dir, hashes):
+    """Grava os hashes das figuras geradas."""
+    with open(output_dir / ARQUIVO_HASHES, 'w', encoding='utf-8') as f:
+        json.dump(hashes, f, indent=2, sort_keys=True)
+
+def carregar_estrategias():
+    """
+    Carrega e prepara as planilhas de todas as estratégias uma única vez.
+
+    Returns:
+        dict: {estratégia: (módulo, DataFrame preparado)} apenas para as planilhas encontradas
+    """
+    dados = {}
+    for estrategia, (nome_modulo, arquivo_excel, _) in ESTRATEGIAS.items():
+        caminho = PROJETO_ROOT / arquivo_excel
+        if not caminho.exists():
+            print(f"⚠️  Arquivo não encontrado: {caminho}")
+            continue
+
+        modulo = importlib.import_module(nome_modulo)
+        df = modulo.carregar_dados(caminho)
+        if df is None:
+            continue
+
+        dados[estrategia] = (modulo, modulo.preparar_dados(df))
+    return dados
 
 def main():
     """Função principal."""
+    parser = argparse.ArgumentParser(description="Gera todos os boxplots das estratégias de Delta Hedge.")
+    parser.add_argument('--forcar', action='store_true',
+                        help="Regera todas as figuras, mesmo que os dados não tenham mudado")
+    parser.add_argument('--processos', type=int, default=None,
+                        help="Número de processos para renderizar as figuras (padrão: número de CPUs)")
+    args = parser.parse_args()
+
     print("=" * 80)
     print("GERADOR DE BOXPLOTS - TODAS AS ESTRATÉGIAS DE DELTA HEDGE")
     print("=" * 80)
-    
-    # Obter o diretório raiz do projeto
-    projeto_root = Path(__file__).parent.parent.parent
-    print(f"Diretório do projeto: {projeto_root}")
-    print(f"Diretório de saída: {projeto_root / 'graficos'}")
-    
-    # Lista dos programas a serem executados
-    programas = [
-        'src/gera-graficos/boxplot_simulacao_delta.py',
-        'src/gera-graficos/boxplot_simulacao_dia.py', 
-        'src/gera-graficos/boxplot_simulacao_lote.py'
-    ]
-    
-    # Verificar se os arquivos existem
-    programas_existentes = []
-    for programa in programas:
-        if Path(programa).exists():
-            programas_existentes.append(programa)
-        else:
-            print(f"⚠️  Arquivo não encontrado: {programa}")
-    
-    if not programas_existentes:
-        print("❌ Nenhum programa encontrado para executar!")
+
+    output_dir = PROJETO_ROOT / 'graficos'
+    output_dir.mkdir(exist_ok=True)
+    print(f"Diretório do projeto: {PROJETO_ROOT}")
+    print(f"Diretório de saída: {output_dir}")
+
+    # Carrega as três planilhas uma única vez
+    dados = carregar_estrategias()
+    if not dados:
+        print("❌ Nenhuma planilha encontrada para gerar os gráficos!")
         return
-    
-    print(f"📊 Encontrados {len(programas_existentes)} programas para executar:")
-    for programa in programas_existentes:
-        print(f"   - {programa}")
-    
-    # Executar cada programa
+
+    # Estatísticas descritivas (texto) são geradas no processo principal
+    for estrategia, (modulo, df) in dados.items():
+        modulo.gerar_estatisticas_descritivas(df, output_dir)
+
+    # Monta a lista de figuras a renderizar, pulando as que não mudaram
+    hashes = {} if args.forcar else carregar_hashes(output_dir)
+    tarefas = []
+    puladas = 0
+    for estrategia, (modulo, df) in dados.items():
+        for nome_funcao, arquivo_figura in ESTRATEGIAS[estrategia][2]:
+            hash_figura = calcular_hash_figura(df, getattr(modulo, nome_funcao))
+            if hashes.get(arquivo_figura) == hash_figura and (output_dir / arquivo_figura).exists():
+                print(f"↷ {arquivo_figura} sem alterações, pulando")
+                puladas += 1
+                continue
+            tarefas.append((modulo.__name__, nome_funcao, df, arquivo_figura, hash_figura))
+
+    print(f"📊 {len(tarefas)} figura(s) para renderizar, {puladas} sem alterações")
+
+    # Renderiza as figuras em paralelo
     sucessos = 0
     falhas = 0
-    
-    for programa in programas_existentes:
-        if executar_programa(programa):
-            sucessos += 1
-        else:
-            falhas += 1
-    
+    if tarefas:
+        with ProcessPoolExecutor(max_workers=args.processos, initializer=_inicializar_worker) as executor:
+            futuros = {
+                executor.submit(renderizar_figura, nome_modulo, nome_funcao, df, str(output_dir)):
+                    (arquivo_figura, hash_figura)
+                for nome_modulo, nome_funcao, df, arquivo_figura, hash_figura in tarefas
+            }
+            for futuro in as_completed(futuros):
+                arquivo_figura, hash_figura = futuros[futuro]
+                try:
+                    futuro.result()
+                    hashes[arquivo_figura] = hash_figura
+                    print(f"✓ {arquivo_figura} gerado com sucesso!")
+                    sucessos += 1
+                except Exception as e:
+                    print(f"✗ Erro ao gerar {arquivo_figura}: {str(e)}")
+                    falhas += 1
+
+        salvar_hashes(output_dir, hashes)
+
     # Resumo final
     print(f"\n{'='*80}")
     print("RESUMO DA EXECUÇÃO")
     print(f"{'='*80}")
-    print(f"✓ Programas executados com sucesso: {sucessos}")
-    print(f"✗ Programas com falha: {falhas}")
-    print(f"📁 Gráficos salvos em: {projeto_root / 'graficos'}")
-    
-    if sucessos > 0:
-        print(f"\n📈 Gráficos gerados:")
-        print(f"   - Boxplots por categoria de simulação")
-        print(f"   - Boxplots por parâmetros específicos de cada estratégia")
-        print(f"   - Boxplots combinados")
-        print(f"   - Heatmaps de correlação")
-        print(f"   - Estatísticas descritivas")
-    
+    print(f"✓ Figuras geradas com sucesso: {sucessos}")
+    print(f"↷ Figuras sem alterações: {puladas}")
+    print(f"✗ Figuras com falha: {falhas}")
+    print(f"📁 Gráficos salvos em: {output_dir}")
+
     if falhas > 0:
-        print(f"\n⚠️  {falhas} programa(s) falharam. Verifique os erros acima.")
+        print(f"\n⚠️  {falhas} figura(s) falharam. Verifique os erros acima.")
         sys.exit(1)
     else:
-        print(f"\n🎉 Todos os programas executados com sucesso!")
+        print(f"\n🎉 Todas as figuras geradas com sucesso!")
         print(f"📊 Análise completa das estratégias de Delta Hedge concluída!")
 
 if __name__ == "__main__":
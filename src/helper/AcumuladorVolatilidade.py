@@ -0,0 +1,137 @@
+import numpy as np
+
+# Fator de anualização da volatilidade diária (252 pregões por ano)
+FATOR_ANUAL = np.sqrt(252)
+
+class AcumuladorVolatilidade:
+    """
+    Volatilidade móvel de várias janelas, atualizada em O(1) a cada fechamento.
+
+    Para cada janela de `pregoes` fechamentos guarda a média e a soma dos
+    quadrados dos desvios (M2) dos últimos pregoes - 1 retornos (Welford com
+    janela deslizante: o retorno novo entra e o mais antigo sai na mesma
+    atualização). Para não acumular erro de arredondamento, a média e o M2
+    de cada janela são recalculados exatamente a cada volta completa da
+    janela (custo amortizado O(1)).
+
+    O resultado é o mesmo de TradeHelper.recuperaVolatilidadeAnualPara_x_Pregoes
+    e de DadosMercado.volatilidade_anual: desvio padrão populacional dos
+    retornos x sqrt(252), NaN sem pregões suficientes ou, quando as datas são
+    informadas, se a janela não couber em 2 x pregoes dias corridos.
+    """
+
+    def __init__(self, janelas):
+        """
+        Args:
+            janelas: Número de pregões de cada janela (ex: [20, 30, 60])
+        """
+        self.janelas = np.unique(np.atleast_1d(np.asarray(janelas, dtype=int)))
+        if len(self.janelas) == 0 or self.janelas[0] < 2:
+            raise ValueError("A volatilidade exige pelo menos 2 pregões.")
+
+        self._tamanhos = self.janelas - 1   # Retornos em cada janela
+        self._capacidade = int(self.janelas[-1])
+        self._retornos = np.zeros(self._capacidade)
+        self._datas = np.full(self._capacidade, np.datetime64('NaT'), dtype='datetime64[D]')
+        self._media = np.zeros(len(self.janelas))
+        self._m2 = np.zeros(len(self.janelas))
+        self._posicao_janela = {int(janela): i for i, janela in enumerate(self.janelas)}
+
+        self.precos = 0           # Fechamentos recebidos
+        self._ultimo = None       # Último fechamento
+
+    def adicionar(self, fechamento: float, data=None):
+        """
+        Inclui o fechamento de um novo pregão.
+
+        Args:
+            fechamento: Preço de fechamento
+            data: Data do pregão (opcional; sem datas a regra dos 2 x pregoes dias não é aplicada)
+        """
+        fechamento = float(fechamento)
+        self._datas[self.precos % self._capacidade] = np.datetime64('NaT') if data is None \
+            else np.datetime64(data, 'D')
+
+        if self._ultimo is not None:
+            retorno = fechamento / self._ultimo - 1
+            contagem = self.precos - 1  # Retornos antes deste
+            n = self._tamanhos
+            cheia = contagem >= n
+
+            # Janelas ainda incompletas: Welford comum
+            incompleta = ~cheia
+            if incompleta.any():
+                desvio = retorno - self._media[incompleta]
+                self._media[incompleta] += desvio / (contagem + 1)
+                self._m2[incompleta] += desvio * (retorno - self._media[incompleta])
+
+            # Janelas completas: o retorno novo substitui o mais antigo
+            if cheia.any():
+                antigo = self._retornos[(contagem - n[cheia]) % self._capacidade]
+                diferenca = retorno - antigo
+                media_anterior = self._media[cheia]
+                media = media_anterior + diferenca / n[cheia]
+                self._m2[cheia] += diferenca * (retorno - media + antigo - media_anterior)
+                self._media[cheia] = media
+            np.maximum(self._m2, 0.0, out=self._m2)
+
+            self._retornos[contagem % self._capacidade] = retorno
+
+            # Recalcula exatamente as janelas que completaram uma volta
+            for i in np.flatnonzero((contagem + 1 >= n) & ((contagem + 1) % n == 0)):
+                ultimos = self._retornos[(contagem - np.arange(n[i])) % self._capacidade]
+                self._media[i] = ultimos.mean()
+                self._m2[i] = ((ultimos - self._media[i]) ** 2).sum()
+
+        self._ultimo = fechamento
+        self.precos += 1
+
+    def volatilidades(self, anual: bool = True) -> np.ndarray:
+        """
+        Volatilidade atual de cada janela (na ordem de self.janelas).
+
+        Args:
+            anual: Se True, anualiza com sqrt(252) (padrão: True)
+        """
+        completas = self.precos >= self.janelas
+        resultado = np.full(len(self.janelas), np.nan)
+        resultado[completas] = np.sqrt(self._m2[completas] / self._tamanhos[completas])
+
+        # A janela precisa caber em 2 x pregoes dias corridos antes da data atual
+        if self.precos:
+            atual = self._datas[(self.precos - 1) % self._capacidade]
+            if not np.isnat(atual):
+                inicio = self._datas[(self.precos - np.minimum(self.janelas, self.precos)) % self._capacidade]
+                resultado[completas & (inicio < atual - 2 * self.janelas.astype('timedelta64[D]'))] = np.nan
+
+        return resultado * FATOR_ANUAL if anual else resultado
+
+    def volatilidade(self, pregoes: int, anual: bool = True) -> float:
+        """
+        Volatilidade atual de uma das janelas.
+        """
+        if pregoes not in self._posicao_janela:
+            raise ValueError(f"Janela de {pregoes} pregões não acompanhada. Janelas: {self.janelas.tolist()}")
+        return float(self.volatilidades(anual)[self._posicao_janela[pregoes]])
+
+    @staticmethod
+    def serie(fechamentos, janelas, datas=None) -> np.ndarray:
+        """
+        Volatilidade anual de várias janelas ao longo de um histórico, passando
+        os fechamentos pelo acumulador um a um.
+
+        Args:
+            fechamentos: Fechamentos em ordem cronológica
+            janelas: Número de pregões de cada janela
+            datas: Datas dos fechamentos (opcional)
+
+        Returns:
+            np.ndarray: Formato (janelas únicas em ordem crescente, pregões)
+        """
+        acumulador = AcumuladorVolatilidade(janelas)
+        fechamentos = np.asarray(fechamentos, dtype=float)
+        resultado = np.empty((len(acumulador.janelas), len(fechamentos)))
+        for i, fechamento in enumerate(fechamentos):
+            acumulador.adicionar(fechamento, None if datas is None else datas[i])
+            resultado[:, i] = acumulador.volatilidades()
+        return resultado
@@ -0,0 +1,136 @@
+import numpy as np
+
+# Métodos de construção da árvore
+METODOS = ('crr', 'leisen_reimer')
+
+# Número de passos padrão (Leisen-Reimer converge com O(1/n²) e usa passos ímpares)
+PASSOS_PADRAO = 201
+
+class ArvoreBinomial:
+    """
+    Preço e delta de opções americanas (ou europeias) por árvore binomial.
+
+    As opções de ações da B3 (ex: as séries PETR) são americanas: a call pode ser
+    exercida antes do vencimento, o que importa quando há dividendos (q > 0) e,
+    nas puts, com juros altos. A árvore é construída em dois formatos:
+
+    - 'crr': Cox-Ross-Rubinstein (u = exp(sigma x sqrt(dt)), d = 1/u);
+    - 'leisen_reimer': probabilidades pela inversão de Peizer-Pratt de d1 e d2,
+      centrada no strike, com convergência muito mais rápida (passos ímpares).
+
+    Todas as opções (por exemplo, uma cadeia inteira em um mês de pregões) são
+    precificadas juntas: cada passo da indução retroativa opera sobre a matriz
+    (opções, nós), de modo que o laço em Python é só sobre os passos da árvore.
+    """
+
+    @staticmethod
+    def _inversao_peizer_pratt(z, passos: int):
+        """
+        Probabilidade binomial equivalente a N(z) em uma árvore de n passos (Peizer-Pratt, método 2).
+        """
+        n = passos
+        with np.errstate(invalid='ignore', over='ignore'):
+            termo = (z / (n + 1.0 / 3.0 + 0.1 / (n + 1))) ** 2 * (n + 1.0 / 6.0)
+            return 0.5 + np.sign(z) * 0.5 * np.sqrt(1.0 - np.exp(-termo))
+
+    @staticmethod
+    def _arvore(put, S, K, T, r, sigma, q, passos: int, metodo: str, americana: bool) -> tuple:
+        """
+        Indução retroativa de uma árvore para arrays 1D de opções com T > 0.
+
+        Returns:
+            tuple: (preço, delta) por opção
+        """
+        dt = T / passos
+        crescimento = np.exp((r - q) * dt)
+        if metodo == 'crr':
+            u = np.exp(sigma * np.sqrt(dt))
+            d = 1.0 / u
+            p = (crescimento - d) / (u - d)
+        else:
+            raiz_T = sigma * np.sqrt(T)
+            d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / raiz_T
+            d2 = d1 - raiz_T
+            p = ArvoreBinomial._inversao_peizer_pratt(d2, passos)
+            p_linha = ArvoreBinomial._inversao_peizer_pratt(d1, passos)
+            u = crescimento * p_linha / p
+            d = (crescimento - p * u) / (1.0 - p)
+
+        desconto = np.exp(-r * dt)
+        sinal = np.where(put, -1.0, 1.0)[:, None]
+        p, u, d, desconto = p[:, None], u[:, None], d[:, None], desconto[:, None]
+        K = K[:, None]
+
+        # Preços do ativo no vencimento: nó j com j subidas (ordem crescente)
+        j = np.arange(passos + 1)
+        precos = S[:, None] * u ** j * d ** (passos - j)
+        valores = np.maximum(sinal * (precos - K), 0.0)
+
+        for passo in range(passos - 1, -1, -1):
+            if passo == 0:
+                # Delta pelos dois nós do primeiro passo
+                delta = (valores[:, 1] - valores[:, 0]) / (precos[:, 1] - precos[:, 0])
+            valores = desconto * (p * valores[:, 1:] + (1.0 - p) * valores[:, :-1])
+            precos = precos[:, :-1] / d
+            if americana:
+                np.maximum(valores, sinal * (precos - K), out=valores)
+
+        return valores[:, 0], delta
+
+    @staticmethod
+    def calcular(put, S, K, T, r, sigma, q=0.0, passos: int = PASSOS_PADRAO, metodo: str = 'leisen_reimer',
+                 americana: bool = True, richardson: bool = False) -> tuple:
+        """
+        Calcula preço e delta de opções por árvore binomial.
+
+        Args:
+            put: True nas puts e False nas calls (array com broadcasting como os demais)
+            S: Preço do ativo
+            K: Preço de exercício
+            T: Tempo até o vencimento em anos (T <= 0 retorna o valor intrínseco)
+            r: Taxa de juros livre de risco
+            sigma: Volatilidade anual
+            q: Dividend yield contínuo (padrão: 0)
+            passos: Número de passos da árvore (padrão: 201; no Leisen-Reimer é arredondado para ímpar)
+            metodo: 'crr' ou 'leisen_reimer' (padrão: 'leisen_reimer')
+            americana: Se True, permite exercício antecipado (padrão: True)
+            richardson: Se True, extrapola a partir das árvores de n e n/2 passos (padrão: False)
+
+        Returns:
+            tuple: (preço, delta), arrays no formato do broadcasting das entradas
+        """
+        if metodo not in METODOS:
+            raise ValueError(f"Método inválido: {metodo}. Use um de {METODOS}.")
+        if passos < 2:
+            raise ValueError("A árvore precisa de pelo menos 2 passos.")
+        if metodo == 'leisen_reimer':
+            passos += 1 - passos % 2
+
+        put, S, K, T, r, sigma, q = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in
+                                                        (put, S, K, T, r, sigma, q)))
+        formato = S.shape
+        put, S, K, T, r, sigma, q = (x.ravel() for x in (put, S, K, T, r, sigma, q))
+        put = put.astype(bool)
+
+        # No vencimento (T <= 0): valor intrínseco e delta 0/1 (como o d1 infinito de Black-Scholes)
+        preco = np.where(put, np.maximum(K - S, 0.0), np.maximum(S - K, 0.0))
+        delta = np.where(put, -(S < K).astype(float), (S > K).astype(float))
+
+        vivas = T > 0
+        if vivas.any():
+            argumentos = (put[vivas], S[vivas], K[vivas], T[vivas], r[vivas], sigma[vivas], q[vivas])
+            preco_vivas, delta_vivas = ArvoreBinomial._arvore(*argumentos, passos, metodo, americana)
+            if richardson:
+                # Erro de ordem 1/n no CRR e 1/n² no Leisen-Reimer
+                passos_grosso = passos // 2
+                if metodo == 'leisen_reimer':
+                    passos_grosso += 1 - passos_grosso % 2
+                preco_grosso, delta_grosso = ArvoreBinomial._arvore(*argumentos, passos_grosso, metodo, americana)
+                ordem = 1 if metodo == 'crr' else 2
+                peso = passos ** ordem / (passos ** ordem - passos_grosso ** ordem)
+                preco_vivas = peso * preco_vivas + (1 - peso) * preco_grosso
+                delta_vivas = peso * delta_vivas + (1 - peso) * delta_grosso
+            preco[vivas] = preco_vivas
+            delta[vivas] = delta_vivas
+
+        return preco.reshape(formato), delta.reshape(formato)
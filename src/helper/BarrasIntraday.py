@@ -0,0 +1,266 @@
+import sqlite3
+import numpy as np
+from helper.DadosMercado import DadosMercado
+
+# Tabelas de barras intradiárias. A chave primária composta (instrumento, data_hora) é o
+# índice das consultas por intervalo de tempo; WITHOUT ROWID guarda as linhas na ordem
+# da chave, então a leitura de um período é sequencial no arquivo.
+ESQUEMA_BARRAS = [
+    """
+    CREATE TABLE IF NOT EXISTS BARRA_ATIVO (
+        id_ativo INTEGER NOT NULL,
+        data_hora TIMESTAMP NOT NULL,
+        abertura FLOAT NOT NULL,
+        fechamento FLOAT NOT NULL,
+        maximo FLOAT NOT NULL,
+        minimo FLOAT NOT NULL,
+        volume FLOAT NOT NULL DEFAULT 0,
+        PRIMARY KEY (id_ativo, data_hora),
+        FOREIGN KEY (id_ativo) REFERENCES ATIVO(id)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS BARRA_OPCAO (
+        id_opcao INTEGER NOT NULL,
+        data_hora TIMESTAMP NOT NULL,
+        abertura FLOAT NOT NULL,
+        fechamento FLOAT NOT NULL,
+        maximo FLOAT NOT NULL,
+        minimo FLOAT NOT NULL,
+        volume FLOAT NOT NULL DEFAULT 0,
+        PRIMARY KEY (id_opcao, data_hora),
+        FOREIGN KEY (id_opcao) REFERENCES OPCAO(id)
+    ) WITHOUT ROWID
+    """,
+]
+
+# Tabela -> coluna do instrumento
+TABELAS_BARRAS = {
+    'BARRA_ATIVO': 'id_ativo',
+    'BARRA_OPCAO': 'id_opcao',
+}
+
+# Horário do pregão regular (usado para a fração do dia que falta até o fechamento)
+INICIO_PREGAO = '10:00'
+FIM_PREGAO = '17:00'
+
+# Linhas lidas do SQLite por vez
+TAMANHO_BLOCO = 100000
+
+class BarrasIntraday:
+    """
+    Barras intradiárias (5 minutos, 1 hora, ...) do ativo e das opções.
+
+    As barras são lidas em blocos direto para arrays NumPy e a simulação é
+    montada no mesmo formato de DadosMercado.carregar_simulacao, com uma
+    posição por barra em vez de uma por pregão. Assim HedgeVetorizado e o
+    otimizador rodam sobre barras sem alteração:
+
+    - 'indices' aponta para o pregão da barra no histórico diário (volatilidade);
+    - 'dias_uteis' é fracionário: pregões até o vencimento, descontada a parte
+      do pregão que já passou (na abertura do dia vale o mesmo que na série diária);
+    - 'eh_ultimo_dia' marca a última barra, que ajusta pelo fechamento.
+    """
+
+    @staticmethod
+    def criar_tabelas(conn: sqlite3.Connection):
+        """
+        Cria as tabelas BARRA_ATIVO e BARRA_OPCAO, se ainda não existirem.
+        """
+        for comando in ESQUEMA_BARRAS:
+            conn.execute(comando)
+        conn.commit()
+
+    @staticmethod
+    def gravar(conn: sqlite3.Connection, tabela: str, id_instrumento: int, data_hora, abertura, fechamento,
+               maximo, minimo, volume=None) -> int:
+        """
+        Grava (ou substitui) barras de um instrumento.
+
+        Args:
+            conn: Conexão com o banco de dados SQLite
+            tabela: 'BARRA_ATIVO' ou 'BARRA_OPCAO'
+            id_instrumento: ID do ativo ou da opção
+            data_hora: Horários de início das barras (datetime64 ou texto YYYY-MM-DD HH:MM:SS)
+            abertura, fechamento, maximo, minimo: Preços das barras
+            volume: Volume das barras (padrão: 0)
+
+        Returns:
+            int: Número de barras gravadas
+        """
+        coluna = BarrasIntraday._coluna(tabela)
+        data_hora = np.asarray(data_hora, dtype='datetime64[s]')
+        volume = np.zeros(len(data_hora)) if volume is None else volume
+        textos = np.datetime_as_string(data_hora, unit='s')
+        linhas = zip([id_instrumento] * len(data_hora), np.char.replace(textos, 'T', ' ').tolist(),
+                     *(np.asarray(serie, dtype=float).tolist() for serie in (abertura, fechamento, maximo,
+                                                                           minimo, volume)))
+        conn.executemany(f"""
+            INSERT OR REPLACE INTO {tabela} ({coluna}, data_hora, abertura, fechamento, maximo, minimo, volume)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, linhas)
+        conn.commit()
+        return len(data_hora)
+
+    @staticmethod
+    def carregar(conn: sqlite3.Connection, tabela: str, id_instrumento: int, data_inicio, data_fim,
+                 tamanho_bloco: int = TAMANHO_BLOCO) -> dict:
+        """
+        Lê as barras de um instrumento entre duas datas (inclusive) em blocos.
+
+        Cada bloco de `tamanho_bloco` linhas vira arrays e os blocos são
+        concatenados no final, sem manter uma lista de tuplas do período todo.
+
+        Returns:
+            dict: 'data_hora' (datetime64[s]), 'abertura', 'fechamento', 'maximo',
+                  'minimo' e 'volume', em ordem de horário
+        """
+        coluna = BarrasIntraday._coluna(tabela)
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT data_hora, abertura, fechamento, maximo, minimo, volume
+            FROM {tabela}
+            WHERE {coluna} = ?
+              AND data_hora BETWEEN ? AND ?
+            ORDER BY data_hora ASC
+        """, (id_instrumento, f"{data_inicio} 00:00:00", f"{data_fim} 23:59:59"))
+
+        horarios = []
+        valores = []
+        while True:
+            linhas = cursor.fetchmany(tamanho_bloco)
+            if not linhas:
+                break
+            horarios.append(np.array([linha[0] for linha in linhas], dtype='datetime64[s]'))
+            valores.append(np.array([linha[1:] for linha in linhas], dtype=float))
+
+        if not horarios:
+            return {'data_hora': np.array([], dtype='datetime64[s]'),
+                    **{nome: np.array([]) for nome in ('abertura', 'fechamento', 'maximo', 'minimo', 'volume')}}
+
+        valores = np.concatenate(valores)
+        return {
+            'data_hora': np.concatenate(horarios),
+            'abertura': valores[:, 0],
+            'fechamento': valores[:, 1],
+            'maximo': valores[:, 2],
+            'minimo': valores[:, 3],
+            'volume': valores[:, 4],
+        }
+
+    @staticmethod
+    def reamostrar(barras: dict, intervalo_minutos: int) -> dict:
+        """
+        Agrupa barras em intervalos maiores (ex: 5 minutos -> 60 minutos).
+
+        Abertura da primeira barra, fechamento da última, máximo, mínimo e soma do
+        volume de cada intervalo, calculados com reduceat sobre os arrays.
+        """
+        if intervalo_minutos <= 0:
+            raise ValueError("O intervalo deve ser positivo.")
+        if len(barras['data_hora']) == 0:
+            return barras
+
+        chave = barras['data_hora'].astype('datetime64[m]').astype(np.int64) // intervalo_minutos
+        inicios = np.flatnonzero(np.r_[True, chave[1:] != chave[:-1]])
+        fins = np.r_[inicios[1:], len(chave)] - 1
+
+        return {
+            'data_hora': (chave[inicios] * intervalo_minutos).astype('datetime64[m]').astype('datetime64[s]'),
+            'abertura': barras['abertura'][inicios],
+            'fechamento': barras['fechamento'][fins],
+            'maximo': np.maximum.reduceat(barras['maximo'], inicios),
+            'minimo': np.minimum.reduceat(barras['minimo'], inicios),
+            'volume': np.add.reduceat(barras['volume'], inicios),
+        }
+
+    @staticmethod
+    def carregar_simulacao(dados: DadosMercado, id_simulacao: int, intervalo_minutos: int = None,
+                           inicio_pregao: str = INICIO_PREGAO, fim_pregao: str = FIM_PREGAO) -> dict:
+        """
+        Carrega uma simulação sobre as barras intradiárias do ativo e da opção.
+
+        Só entram os horários com barra do ativo e da opção (junção pelos horários).
+
+        Args:
+            dados: Histórico diário do ativo (volatilidade e pregões até o vencimento)
+            id_simulacao: ID da simulação na tabela SIMULACAO
+            intervalo_minutos: Se informado, reamostra as barras para esse intervalo
+            inicio_pregao: Horário de abertura do pregão (padrão: 10:00)
+            fim_pregao: Horário de fechamento do pregão (padrão: 17:00)
+
+        Returns:
+            dict: Mesmas chaves de DadosMercado.carregar_simulacao, com 'datas' em datetime64[s]
+
+        Raises:
+            ValueError: Se a simulação não existir ou não houver barras em comum
+        """
+        cursor = dados.conn.cursor()
+        cursor.execute("""
+            SELECT s.data_inicio, s.data_termino, s.quantidade, s.id_opcao,
+                   o.ticker, o.tipo, o.strike, o.vencimento
+            FROM SIMULACAO s
+            JOIN OPCAO o ON o.id = s.id_opcao
+            WHERE s.id = ? AND o.id_ativo = ?
+        """, (id_simulacao, dados.id_ativo))
+        simulacao = cursor.fetchone()
+        if not simulacao:
+            raise ValueError(f"Simulação com ID {id_simulacao} não encontrada.")
+
+        data_inicio, data_termino, quantidade, id_opcao, ticker_opcao, tipo, strike, vencimento = simulacao
+
+        ativo = BarrasIntraday.carregar(dados.conn, 'BARRA_ATIVO', dados.id_ativo, data_inicio, data_termino)
+        opcao = BarrasIntraday.carregar(dados.conn, 'BARRA_OPCAO', id_opcao, data_inicio, data_termino)
+        if intervalo_minutos:
+            ativo = BarrasIntraday.reamostrar(ativo, intervalo_minutos)
+            opcao = BarrasIntraday.reamostrar(opcao, intervalo_minutos)
+
+        horarios, posicao_ativo, posicao_opcao = np.intersect1d(ativo['data_hora'], opcao['data_hora'],
+                                                                assume_unique=True, return_indices=True)
+        if len(horarios) == 0:
+            raise ValueError(f"Não há barras intradiárias do ativo e da opção {ticker_opcao} "
+                             f"(ID: {id_opcao}) no período da simulação.")
+
+        # Pregão de cada barra no histórico diário
+        dias = horarios.astype('datetime64[D]')
+        indices = dados.indices(dias)
+
+        # Fração do pregão que ainda falta na barra (1 na abertura, 0 no fechamento)
+        abertura_pregao = BarrasIntraday._minutos(inicio_pregao)
+        fechamento_pregao = BarrasIntraday._minutos(fim_pregao)
+        minuto_barra = (horarios - dias).astype('timedelta64[m]').astype(float)
+        fracao_restante = np.clip((fechamento_pregao - minuto_barra) / (fechamento_pregao - abertura_pregao), 0, 1)
+
+        dias_uteis = np.maximum(0, dados.dias_uteis(dias, vencimento) - 1 + fracao_restante)
+        eh_ultimo_dia = np.zeros(len(horarios), dtype=bool)
+        eh_ultimo_dia[-1] = True
+
+        return {
+            'id_simulacao': id_simulacao,
+            'ticker_opcao': ticker_opcao,
+            'tipo': 'put' if str(tipo).upper() == 'PUT' else 'call',
+            'strike': float(strike),
+            'vencimento': np.datetime64(vencimento, 'D'),
+            'quantidade': float(quantidade),
+            'datas': horarios,
+            'indices': indices,
+            'ativo_abertura': ativo['abertura'][posicao_ativo],
+            'ativo_fechamento': ativo['fechamento'][posicao_ativo],
+            'opcao_abertura': opcao['abertura'][posicao_opcao],
+            'opcao_fechamento': opcao['fechamento'][posicao_opcao],
+            'eh_ultimo_dia': eh_ultimo_dia,
+            'dias_uteis': dias_uteis,
+        }
+
+    @staticmethod
+    def _coluna(tabela: str) -> str:
+        """Coluna do instrumento da tabela (apenas as tabelas de barras conhecidas)."""
+        if tabela not in TABELAS_BARRAS:
+            raise ValueError(f"Tabela de barras inválida: {tabela}. Use uma de {tuple(TABELAS_BARRAS)}.")
+        return TABELAS_BARRAS[tabela]
+
+    @staticmethod
+    def _minutos(horario: str) -> float:
+        """Converte HH:MM em minutos desde a meia-noite."""
+        horas, minutos = horario.split(':')
+        return int(horas) * 60 + int(minutos)
@@ -0,0 +1,111 @@
+import numpy as np
+from scipy.special import ndtr
+
+class BlackScholesVetorizado:
+    """
+    Fórmulas de Black-Scholes operando sobre arrays NumPy.
+
+    Todos os argumentos aceitam escalares ou arrays com formatos compatíveis
+    (broadcasting), o que permite calcular de uma vez os deltas de todos os dias
+    de uma simulação para várias janelas de volatilidade.
+    """
+
+    @staticmethod
+    def d1(S, K, T, r, sigma, q=0.0):
+        """
+        Calcula o d1 de Black-Scholes (com dividend yield contínuo q opcional).
+
+        Segue a aritmética de ponto flutuante do cálculo escalar do TradeHelper:
+        com T = 0 o d1 vale +inf/-inf (delta 1 ou 0, o valor intrínseco) e com
+        S = K no vencimento o resultado é NaN.
+        """
+        S, K, T, sigma = np.asarray(S, dtype=float), np.asarray(K, dtype=float), \
+            np.asarray(T, dtype=float), np.asarray(sigma, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
+
+    @staticmethod
+    def delta(opcao: str, S, K, T, r, sigma, q=0.0):
+        """
+        Calcula o delta de Black-Scholes.
+
+        Args:
+            opcao: Tipo da opção ('call' ou 'put')
+            S: Preço do ativo
+            K: Preço de exercício
+            T: Tempo até o vencimento em anos
+            r: Taxa de juros livre de risco
+            sigma: Volatilidade anual
+            q: Dividend yield contínuo (padrão: 0)
+
+        Returns:
+            np.ndarray: Delta da opção
+        """
+        d1 = BlackScholesVetorizado.d1(S, K, T, r, sigma, q)
+        desconto_q = np.exp(-q * np.asarray(T, dtype=float))
+
+        if opcao.lower() == 'call':
+            return desconto_q * ndtr(d1)
+        elif opcao.lower() == 'put':
+            return desconto_q * (ndtr(d1) - 1)
+        else:
+            raise ValueError("Tipo de opção inválido. Use 'call' ou 'put'.")
+
+    @staticmethod
+    def delta_por_tipo(put, S, K, T, r, sigma, q=0.0):
+        """
+        Calcula o delta de Black-Scholes de calls e puts misturadas em um mesmo array.
+
+        Args:
+            put: True nas puts e False nas calls (array com broadcasting como os demais)
+            S, K, T, r, sigma, q: Como em delta()
+
+        Returns:
+            np.ndarray: Delta de cada opção (N(d1) nas calls e N(d1) - 1 nas puts)
+        """
+        d1 = BlackScholesVetorizado.d1(S, K, T, r, sigma, q)
+        desconto_q = np.exp(-q * np.asarray(T, dtype=float))
+        return desconto_q * (ndtr(d1) - np.asarray(put, dtype=float))
+
+    @staticmethod
+    def preco(opcao: str, S, K, T, r, sigma, q=0.0):
+        """
+        Calcula o preço de Black-Scholes. No vencimento (T <= 0) retorna o valor intrínseco.
+        """
+        S, K, T = np.asarray(S, dtype=float), np.asarray(K, dtype=float), np.asarray(T, dtype=float)
+        d1 = BlackScholesVetorizado.d1(S, K, T, r, sigma, q)
+        d2 = d1 - np.asarray(sigma, dtype=float) * np.sqrt(np.maximum(T, 0.0))
+        desconto_r = np.exp(-r * T)
+        desconto_q = np.exp(-q * T)
+
+        if opcao.lower() == 'call':
+            preco = S * desconto_q * ndtr(d1) - K * desconto_r * ndtr(d2)
+            intrinseco = np.maximum(S - K, 0.0)
+        elif opcao.lower() == 'put':
+            preco = K * desconto_r * ndtr(-d2) - S * desconto_q * ndtr(-d1)
+            intrinseco = np.maximum(K - S, 0.0)
+        else:
+            raise ValueError("Tipo de opção inválido. Use 'call' ou 'put'.")
+
+        return np.where(T > 0, preco, intrinseco)
+
+    @staticmethod
+    def gamma(S, K, T, r, sigma, q=0.0):
+        """
+        Calcula o gamma de Black-Scholes (igual para call e put).
+        """
+        S, T, sigma = np.asarray(S, dtype=float), np.asarray(T, dtype=float), np.asarray(sigma, dtype=float)
+        d1 = BlackScholesVetorizado.d1(S, K, T, r, sigma, q)
+        densidade = np.exp(-0.5 * d1 ** 2) / np.sqrt(2 * np.pi)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.exp(-q * T) * densidade / (S * sigma * np.sqrt(T))
+
+    @staticmethod
+    def vega(S, K, T, r, sigma, q=0.0):
+        """
+        Calcula o vega de Black-Scholes (variação do preço para 1,00 de volatilidade).
+        """
+        S, T = np.asarray(S, dtype=float), np.asarray(T, dtype=float)
+        d1 = BlackScholesVetorizado.d1(S, K, T, r, sigma, q)
+        densidade = np.exp(-0.5 * d1 ** 2) / np.sqrt(2 * np.pi)
+        return S * np.exp(-q * T) * densidade * np.sqrt(np.maximum(T, 0.0))
@@ -0,0 +1,200 @@
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+class CacheResultados:
+    """
+    Cache persistente (SQLite) dos resultados dos cenários de delta hedge.
+
+    Cada resultado é endereçado pelo conteúdo: a chave combina o ID da simulação,
+    uma impressão digital dos dados de mercado usados pela simulação, a estratégia,
+    os parâmetros do cenário e uma impressão digital do código que gera o resultado
+    (todo o pacote helper, os módulos das classes de cálculo e os arquivos informados,
+    como o script que monta o texto). Se qualquer um desses itens mudar, a chave muda
+    e o cenário é recalculado.
+    """
+
+    # Pacote helper, cujo código entra na versão do código de todos os cenários
+    DIRETORIO_HELPER = os.path.dirname(os.path.abspath(__file__))
+
+    def __init__(self, caminho_cache: str = 'banco/cache_cenarios.db', classes: list = None, arquivos: list = None):
+        """
+        Inicializa o cache.
+
+        Args:
+            caminho_cache: Caminho do banco SQLite do cache (padrão: banco/cache_cenarios.db)
+            classes: Classes cujo código-fonte invalida o cache quando alterado
+                     (ex: [DeltaHedgeAjustePeloDelta, TradeHelper])
+            arquivos: Outros arquivos de código que invalidam o cache (ex: [__file__] do script)
+        """
+        diretorio = os.path.dirname(caminho_cache)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+        self.conn_cache = sqlite3.connect(caminho_cache)
+        self.conn_cache.execute("""
+            CREATE TABLE IF NOT EXISTS CACHE_CENARIO (
+                chave TEXT PRIMARY KEY,
+                id_simulacao INTEGER NOT NULL,
+                estrategia TEXT NOT NULL,
+                parametros TEXT NOT NULL,
+                impressao_dados TEXT NOT NULL,
+                resultado TEXT NOT NULL,
+                data_criacao TEXT NOT NULL
+            )
+        """)
+        self.conn_cache.commit()
+
+        self.versao_codigo = CacheResultados.calcular_versao_codigo(classes or [], arquivos or [])
+        self._impressoes = {}  # Impressão digital dos dados por simulação (calculada uma vez por execução)
+        self.acertos = 0
+        self.faltas = 0
+
+    @staticmethod
+    def arquivos_helper() -> list:
+        """
+        Arquivos .py do pacote helper (sem os testes), usados por todos os motores de cálculo.
+        """
+        diretorio = CacheResultados.DIRETORIO_HELPER
+        return [os.path.join(diretorio, nome) for nome in sorted(os.listdir(diretorio))
+                if nome.endswith('.py') and not nome.startswith('Test')]
+
+    @staticmethod
+    def calcular_versao_codigo(classes: list, arquivos: list = ()) -> str:
+        """
+        Calcula uma impressão digital do código-fonte do pacote helper, dos módulos
+        das classes informadas e dos arquivos informados.
+        """
+        caminhos = CacheResultados.arquivos_helper()
+        caminhos += [inspect.getsourcefile(classe) for classe in classes]
+        caminhos += list(arquivos)
+
+        hash_codigo = hashlib.sha256()
+        for caminho in sorted({os.path.abspath(caminho) for caminho in caminhos}):
+            hash_codigo.update(os.path.basename(caminho).encode('utf-8'))
+            with open(caminho, 'rb') as f:
+                hash_codigo.update(f.read())
+        return hash_codigo.hexdigest()
+
+    @staticmethod
+    def calcular_impressao_dados(conn: sqlite3.Connection, id_simulacao: int) -> str:
+        """
+        Calcula a impressão digital dos dados de mercado usados por uma simulação.
+
+        Inclui a própria simulação, a opção, o histórico da opção no período e o
+        histórico do ativo até o vencimento (usado na volatilidade e nos dias úteis).
+
+        Args:
+            conn: Conexão com o banco de dados SQLite
+            id_simulacao: ID da simulação na tabela SIMULACAO
+
+        Returns:
+            str: Hash SHA-256 dos dados
+        """
+        cursor = conn.cursor()
+        hash_dados = hashlib.sha256()
+
+        cursor.execute("""
+            SELECT s.id_opcao, s.data_inicio, s.data_termino, s.quantidade,
+                   o.id_ativo, o.tipo, o.ticker, o.strike, o.vencimento
+            FROM SIMULACAO s
+            JOIN OPCAO o ON o.id = s.id_opcao
+            WHERE s.id = ?
+        """, (id_simulacao,))
+        simulacao = cursor.fetchone()
+        if not simulacao:
+            raise ValueError(f"Simulação com ID {id_simulacao} não encontrada.")
+        hash_dados.update(repr(simulacao).encode('utf-8'))
+
+        id_opcao, data_inicio, data_termino = simulacao[0], simulacao[1], simulacao[2]
+        id_ativo, vencimento = simulacao[4], simulacao[8]
+
+        cursor.execute("""
+            SELECT data, abertura, fechamento, maximo, minimo
+            FROM HIST_OPCAO
+            WHERE id_opcao = ?
+              AND data BETWEEN ? AND ?
+            ORDER BY data ASC
+        """, (id_opcao, data_inicio, data_termino))
+        hash_dados.update(repr(cursor.fetchall()).encode('utf-8'))
+
+        cursor.execute("""
+            SELECT data, abertura, fechamento, maximo, minimo
+            FROM HIST_ATIVO
+            WHERE id_ativo = ?
+              AND data <= ?
+            ORDER BY data ASC
+        """, (id_ativo, max(data_termino, vencimento)))
+        hash_dados.update(repr(cursor.fetchall()).encode('utf-8'))
+
+        return hash_dados.hexdigest()
+
+    def _impressao(self, conn: sqlite3.Connection, id_simulacao: int) -> str:
+        if id_simulacao not in self._impressoes:
+            self._impressoes[id_simulacao] = CacheResultados.calcular_impressao_dados(conn, id_simulacao)
+        return self._impressoes[id_simulacao]
+
+    def _chave(self, id_simulacao: int, impressao: str, estrategia: str, parametros: dict) -> str:
+        conteudo = json.dumps({
+            'id_simulacao': id_simulacao,
+            'impressao_dados': impressao,
+            'estrategia': estrategia,
+            'parametros': parametros,
+            'versao_codigo': self.versao_codigo,
+        }, sort_keys=True)
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+    def obter(self, conn: sqlite3.Connection, id_simulacao: int, estrategia: str, parametros: dict):
+        """
+        Recupera o resultado de um cenário já calculado.
+
+        Args:
+            conn: Conexão com o banco de dados de mercado
+            id_simulacao: ID da simulação
+            estrategia: Nome da estratégia (ex: 'delta', 'dia', 'lote')
+            parametros: Parâmetros do cenário (ex: {'limite_delta': 0.1, ...})
+
+        Returns:
+            str ou None: Texto do resultado, ou None se o cenário ainda não foi calculado
+        """
+        chave = self._chave(id_simulacao, self._impressao(conn, id_simulacao), estrategia, parametros)
+        linha = self.conn_cache.execute(
+            "SELECT resultado FROM CACHE_CENARIO WHERE chave = ?", (chave,)
+        ).fetchone()
+
+        if linha is None:
+            self.faltas += 1
+            return None
+
+        self.acertos += 1
+        return linha[0]
+
+    def gravar(self, conn: sqlite3.Connection, id_simulacao: int, estrategia: str, parametros: dict, resultado: str):
+        """
+        Grava o resultado de um cenário no cache.
+
+        Args:
+            conn: Conexão com o banco de dados de mercado
+            id_simulacao: ID da simulação
+            estrategia: Nome da estratégia
+            parametros: Parâmetros do cenário
+            resultado: Texto do resultado do cenário
+        """
+        impressao = self._impressao(conn, id_simulacao)
+        chave = self._chave(id_simulacao, impressao, estrategia, parametros)
+        self.conn_cache.execute("""
+            INSERT OR REPLACE INTO CACHE_CENARIO
+                (chave, id_simulacao, estrategia, parametros, impressao_dados, resultado, data_criacao)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (chave, id_simulacao, estrategia, json.dumps(parametros, sort_keys=True), impressao,
+              resultado, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+        self.conn_cache.commit()
+
+    def fechar(self):
+        """
+        Fecha a conexão com o banco do cache.
+        """
+        self.conn_cache.close()
@@ -0,0 +1,125 @@
+import sqlite3
+import numpy as np
+
+# Curva de juros por data: taxa anual (decimal, capitalização exponencial em 252 dias
+# úteis, como o DI e a Selic) para cada prazo em dias úteis. Um fixing diário
+# (CDI/Selic over) é a curva com o único prazo de 1 dia útil.
+ESQUEMA_CURVA_JUROS = """
+    CREATE TABLE IF NOT EXISTS CURVA_JUROS (
+        data DATE NOT NULL,
+        prazo INTEGER NOT NULL,
+        taxa FLOAT NOT NULL,
+        PRIMARY KEY (data, prazo)
+    ) WITHOUT ROWID
+"""
+
+class CurvaJuros:
+    """
+    Estrutura a termo da taxa de juros (tabela CURVA_JUROS) com consultas vetorizadas.
+
+    Todas as curvas são lidas uma única vez e interpoladas em uma grade densa
+    (datas da curva x prazos de 0 ao maior vértice, em dias úteis) de taxas
+    contínuas, a convenção do Black-Scholes e do carrego:
+
+    - entre vértices, interpolação flat forward (linear no log do fator de desconto),
+      a convenção usual da curva de DI;
+    - antes do primeiro vértice e depois do último, taxa constante do vértice;
+    - em cada data vale a última curva publicada até ela.
+
+    Depois disso, a taxa de qualquer conjunto de pares (data, dias úteis até o
+    vencimento) sai de uma busca binária nas datas e de um índice na grade.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        """
+        Lê a tabela CURVA_JUROS e monta a grade de interpolação.
+
+        Raises:
+            ValueError: Se a tabela não existir ou estiver vazia
+        """
+        try:
+            linhas = conn.execute("""
+                SELECT data, prazo, taxa
+                FROM CURVA_JUROS
+                ORDER BY data ASC, prazo ASC
+            """).fetchall()
+        except sqlite3.OperationalError:
+            linhas = []
+        if not linhas:
+            raise ValueError("A tabela CURVA_JUROS não tem taxas. Carregue a curva com GravarCurvaJuros.")
+
+        datas = np.array([linha[0] for linha in linhas], dtype='datetime64[D]')
+        prazos = np.array([linha[1] for linha in linhas], dtype=int)
+        taxas = np.log1p(np.array([linha[2] for linha in linhas], dtype=float))  # Taxa contínua
+
+        self.datas, inicio = np.unique(datas, return_index=True)
+        self.prazo_maximo = int(max(prazos.max(), 1))
+        grade = np.arange(self.prazo_maximo + 1)
+
+        # Log do fator de desconto (taxa x prazo / 252) interpolado por data da curva
+        self._taxas = np.empty((len(self.datas), self.prazo_maximo + 1))
+        fim = np.r_[inicio[1:], len(linhas)]
+        for i, (a, b) in enumerate(zip(inicio, fim)):
+            vertices, taxas_vertices = prazos[a:b], taxas[a:b]
+            log_fator = np.interp(grade, np.r_[0, vertices], np.r_[0.0, taxas_vertices * vertices / 252])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                taxa = log_fator * 252 / grade
+            taxa[0] = taxas_vertices[0]
+            depois = grade > vertices[-1]
+            taxa[depois] = taxas_vertices[-1]
+            self._taxas[i] = taxa
+
+    @staticmethod
+    def criar_tabela(conn: sqlite3.Connection):
+        """
+        Cria a tabela CURVA_JUROS, se ainda não existir.
+        """
+        conn.execute(ESQUEMA_CURVA_JUROS)
+        conn.commit()
+
+    @staticmethod
+    def gravar(conn: sqlite3.Connection, datas, prazos, taxas) -> int:
+        """
+        Grava (ou substitui) vértices da curva.
+
+        Args:
+            conn: Conexão com o banco de dados SQLite
+            datas: Datas das curvas (datetime64 ou texto YYYY-MM-DD)
+            prazos: Prazo de cada vértice em dias úteis
+            taxas: Taxa anual em decimal (exponencial, base 252)
+
+        Returns:
+            int: Número de vértices gravados
+        """
+        datas = np.asarray(datas, dtype='datetime64[D]').astype(str)
+        conn.executemany("""
+            INSERT OR REPLACE INTO CURVA_JUROS (data, prazo, taxa)
+            VALUES (?, ?, ?)
+        """, zip(datas.tolist(), np.asarray(prazos, dtype=int).tolist(), np.asarray(taxas, dtype=float).tolist()))
+        conn.commit()
+        return len(datas)
+
+    def taxas(self, datas, dias_uteis) -> np.ndarray:
+        """
+        Taxa contínua anual para cada (data, dias úteis até o vencimento).
+
+        Com 0 dias úteis (vencimento) retorna a taxa do primeiro vértice.
+
+        Args:
+            datas: Datas de avaliação
+            dias_uteis: Dias úteis até o vencimento (broadcasting com datas)
+
+        Returns:
+            np.ndarray: Taxa contínua, no formato do broadcasting; NaN nas datas anteriores à primeira curva
+        """
+        datas = np.asarray(datas, dtype='datetime64[D]')
+        linha = np.searchsorted(self.datas, datas, side='right') - 1
+        coluna = np.clip(np.asarray(dias_uteis, dtype=int), 0, self.prazo_maximo)
+        taxas = self._taxas[np.maximum(linha, 0), coluna]
+        return np.where(linha >= 0, taxas, np.nan)
+
+    def taxas_overnight(self, datas) -> np.ndarray:
+        """
+        Taxa contínua de 1 dia útil em cada data, usada no carrego do caixa até o pregão seguinte.
+        """
+        return self.taxas(datas, 1)
@@ -0,0 +1,226 @@
+import sqlite3
+import numpy as np
+from helper.EstimadoresVolatilidade import EstimadoresVolatilidade
+from helper.Dividendos import Dividendos
+
+class DadosMercado:
+    """
+    Histórico de um ativo carregado uma única vez em arrays NumPy.
+
+    Substitui as consultas feitas dia a dia pelas classes DeltaHedgeAjustePelo*
+    (volatilidade, dias úteis até o vencimento e preços) por operações
+    vetorizadas sobre o histórico completo, com as mesmas regras de cálculo
+    do TradeHelper.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, ticker: str = 'PETR4'):
+        """
+        Carrega o histórico do ativo.
+
+        Args:
+            conn: Conexão com o banco de dados SQLite
+            ticker: Ticker do ativo (padrão: PETR4)
+        """
+        self.conn = conn
+        self.ticker = ticker
+
+        cursor = conn.cursor()
+        cursor.execute("SELECT id FROM ATIVO WHERE ticker = ?", (ticker,))
+        ativo = cursor.fetchone()
+        if not ativo:
+            raise ValueError(f"Ativo {ticker} não encontrado.")
+        self.id_ativo = ativo[0]
+
+        cursor.execute("""
+            SELECT DISTINCT data, abertura, fechamento, maximo, minimo
+            FROM HIST_ATIVO
+            WHERE id_ativo = ?
+            ORDER BY data ASC
+        """, (self.id_ativo,))
+        historico = cursor.fetchall()
+        if not historico:
+            raise ValueError(f"Não há histórico para o ativo {ticker}.")
+
+        self.datas = np.array([linha[0] for linha in historico], dtype='datetime64[D]')
+        self.abertura = np.array([linha[1] for linha in historico], dtype=float)
+        self.fechamento = np.array([linha[2] for linha in historico], dtype=float)
+        self.maximo = np.array([linha[3] for linha in historico], dtype=float)
+        self.minimo = np.array([linha[4] for linha in historico], dtype=float)
+
+        self._volatilidades = {}  # Volatilidade anual por (estimador, pregões) (calculada sob demanda)
+        self._dividendos = None   # (datas ex, valores) da tabela DIVIDENDO (lidos sob demanda)
+
+    def indices(self, datas) -> np.ndarray:
+        """
+        Retorna a posição de cada data no histórico do ativo.
+
+        Raises:
+            ValueError: Se alguma data não for um pregão do histórico
+        """
+        datas = np.asarray(datas, dtype='datetime64[D]')
+        posicoes = np.searchsorted(self.datas, datas)
+        encontradas = (posicoes < len(self.datas)) & (self.datas[np.minimum(posicoes, len(self.datas) - 1)] == datas)
+        if not np.all(encontradas):
+            raise ValueError(f"Datas fora do histórico do ativo {self.ticker}: {datas[~encontradas][:5]}")
+        return posicoes
+
+    def volatilidade_anual(self, pregoes: int, estimador: str = 'historica') -> np.ndarray:
+        """
+        Volatilidade anualizada de x pregões para todas as datas do histórico.
+
+        Com o estimador 'historica', reproduz TradeHelper.recuperaVolatilidadeAnualPara_x_Pregoes:
+        desvio padrão populacional dos retornos dos últimos `pregoes` fechamentos até a data,
+        considerando apenas pregões dentro de 2 x pregoes dias corridos. Os demais
+        estimadores estão em EstimadoresVolatilidade. Cada (estimador, pregões) é
+        calculado uma única vez por ativo.
+        Datas sem pregões suficientes ficam com NaN (onde o TradeHelper lança ValueError).
+
+        Args:
+            pregoes: Número de pregões da janela
+            estimador: Um de ESTIMADORES (padrão: 'historica')
+
+        Returns:
+            np.ndarray: Volatilidade anual alinhada com self.datas
+        """
+        chave = (estimador, pregoes)
+        if chave not in self._volatilidades:
+            self._volatilidades[chave] = EstimadoresVolatilidade.calcular(
+                estimador, pregoes, self.datas, self.abertura, self.maximo, self.minimo, self.fechamento)
+        return self._volatilidades[chave]
+
+    def dias_uteis(self, datas, data_fim) -> np.ndarray:
+        """
+        Pregões entre cada data e data_fim, excluindo o último dia
+        (mesma regra de TradeHelper.calcular_dias_uteis).
+        """
+        datas = np.asarray(datas, dtype='datetime64[D]')
+        fim = np.searchsorted(self.datas, np.datetime64(data_fim, 'D'), side='right')
+        inicio = np.searchsorted(self.datas, datas, side='left')
+        return np.maximum(0, fim - inicio - 1)
+
+    def valor_presente_dividendos(self, datas, vencimento, taxa_juros: float) -> np.ndarray:
+        """
+        Valor presente, em cada data, dos dividendos com data ex depois dela e até
+        o vencimento (Dividendos.valor_presente). Os dividendos do ativo são lidos
+        da tabela DIVIDENDO uma única vez.
+        """
+        if self._dividendos is None:
+            self._dividendos = Dividendos.carregar(self.conn, self.id_ativo)
+        datas_ex, valores = self._dividendos
+        return Dividendos.valor_presente(self.datas, datas_ex, valores, datas, vencimento, taxa_juros)
+
+    def carregar_simulacao(self, id_simulacao: int) -> dict:
+        """
+        Carrega os dados de uma simulação alinhados por data.
+
+        Args:
+            id_simulacao: ID da simulação na tabela SIMULACAO
+
+        Returns:
+            dict: id_simulacao, ticker_opcao, tipo, strike, vencimento, quantidade,
+                  datas, indices (posição no histórico do ativo), ativo_abertura,
+                  ativo_fechamento, opcao_abertura, opcao_fechamento, eh_ultimo_dia
+                  e dias_uteis
+
+        Raises:
+            ValueError: Se a simulação não existir ou as datas da opção e do ativo não corresponderem
+        """
+        simulacao, historico_opcao = self._ler_simulacao(id_simulacao)
+        data_inicio, data_termino, quantidade, id_opcao, ticker_opcao, tipo, strike, vencimento = simulacao
+        datas_opcao, abertura_opcao, fechamento_opcao = historico_opcao
+
+        # Pregões do ativo no período da simulação
+        primeiro = np.searchsorted(self.datas, np.datetime64(data_inicio, 'D'), side='left')
+        ultimo = np.searchsorted(self.datas, np.datetime64(data_termino, 'D'), side='right')
+        indices = np.arange(primeiro, ultimo)
+
+        datas_opcao = np.asarray(datas_opcao, dtype='datetime64[D]')
+        if len(indices) == 0 or len(datas_opcao) != len(indices) or np.any(datas_opcao != self.datas[indices]):
+            raise ValueError(f"As datas dos preços da opção e do ativo não correspondem. "
+                             f"Opção: {ticker_opcao} (ID: {id_opcao})")
+
+        datas = self.datas[indices]
+        return {
+            'id_simulacao': id_simulacao,
+            'ticker_opcao': ticker_opcao,
+            'tipo': 'put' if str(tipo).upper() == 'PUT' else 'call',
+            'strike': float(strike),
+            'vencimento': np.datetime64(vencimento, 'D'),
+            'quantidade': float(quantidade),
+            'datas': datas,
+            'indices': indices,
+            'ativo_abertura': self.abertura[indices],
+            'ativo_fechamento': self.fechamento[indices],
+            'opcao_abertura': np.asarray(abertura_opcao, dtype=float),
+            'opcao_fechamento': np.asarray(fechamento_opcao, dtype=float),
+            'eh_ultimo_dia': datas == np.datetime64(data_termino, 'D'),
+            'dias_uteis': self.dias_uteis(datas, vencimento),
+        }
+
+    def carregar_simulacoes(self, ids_simulacao: list = None) -> tuple:
+        """
+        Carrega várias simulações (todas do ativo, se ids_simulacao for None).
+
+        Returns:
+            tuple: (lista de simulações carregadas, dict {id_simulacao: mensagem de erro})
+        """
+        if ids_simulacao is None:
+            ids_simulacao = self._ids_simulacao()
+
+        simulacoes = []
+        erros = {}
+        for id_simulacao in ids_simulacao:
+            try:
+                simulacoes.append(self.carregar_simulacao(id_simulacao))
+            except ValueError as e:
+                erros[id_simulacao] = str(e)
+        return simulacoes, erros
+
+    def _ler_simulacao(self, id_simulacao: int) -> tuple:
+        """
+        Lê a simulação e o histórico da opção no período da simulação.
+
+        Returns:
+            tuple: ((data_inicio, data_termino, quantidade, id_opcao, ticker, tipo, strike, vencimento),
+                    (datas, abertura, fechamento) da opção)
+
+        Raises:
+            ValueError: Se a simulação não existir
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT s.data_inicio, s.data_termino, s.quantidade, s.id_opcao,
+                   o.ticker, o.tipo, o.strike, o.vencimento
+            FROM SIMULACAO s
+            JOIN OPCAO o ON o.id = s.id_opcao
+            WHERE s.id = ? AND o.id_ativo = ?
+        """, (id_simulacao, self.id_ativo))
+        simulacao = cursor.fetchone()
+        if not simulacao:
+            raise ValueError(f"Simulação com ID {id_simulacao} não encontrada.")
+
+        data_inicio, data_termino, id_opcao = simulacao[0], simulacao[1], simulacao[3]
+        cursor.execute("""
+            SELECT data, abertura, fechamento
+            FROM HIST_OPCAO
+            WHERE id_opcao = ?
+              AND data BETWEEN ? AND ?
+            ORDER BY data ASC
+        """, (id_opcao, data_inicio, data_termino))
+        historico = cursor.fetchall()
+
+        return simulacao, (np.array([linha[0] for linha in historico], dtype='datetime64[D]'),
+                           np.array([linha[1] for linha in historico], dtype=float),
+                           np.array([linha[2] for linha in historico], dtype=float))
+
+    def _ids_simulacao(self) -> list:
+        """IDs de todas as simulações do ativo, em ordem."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT s.id
+            FROM SIMULACAO s
+            JOIN OPCAO o ON o.id = s.id_opcao
+            WHERE o.id_ativo = ?
+            ORDER BY s.id ASC
+        """, (self.id_ativo,))
+        return [linha[0] for linha in cursor.fetchall()]
@@ -0,0 +1,145 @@
+import sqlite3
+import numpy as np
+
+# Tabela de proventos: um registro por (ativo, data ex, tipo). O valor é por ação,
+# em R$, como pago (no JCP, o valor líquido do imposto se for o que interessa).
+ESQUEMA_DIVIDENDO = """
+    CREATE TABLE IF NOT EXISTS DIVIDENDO (
+        id_ativo INTEGER NOT NULL,
+        data_ex DATE NOT NULL,
+        tipo VARCHAR NOT NULL DEFAULT 'DIVIDENDO',
+        valor FLOAT NOT NULL,
+        PRIMARY KEY (id_ativo, data_ex, tipo),
+        FOREIGN KEY (id_ativo) REFERENCES ATIVO(id)
+    ) WITHOUT ROWID
+"""
+
+# Modelos de ajuste do Black-Scholes pelos dividendos
+MODELOS_DIVIDENDOS = ('discreto', 'continuo')
+
+class Dividendos:
+    """
+    Dividendos discretos do ativo (tabela DIVIDENDO) no Black-Scholes.
+
+    O ajuste parte do valor presente, em cada data, dos dividendos com data ex
+    depois dela e até o vencimento da opção. O valor presente de todas as datas
+    sai de uma soma acumulada sobre os dividendos ordenados e de duas buscas
+    binárias, sem laço: com os prazos em pregões (a convenção de T = pregões/252),
+
+        VP(d) = exp(r x pos(d)/252) x soma de D_j x exp(-r x pos(ex_j)/252)
+
+    sobre os dividendos com pos(d) < pos(ex_j) e ex_j <= vencimento.
+
+    Modelos:
+    - 'discreto': preço à vista descontado do valor presente (S - VP), sem yield;
+    - 'continuo' (Merton): dividend yield contínuo q equivalente, com
+      S x exp(-q x T) = S - VP; o delta fica multiplicado por exp(-q x T).
+    """
+
+    @staticmethod
+    def criar_tabela(conn: sqlite3.Connection):
+        """
+        Cria a tabela DIVIDENDO, se ainda não existir.
+        """
+        conn.execute(ESQUEMA_DIVIDENDO)
+        conn.commit()
+
+    @staticmethod
+    def gravar(conn: sqlite3.Connection, id_ativo: int, datas_ex, valores, tipos=None) -> int:
+        """
+        Grava (ou substitui) dividendos de um ativo.
+
+        Args:
+            conn: Conexão com o banco de dados SQLite
+            id_ativo: ID do ativo
+            datas_ex: Datas ex (datetime64 ou texto YYYY-MM-DD)
+            valores: Valor por ação em R$
+            tipos: Tipo de cada provento (ex: DIVIDENDO, JCP) (padrão: DIVIDENDO)
+
+        Returns:
+            int: Número de dividendos gravados
+        """
+        datas_ex = np.asarray(datas_ex, dtype='datetime64[D]').astype(str)
+        tipos = ['DIVIDENDO'] * len(datas_ex) if tipos is None else [str(tipo).upper() for tipo in tipos]
+        conn.executemany("""
+            INSERT OR REPLACE INTO DIVIDENDO (id_ativo, data_ex, tipo, valor)
+            VALUES (?, ?, ?, ?)
+        """, zip([id_ativo] * len(datas_ex), datas_ex.tolist(), tipos, np.asarray(valores, dtype=float).tolist()))
+        conn.commit()
+        return len(datas_ex)
+
+    @staticmethod
+    def carregar(conn: sqlite3.Connection, id_ativo: int) -> tuple:
+        """
+        Lê os dividendos de um ativo, somando os proventos com a mesma data ex.
+        Sem a tabela DIVIDENDO, o ativo fica sem dividendos.
+
+        Returns:
+            tuple: (datas ex em datetime64[D], valores), em ordem de data
+        """
+        try:
+            cursor = conn.execute("""
+                SELECT data_ex, SUM(valor)
+                FROM DIVIDENDO
+                WHERE id_ativo = ?
+                GROUP BY data_ex
+                ORDER BY data_ex ASC
+            """, (id_ativo,))
+        except sqlite3.OperationalError:
+            return np.array([], dtype='datetime64[D]'), np.array([], dtype=float)
+        linhas = cursor.fetchall()
+        return (np.array([linha[0] for linha in linhas], dtype='datetime64[D]'),
+                np.array([linha[1] for linha in linhas], dtype=float))
+
+    @staticmethod
+    def valor_presente(pregoes, datas_ex, valores, datas, vencimentos, taxa_juros: float) -> np.ndarray:
+        """
+        Valor presente dos dividendos entre cada data (exclusive) e o vencimento (inclusive).
+
+        Args:
+            pregoes: Datas dos pregões do ativo (ordenadas), que definem os prazos
+            datas_ex, valores: Dividendos de carregar()
+            datas: Datas de avaliação (pregões)
+            vencimentos: Vencimento de cada data (escalar ou array com o formato de datas)
+            taxa_juros: Taxa de juros anual (contínua, como no Black-Scholes)
+
+        Returns:
+            np.ndarray: Valor presente por data (zero sem dividendos no período)
+        """
+        datas = np.asarray(datas, dtype='datetime64[D]')
+        vencimentos = np.broadcast_to(np.asarray(vencimentos, dtype='datetime64[D]'), datas.shape)
+        if len(datas_ex) == 0:
+            return np.zeros(datas.shape)
+
+        # Prazo em pregões: a data ex cai no primeiro pregão a partir dela
+        posicao_ex = np.searchsorted(pregoes, datas_ex, side='left')
+        posicao_data = np.searchsorted(pregoes, datas, side='left')
+        acumulado = np.r_[0.0, np.cumsum(valores * np.exp(-taxa_juros * posicao_ex / 252))]
+
+        primeiro = np.searchsorted(posicao_ex, posicao_data, side='right')
+        ultimo = np.searchsorted(datas_ex, vencimentos, side='right')
+        soma = np.where(ultimo > primeiro, acumulado[ultimo] - acumulado[np.minimum(primeiro, ultimo)], 0.0)
+        return np.exp(taxa_juros * posicao_data / 252) * soma
+
+    @staticmethod
+    def ajustar(modelo: str, S, valor_presente, T) -> tuple:
+        """
+        Preço à vista e dividend yield contínuo do modelo de dividendos.
+
+        Args:
+            modelo: 'discreto' ou 'continuo'
+            S: Preço do ativo
+            valor_presente: Valor presente dos dividendos até o vencimento (valor_presente())
+            T: Tempo até o vencimento em anos
+
+        Returns:
+            tuple: (S ajustado, q) para BlackScholesVetorizado
+        """
+        S, valor_presente, T = (np.asarray(x, dtype=float) for x in (S, valor_presente, T))
+        if modelo == 'discreto':
+            return S - valor_presente, np.zeros(np.broadcast(S, valor_presente, T).shape)
+        if modelo == 'continuo':
+            with np.errstate(divide='ignore', invalid='ignore'):
+                q = np.where(T > 0, -np.log1p(-valor_presente / S) / T, 0.0)
+            return S, q
+        raise ValueError(f"Modelo de dividendos inválido: {modelo}. Use um de {MODELOS_DIVIDENDOS}.")
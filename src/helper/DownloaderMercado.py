@@ -0,0 +1,230 @@
+import asyncio
+import io
+import os
+import sqlite3
+import urllib.error
+import urllib.parse
+import urllib.request
+import numpy as np
+import pandas as pd
+
+# Colunas dos pregões devolvidos pelos provedores (mesmos nomes de HIST_ATIVO)
+COLUNAS_PREGOES = ['data', 'abertura', 'fechamento', 'maximo', 'minimo']
+
+class ProvedorYahoo:
+    """
+    Pregões diários do Yahoo Finance (biblioteca yfinance, importada só quando usada).
+
+    A biblioteca é bloqueante: cada ticker roda em uma thread (asyncio.to_thread),
+    com um objeto yf.Ticker próprio em vez do yf.download compartilhado.
+    """
+
+    def __init__(self, sufixo: str = '.SA'):
+        """
+        Args:
+            sufixo: Sufixo da bolsa no Yahoo (padrão: '.SA', B3)
+        """
+        self.sufixo = sufixo
+
+    async def baixar(self, ticker: str, inicio, fim) -> pd.DataFrame:
+        return await asyncio.to_thread(self._baixar, ticker, inicio, fim)
+
+    def _baixar(self, ticker: str, inicio, fim) -> pd.DataFrame:
+        import yfinance as yf
+
+        historico = yf.Ticker(f"{ticker}{self.sufixo}").history(start=str(inicio), end=str(fim), interval='1d')
+        if historico.empty:
+            raise ValueError(f"Sem dados do Yahoo para {ticker}{self.sufixo}.")
+        return pd.DataFrame({
+            'data': historico.index.tz_localize(None).normalize(),
+            'abertura': historico['Open'].to_numpy(),
+            'fechamento': historico['Close'].to_numpy(),
+            'maximo': historico['High'].to_numpy(),
+            'minimo': historico['Low'].to_numpy(),
+        }).round(2)
+
+class ProvedorHttp:
+    """
+    Pregões em CSV de um serviço HTTP: GET {url_base}/{ticker}?inicio=...&fim=...
+
+    Usado com o serviço local de testes (benchmark/ServidorDadosLocal) ou com
+    qualquer serviço que devolva as colunas data, abertura, fechamento, maximo e minimo.
+    """
+
+    def __init__(self, url_base: str, timeout: float = 30.0):
+        self.url_base = url_base.rstrip('/')
+        self.timeout = timeout
+
+    async def baixar(self, ticker: str, inicio, fim) -> pd.DataFrame:
+        return await asyncio.to_thread(self._baixar, ticker, inicio, fim)
+
+    def _baixar(self, ticker: str, inicio, fim) -> pd.DataFrame:
+        consulta = urllib.parse.urlencode({'inicio': str(inicio), 'fim': str(fim)})
+        url = f"{self.url_base}/{urllib.parse.quote(ticker)}?{consulta}"
+        with urllib.request.urlopen(url, timeout=self.timeout) as resposta:
+            return pd.read_csv(io.StringIO(resposta.read().decode('utf-8')), parse_dates=['data'])
+
+class ProvedorArquivo:
+    """
+    Pregões de arquivos CSV locais ({diretorio}/{ticker}.csv), para uso sem rede.
+    """
+
+    def __init__(self, diretorio: str):
+        self.diretorio = diretorio
+
+    async def baixar(self, ticker: str, inicio, fim) -> pd.DataFrame:
+        df = await asyncio.to_thread(pd.read_csv, os.path.join(self.diretorio, f"{ticker}.csv"),
+                                     parse_dates=['data'])
+        return df[(df['data'] >= pd.Timestamp(inicio)) & (df['data'] <= pd.Timestamp(fim))]
+
+class LimitadorTaxa:
+    """
+    Limita o início das requisições a uma taxa máxima (requisições por segundo),
+    espaçando-as igualmente entre todas as tarefas.
+    """
+
+    def __init__(self, requisicoes_por_segundo: float):
+        self.intervalo = 1.0 / requisicoes_por_segundo
+        self._proximo = 0.0
+        self._trava = asyncio.Lock()
+
+    async def aguardar(self):
+        async with self._trava:
+            agora = asyncio.get_running_loop().time()
+            inicio = max(agora, self._proximo)
+            self._proximo = inicio + self.intervalo
+        if inicio > agora:
+            await asyncio.sleep(inicio - agora)
+
+class DownloaderMercado:
+    """
+    Baixa os pregões de muitos tickers em um único lote concorrente.
+
+    Em vez de uma chamada bloqueante por ticker, as requisições rodam em
+    paralelo no asyncio, com:
+
+    - no máximo `concorrencia` requisições simultâneas (semáforo);
+    - no máximo `requisicoes_por_segundo` inícios de requisição por segundo (LimitadorTaxa);
+    - até `tentativas` tentativas por ticker, com espera exponencial entre elas,
+      só para erros transitórios (rede, timeout, HTTP 429 e 5xx). Ticker
+      inexistente (HTTP 4xx) ou sem dados (ValueError) falha na hora.
+
+    O provedor é qualquer objeto com `async baixar(ticker, inicio, fim)` que
+    devolva um DataFrame com COLUNAS_PREGOES (ProvedorYahoo, ProvedorHttp, ProvedorArquivo).
+    """
+
+    def __init__(self, provedor, concorrencia: int = 8, tentativas: int = 3, espera_inicial: float = 0.5,
+                 requisicoes_por_segundo: float = None):
+        """
+        Args:
+            provedor: Provedor de dados (ProvedorYahoo, ProvedorHttp ou ProvedorArquivo)
+            concorrencia: Requisições simultâneas (padrão: 8)
+            tentativas: Tentativas por ticker (padrão: 3)
+            espera_inicial: Espera antes da segunda tentativa em segundos; dobra a cada nova falha (padrão: 0,5)
+            requisicoes_por_segundo: Taxa máxima de requisições (padrão: None, sem limite)
+        """
+        self.provedor = provedor
+        self.concorrencia = max(1, concorrencia)
+        self.tentativas = max(1, tentativas)
+        self.espera_inicial = espera_inicial
+        self.requisicoes_por_segundo = requisicoes_por_segundo
+
+    @staticmethod
+    def erro_transitorio(erro: Exception) -> bool:
+        """
+        Indica se vale tentar de novo: erros de rede e HTTP 429/5xx, mas não ticker inexistente ou sem dados.
+        """
+        if isinstance(erro, urllib.error.HTTPError):
+            return erro.code == 429 or erro.code >= 500
+        if isinstance(erro, FileNotFoundError):
+            return False
+        return isinstance(erro, (OSError, TimeoutError, asyncio.TimeoutError))
+
+    async def baixar_lote(self, tickers: list, inicio, fim) -> tuple:
+        """
+        Baixa todos os tickers concorrentemente.
+
+        Returns:
+            tuple: ({ticker: DataFrame com COLUNAS_PREGOES}, {ticker: mensagem de erro})
+        """
+        semaforo = asyncio.Semaphore(self.concorrencia)
+        limitador = LimitadorTaxa(self.requisicoes_por_segundo) if self.requisicoes_por_segundo else None
+
+        async def baixar_ticker(ticker: str) -> pd.DataFrame:
+            for tentativa in range(self.tentativas):
+                async with semaforo:
+                    if limitador is not None:
+                        await limitador.aguardar()
+                    try:
+                        return await self.provedor.baixar(ticker, inicio, fim)
+                    except Exception as erro:
+                        if tentativa == self.tentativas - 1 or not self.erro_transitorio(erro):
+                            raise
+                await asyncio.sleep(self.espera_inicial * 2 ** tentativa)
+
+        resultados = await asyncio.gather(*(baixar_ticker(ticker) for ticker in tickers), return_exceptions=True)
+        dados, erros = {}, {}
+        for ticker, resultado in zip(tickers, resultados):
+            if isinstance(resultado, Exception):
+                erros[ticker] = f"{type(resultado).__name__}: {resultado}"
+            else:
+                dados[ticker] = resultado
+        return dados, erros
+
+    def baixar(self, tickers: list, inicio, fim) -> tuple:
+        """
+        Versão síncrona de baixar_lote (para scripts).
+        """
+        return asyncio.run(self.baixar_lote(list(tickers), inicio, fim))
+
+    @staticmethod
+    def gravar_banco(conn: sqlite3.Connection, dados: dict) -> int:
+        """
+        Grava os pregões baixados em HIST_ATIVO, criando o ATIVO se necessário.
+
+        Os pregões do período baixado são substituídos, então atualizar o mesmo
+        período de novo não duplica linhas.
+
+        Returns:
+            int: Número de pregões gravados
+        """
+        cursor = conn.cursor()
+        total = 0
+        for ticker, df in dados.items():
+            if df.empty:
+                continue
+            cursor.execute("SELECT id FROM ATIVO WHERE ticker = ?", (ticker,))
+            ativo = cursor.fetchone()
+            if ativo is None:
+                cursor.execute("INSERT INTO ATIVO (ticker, empresa) VALUES (?, ?)", (ticker, ticker))
+                id_ativo = cursor.lastrowid
+            else:
+                id_ativo = ativo[0]
+
+            datas = pd.to_datetime(df['data']).dt.strftime('%Y-%m-%d').to_numpy()
+            cursor.execute("DELETE FROM HIST_ATIVO WHERE id_ativo = ? AND data BETWEEN ? AND ?",
+                           (id_ativo, datas.min(), datas.max()))
+            cursor.executemany("""
+                INSERT INTO HIST_ATIVO (id_ativo, data, abertura, fechamento, maximo, minimo)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, zip([id_ativo] * len(df), datas.tolist(),
+                     *(np.asarray(df[coluna], dtype=float).tolist() for coluna in COLUNAS_PREGOES[1:])))
+            total += len(df)
+        conn.commit()
+        return total
+
+    @staticmethod
+    def gravar_parquet(diretorio: str, dados: dict) -> list:
+        """
+        Grava um arquivo {diretorio}/{ticker}.parquet por ticker (requer pyarrow ou fastparquet).
+
+        Returns:
+            list: Caminhos gravados
+        """
+        os.makedirs(diretorio, exist_ok=True)
+        caminhos = []
+        for ticker, df in dados.items():
+            caminho = os.path.join(diretorio, f"{ticker}.parquet")
+            df.to_parquet(caminho, index=False)
+            caminhos.append(caminho)
+        return caminhos
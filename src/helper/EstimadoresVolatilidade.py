@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+# Estimadores disponíveis ('historica' é o desvio padrão dos retornos de fechamento do TradeHelper)
+ESTIMADORES = ('historica', 'ewma', 'parkinson', 'garman_klass', 'rogers_satchell', 'yang_zhang',
+               'ewma_riskmetrics')
+
+# Fator de decaimento diário do RiskMetrics (equivale a uma janela de ~32 pregões), usado pelo 'ewma_riskmetrics'
+LAMBDA_RISKMETRICS = 0.94
+
+class EstimadoresVolatilidade:
+    """
+    Estimadores de volatilidade calculados de uma vez sobre todo o histórico.
+
+    Além do desvio padrão dos retornos de fechamento (o único do TradeHelper),
+    usa abertura, máximo e mínimo de HIST_ATIVO: os estimadores de amplitude
+    (Parkinson, Garman-Klass, Rogers-Satchell e Yang-Zhang) aproveitam a
+    variação dentro do pregão e chegam à mesma precisão com janelas bem mais
+    curtas. O EWMA (RiskMetrics) pondera os retornos com decaimento exponencial.
+
+    Todos devolvem a volatilidade anual alinhada com as datas, usando os
+    `pregoes` pregões até a data (inclusive), e NaN onde a janela não está
+    completa ou não cabe em 2 x pregoes dias corridos (mesma regra do
+    TradeHelper). No 'ewma', `pregoes` define o decaimento pela convenção de
+    span: lambda = 1 - 2 / (pregoes + 1); no 'ewma_riskmetrics' o decaimento
+    é o LAMBDA_RISKMETRICS fixo e `pregoes` só define a semente da recursão.
+    """
+
+    @staticmethod
+    def calcular(estimador: str, pregoes: int, datas, abertura, maximo, minimo, fechamento) -> np.ndarray:
+        """
+        Volatilidade anual de um estimador para todas as datas do histórico.
+
+        Args:
+            estimador: Um dos ESTIMADORES
+            pregoes: Número de pregões da janela
+            datas: Datas do histórico (ordem crescente)
+            abertura, maximo, minimo, fechamento: Preços do ativo alinhados com as datas
+
+        Returns:
+            np.ndarray: Volatilidade anual (NaN onde não há pregões suficientes)
+        """
+        if estimador not in ESTIMADORES:
+            raise ValueError(f"Estimador de volatilidade inválido: {estimador}. Use um de {ESTIMADORES}.")
+        if pregoes < 2:
+            raise ValueError("A volatilidade exige pelo menos 2 pregões.")
+
+        abertura, maximo, minimo, fechamento = (np.asarray(serie, dtype=float)
+                                                for serie in (abertura, maximo, minimo, fechamento))
+        if estimador == 'historica':
+            diaria = EstimadoresVolatilidade.historica(fechamento, pregoes)
+        elif estimador == 'ewma':
+            diaria = EstimadoresVolatilidade.ewma(fechamento, pregoes)
+        elif estimador == 'ewma_riskmetrics':
+            diaria = EstimadoresVolatilidade.ewma(fechamento, pregoes, LAMBDA_RISKMETRICS)
+        elif estimador == 'parkinson':
+            diaria = EstimadoresVolatilidade.parkinson(maximo, minimo, pregoes)
+        elif estimador == 'garman_klass':
+            diaria = EstimadoresVolatilidade.garman_klass(abertura, maximo, minimo, fechamento, pregoes)
+        elif estimador == 'rogers_satchell':
+            diaria = EstimadoresVolatilidade.rogers_satchell(abertura, maximo, minimo, fechamento, pregoes)
+        else:
+            diaria = EstimadoresVolatilidade.yang_zhang(abertura, maximo, minimo, fechamento, pregoes)
+
+        volatilidade = diaria * np.sqrt(252)
+        volatilidade[~EstimadoresVolatilidade.janela_valida(datas, pregoes)] = np.nan
+        return volatilidade
+
+    @staticmethod
+    def janela_valida(datas, pregoes: int) -> np.ndarray:
+        """
+        Indica as datas em que os `pregoes` pregões até a data cabem em 2 x pregoes dias corridos.
+        """
+        datas = np.asarray(datas, dtype='datetime64[D]')
+        inicio = np.arange(len(datas)) - (pregoes - 1)
+        valido = inicio >= 0
+        limite = datas - np.timedelta64(2 * pregoes, 'D')
+        valido[valido] &= datas[inicio[valido]] >= limite[valido]
+        return valido
+
+    @staticmethod
+    def historica(fechamento: np.ndarray, pregoes: int) -> np.ndarray:
+        """
+        Desvio padrão populacional dos pregoes - 1 retornos simples até a data
+        (TradeHelper.recuperaVolatilidadeDiariaPara_x_Pregoes).
+        """
+        retornos = pd.Series(fechamento[1:] / fechamento[:-1] - 1)
+        diaria = np.full(len(fechamento), np.nan)
+        diaria[1:] = retornos.rolling(pregoes - 1).std(ddof=0).to_numpy()
+        return diaria
+
+    @staticmethod
+    def ewma(fechamento: np.ndarray, pregoes: int, lambda_: float = None) -> np.ndarray:
+        """
+        EWMA do RiskMetrics: sigma²_t = lambda x sigma²_t-1 + (1 - lambda) x r²_t, com
+        retornos logarítmicos e média zero. A recursão começa com a média dos
+        quadrados dos primeiros pregoes - 1 retornos e é aplicada com lfilter.
+
+        Args:
+            lambda_: Fator de decaimento (padrão: 1 - 2 / (pregoes + 1); o RiskMetrics usa LAMBDA_RISKMETRICS)
+        """
+        lambda_ = 1 - 2 / (pregoes + 1) if lambda_ is None else lambda_
+        quadrados = np.log(fechamento[1:] / fechamento[:-1]) ** 2
+
+        variancia = np.full(len(fechamento), np.nan)
+        inicio = pregoes - 1
+        if len(quadrados) >= inicio:
+            semente = quadrados[:inicio].mean()
+            variancia[inicio] = semente
+            if len(quadrados) > inicio:
+                variancia[inicio + 1:] = lfilter([1 - lambda_], [1, -lambda_], quadrados[inicio:],
+                                                 zi=[lambda_ * semente])[0]
+        return np.sqrt(variancia)
+
+    @staticmethod
+    def parkinson(maximo: np.ndarray, minimo: np.ndarray, pregoes: int) -> np.ndarray:
+        """
+        Parkinson (1980): média de ln(H/L)² / (4 ln 2) na janela.
+        """
+        termos = np.log(maximo / minimo) ** 2 / (4 * np.log(2))
+        return np.sqrt(EstimadoresVolatilidade._media_movel(termos, pregoes))
+
+    @staticmethod
+    def garman_klass(abertura, maximo, minimo, fechamento, pregoes: int) -> np.ndarray:
+        """
+        Garman-Klass (1980): média de 0,5 ln(H/L)² - (2 ln 2 - 1) ln(C/O)² na janela.
+        """
+        termos = 0.5 * np.log(maximo / minimo) ** 2 - (2 * np.log(2) - 1) * np.log(fechamento / abertura) ** 2
+        return np.sqrt(np.maximum(EstimadoresVolatilidade._media_movel(termos, pregoes), 0))
+
+    @staticmethod
+    def rogers_satchell(abertura, maximo, minimo, fechamento, pregoes: int) -> np.ndarray:
+        """
+        Rogers-Satchell (1991): média de ln(H/C) ln(H/O) + ln(L/C) ln(L/O) na janela
+        (não supõe tendência zero).
+        """
+        termos = EstimadoresVolatilidade._termos_rogers_satchell(abertura, maximo, minimo, fechamento)
+        return np.sqrt(EstimadoresVolatilidade._media_movel(termos, pregoes))
+
+    @staticmethod
+    def yang_zhang(abertura, maximo, minimo, fechamento, pregoes: int) -> np.ndarray:
+        """
+        Yang-Zhang (2000): variância do retorno noturno (abertura / fechamento anterior)
+        + k x variância do retorno do pregão (fechamento / abertura) + (1 - k) x Rogers-Satchell,
+        com k = 0,34 / (1,34 + (n + 1) / (n - 1)) e n = pregoes.
+        """
+        n = pregoes
+        noturno = np.r_[np.nan, np.log(abertura[1:] / fechamento[:-1])]
+        pregao = np.log(fechamento / abertura)
+        termos_rs = EstimadoresVolatilidade._termos_rogers_satchell(abertura, maximo, minimo, fechamento)
+
+        k = 0.34 / (1.34 + (n + 1) / (n - 1))
+        variancia = (pd.Series(noturno).rolling(n).var(ddof=1).to_numpy()
+                     + k * pd.Series(pregao).rolling(n).var(ddof=1).to_numpy()
+                     + (1 - k) * EstimadoresVolatilidade._media_movel(termos_rs, n))
+        return np.sqrt(np.maximum(variancia, 0))
+
+    @staticmethod
+    def _termos_rogers_satchell(abertura, maximo, minimo, fechamento) -> np.ndarray:
+        """Termo diário do estimador de Rogers-Satchell."""
+        return (np.log(maximo / fechamento) * np.log(maximo / abertura)
+                + np.log(minimo / fechamento) * np.log(minimo / abertura))
+
+    @staticmethod
+    def _media_movel(valores: np.ndarray, pregoes: int) -> np.ndarray:
+        """Média dos últimos `pregoes` valores até cada posição (NaN antes da janela completa)."""
+        return pd.Series(valores).rolling(pregoes).mean().to_numpy()
@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+
+# Formatos numéricos do Excel usados nas planilhas de simulação
+FORMATO_MONETARIO = '"R$" #,##0.00'
+FORMATO_DELTA = '0.0000'
+FORMATO_DATA = 'yyyy-mm-dd'
+
+# Largura usada quando não é possível estimar o conteúdo da coluna
+LARGURA_PADRAO = 15
+
+
+class ExportadorExcel:
+    @staticmethod
+    def exportar(caminho: str, abas: dict, formatos: dict = None):
+        """
+        Grava um ou mais DataFrames em um arquivo Excel mantendo os valores numéricos.
+
+        Usa o modo write-only do openpyxl (memória constante): as linhas são
+        enviadas em fluxo para o arquivo e as células monetárias recebem um
+        formato numérico do Excel em vez de texto pré-formatado. Colunas de
+        data sem formato informado usam FORMATO_DATA.
+
+        Args:
+            caminho: Caminho do arquivo .xlsx de saída
+            abas: Dicionário {nome da aba: DataFrame}, na ordem das abas
+            formatos: Dicionário {nome da coluna: formato numérico do Excel}
+                      (ex: {'Saldo Final': FORMATO_MONETARIO})
+        """
+        formatos = formatos or {}
+        workbook = Workbook(write_only=True)
+
+        for nome_aba, df in abas.items():
+            worksheet = workbook.create_sheet(title=nome_aba)
+            colunas = list(df.columns)
+            formatos_colunas = [formatos.get(coluna) or
+                                (FORMATO_DATA if pd.api.types.is_datetime64_any_dtype(df[coluna]) else None)
+                                for coluna in colunas]
+
+            # No modo write-only as larguras precisam ser definidas antes das linhas
+            larguras = ExportadorExcel.calcular_larguras(df, formatos)
+            for col_idx, largura in enumerate(larguras, 1):
+                worksheet.column_dimensions[get_column_letter(col_idx)].width = largura
+
+            worksheet.append(colunas)
+
+            # Converte cada coluna uma única vez para objetos Python (NaN -> célula vazia)
+            valores_colunas = [ExportadorExcel._valores_coluna(df[coluna]) for coluna in colunas]
+
+            # Células formatadas reaproveitam o formato; as demais vão como valor puro
+            indices_formatados = [i for i, formato in enumerate(formatos_colunas) if formato]
+
+            for linha in zip(*valores_colunas):
+                if indices_formatados:
+                    linha = list(linha)
+                    for i in indices_formatados:
+                        if linha[i] is not None:
+                            celula = WriteOnlyCell(worksheet, value=linha[i])
+                            celula.number_format = formatos_colunas[i]
+                            linha[i] = celula
+                worksheet.append(linha)
+
+        workbook.save(caminho)
+
+    @staticmethod
+    def calcular_larguras(df: pd.DataFrame, formatos: dict = None) -> list:
+        """
+        Calcula a largura de cada coluna (maior conteúdo ou cabeçalho + 2).
+
+        Colunas numéricas têm a largura estimada de forma vetorizada a partir do
+        número de dígitos, sem converter cada célula para texto.
+
+        Args:
+            df: DataFrame a ser exportado
+            formatos: Dicionário {nome da coluna: formato numérico do Excel}
+
+        Returns:
+            list: Larguras das colunas na ordem do DataFrame
+        """
+        formatos = formatos or {}
+        larguras = []
+
+        for coluna in df.columns:
+            serie = df[coluna]
+            try:
+                if pd.api.types.is_bool_dtype(serie):
+                    max_len = 5  # 'False'
+                elif pd.api.types.is_numeric_dtype(serie):
+                    max_len = ExportadorExcel._largura_numerica(serie.to_numpy(dtype=float), formatos.get(coluna))
+                elif pd.api.types.is_datetime64_any_dtype(serie):
+                    max_len = 10  # yyyy-mm-dd
+                else:
+                    max_len = serie.dropna().astype(str).str.len().max()
+
+                if pd.isna(max_len):
+                    raise ValueError("Coluna vazia")
+
+                larguras.append(max(int(max_len), len(str(coluna))) + 2)
+            except (ValueError, TypeError):
+                # Se houver erro (ex: coluna vazia), usa um valor padrão
+                larguras.append(LARGURA_PADRAO)
+
+        return larguras
+
+    @staticmethod
+    def _largura_numerica(valores: np.ndarray, formato: str = None) -> int:
+        """
+        Estima o maior texto exibido para uma coluna numérica.
+
+        Args:
+            valores: Valores da coluna
+            formato: Formato numérico do Excel (None para o formato geral)
+
+        Returns:
+            int: Número de caracteres do maior valor exibido
+        """
+        valores = valores[np.isfinite(valores)]
+        if valores.size == 0:
+            raise ValueError("Coluna sem valores numéricos")
+
+        absolutos = np.abs(valores)
+        digitos_inteiros = np.floor(np.log10(np.maximum(absolutos, 1.0))).astype(int) + 1
+        sinal = (valores < 0).astype(int)
+
+        if formato:
+            # Ex: '"R$" #,##0.00' -> prefixo 'R$ ' (3), separador de milhar, 2 casas
+            partes = formato.split('"')
+            parte_numerica = partes[-1]
+            prefixo = len(''.join(partes[1::2])) + len(parte_numerica) - len(parte_numerica.lstrip())
+            parte_numerica = parte_numerica.strip()
+            casas = len(parte_numerica.split('.')[1]) if '.' in parte_numerica else 0
+            separadores = (digitos_inteiros - 1) // 3 if ',' in parte_numerica else 0
+            larguras = sinal + digitos_inteiros + separadores + (casas + 1 if casas else 0) + prefixo
+        else:
+            # Formato geral: inteiros sem casas, demais com até 4 casas visíveis
+            tem_fracao = (absolutos != np.floor(absolutos)).astype(int)
+            larguras = sinal + digitos_inteiros + tem_fracao * 5
+
+        return int(larguras.max())
+
+    @staticmethod
+    def _valores_coluna(serie: pd.Series) -> list:
+        """
+        Converte uma coluna para uma lista de objetos Python aceitos pelo openpyxl.
+        """
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            return [None if pd.isna(v) else v.to_pydatetime() for v in serie]
+
+        valores = serie.astype(object).where(serie.notna(), None)
+        return valores.tolist()
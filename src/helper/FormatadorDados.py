@@ -0,0 +1,70 @@
+import pandas as pd
+
+# Formatos de texto usados na apresentação das tabelas
+TEXTO_MONETARIO = 'R$ {:.2f}'
+TEXTO_DELTA = '{:.4f}'
+TEXTO_QUANTIDADE = '{:.2f}'
+TEXTO_PERCENTUAL = '{:.2f}%'
+TEXTO_DATA = '%Y-%m-%d'
+
+# Formatos das colunas de DeltaHedgeAjustePelo*.listar_dados()
+FORMATOS_DELTA_HEDGE = {
+    'Ativo': TEXTO_MONETARIO,
+    'Opção': TEXTO_MONETARIO,
+    'Delta': TEXTO_DELTA,
+    'Ajuste Ações': TEXTO_QUANTIDADE,
+    'Qtd Ações': TEXTO_QUANTIDADE,
+    'Ajuste Saldo': TEXTO_MONETARIO,
+    'Saldo Acumulado': TEXTO_MONETARIO,
+    'Saldo Real': TEXTO_MONETARIO,
+}
+
+
+class FormatadorDados:
+    """
+    Apresentação em texto dos DataFrames numéricos das simulações.
+
+    Os métodos listar_dados() devolvem colunas float64, bool e datetime; a
+    conversão para texto ('R$ 1.23', '0.4567', ...) acontece só aqui, no
+    momento de imprimir, para que quem consome os dados não precise
+    desfazer a formatação.
+    """
+
+    @staticmethod
+    def formatar(df: pd.DataFrame, formatos: dict = None, formato_data: str = TEXTO_DATA) -> pd.DataFrame:
+        """
+        Retorna uma cópia do DataFrame com as colunas convertidas em texto.
+
+        Args:
+            df: DataFrame com valores numéricos
+            formatos: Dicionário {nome da coluna: formato str.format} (padrão: FORMATOS_DELTA_HEDGE)
+            formato_data: Formato strftime das colunas de data (padrão: YYYY-MM-DD)
+
+        Returns:
+            pd.DataFrame: Cópia formatada; colunas sem formato ficam como estão
+        """
+        formatos = FORMATOS_DELTA_HEDGE if formatos is None else formatos
+        formatado = df.copy()
+
+        for coluna in formatado.columns:
+            if coluna in formatos:
+                formatado[coluna] = formatado[coluna].map(formatos[coluna].format)
+            elif pd.api.types.is_datetime64_any_dtype(formatado[coluna]):
+                formatado[coluna] = formatado[coluna].dt.strftime(formato_data)
+
+        return formatado
+
+    @staticmethod
+    def tabela_texto(df: pd.DataFrame, formatos: dict = None, formato_data: str = TEXTO_DATA) -> str:
+        """
+        Renderiza o DataFrame como a tabela de texto impressa pelas simulações.
+
+        Args:
+            df: DataFrame com valores numéricos
+            formatos: Dicionário {nome da coluna: formato str.format} (padrão: FORMATOS_DELTA_HEDGE)
+            formato_data: Formato strftime das colunas de data (padrão: YYYY-MM-DD)
+
+        Returns:
+            str: Tabela sem índice (DataFrame.to_string)
+        """
+        return FormatadorDados.formatar(df, formatos, formato_data).to_string(index=False)
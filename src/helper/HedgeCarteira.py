@@ -0,0 +1,160 @@
+import numpy as np
+from helper.DadosMercado import DadosMercado
+from helper.BlackScholesVetorizado import BlackScholesVetorizado
+
+class HedgeCarteira:
+    """
+    Delta hedge de uma carteira de opções (calls e puts) sobre o mesmo ativo.
+
+    Em vez de uma posição em ações por opção, a carteira inteira tem uma única
+    posição, ajustada pelo delta líquido: a soma dos deltas das opções
+    ponderados pelas quantidades. Os deltas de todas as opções em todos os
+    dias saem de uma única chamada de BlackScholesVetorizado.delta_por_tipo
+    sobre a matriz (dias, opções), e o ajuste usa o kernel HedgeVetorizado
+    sobre uma "simulação" que representa a carteira. Assim, o custo de uma
+    carteira de 200 opções é praticamente o de uma opção.
+
+    Convenções da carteira:
+    - quantidade positiva é opção vendida e negativa, opção comprada;
+    - os deltas são por opção da carteira: delta líquido em ações dividido
+      pelo total de opções (soma das quantidades absolutas), de modo que o
+      limite da estratégia 'delta' tem a mesma escala da simulação individual;
+    - cada opção sai da carteira no último pregão antes do seu vencimento (ou
+      no fim do período): a partir daí seu delta é zero e seu valor fica fixo
+      no último fechamento, como se tivesse sido recomprada nesse preço.
+    """
+
+    @staticmethod
+    def carregar(dados: DadosMercado, posicoes: dict, data_inicio, data_fim=None) -> dict:
+        """
+        Monta a carteira alinhada por data com os pregões do ativo.
+
+        Args:
+            dados: DadosMercado do ativo (com conexão ao banco)
+            posicoes: {id_opcao: quantidade}; positiva para opção vendida, negativa para comprada
+            data_inicio: Primeiro pregão da carteira (todas as opções precisam ter preço nele)
+            data_fim: Último pregão (padrão: o último pregão antes do vencimento mais distante)
+
+        Returns:
+            dict: Campos de DadosMercado.carregar_simulacao usados por HedgeVetorizado.simular
+                  (quantidade = total de opções, preços da opção = valor da carteira por opção)
+                  e, por opção, 'ids_opcao', 'tickers', 'put', 'strike', 'vencimento',
+                  'quantidades', 'ativa', 'opcao_abertura_cadeia', 'opcao_fechamento_cadeia'
+                  e 'dias_uteis_cadeia' (formato (dias, opções))
+
+        Raises:
+            ValueError: Se faltar opção no banco ou preço de alguma opção em um pregão em que ela está ativa
+        """
+        ids_opcao = np.array(sorted(posicoes), dtype=int)
+        if len(ids_opcao) == 0:
+            raise ValueError("A carteira não tem opções.")
+        quantidades = np.array([float(posicoes[i]) for i in ids_opcao])
+
+        cursor = dados.conn.cursor()
+        marcadores = ', '.join('?' * len(ids_opcao))
+        cursor.execute(f"""
+            SELECT id, ticker, tipo, strike, vencimento
+            FROM OPCAO
+            WHERE id_ativo = ? AND id IN ({marcadores})
+            ORDER BY id ASC
+        """, (dados.id_ativo, *ids_opcao.tolist()))
+        opcoes = cursor.fetchall()
+        if len(opcoes) != len(ids_opcao):
+            faltantes = sorted(set(ids_opcao.tolist()) - {linha[0] for linha in opcoes})
+            raise ValueError(f"Opções não encontradas para o ativo {dados.ticker}: {faltantes}")
+
+        tickers = np.array([linha[1] for linha in opcoes], dtype=str)
+        put = np.array([str(linha[2]).upper() == 'PUT' for linha in opcoes])
+        strike = np.array([linha[3] for linha in opcoes], dtype=float)
+        vencimento = np.array([linha[4] for linha in opcoes], dtype='datetime64[D]')
+
+        # Pregões da carteira e último pregão de cada opção (o anterior ao vencimento)
+        data_inicio = np.datetime64(str(data_inicio), 'D')
+        ultimo_pregao = dados.datas[np.maximum(np.searchsorted(dados.datas, vencimento, side='left') - 1, 0)]
+        data_fim = ultimo_pregao.max() if data_fim is None else np.datetime64(str(data_fim), 'D')
+        primeiro = np.searchsorted(dados.datas, data_inicio, side='left')
+        ultimo = np.searchsorted(dados.datas, data_fim, side='right')
+        indices = np.arange(primeiro, ultimo)
+        if len(indices) == 0:
+            raise ValueError(f"Nenhum pregão do ativo entre {data_inicio} e {data_fim}.")
+        datas = dados.datas[indices]
+        termino = np.minimum(ultimo_pregao, data_fim)
+        if np.any(termino < datas[0]):
+            raise ValueError(f"Opções vencidas antes de {datas[0]}: {tickers[termino < datas[0]].tolist()}")
+
+        # Preços de todas as opções em uma consulta, espalhados na matriz (dias, opções)
+        cursor.execute(f"""
+            SELECT id_opcao, data, abertura, fechamento
+            FROM HIST_OPCAO
+            WHERE id_opcao IN ({marcadores})
+              AND data BETWEEN ? AND ?
+        """, (*ids_opcao.tolist(), str(datas[0]), str(datas[-1])))
+        historico = cursor.fetchall()
+        abertura = np.full((len(datas), len(ids_opcao)), np.nan)
+        fechamento = np.full((len(datas), len(ids_opcao)), np.nan)
+        if historico:
+            coluna = np.searchsorted(ids_opcao, [linha[0] for linha in historico])
+            linha_data = np.searchsorted(datas, np.array([linha[1] for linha in historico], dtype='datetime64[D]'))
+            abertura[linha_data, coluna] = [linha[2] for linha in historico]
+            fechamento[linha_data, coluna] = [linha[3] for linha in historico]
+
+        ativa = datas[:, None] <= termino[None, :]
+        sem_preco = ativa & (np.isnan(abertura) | np.isnan(fechamento))
+        if sem_preco.any():
+            dia, opcao = np.argwhere(sem_preco)[0]
+            raise ValueError(f"As datas dos preços da opção e do ativo não correspondem. "
+                             f"Opção: {tickers[opcao]} (ID: {ids_opcao[opcao]}), data {datas[dia]}")
+
+        # Depois de sair da carteira, a opção fica com o último fechamento
+        posicao_termino = np.searchsorted(datas, termino, side='right') - 1
+        fechamento_fixo = fechamento[posicao_termino, np.arange(len(ids_opcao))]
+        fechamento = np.where(ativa, fechamento, fechamento_fixo[None, :])
+
+        total = float(np.abs(quantidades).sum())
+        return {
+            'id_simulacao': None,
+            'ticker_opcao': 'CARTEIRA',
+            'quantidade': total,
+            'datas': datas,
+            'indices': indices,
+            'ativo_abertura': dados.abertura[indices],
+            'ativo_fechamento': dados.fechamento[indices],
+            'opcao_abertura': (np.nan_to_num(abertura) @ quantidades) / total,
+            'opcao_fechamento': (fechamento @ quantidades) / total,
+            'eh_ultimo_dia': datas == datas[-1],
+            'dias_uteis': dados.dias_uteis(datas, datas[-1]),
+            'ids_opcao': ids_opcao,
+            'tickers': tickers,
+            'put': put,
+            'strike': strike,
+            'vencimento': vencimento,
+            'quantidades': quantidades,
+            'ativa': ativa,
+            'opcao_abertura_cadeia': abertura,
+            'opcao_fechamento_cadeia': fechamento,
+            'dias_uteis_cadeia': np.stack([dados.dias_uteis(datas, v) for v in vencimento], axis=1),
+        }
+
+    @staticmethod
+    def calcular_deltas(carteira: dict, volatilidades: np.ndarray, taxa_juros: float = 0.15) -> np.ndarray:
+        """
+        Delta líquido da carteira por opção, para uma ou mais séries de volatilidade.
+
+        Args:
+            carteira: Dados de HedgeCarteira.carregar
+            volatilidades: Volatilidade anual por dia, formato (dias,) ou (séries, dias)
+            taxa_juros: Taxa de juros anual (padrão: 15%)
+
+        Returns:
+            np.ndarray: Delta líquido / total de opções, no formato de volatilidades
+        """
+        # No último dia o delta usa o preço de fechamento; nos demais, o de abertura
+        preco_delta = np.where(carteira['eh_ultimo_dia'], carteira['ativo_fechamento'], carteira['ativo_abertura'])
+        volatilidades = np.asarray(volatilidades, dtype=float)
+
+        # (..., dias, opções): todas as opções da cadeia em todos os dias de uma vez
+        deltas = BlackScholesVetorizado.delta_por_tipo(carteira['put'], preco_delta[:, None], carteira['strike'],
+                                                       carteira['dias_uteis_cadeia'] / 252, taxa_juros,
+                                                       volatilidades[..., None])
+        deltas = np.where(carteira['ativa'], deltas, 0.0)
+        return deltas @ carteira['quantidades'] / carteira['quantidade']
@@ -0,0 +1,232 @@
+import numpy as np
+from helper.DadosMercado import DadosMercado
+from helper.BlackScholesVetorizado import BlackScholesVetorizado
+from helper.HedgeVetorizado import HedgeVetorizado, ESTRATEGIAS
+
+# Gamma mínimo da opção de hedge para resolver o sistema (abaixo disso o dia fica só com ações)
+GAMA_MINIMO = 1e-6
+
+# Limite de opções de hedge por opção vendida (evita posições enormes quando o gamma da opção de hedge é pequeno)
+RAZAO_MAXIMA = 5.0
+
+class HedgeDeltaGama:
+    """
+    Hedge delta-gamma: ações e uma segunda opção listada protegem a opção vendida.
+
+    A opção de hedge é a de strike mais próximo com o mesmo vencimento (e preço
+    em todos os pregões da simulação). A cada dia as quantidades saem do sistema
+    2 x 2 que zera o gamma e o delta da posição:
+
+        gamma_h x n_h             = quantidade x gamma
+        delta_h x n_h + n_acoes   = quantidade x delta
+
+    resolvido de uma vez para todos os dias (e séries de volatilidade) com
+    np.linalg.solve sobre a pilha de matrizes. As regras de ajuste são as de
+    HedgeVetorizado (o gatilho da estratégia 'delta' usa o delta da opção
+    vendida); quando dispara, as duas posições vão para o alvo do dia.
+    """
+
+    @staticmethod
+    def carregar_opcao_hedge(dados: DadosMercado, simulacao: dict) -> dict:
+        """
+        Escolhe a opção de hedge de uma simulação: mesmo ativo e vencimento,
+        strike mais próximo e preço em todos os pregões da simulação.
+
+        Args:
+            dados: DadosMercado do ativo (com conexão ao banco)
+            simulacao: Dados de DadosMercado.carregar_simulacao
+
+        Returns:
+            dict: ticker_opcao, tipo, strike, opcao_abertura e opcao_fechamento (alinhados com a simulação)
+
+        Raises:
+            ValueError: Se nenhuma opção do mesmo vencimento tiver preço em todos os pregões
+        """
+        datas = simulacao['datas']
+        cursor = dados.conn.cursor()
+        cursor.execute("""
+            SELECT o.id, o.ticker, o.tipo, o.strike
+            FROM OPCAO o
+            JOIN HIST_OPCAO h ON h.id_opcao = o.id
+            WHERE o.id_ativo = ?
+              AND o.vencimento = ?
+              AND o.ticker <> ?
+              AND h.data BETWEEN ? AND ?
+            GROUP BY o.id
+            HAVING COUNT(DISTINCT h.data) = ?
+            ORDER BY ABS(o.strike - ?) ASC, o.strike ASC
+            LIMIT 1
+        """, (dados.id_ativo, str(simulacao['vencimento']), simulacao['ticker_opcao'],
+              str(datas[0]), str(datas[-1]), len(datas), simulacao['strike']))
+        opcao = cursor.fetchone()
+        if not opcao:
+            raise ValueError(f"Nenhuma opção de hedge com vencimento {simulacao['vencimento']} e preço "
+                             f"em todos os pregões da simulação {simulacao['id_simulacao']}.")
+
+        id_opcao, ticker_opcao, tipo, strike = opcao
+        cursor.execute("""
+            SELECT data, abertura, fechamento
+            FROM HIST_OPCAO
+            WHERE id_opcao = ?
+              AND data BETWEEN ? AND ?
+            ORDER BY data ASC
+        """, (id_opcao, str(datas[0]), str(datas[-1])))
+        historico = cursor.fetchall()
+        if np.any(np.array([linha[0] for linha in historico], dtype='datetime64[D]') != datas):
+            raise ValueError(f"As datas dos preços da opção e do ativo não correspondem. "
+                             f"Opção: {ticker_opcao} (ID: {id_opcao})")
+
+        return {
+            'ticker_opcao': ticker_opcao,
+            'tipo': 'put' if str(tipo).upper() == 'PUT' else 'call',
+            'strike': float(strike),
+            'opcao_abertura': np.array([linha[1] for linha in historico], dtype=float),
+            'opcao_fechamento': np.array([linha[2] for linha in historico], dtype=float),
+        }
+
+    @staticmethod
+    def calcular_posicoes(simulacao: dict, hedge: dict, volatilidades: np.ndarray,
+                          taxa_juros: float = 0.15) -> tuple:
+        """
+        Quantidades alvo de opções de hedge e de ações em cada dia.
+
+        Nos dias em que o gamma da opção de hedge é menor que GAMA_MINIMO (ex: no
+        vencimento) o sistema não é resolvido: a opção de hedge vai a zero e as
+        ações fazem o delta hedge comum. As opções de hedge ficam limitadas a
+        RAZAO_MAXIMA x quantidade.
+
+        Args:
+            simulacao: Dados de DadosMercado.carregar_simulacao
+            hedge: Dados de carregar_opcao_hedge
+            volatilidades: Volatilidade anual por dia, formato (dias,) ou (séries, dias)
+            taxa_juros: Taxa de juros anual (padrão: 15%)
+
+        Returns:
+            tuple: (delta da opção vendida, opções de hedge, ações), no formato de volatilidades
+        """
+        # No último dia usa o preço de fechamento; nos demais, o de abertura
+        preco = np.where(simulacao['eh_ultimo_dia'], simulacao['ativo_fechamento'], simulacao['ativo_abertura'])
+        T = simulacao['dias_uteis'] / 252
+        quantidade = simulacao['quantidade']
+
+        delta = BlackScholesVetorizado.delta(simulacao['tipo'], preco, simulacao['strike'], T, taxa_juros, volatilidades)
+        gama = BlackScholesVetorizado.gamma(preco, simulacao['strike'], T, taxa_juros, volatilidades)
+        delta_h = BlackScholesVetorizado.delta(hedge['tipo'], preco, hedge['strike'], T, taxa_juros, volatilidades)
+        gama_h = BlackScholesVetorizado.gamma(preco, hedge['strike'], T, taxa_juros, volatilidades)
+
+        # Pilha de sistemas 2 x 2 (um por dia); dias sem gamma usável viram n_h = 0
+        resolvivel = np.isfinite(gama) & np.isfinite(gama_h) & (gama_h > GAMA_MINIMO)
+        matrizes = np.zeros(delta.shape + (2, 2))
+        matrizes[..., 0, 0] = np.where(resolvivel, gama_h, 1.0)
+        matrizes[..., 1, 0] = np.where(resolvivel, delta_h, 0.0)
+        matrizes[..., 1, 1] = 1.0
+        lado_direito = quantidade * np.stack([np.where(resolvivel, gama, 0.0), delta], axis=-1)
+        solucao = np.linalg.solve(matrizes, lado_direito[..., None])[..., 0]
+
+        opcoes_hedge = np.clip(solucao[..., 0], -RAZAO_MAXIMA * quantidade, RAZAO_MAXIMA * quantidade)
+        acoes = quantidade * delta - opcoes_hedge * np.where(resolvivel, delta_h, 0.0)
+        return delta, opcoes_hedge, acoes
+
+    @staticmethod
+    def simular(deltas: np.ndarray, opcoes_hedge: np.ndarray, acoes: np.ndarray, simulacao: dict, hedge: dict,
+                estrategia: str, limites) -> dict:
+        """
+        Simula P políticas de ajuste do hedge delta-gamma sobre a mesma simulação.
+
+        Args:
+            deltas, opcoes_hedge, acoes: Saída de calcular_posicoes, formato (P, dias)
+            simulacao: Dados de DadosMercado.carregar_simulacao
+            hedge: Dados de carregar_opcao_hedge
+            estrategia: 'delta', 'dia' ou 'lote' (como em HedgeVetorizado.simular; 'lote' compara as ações)
+            limites: Parâmetro da estratégia por política, formato (P,) ou escalar
+
+        Returns:
+            dict: Arrays (P, dias) 'qtd_acoes', 'qtd_opcoes_hedge', 'ajuste_saldo',
+                  'saldo_acumulado', 'saldo_real' e 'ajustou'; arrays (P,) 'num_ajustes',
+                  'saldo_final' e 'variancia_pl' (variância do resultado diário)
+        """
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(f"Estratégia inválida: {estrategia}. Use uma de {ESTRATEGIAS}.")
+
+        deltas, opcoes_hedge, acoes = (np.atleast_2d(np.asarray(x, dtype=float))
+                                       for x in (deltas, opcoes_hedge, acoes))
+        politicas, dias = deltas.shape
+        limites = np.broadcast_to(np.asarray(limites), (politicas,))
+        quantidade = simulacao['quantidade']
+        eh_ultimo_dia = simulacao['eh_ultimo_dia']
+
+        qtd_acoes = np.empty((politicas, dias))
+        qtd_opcoes = np.empty((politicas, dias))
+        ajustou = np.zeros((politicas, dias), dtype=bool)
+        qtd_acoes[:, 0] = acoes[:, 0]
+        qtd_opcoes[:, 0] = opcoes_hedge[:, 0]
+        ajustou[:, 0] = True
+
+        for i in range(1, dias):
+            if estrategia == 'delta':
+                gatilho = np.abs(deltas[:, i] - deltas[:, i - 1]) > limites
+            elif estrategia == 'lote':
+                gatilho = np.abs(acoes[:, i] - qtd_acoes[:, i - 1]) > limites
+            else:
+                gatilho = (i % limites) == 0
+            gatilho = gatilho | eh_ultimo_dia[i]
+
+            qtd_acoes[:, i] = np.where(gatilho, acoes[:, i], qtd_acoes[:, i - 1])
+            qtd_opcoes[:, i] = np.where(gatilho, opcoes_hedge[:, i], qtd_opcoes[:, i - 1])
+            ajustou[:, i] = gatilho
+
+        # Execução na abertura (no fechamento do último dia), como em HedgeVetorizado
+        def preco_execucao(abertura, fechamento):
+            preco = np.where(eh_ultimo_dia, fechamento, abertura)
+            preco[0] = abertura[0]
+            return preco
+
+        ajuste_acoes = np.diff(qtd_acoes, axis=1, prepend=0.0)
+        ajuste_opcoes = np.diff(qtd_opcoes, axis=1, prepend=0.0)
+        ajuste_saldo = (-ajuste_acoes * preco_execucao(simulacao['ativo_abertura'], simulacao['ativo_fechamento'])
+                        - ajuste_opcoes * preco_execucao(hedge['opcao_abertura'], hedge['opcao_fechamento']))
+        ajuste_saldo[:, 0] += quantidade * simulacao['opcao_abertura'][0]
+
+        saldo_acumulado = np.cumsum(ajuste_saldo, axis=1)
+        saldo_real = (saldo_acumulado + qtd_acoes * simulacao['ativo_fechamento']
+                      + qtd_opcoes * hedge['opcao_fechamento'] - quantidade * simulacao['opcao_fechamento'])
+        return {
+            'qtd_acoes': qtd_acoes,
+            'qtd_opcoes_hedge': qtd_opcoes,
+            'ajuste_saldo': ajuste_saldo,
+            'saldo_acumulado': saldo_acumulado,
+            'saldo_real': saldo_real,
+            'ajustou': ajustou,
+            'num_ajustes': ajustou.sum(axis=1),
+            'saldo_final': saldo_real[:, -1],
+            'variancia_pl': HedgeDeltaGama.variancia_pl(saldo_real),
+        }
+
+    @staticmethod
+    def variancia_pl(saldo_real: np.ndarray) -> np.ndarray:
+        """
+        Variância do resultado diário (variação do Saldo Real de um pregão para o seguinte).
+        """
+        return np.var(np.diff(saldo_real, axis=-1), axis=-1)
+
+    @staticmethod
+    def comparar(simulacao: dict, hedge: dict, volatilidade: np.ndarray, estrategia: str, limite,
+                 taxa_juros: float = 0.15) -> dict:
+        """
+        Compara o hedge delta-gamma com o delta hedge só com ações na mesma simulação.
+
+        Returns:
+            dict: 'ajustes_delta', 'ajustes_delta_gama', 'variancia_delta', 'variancia_delta_gama',
+                  'saldo_delta' e 'saldo_delta_gama'
+        """
+        deltas, opcoes_hedge, acoes = HedgeDeltaGama.calcular_posicoes(simulacao, hedge, volatilidade, taxa_juros)
+        delta_gama = HedgeDeltaGama.simular(deltas, opcoes_hedge, acoes, simulacao, hedge, estrategia, [limite])
+        so_delta = HedgeVetorizado.simular(np.atleast_2d(deltas), simulacao, estrategia, [limite])
+        return {
+            'ajustes_delta': int(so_delta['num_ajustes'][0]),
+            'ajustes_delta_gama': int(delta_gama['num_ajustes'][0]),
+            'variancia_delta': float(HedgeDeltaGama.variancia_pl(so_delta['saldo_real'])[0]),
+            'variancia_delta_gama': float(delta_gama['variancia_pl'][0]),
+            'saldo_delta': float(so_delta['saldo_final'][0]),
+            'saldo_delta_gama': float(delta_gama['saldo_final'][0]),
+        }
@@ -0,0 +1,205 @@
+import numpy as np
+from helper.BlackScholesVetorizado import BlackScholesVetorizado
+from helper.ModeloCustos import ModeloCustos
+from helper.Dividendos import Dividendos
+
+# Estratégias de ajuste suportadas pelo kernel (mesmas regras das classes DeltaHedgeAjustePelo*)
+ESTRATEGIAS = ('delta', 'dia', 'lote')
+
+class HedgeVetorizado:
+    """
+    Kernel de delta hedge que simula várias políticas de ajuste ao mesmo tempo.
+
+    O laço percorre apenas os dias da simulação; cada passo atualiza todas as
+    P políticas de uma vez (arrays de formato (P, dias)). As regras são as das
+    classes DeltaHedgeAjustePeloDelta, DeltaHedgeAjustePeloDia e
+    DeltaHedgeAjustePeloLote:
+
+    - no primeiro dia vende as opções e compra delta x quantidade de ações;
+    - nos dias seguintes ajusta a posição quando o gatilho da estratégia dispara
+      ou no último dia da simulação (que usa o preço de fechamento);
+    - o Saldo Real marca a posição a mercado com os fechamentos do ativo e da opção.
+
+    Com um ModeloCustos, o resultado traz também o saldo líquido dos custos de
+    transação (o saldo bruto continua em 'saldo_real' e 'saldo_final'). Com
+    taxa_carrego, o saldo de caixa rende (ou paga, quando financia a compra de
+    ações) juros a cada pregão.
+    """
+
+    @staticmethod
+    def calcular_deltas(simulacao: dict, volatilidades: np.ndarray, taxa_juros: float = 0.15,
+                        dividendos: np.ndarray = None, modelo_dividendos: str = 'discreto') -> np.ndarray:
+        """
+        Calcula os deltas diários de uma simulação para uma ou mais séries de volatilidade.
+
+        Args:
+            simulacao: Dados de DadosMercado.carregar_simulacao
+            volatilidades: Volatilidade anual por dia, formato (dias,) ou (janelas, dias)
+            taxa_juros: Taxa de juros anual (padrão: 15%); escalar ou por dia (ex: CurvaJuros.taxas)
+            dividendos: Valor presente dos dividendos até o vencimento por dia
+                        (DadosMercado.valor_presente_dividendos) (padrão: None, sem dividendos)
+            modelo_dividendos: 'discreto' ou 'continuo' (Dividendos.ajustar) (padrão: 'discreto')
+
+        Returns:
+            np.ndarray: Deltas no mesmo formato de volatilidades
+        """
+        # No último dia o delta usa o preço de fechamento; nos demais, o de abertura
+        preco_delta = np.where(simulacao['eh_ultimo_dia'], simulacao['ativo_fechamento'], simulacao['ativo_abertura'])
+        tempo_anualizado = simulacao['dias_uteis'] / 252
+
+        q = 0.0
+        if dividendos is not None:
+            preco_delta, q = Dividendos.ajustar(modelo_dividendos, preco_delta, dividendos, tempo_anualizado)
+        return BlackScholesVetorizado.delta(simulacao['tipo'], preco_delta, simulacao['strike'],
+                                            tempo_anualizado, taxa_juros, volatilidades, q)
+
+    @staticmethod
+    def fator_carrego(dias_uteis, taxa_juros) -> np.ndarray:
+        """
+        Fator de capitalização do caixa desde o primeiro dia da simulação.
+
+        Produto acumulado de exp(r x pregões decorridos / 252) sobre as datas, a
+        mesma convenção de prazo e de taxa contínua usada no Black-Scholes.
+
+        Args:
+            dias_uteis: Pregões até o vencimento em cada data (decrescente)
+            taxa_juros: Taxa de juros anual, escalar ou por data (ex: CurvaJuros.taxas_overnight);
+                        a taxa de cada data vale até a data seguinte
+
+        Returns:
+            np.ndarray: Fator por data (1 no primeiro dia)
+        """
+        dias_uteis = np.asarray(dias_uteis, dtype=float)
+        taxa_juros = np.asarray(taxa_juros, dtype=float)
+        if taxa_juros.ndim:
+            taxa_juros = taxa_juros[:-1]
+        crescimento = np.exp(taxa_juros * -np.diff(dias_uteis) / 252)
+        return np.concatenate(([1.0], np.cumprod(crescimento)))
+
+    @staticmethod
+    def acumular_com_carrego(fluxos: np.ndarray, fator: np.ndarray) -> np.ndarray:
+        """
+        Saldo acumulado com juros: saldo[t] = saldo[t-1] x fator[t] / fator[t-1] + fluxo[t].
+
+        Calculado sem laço como fator[t] x soma acumulada de fluxo / fator.
+
+        Args:
+            fluxos: Fluxos de caixa por dia (dias no último eixo)
+            fator: Fator de capitalização de fator_carrego
+
+        Returns:
+            np.ndarray: Saldo acumulado no formato de fluxos
+        """
+        return fator * np.cumsum(fluxos / fator, axis=-1)
+
+    @staticmethod
+    def simular(deltas: np.ndarray, simulacao: dict, estrategia: str, limites,
+                custos: ModeloCustos = None, taxa_carrego=None) -> dict:
+        """
+        Simula P políticas de ajuste sobre a mesma simulação.
+
+        Args:
+            deltas: Deltas por política e dia, formato (P, dias)
+            simulacao: Dados de DadosMercado.carregar_simulacao
+            estrategia: 'delta' (|delta - delta anterior| > limite),
+                        'lote' (|ações alvo - ações atuais| > limite) ou
+                        'dia' (ajusta a cada `limite` dias)
+            limites: Parâmetro da estratégia por política, formato (P,) ou escalar
+            custos: Modelo de custos de transação (padrão: None, sem custos)
+            taxa_carrego: Taxa anual de juros sobre o saldo de caixa, escalar ou por dia
+                          (padrão: None, sem juros)
+
+        Returns:
+            dict: Arrays (P, dias) 'qtd_acoes', 'ajuste_acoes', 'ajuste_saldo',
+                  'saldo_acumulado', 'saldo_real' e 'ajustou'; arrays (P,)
+                  'num_ajustes' e 'saldo_final'. Com custos, 'num_ajustes' conta só
+                  os dias com negociação (ajuste_acoes != 0), e há também 'custos' e
+                  'saldo_real_liquido' (dias no último eixo) e 'custo_total' e
+                  'saldo_final_liquido'; se o modelo tiver C níveis de custo,
+                  esses quatro ganham um primeiro eixo de tamanho C. Com taxa_carrego,
+                  também 'juros_carrego' (P,), os juros acumulados no saldo final.
+        """
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(f"Estratégia inválida: {estrategia}. Use uma de {ESTRATEGIAS}.")
+
+        deltas = np.atleast_2d(np.asarray(deltas, dtype=float))
+        politicas, dias = deltas.shape
+        limites = np.broadcast_to(np.asarray(limites), (politicas,))
+
+        quantidade = simulacao['quantidade']
+        eh_ultimo_dia = simulacao['eh_ultimo_dia']
+        ativo_abertura = simulacao['ativo_abertura']
+        ativo_fechamento = simulacao['ativo_fechamento']
+
+        # Preço de execução dos ajustes: fechamento no último dia, abertura nos demais
+        preco_ajuste = np.where(eh_ultimo_dia, ativo_fechamento, ativo_abertura)
+        preco_ajuste[0] = ativo_abertura[0]
+
+        alvo = deltas * quantidade
+        if custos is not None:
+            alvo = custos.arredondar(alvo)
+        qtd_acoes = np.empty((politicas, dias))
+        ajuste_acoes = np.zeros((politicas, dias))
+        ajustou = np.zeros((politicas, dias), dtype=bool)
+
+        # Primeiro dia: compra delta x quantidade de ações
+        qtd_acoes[:, 0] = alvo[:, 0]
+        ajuste_acoes[:, 0] = alvo[:, 0]
+        ajustou[:, 0] = True
+
+        for i in range(1, dias):
+            anterior = qtd_acoes[:, i - 1]
+            if estrategia == 'delta':
+                gatilho = np.abs(deltas[:, i] - deltas[:, i - 1]) > limites
+            elif estrategia == 'lote':
+                gatilho = np.abs(alvo[:, i] - anterior) > limites
+            else:
+                gatilho = (i % limites) == 0
+            gatilho = gatilho | eh_ultimo_dia[i]
+
+            qtd_acoes[:, i] = np.where(gatilho, alvo[:, i], anterior)
+            ajuste_acoes[:, i] = np.where(gatilho, alvo[:, i] - anterior, 0.0)
+            ajustou[:, i] = gatilho
+
+        # Comprar gasta e vender recebe; no primeiro dia entra o prêmio das opções vendidas
+        ajuste_saldo = -ajuste_acoes * preco_ajuste
+        ajuste_saldo[:, 0] += quantidade * simulacao['opcao_abertura'][0]
+
+        if taxa_carrego is None:
+            fator = None
+            saldo_acumulado = np.cumsum(ajuste_saldo, axis=1)
+        else:
+            fator = HedgeVetorizado.fator_carrego(simulacao['dias_uteis'], taxa_carrego)
+            saldo_acumulado = HedgeVetorizado.acumular_com_carrego(ajuste_saldo, fator)
+        saldo_real = saldo_acumulado + qtd_acoes * ativo_fechamento - quantidade * simulacao['opcao_fechamento']
+
+        resultado = {
+            'qtd_acoes': qtd_acoes,
+            'ajuste_acoes': ajuste_acoes,
+            'ajuste_saldo': ajuste_saldo,
+            'saldo_acumulado': saldo_acumulado,
+            'saldo_real': saldo_real,
+            'ajustou': ajustou,
+            # Com custos, o arredondamento ao lote pode zerar o ajuste de um dia com gatilho:
+            # sem negociação não há ajuste (nem corretagem em ModeloCustos.calcular)
+            'num_ajustes': ajustou.sum(axis=1) if custos is None else (ajuste_acoes != 0).sum(axis=1),
+            'saldo_final': saldo_real[:, -1],
+        }
+        if fator is not None:
+            resultado['juros_carrego'] = saldo_acumulado[:, -1] - ajuste_saldo.sum(axis=1)
+
+        # Custos calculados depois do laço: os níveis de custo não repetem a simulação
+        if custos is not None:
+            custo = custos.calcular(ajuste_acoes, preco_ajuste)
+            if fator is None:
+                custo_acumulado = np.cumsum(custo, axis=-1)
+            else:
+                custo_acumulado = HedgeVetorizado.acumular_com_carrego(custo, fator)
+            saldo_real_liquido = saldo_real - custo_acumulado
+            resultado.update({
+                'custos': custo,
+                'custo_total': custo.sum(axis=-1),
+                'saldo_real_liquido': saldo_real_liquido,
+                'saldo_final_liquido': saldo_real_liquido[..., -1],
+            })
+        return resultado
@@ -0,0 +1,162 @@
+import cProfile
+import os
+import pstats
+import sqlite3
+import time
+from contextlib import nullcontext
+
+# Variável de ambiente que liga a instrumentação (ex: DELTA_HEDGE_INSTRUMENTACAO=1)
+VARIAVEL_AMBIENTE = 'DELTA_HEDGE_INSTRUMENTACAO'
+
+class _Etapa:
+    """Cronômetro de uma etapa (usado apenas com a instrumentação ligada)."""
+    __slots__ = ('nome', 'inicio')
+
+    def __init__(self, nome: str):
+        self.nome = nome
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excecao):
+        Instrumentacao.registrar(self.nome, time.perf_counter() - self.inicio)
+        return False
+
+class Instrumentacao:
+    """
+    Temporizadores e contadores leves para as etapas do pipeline de delta hedge.
+
+    Uso:
+        with Instrumentacao.etapa('sql.volatilidade'):
+            cursor.execute(...)
+
+    Desligada (padrão), etapa() devolve sempre o mesmo contexto vazio e contar()
+    retorna na primeira linha, então o custo é o de uma chamada de função.
+    Liga com a variável de ambiente DELTA_HEDGE_INSTRUMENTACAO=1 ou com ativar().
+    """
+
+    ativa = os.environ.get(VARIAVEL_AMBIENTE, '').lower() not in ('', '0', 'false', 'nao', 'não')
+
+    _SEM_MEDICAO = nullcontext()
+    _tempos = {}        # etapa -> [tempo total, chamadas]
+    _contadores = {}    # contador -> quantidade
+    _inicio = time.perf_counter()
+    _perfil = None
+    _arquivo_perfil = None
+
+    @classmethod
+    def ativar(cls, arquivo_perfil: str = None):
+        """
+        Liga a instrumentação e zera as medições.
+
+        Args:
+            arquivo_perfil: Se informado, executa também o cProfile e grava o pstats neste arquivo
+        """
+        cls.ativa = True
+        cls._tempos = {}
+        cls._contadores = {}
+        cls._inicio = time.perf_counter()
+        if arquivo_perfil:
+            cls._arquivo_perfil = arquivo_perfil
+            cls._perfil = cProfile.Profile()
+            cls._perfil.enable()
+
+    @classmethod
+    def configurar_por_argumentos(cls, argumentos: list):
+        """
+        Liga a instrumentação a partir da linha de comando.
+
+        Reconhece --instrumentar e --perfil <arquivo.pstats> (que implica --instrumentar).
+        Sem esses argumentos, mantém o estado definido pela variável de ambiente.
+        """
+        arquivo_perfil = None
+        if '--perfil' in argumentos:
+            posicao = argumentos.index('--perfil')
+            arquivo_perfil = argumentos[posicao + 1] if posicao + 1 < len(argumentos) else 'perfil.pstats'
+
+        if arquivo_perfil or '--instrumentar' in argumentos or cls.ativa:
+            cls.ativar(arquivo_perfil)
+
+    @classmethod
+    def etapa(cls, nome: str):
+        """
+        Retorna um gerenciador de contexto que mede o tempo da etapa.
+        """
+        if not cls.ativa:
+            return cls._SEM_MEDICAO
+        return _Etapa(nome)
+
+    @classmethod
+    def registrar(cls, nome: str, segundos: float):
+        """
+        Acumula o tempo de uma execução da etapa.
+        """
+        medicao = cls._tempos.get(nome)
+        if medicao is None:
+            cls._tempos[nome] = [segundos, 1]
+        else:
+            medicao[0] += segundos
+            medicao[1] += 1
+
+    @classmethod
+    def contar(cls, nome: str, quantidade: int = 1):
+        """
+        Incrementa um contador (ex: número de cenários lidos do cache).
+        """
+        if not cls.ativa:
+            return
+        cls._contadores[nome] = cls._contadores.get(nome, 0) + quantidade
+
+    @classmethod
+    def monitorar_conexao(cls, conn: sqlite3.Connection):
+        """
+        Conta os comandos SQL executados na conexão, por tipo (SELECT, INSERT, ...).
+        """
+        if not cls.ativa:
+            return
+        conn.set_trace_callback(
+            lambda comando: cls.contar(f"sql.comandos.{comando.lstrip().split(None, 1)[0].upper()}")
+        )
+
+    @classmethod
+    def relatorio(cls) -> str:
+        """
+        Monta o relatório das etapas (tempo total, chamadas, média e % do tempo decorrido).
+        As etapas podem ser aninhadas, então os percentuais não somam 100%.
+        """
+        decorrido = time.perf_counter() - cls._inicio
+
+        texto = "\nINSTRUMENTAÇÃO - TEMPO POR ETAPA\n"
+        texto += "=" * 80 + "\n"
+        texto += f"{'Etapa':<34} {'Chamadas':>10} {'Total (s)':>11} {'Média (ms)':>11} {'% total':>9}\n"
+        texto += "-" * 80 + "\n"
+        for nome, (total, chamadas) in sorted(cls._tempos.items(), key=lambda item: -item[1][0]):
+            percentual = 100 * total / decorrido if decorrido > 0 else 0
+            texto += f"{nome:<34} {chamadas:>10} {total:>11.3f} {1000 * total / chamadas:>11.3f} {percentual:>8.1f}%\n"
+        texto += "-" * 80 + "\n"
+        texto += f"{'Tempo decorrido':<34} {'':>10} {decorrido:>11.3f}\n"
+
+        if cls._contadores:
+            texto += "\nContadores:\n"
+            for nome, quantidade in sorted(cls._contadores.items()):
+                texto += f"  {nome:<40} {quantidade:>10}\n"
+
+        return texto
+
+    @classmethod
+    def finalizar(cls):
+        """
+        Imprime o relatório e grava o perfil do cProfile, se estiverem ligados.
+        """
+        if not cls.ativa:
+            return
+
+        if cls._perfil is not None:
+            cls._perfil.disable()
+            cls._perfil.dump_stats(cls._arquivo_perfil)
+            print(f"\nPerfil do cProfile salvo em: {cls._arquivo_perfil}")
+            pstats.Stats(cls._arquivo_perfil).sort_stats('cumulative').print_stats(15)
+            cls._perfil = None
+
+        print(cls.relatorio())
@@ -0,0 +1,114 @@
+import numpy as np
+from multiprocessing import shared_memory
+
+# Alinhamento (bytes) do início de cada array dentro do bloco compartilhado
+ALINHAMENTO = 64
+
+# Campos array de DadosMercado.carregar_simulacao publicados por empacotar_simulacoes
+CAMPOS_SIMULACAO = ('datas', 'indices', 'ativo_abertura', 'ativo_fechamento', 'opcao_abertura',
+                    'opcao_fechamento', 'eh_ultimo_dia', 'dias_uteis')
+
+class MemoriaCompartilhada:
+    """
+    Arrays NumPy publicados em um único bloco de multiprocessing.shared_memory.
+
+    O processo principal copia os arrays para o bloco uma vez; os processos
+    do pool recebem só o descritor (nome do bloco e posição, forma e dtype de
+    cada array) e montam views sem cópia com anexar(). A memória usada não
+    cresce com o número de processos.
+
+    Uso no processo principal:
+
+        with MemoriaCompartilhada({'volatilidades': matriz}) as memoria:
+            executor = ProcessPoolExecutor(initializer=..., initargs=(memoria.descritor,))
+    """
+
+    def __init__(self, arrays: dict):
+        """
+        Cria o bloco e copia os arrays para ele.
+
+        Args:
+            arrays: Dicionário {nome: array}
+        """
+        arrays = {nome: np.asarray(valores) for nome, valores in arrays.items()}
+
+        layout = {}
+        tamanho = 0
+        for nome, valores in arrays.items():
+            tamanho = -(-tamanho // ALINHAMENTO) * ALINHAMENTO
+            layout[nome] = (tamanho, valores.shape, valores.dtype.str)
+            tamanho += valores.nbytes
+
+        self.memoria = shared_memory.SharedMemory(create=True, size=max(tamanho, 1))
+        self.descritor = {'nome': self.memoria.name, 'layout': layout}
+
+        for nome, valores in arrays.items():
+            MemoriaCompartilhada._view(self.memoria, *layout[nome])[...] = valores
+
+    def fechar(self):
+        """
+        Libera o bloco (deve ser chamado pelo processo principal depois que o pool terminar).
+        """
+        if self.memoria is not None:
+            self.memoria.close()
+            self.memoria.unlink()
+            self.memoria = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    @staticmethod
+    def anexar(descritor: dict) -> tuple:
+        """
+        Anexa o bloco descrito e monta views somente leitura dos arrays.
+
+        O objeto SharedMemory devolvido deve ser mantido vivo enquanto as views forem usadas.
+
+        Returns:
+            tuple: (SharedMemory, dict {nome: array})
+        """
+        memoria = shared_memory.SharedMemory(name=descritor['nome'])
+        arrays = {}
+        for nome, (posicao, forma, tipo) in descritor['layout'].items():
+            view = MemoriaCompartilhada._view(memoria, posicao, forma, tipo)
+            view.flags.writeable = False
+            arrays[nome] = view
+        return memoria, arrays
+
+    @staticmethod
+    def empacotar_simulacoes(simulacoes: list) -> tuple:
+        """
+        Concatena os arrays de várias simulações (DadosMercado.carregar_simulacao).
+
+        Returns:
+            tuple: (arrays a publicar, metadados com os campos escalares de cada simulação)
+        """
+        tamanhos = [len(simulacao['datas']) for simulacao in simulacoes]
+        arrays = {f'simulacao_{campo}': np.concatenate([simulacao[campo] for simulacao in simulacoes])
+                  for campo in CAMPOS_SIMULACAO}
+        arrays['simulacao_inicio'] = np.r_[0, np.cumsum(tamanhos)]
+
+        metadados = [{chave: valor for chave, valor in simulacao.items() if chave not in CAMPOS_SIMULACAO}
+                     for simulacao in simulacoes]
+        return arrays, metadados
+
+    @staticmethod
+    def desempacotar_simulacoes(arrays: dict, metadados: list) -> list:
+        """
+        Remonta as simulações empacotadas como views dos arrays compartilhados.
+        """
+        inicio = arrays['simulacao_inicio']
+        simulacoes = []
+        for i, escalares in enumerate(metadados):
+            trecho = slice(int(inicio[i]), int(inicio[i + 1]))
+            simulacoes.append({**escalares,
+                               **{campo: arrays[f'simulacao_{campo}'][trecho] for campo in CAMPOS_SIMULACAO}})
+        return simulacoes
+
+    @staticmethod
+    def _view(memoria: shared_memory.SharedMemory, posicao: int, forma: tuple, tipo: str) -> np.ndarray:
+        """Array NumPy sobre um trecho do bloco compartilhado."""
+        return np.ndarray(forma, dtype=np.dtype(tipo), buffer=memoria.buf, offset=posicao)
@@ -0,0 +1,84 @@
+import numpy as np
+
+# Emolumentos da B3 para ações no mercado à vista (negociação 0,005% + liquidação 0,025%), em bps
+EMOLUMENTOS_B3_BPS = 3.0
+
+# Lote padrão de ações na B3 (abaixo disso a negociação é no mercado fracionário)
+LOTE_PADRAO_B3 = 100
+
+class ModeloCustos:
+    """
+    Custos de transação dos ajustes de delta hedge.
+
+    Cada negociação de ações custa:
+        corretagem (R$ fixo por ordem)
+        + emolumentos_bps / 10000 x volume financeiro
+        + meio_spread (R$ por ação) x quantidade negociada
+    e, se `lote` for informado, a quantidade alvo de ações é arredondada para
+    múltiplos do lote antes de decidir o ajuste.
+
+    Corretagem, emolumentos e spread podem ser escalares ou arrays (C,): nesse
+    caso calcular() devolve os custos dos C níveis de uma só vez, sem simular
+    a estratégia de novo para cada nível. O lote altera as posições, por isso
+    é um valor único por modelo.
+    """
+
+    def __init__(self, corretagem=0.0, emolumentos_bps=0.0, meio_spread=0.0, lote: int = None):
+        """
+        Inicializa o modelo de custos.
+
+        Args:
+            corretagem: Corretagem por ordem em R$ (padrão: 0)
+            emolumentos_bps: Emolumentos em pontos-base do volume (padrão: 0; B3: EMOLUMENTOS_B3_BPS)
+            meio_spread: Metade do spread de compra e venda em R$ por ação (padrão: 0)
+            lote: Lote de negociação; None negocia quantidades fracionárias (padrão: None)
+        """
+        self.corretagem, self.emolumentos_bps, self.meio_spread = np.broadcast_arrays(
+            np.asarray(corretagem, dtype=float),
+            np.asarray(emolumentos_bps, dtype=float),
+            np.asarray(meio_spread, dtype=float))
+        if self.corretagem.ndim > 1:
+            raise ValueError("Os níveis de custo devem ser escalares ou arrays de uma dimensão.")
+        if np.any(self.corretagem < 0) or np.any(self.emolumentos_bps < 0) or np.any(self.meio_spread < 0):
+            raise ValueError("Os custos não podem ser negativos.")
+        if lote is not None and lote <= 0:
+            raise ValueError("O lote deve ser positivo.")
+        self.lote = lote
+
+    @property
+    def niveis(self) -> int:
+        """Número de níveis de custo (1 quando os parâmetros são escalares)."""
+        return self.corretagem.size
+
+    def arredondar(self, quantidades: np.ndarray) -> np.ndarray:
+        """
+        Arredonda as quantidades de ações para o múltiplo mais próximo do lote.
+        """
+        if self.lote is None:
+            return quantidades
+        return np.round(quantidades / self.lote) * self.lote
+
+    def calcular(self, ajuste_acoes: np.ndarray, precos: np.ndarray) -> np.ndarray:
+        """
+        Calcula o custo de cada negociação.
+
+        Args:
+            ajuste_acoes: Ações compradas (+) ou vendidas (-), formato (..., dias)
+            precos: Preço de execução por dia, broadcast com ajuste_acoes
+
+        Returns:
+            np.ndarray: Custos em R$ (positivos), no formato de ajuste_acoes ou,
+                        com parâmetros em array, (C,) + formato de ajuste_acoes
+        """
+        ajuste_acoes = np.asarray(ajuste_acoes, dtype=float)
+        volume_acoes = np.abs(ajuste_acoes)
+        volume_financeiro = volume_acoes * precos
+        negociou = volume_acoes > 0
+
+        # Níveis no primeiro eixo, broadcast sobre as dimensões dos ajustes
+        formato = self.corretagem.shape + (1,) * ajuste_acoes.ndim
+        corretagem = self.corretagem.reshape(formato)
+        emolumentos = self.emolumentos_bps.reshape(formato) / 10000
+        meio_spread = self.meio_spread.reshape(formato)
+
+        return corretagem * negociou + emolumentos * volume_financeiro + meio_spread * volume_acoes
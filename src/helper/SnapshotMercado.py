@@ -0,0 +1,267 @@
+import os
+import json
+import shutil
+import hashlib
+import sqlite3
+from datetime import datetime
+import numpy as np
+from helper.DadosMercado import DadosMercado
+
+# Diretório padrão dos snapshots (um subdiretório por ativo)
+DIRETORIO_SNAPSHOT = 'banco/snapshot'
+
+# Janelas de volatilidade pré-calculadas (as mesmas do otimizador)
+JANELAS_SNAPSHOT = np.arange(2, 253)
+
+# Arquivo de metadados do snapshot e versão do formato
+ARQUIVO_META = 'meta.json'
+VERSAO_SNAPSHOT = 1
+
+class SnapshotMercado:
+    """
+    Snapshot em arquivos .npy do histórico de mercado de um ativo.
+
+    Exporta HIST_ATIVO, HIST_OPCAO (todas as opções do ativo, em blocos
+    contíguos por opção), OPCAO, SIMULACAO e as volatilidades anuais de
+    várias janelas já calculadas. Os arquivos são abertos com
+    np.load(mmap_mode='r'): a carga não copia dados, e vários processos
+    lendo o mesmo snapshot compartilham as páginas do cache do sistema.
+
+    O snapshot guarda uma impressão digital do banco; se o banco mudar,
+    esta_atualizado() devolve False e o snapshot deve ser gerado de novo.
+    """
+
+    @staticmethod
+    def exportar(conn: sqlite3.Connection, diretorio: str = DIRETORIO_SNAPSHOT, ticker: str = 'PETR4',
+                 janelas=None) -> str:
+        """
+        Gera o snapshot de um ativo (substitui o anterior).
+
+        Args:
+            conn: Conexão com o banco de dados SQLite
+            diretorio: Diretório base dos snapshots (padrão: banco/snapshot)
+            ticker: Ticker do ativo (padrão: PETR4)
+            janelas: Janelas de volatilidade pré-calculadas (padrão: 2 a 252 pregões)
+
+        Returns:
+            str: Diretório do snapshot do ativo
+        """
+        dados = DadosMercado(conn, ticker)
+        janelas = np.asarray(JANELAS_SNAPSHOT if janelas is None else janelas, dtype=int)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT id, ticker, tipo, strike, vencimento
+            FROM OPCAO
+            WHERE id_ativo = ?
+            ORDER BY id ASC
+        """, (dados.id_ativo,))
+        opcoes = cursor.fetchall()
+
+        cursor.execute("""
+            SELECT h.id_opcao, h.data, h.abertura, h.fechamento
+            FROM HIST_OPCAO h
+            JOIN OPCAO o ON o.id = h.id_opcao
+            WHERE o.id_ativo = ?
+            ORDER BY h.id_opcao ASC, h.data ASC
+        """, (dados.id_ativo,))
+        historico = cursor.fetchall()
+
+        cursor.execute("""
+            SELECT s.id, s.id_opcao, s.data_inicio, s.data_termino, s.quantidade
+            FROM SIMULACAO s
+            JOIN OPCAO o ON o.id = s.id_opcao
+            WHERE o.id_ativo = ?
+            ORDER BY s.id ASC
+        """, (dados.id_ativo,))
+        simulacoes = cursor.fetchall()
+
+        opcao_id = np.array([linha[0] for linha in opcoes], dtype=np.int64)
+        historico_id = np.array([linha[0] for linha in historico], dtype=np.int64)
+
+        arrays = {
+            'ativo_datas': dados.datas,
+            'ativo_abertura': dados.abertura,
+            'ativo_fechamento': dados.fechamento,
+            'ativo_maximo': dados.maximo,
+            'ativo_minimo': dados.minimo,
+            'janelas': janelas,
+            'volatilidades': np.vstack([dados.volatilidade_anual(int(j)) for j in janelas])
+                             if len(janelas) else np.empty((0, len(dados.datas))),
+            'opcao_id': opcao_id,
+            'opcao_ticker': np.array([str(linha[1]) for linha in opcoes], dtype=str),
+            'opcao_tipo': np.array([str(linha[2]) for linha in opcoes], dtype=str),
+            'opcao_strike': np.array([linha[3] for linha in opcoes], dtype=float),
+            'opcao_vencimento': np.array([linha[4] for linha in opcoes], dtype='datetime64[D]'),
+            # Histórico da opção i em historico_*[opcao_inicio[i]:opcao_inicio[i + 1]]
+            'opcao_inicio': np.searchsorted(historico_id, np.r_[opcao_id, np.iinfo(np.int64).max]),
+            'historico_datas': np.array([linha[1] for linha in historico], dtype='datetime64[D]'),
+            'historico_abertura': np.array([linha[2] for linha in historico], dtype=float),
+            'historico_fechamento': np.array([linha[3] for linha in historico], dtype=float),
+            'simulacao_id': np.array([linha[0] for linha in simulacoes], dtype=np.int64),
+            'simulacao_opcao': np.array([linha[1] for linha in simulacoes], dtype=np.int64),
+            'simulacao_inicio': np.array([linha[2] for linha in simulacoes], dtype='datetime64[D]'),
+            'simulacao_termino': np.array([linha[3] for linha in simulacoes], dtype='datetime64[D]'),
+            'simulacao_quantidade': np.array([linha[4] for linha in simulacoes], dtype=float),
+        }
+
+        # Grava em um diretório temporário e troca no final, para não deixar snapshot pela metade
+        destino = os.path.join(diretorio, ticker)
+        temporario = destino + '.tmp'
+        shutil.rmtree(temporario, ignore_errors=True)
+        os.makedirs(temporario)
+        for nome, valores in arrays.items():
+            np.save(os.path.join(temporario, f'{nome}.npy'), np.ascontiguousarray(valores))
+
+        meta = {
+            'versao': VERSAO_SNAPSHOT,
+            'ticker': ticker,
+            'id_ativo': dados.id_ativo,
+            'impressao': SnapshotMercado.impressao_banco(conn, dados.id_ativo),
+            'data_criacao': datetime.now().isoformat(timespec='seconds'),
+        }
+        with open(os.path.join(temporario, ARQUIVO_META), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+        shutil.rmtree(destino, ignore_errors=True)
+        os.replace(temporario, destino)
+        return destino
+
+    @staticmethod
+    def carregar(diretorio: str = DIRETORIO_SNAPSHOT, ticker: str = 'PETR4',
+                 conn: sqlite3.Connection = None) -> 'DadosMercadoSnapshot':
+        """
+        Abre o snapshot de um ativo (memory-mapped, somente leitura).
+
+        Args:
+            diretorio: Diretório base dos snapshots (padrão: banco/snapshot)
+            ticker: Ticker do ativo (padrão: PETR4)
+            conn: Conexão opcional, para quem ainda consulta o banco (ex: barras intradiárias);
+                  com ela, o snapshot é conferido contra o conteúdo atual do banco
+
+        Raises:
+            FileNotFoundError: Se o snapshot não existir
+            ValueError: Se o banco mudou depois que o snapshot foi gerado
+        """
+        snapshot = DadosMercadoSnapshot(os.path.join(diretorio, ticker), conn)
+        if conn is not None and not SnapshotMercado.esta_atualizado(conn, diretorio, ticker):
+            raise ValueError(f"O snapshot em '{snapshot.caminho}' não corresponde ao banco atual; "
+                             f"gere o snapshot novamente (cargas/GerarSnapshotMercado.py).")
+        return snapshot
+
+    @staticmethod
+    def impressao_banco(conn: sqlite3.Connection, id_ativo: int) -> str:
+        """
+        Impressão digital das tabelas exportadas e dos dividendos do ativo
+        (contagens, datas e somas de preços e valores).
+        """
+        cursor = conn.cursor()
+        partes = []
+        for consulta in (
+            "SELECT COUNT(*), MIN(data), MAX(data), SUM(abertura), SUM(fechamento), SUM(maximo), SUM(minimo) "
+            "FROM HIST_ATIVO WHERE id_ativo = ?",
+            "SELECT COUNT(*), MIN(h.data), MAX(h.data), SUM(h.abertura), SUM(h.fechamento) "
+            "FROM HIST_OPCAO h JOIN OPCAO o ON o.id = h.id_opcao WHERE o.id_ativo = ?",
+            "SELECT COUNT(*), SUM(id), SUM(strike), MAX(vencimento) FROM OPCAO WHERE id_ativo = ?",
+            "SELECT COUNT(*), SUM(s.id), SUM(s.quantidade), MAX(s.data_termino) "
+            "FROM SIMULACAO s JOIN OPCAO o ON o.id = s.id_opcao WHERE o.id_ativo = ?",
+        ):
+            cursor.execute(consulta, (id_ativo,))
+            partes.append(repr(cursor.fetchone()))
+
+        # Sem a tabela DIVIDENDO, o ativo não tem dividendos (como em Dividendos.carregar)
+        try:
+            cursor.execute("SELECT COUNT(*), MIN(data_ex), MAX(data_ex), SUM(valor), "
+                           "SUM(valor * (julianday(data_ex) - 2400000)) FROM DIVIDENDO WHERE id_ativo = ?",
+                           (id_ativo,))
+            dividendos = cursor.fetchone()
+        except sqlite3.OperationalError:
+            dividendos = (0, None, None, None, None)
+        partes.append(repr(dividendos))
+        return hashlib.sha256('|'.join(partes).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def esta_atualizado(conn: sqlite3.Connection, diretorio: str = DIRETORIO_SNAPSHOT,
+                        ticker: str = 'PETR4') -> bool:
+        """
+        Indica se o snapshot existe e corresponde ao conteúdo atual do banco.
+        """
+        caminho_meta = os.path.join(diretorio, ticker, ARQUIVO_META)
+        if not os.path.exists(caminho_meta):
+            return False
+        with open(caminho_meta, encoding='utf-8') as f:
+            meta = json.load(f)
+        return (meta.get('versao') == VERSAO_SNAPSHOT
+                and meta.get('impressao') == SnapshotMercado.impressao_banco(conn, meta['id_ativo']))
+
+
+class DadosMercadoSnapshot(DadosMercado):
+    """
+    DadosMercado lido de um snapshot (SnapshotMercado) em vez do SQLite.
+
+    Os arrays são views memory-mapped; as volatilidades das janelas
+    exportadas (estimador 'historica') são linhas da matriz gravada, e as
+    demais são calculadas sob demanda como em DadosMercado.
+    """
+
+    def __init__(self, caminho: str, conn: sqlite3.Connection = None):
+        """
+        Abre o snapshot.
+
+        Args:
+            caminho: Diretório do snapshot do ativo (ex: banco/snapshot/PETR4)
+            conn: Conexão opcional com o banco de dados SQLite
+        """
+        caminho_meta = os.path.join(caminho, ARQUIVO_META)
+        if not os.path.exists(caminho_meta):
+            raise FileNotFoundError(f"Snapshot não encontrado em '{caminho}'.")
+        with open(caminho_meta, encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('versao') != VERSAO_SNAPSHOT:
+            raise ValueError(f"Versão do snapshot em '{caminho}' incompatível; gere o snapshot novamente.")
+
+        self.conn = conn
+        self.ticker = meta['ticker']
+        self.id_ativo = meta['id_ativo']
+        self.caminho = caminho
+        self.arrays = {nome[:-4]: np.load(os.path.join(caminho, nome), mmap_mode='r')
+                       for nome in os.listdir(caminho) if nome.endswith('.npy')}
+
+        self.datas = self.arrays['ativo_datas']
+        self.abertura = self.arrays['ativo_abertura']
+        self.fechamento = self.arrays['ativo_fechamento']
+        self.maximo = self.arrays['ativo_maximo']
+        self.minimo = self.arrays['ativo_minimo']
+
+        self._volatilidades = {('historica', int(janela)): self.arrays['volatilidades'][i]
+                               for i, janela in enumerate(self.arrays['janelas'])}
+
+    def _ler_simulacao(self, id_simulacao: int) -> tuple:
+        """
+        Lê a simulação e o histórico da opção dos arrays do snapshot.
+        """
+        a = self.arrays
+        s = np.searchsorted(a['simulacao_id'], id_simulacao)
+        if s >= len(a['simulacao_id']) or a['simulacao_id'][s] != id_simulacao:
+            raise ValueError(f"Simulação com ID {id_simulacao} não encontrada.")
+
+        id_opcao = int(a['simulacao_opcao'][s])
+        o = np.searchsorted(a['opcao_id'], id_opcao)
+        data_inicio = a['simulacao_inicio'][s]
+        data_termino = a['simulacao_termino'][s]
+
+        # Bloco da opção no histórico, recortado no período da simulação
+        datas = a['historico_datas'][a['opcao_inicio'][o]:a['opcao_inicio'][o + 1]]
+        primeiro = a['opcao_inicio'][o] + np.searchsorted(datas, data_inicio, side='left')
+        ultimo = a['opcao_inicio'][o] + np.searchsorted(datas, data_termino, side='right')
+
+        simulacao = (data_inicio, data_termino, float(a['simulacao_quantidade'][s]), id_opcao,
+                     str(a['opcao_ticker'][o]), str(a['opcao_tipo'][o]), float(a['opcao_strike'][o]),
+                     a['opcao_vencimento'][o])
+        return simulacao, (a['historico_datas'][primeiro:ultimo],
+                           a['historico_abertura'][primeiro:ultimo],
+                           a['historico_fechamento'][primeiro:ultimo])
+
+    def _ids_simulacao(self) -> list:
+        """IDs de todas as simulações do snapshot, em ordem."""
+        return self.arrays['simulacao_id'].tolist()
@@ -0,0 +1,48 @@
+import sys
+import os
+
+# Adiciona os diretórios 'src' e 'src/benchmark' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmark')))
+
+import unittest
+import numpy as np
+from helper.DadosMercado import DadosMercado
+from helper.AcumuladorVolatilidade import AcumuladorVolatilidade
+from GeradorDadosSinteticos import GeradorDadosSinteticos
+
+class TestAcumuladorVolatilidade(unittest.TestCase):
+    def test_igual_ao_np_std(self):
+        rng = np.random.default_rng(7)
+        precos = 30 * np.exp(np.cumsum(rng.normal(0, 0.02, 3000)))
+        janelas = [2, 5, 30, 252]
+
+        acumulador = AcumuladorVolatilidade(janelas)
+        for i, preco in enumerate(precos):
+            acumulador.adicionar(preco)
+            for pregoes in janelas:
+                obtido = acumulador.volatilidade(pregoes, anual=False)
+                if i + 1 < pregoes:
+                    self.assertTrue(np.isnan(obtido))
+                else:
+                    ultimos = precos[i + 1 - pregoes:i + 1]
+                    self.assertAlmostEqual(obtido, np.std(ultimos[1:] / ultimos[:-1] - 1), places=13)
+
+    def test_serie_igual_a_dados_mercado(self):
+        conn = GeradorDadosSinteticos(pregoes=400, opcoes=1).criar_banco()
+        dados = DadosMercado(conn, 'PETR4')
+        conn.close()
+
+        # Um buraco de 10 dias no histórico invalida as janelas curtas que o atravessam
+        datas = dados.datas.copy()
+        datas[200:] += np.timedelta64(10, 'D')
+        dados.datas = datas
+
+        janelas = [3, 10, 30]
+        serie = AcumuladorVolatilidade.serie(dados.fechamento, janelas, dados.datas)
+        for linha, pregoes in enumerate(janelas):
+            np.testing.assert_allclose(serie[linha], dados.volatilidade_anual(pregoes), rtol=1e-10)
+        self.assertTrue(np.isnan(serie[0, 200]) and not np.isnan(serie[0, 203]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import sys
+import os
+
+# Adiciona o diretório 'src' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from helper.ArvoreBinomial import ArvoreBinomial
+from helper.BlackScholesVetorizado import BlackScholesVetorizado
+
+class TestArvoreBinomial(unittest.TestCase):
+    def setUp(self):
+        # Cadeia de 6 strikes em 21 pregões até o vencimento
+        rng = np.random.default_rng(7)
+        self.S = (30 + rng.standard_normal(21))[:, None]
+        self.K = np.linspace(26, 34, 6)[None, :]
+        self.T = (np.arange(21, 0, -1) / 252)[:, None]
+        self.r, self.sigma = 0.15, 0.35
+
+    def test_europeia_converge_para_black_scholes(self):
+        for put, tipo in ((False, 'call'), (True, 'put')):
+            preco_bs = BlackScholesVetorizado.preco(tipo, self.S, self.K, self.T, self.r, self.sigma)
+            delta_bs = BlackScholesVetorizado.delta(tipo, self.S, self.K, self.T, self.r, self.sigma)
+            for metodo, tolerancia in (('crr', 2e-2), ('leisen_reimer', 1e-4)):
+                preco, delta = ArvoreBinomial.calcular(put, self.S, self.K, self.T, self.r, self.sigma,
+                                                       metodo=metodo, americana=False)
+                self.assertEqual(preco.shape, (21, 6))
+                np.testing.assert_allclose(preco, preco_bs, atol=tolerancia)
+                np.testing.assert_allclose(delta, delta_bs, atol=5e-3)
+
+        # Extrapolação de Richardson reduz o erro do Leisen-Reimer
+        preco_bs = BlackScholesVetorizado.preco('call', self.S, self.K, self.T, self.r, self.sigma)
+        erros = [np.abs(ArvoreBinomial.calcular(False, self.S, self.K, self.T, self.r, self.sigma, passos=51,
+                                                americana=False, richardson=richardson)[0] - preco_bs).max()
+                 for richardson in (False, True)]
+        self.assertLess(erros[1], erros[0])
+
+    def test_exercicio_antecipado(self):
+        # Call sem dividendos não é exercida antes do vencimento; put e call com dividendos, sim
+        call_americana = ArvoreBinomial.calcular(False, self.S, self.K, self.T, self.r, self.sigma)[0]
+        call_europeia = ArvoreBinomial.calcular(False, self.S, self.K, self.T, self.r, self.sigma, americana=False)[0]
+        np.testing.assert_allclose(call_americana, call_europeia, atol=1e-10)
+
+        put_americana = ArvoreBinomial.calcular(True, self.S, self.K, self.T, self.r, self.sigma)[0]
+        put_europeia = BlackScholesVetorizado.preco('put', self.S, self.K, self.T, self.r, self.sigma)
+        self.assertTrue(np.all(put_americana >= put_europeia - 1e-4))
+        self.assertTrue(np.all(put_americana >= np.maximum(self.K - self.S, 0.0) - 1e-12))
+        self.assertGreater((put_americana - put_europeia).max(), 0.01)
+
+        call_dividendos = ArvoreBinomial.calcular(False, 30.0, 26.0, 0.25, self.r, self.sigma, q=0.3)[0]
+        self.assertGreater(call_dividendos, BlackScholesVetorizado.preco('call', 30.0, 26.0, 0.25, self.r,
+                                                                         self.sigma, q=0.3) + 0.01)
+
+    def test_vencimento_e_parametros(self):
+        preco, delta = ArvoreBinomial.calcular([False, True, False], 30.0, [28.0, 32.0, 31.0], 0.0, self.r, self.sigma)
+        np.testing.assert_allclose(preco, [2.0, 2.0, 0.0])
+        np.testing.assert_allclose(delta, [1.0, -1.0, 0.0])
+        with self.assertRaises(ValueError):
+            ArvoreBinomial.calcular(False, 30.0, 30.0, 0.1, self.r, self.sigma, metodo='trinomial')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import sys
+import os
+
+# Adiciona os diretórios 'src' e 'src/benchmark' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmark')))
+
+import unittest
+import numpy as np
+from helper.DadosMercado import DadosMercado
+from helper.BarrasIntraday import BarrasIntraday
+from helper.HedgeVetorizado import HedgeVetorizado
+from GeradorDadosSinteticos import GeradorDadosSinteticos
+
+class TestBarrasIntraday(unittest.TestCase):
+    def setUp(self):
+        self.conn = GeradorDadosSinteticos(pregoes=400, opcoes=2).criar_banco()
+        BarrasIntraday.criar_tabelas(self.conn)
+        self.dados = DadosMercado(self.conn, 'PETR4')
+
+    def tearDown(self):
+        self.conn.close()
+
+    def _gravar_uma_barra_por_dia(self, tabela, id_instrumento, tabela_diaria, coluna):
+        linhas = self.conn.execute(f"""
+            SELECT data, abertura, fechamento, maximo, minimo
+            FROM {tabela_diaria}
+            WHERE {coluna} = ?
+            ORDER BY data
+        """, (id_instrumento,)).fetchall()
+        horarios = np.array([f"{linha[0]}T10:00:00" for linha in linhas], dtype='datetime64[s]')
+        precos = np.array([linha[1:] for linha in linhas])
+        BarrasIntraday.gravar(self.conn, tabela, id_instrumento, horarios, *precos.T)
+
+    def test_uma_barra_por_dia_igual_a_serie_diaria(self):
+        self._gravar_uma_barra_por_dia('BARRA_ATIVO', 1, 'HIST_ATIVO', 'id_ativo')
+        self._gravar_uma_barra_por_dia('BARRA_OPCAO', 1, 'HIST_OPCAO', 'id_opcao')
+
+        diaria = self.dados.carregar_simulacao(1)
+        intraday = BarrasIntraday.carregar_simulacao(self.dados, 1)
+        np.testing.assert_allclose(intraday['dias_uteis'], diaria['dias_uteis'])
+        np.testing.assert_array_equal(intraday['indices'], diaria['indices'])
+
+        resultados = []
+        for simulacao in (diaria, intraday):
+            volatilidade = self.dados.volatilidade_anual(30)[simulacao['indices']]
+            deltas = HedgeVetorizado.calcular_deltas(simulacao, volatilidade)[None, :]
+            resultados.append(HedgeVetorizado.simular(deltas, simulacao, 'delta', [0.05]))
+        np.testing.assert_allclose(resultados[1]['saldo_real'], resultados[0]['saldo_real'])
+
+    def test_reamostrar_para_uma_hora(self):
+        horarios = np.datetime64('2025-01-06T10:00:00') + np.arange(24) * np.timedelta64(5, 'm')
+        precos = 30 + np.arange(24) * 0.01
+        barras = {'data_hora': horarios, 'abertura': precos, 'fechamento': precos + 0.005,
+                  'maximo': precos + 0.02, 'minimo': precos - 0.02, 'volume': np.ones(24)}
+
+        hora = BarrasIntraday.reamostrar(barras, 60)
+        np.testing.assert_array_equal(hora['data_hora'], np.array(['2025-01-06T10:00', '2025-01-06T11:00'],
+                                                                  dtype='datetime64[s]'))
+        np.testing.assert_allclose(hora['abertura'], [30.0, 30.12])
+        np.testing.assert_allclose(hora['fechamento'], [30.115, 30.235])
+        np.testing.assert_allclose(hora['maximo'], [30.13, 30.25])
+        np.testing.assert_allclose(hora['volume'], [12, 12])
+
+    def test_carregar_em_blocos(self):
+        self._gravar_uma_barra_por_dia('BARRA_ATIVO', 1, 'HIST_ATIVO', 'id_ativo')
+        completo = BarrasIntraday.carregar(self.conn, 'BARRA_ATIVO', 1, '2015-01-01', '2030-01-01')
+        em_blocos = BarrasIntraday.carregar(self.conn, 'BARRA_ATIVO', 1, '2015-01-01', '2030-01-01',
+                                            tamanho_bloco=7)
+        self.assertEqual(len(completo['data_hora']), 400)
+        for nome, valores in completo.items():
+            np.testing.assert_array_equal(em_blocos[nome], valores)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import os
+
+# Adiciona os diretórios 'src' e 'src/benchmark' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmark')))
+
+import shutil
+import tempfile
+import unittest
+from helper.CacheResultados import CacheResultados
+from GeradorDadosSinteticos import GeradorDadosSinteticos
+
+class TestCacheResultados(unittest.TestCase):
+    def setUp(self):
+        self.conn = GeradorDadosSinteticos(pregoes=300, opcoes=1).criar_banco()
+        self.id_simulacao = self.conn.execute("SELECT MIN(id) FROM SIMULACAO").fetchone()[0]
+
+        # Cópia do pacote helper, para alterar o código sem mexer no original
+        self.temporario = tempfile.mkdtemp()
+        self.helper = os.path.join(self.temporario, 'helper')
+        shutil.copytree(CacheResultados.DIRETORIO_HELPER, self.helper, ignore=shutil.ignore_patterns('__pycache__'))
+        self.diretorio_original = CacheResultados.DIRETORIO_HELPER
+        CacheResultados.DIRETORIO_HELPER = self.helper
+        self.caminho_cache = os.path.join(self.temporario, 'cache.db')
+
+    def tearDown(self):
+        CacheResultados.DIRETORIO_HELPER = self.diretorio_original
+        self.conn.close()
+        shutil.rmtree(self.temporario)
+
+    def consultar(self, arquivos=()) -> str:
+        cache = CacheResultados(self.caminho_cache, arquivos=list(arquivos))
+        try:
+            return cache.obter(self.conn, self.id_simulacao, 'lote', {'lote': 100})
+        finally:
+            cache.fechar()
+
+    def gravar(self, arquivos=()):
+        cache = CacheResultados(self.caminho_cache, arquivos=list(arquivos))
+        cache.gravar(self.conn, self.id_simulacao, 'lote', {'lote': 100}, 'resultado')
+        cache.fechar()
+
+    def test_alteracao_no_helper_invalida_o_cache(self):
+        self.gravar()
+        self.assertEqual(self.consultar(), 'resultado')
+
+        # FormatadorDados não é passado em classes, mas formata o texto guardado
+        with open(os.path.join(self.helper, 'FormatadorDados.py'), 'a', encoding='utf-8') as f:
+            f.write("\n# alteração\n")
+        self.assertIsNone(self.consultar())
+
+    def test_alteracao_no_script_invalida_o_cache(self):
+        script = os.path.join(self.temporario, 'Cenarios.py')
+        with open(script, 'w', encoding='utf-8') as f:
+            f.write("cabecalho = 'v1'\n")
+        self.gravar([script])
+        self.assertEqual(self.consultar([script]), 'resultado')
+
+        with open(script, 'w', encoding='utf-8') as f:
+            f.write("cabecalho = 'v2'\n")
+        self.assertIsNone(self.consultar([script]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import sys
+import os
+
+# Adiciona os diretórios 'src', 'src/benchmark' e 'src/delta-hedge' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmark')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'delta-hedge')))
+
+import io
+import unittest
+import numpy as np
+from contextlib import redirect_stdout
+from helper.CurvaJuros import CurvaJuros
+from helper.DadosMercado import DadosMercado
+from helper.HedgeVetorizado import HedgeVetorizado
+from GeradorDadosSinteticos import GeradorDadosSinteticos
+from DeltaHedgeAjustePeloDia import DeltaHedgeAjustePeloDia
+
+class TestCurvaJuros(unittest.TestCase):
+    def setUp(self):
+        self.conn = GeradorDadosSinteticos(pregoes=400, opcoes=2).criar_banco()
+        self.dados = DadosMercado(self.conn, 'PETR4')
+        CurvaJuros.criar_tabela(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_interpolacao_flat_forward(self):
+        # Duas curvas: vértices de 21 e 63 dias úteis, depois só o fixing de 1 dia
+        datas = self.dados.datas[[100, 100, 110]]
+        CurvaJuros.gravar(self.conn, datas, [21, 63, 1], [0.14, 0.16, 0.13])
+        curva = CurvaJuros(self.conn)
+
+        consultas = self.dados.datas[[99, 100, 105, 105, 105, 105, 110, 120]]
+        dias_uteis = np.array([10, 10, 0, 21, 42, 300, 42, 5])
+        taxas = curva.taxas(consultas, dias_uteis)
+        self.assertTrue(np.isnan(taxas[0]))  # Antes da primeira curva
+
+        r21, r63 = np.log1p(0.14), np.log1p(0.16)
+        forward = (r63 * 63 - r21 * 21) / 42
+        esperado = [r21, r21, r21, (r21 * 21 + forward * 21) / 42, r63, np.log1p(0.13), np.log1p(0.13)]
+        np.testing.assert_allclose(taxas[1:], esperado)
+
+    def test_curva_plana_igual_a_taxa_constante(self):
+        # Curva plana com taxa contínua de 15%: mesmo resultado que taxa_juros=0.15
+        CurvaJuros.gravar(self.conn, self.dados.datas[:1], [1], [np.expm1(0.15)])
+        resultados = []
+        for curva_juros in (False, True):
+            delta_hedge = DeltaHedgeAjustePeloDia(self.conn, 1, frequencia_ajuste=3, carrego_juros=True,
+                                                  curva_juros=curva_juros)
+            with redirect_stdout(io.StringIO()):
+                delta_hedge.processar()
+            resultados.append((delta_hedge.deltas, delta_hedge.saldo_diario))
+        np.testing.assert_allclose(resultados[1][0], resultados[0][0])
+        np.testing.assert_allclose(resultados[1][1], resultados[0][1])
+
+    def test_classe_igual_ao_kernel(self):
+        # Curva inclinada que muda a cada pregão
+        datas = np.repeat(self.dados.datas[200:400], 2)
+        prazos = np.tile([1, 126], 200)
+        taxas = np.where(prazos == 1, 0.12, 0.16) + np.repeat(np.linspace(0, 0.02, 200), 2)
+        CurvaJuros.gravar(self.conn, datas, prazos, taxas)
+        curva = CurvaJuros(self.conn)
+
+        simulacao = self.dados.carregar_simulacao(2)
+        volatilidade = self.dados.volatilidade_anual(30)[simulacao['indices']]
+        taxas = curva.taxas(simulacao['datas'], simulacao['dias_uteis'])
+        deltas = HedgeVetorizado.calcular_deltas(simulacao, volatilidade, taxas)
+        resultado = HedgeVetorizado.simular(deltas[None, :], simulacao, 'dia', [2],
+                                            taxa_carrego=curva.taxas_overnight(simulacao['datas']))
+
+        delta_hedge = DeltaHedgeAjustePeloDia(self.conn, 2, frequencia_ajuste=2, carrego_juros=True,
+                                              curva_juros=True)
+        with redirect_stdout(io.StringIO()):
+            delta_hedge.processar()
+        np.testing.assert_allclose(delta_hedge.deltas, deltas)
+        np.testing.assert_allclose(delta_hedge.saldo_diario, resultado['saldo_acumulado'][0], atol=1e-7)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import sys
+import os
+
+# Adiciona os diretórios 'src', 'src/delta-hedge' e 'src/benchmark' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'delta-hedge')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmark')))
+
+import unittest
+import numpy as np
+import pandas as pd
+from helper.DadosMercado import DadosMercado
+from helper.HedgeVetorizado import HedgeVetorizado
+from DeltaHedgeIncremental import DeltaHedgeIncremental
+from GeradorDadosSinteticos import GeradorDadosSinteticos
+
+class TestDeltaHedgeIncremental(unittest.TestCase):
+    def setUp(self):
+        self.conn = GeradorDadosSinteticos(pregoes=400, opcoes=4).criar_banco()
+        self.dados = DadosMercado(self.conn, 'PETR4')
+        self.simulacoes, _ = self.dados.carregar_simulacoes()
+
+    def tearDown(self):
+        self.conn.close()
+
+    def _comparar_com_kernel(self, passos, estrategia, limite, pregoes, carrego):
+        for simulacao in self.simulacoes:
+            volatilidade = self.dados.volatilidade_anual(pregoes)[simulacao['indices']]
+            deltas = HedgeVetorizado.calcular_deltas(simulacao, volatilidade)[None, :]
+            esperado = HedgeVetorizado.simular(deltas, simulacao, estrategia, [limite],
+                                               taxa_carrego=0.15 if carrego else None)
+
+            linhas = passos[passos['Simulação'] == simulacao['id_simulacao']]
+            np.testing.assert_array_equal(linhas['Data'].to_numpy(dtype='datetime64[D]'), simulacao['datas'])
+            np.testing.assert_array_equal(linhas['PregõesVencimento'], simulacao['dias_uteis'])
+            np.testing.assert_array_equal(linhas['Ajuste'], esperado['ajustou'][0])
+            np.testing.assert_allclose(linhas['Qtd Ações'], esperado['qtd_acoes'][0], atol=1e-8)
+            np.testing.assert_allclose(linhas['Saldo Acumulado'], esperado['saldo_acumulado'][0], atol=1e-6)
+            np.testing.assert_allclose(linhas['Saldo Real'], esperado['saldo_real'][0], atol=1e-6)
+
+    def test_igual_ao_kernel(self):
+        for estrategia, limite, carrego in (('delta', 0.05, False), ('dia', 3, True), ('lote', 50, False)):
+            with self.subTest(estrategia=estrategia):
+                livro = DeltaHedgeIncremental(self.conn, 'PETR4')
+                for simulacao in self.simulacoes:
+                    livro.abrir(simulacao['id_simulacao'], estrategia, limite, 30, carrego_juros=carrego)
+                passos = livro.atualizar()
+                self._comparar_com_kernel(passos, estrategia, limite, 30, carrego)
+                self.assertTrue(livro.posicoes['encerrada'].all())
+
+    def test_salvar_e_restaurar(self):
+        livro = DeltaHedgeIncremental(self.conn, 'PETR4')
+        for simulacao in self.simulacoes:
+            livro.abrir(simulacao['id_simulacao'], 'delta', 0.05, 20, carrego_juros=True)
+
+        # Interrompe no meio da segunda simulação e continua a partir do banco
+        meio = self.simulacoes[1]['datas'][len(self.simulacoes[1]['datas']) // 2]
+        primeira_parte = livro.atualizar(meio)
+        livro.salvar()
+
+        restaurado = DeltaHedgeIncremental.restaurar(self.conn, 'PETR4')
+        self.assertEqual(restaurado.data_ultima, meio)
+        self.assertEqual(len(restaurado.posicoes['id_simulacao']), len(self.simulacoes) - 1)
+        with self.assertRaises(ValueError):
+            restaurado.passo(meio, 30.0, 30.0, {})
+
+        segunda_parte = restaurado.atualizar()
+        passos = pd.concat([primeira_parte, segunda_parte], ignore_index=True)
+        self._comparar_com_kernel(passos, 'delta', 0.05, 20, True)
+
+    def test_posicao_sem_cotacao_nao_trava_o_livro(self):
+        # A opção da primeira simulação fica sem cotação em um pregão no meio do período
+        simulacao = self.simulacoes[0]
+        sem_cotacao = simulacao['datas'][3]
+        self.conn.execute("DELETE FROM HIST_OPCAO WHERE data = ? AND id_opcao = "
+                          "(SELECT id_opcao FROM SIMULACAO WHERE id = ?)",
+                          (str(sem_cotacao), int(simulacao['id_simulacao'])))
+
+        livro = DeltaHedgeIncremental(self.conn, 'PETR4')
+        for outra in self.simulacoes:
+            livro.abrir(outra['id_simulacao'], 'delta', 0.05, 20)
+        passos = livro.atualizar()
+
+        self.assertTrue(livro.posicoes['encerrada'].all())
+        self.assertEqual(list(livro.erros), [simulacao['id_simulacao']])
+        self.assertIn(str(sem_cotacao), livro.erros[simulacao['id_simulacao']])
+
+        # As demais posições seguem iguais ao kernel
+        outras = passos[passos['Simulação'] != simulacao['id_simulacao']]
+        self.simulacoes = self.simulacoes[1:]
+        self._comparar_com_kernel(outras, 'delta', 0.05, 20, False)
+
+        # A posição afetada pula o pregão e volta com o prazo calculado pela data
+        linhas = passos[passos['Simulação'] == simulacao['id_simulacao']]
+        manter = simulacao['datas'] != sem_cotacao
+        np.testing.assert_array_equal(linhas['Data'].to_numpy(dtype='datetime64[D]'), simulacao['datas'][manter])
+        np.testing.assert_array_equal(linhas['PregõesVencimento'], simulacao['dias_uteis'][manter])
+
+if __name__ == '__main__':
+    unittest.main()
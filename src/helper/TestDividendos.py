@@ -0,0 +1,78 @@
+import sys
+import os
+
+# Adiciona os diretórios 'src', 'src/benchmark' e 'src/delta-hedge' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmark')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'delta-hedge')))
+
+import io
+import unittest
+import numpy as np
+from contextlib import redirect_stdout
+from helper.DadosMercado import DadosMercado
+from helper.Dividendos import Dividendos
+from helper.HedgeVetorizado import HedgeVetorizado
+from helper.BlackScholesVetorizado import BlackScholesVetorizado
+from GeradorDadosSinteticos import GeradorDadosSinteticos
+from DeltaHedgeAjustePeloDelta import DeltaHedgeAjustePeloDelta
+
+class TestDividendos(unittest.TestCase):
+    def setUp(self):
+        self.conn = GeradorDadosSinteticos(pregoes=400, opcoes=2).criar_banco()
+        self.dados = DadosMercado(self.conn, 'PETR4')
+        self.simulacao = self.dados.carregar_simulacao(1)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_valor_presente_igual_ao_laco(self):
+        pregoes = self.dados.datas
+        datas_ex = pregoes[[300, 305, 305, 320]] + np.array([0, 0, 1, 0])  # Uma data ex fora de pregão
+        valores = np.array([0.8, 0.5, 0.3, 1.1])
+        datas = pregoes[290:330]
+        vencimento = pregoes[318]
+
+        esperado = []
+        for data in datas:
+            posicao = np.searchsorted(pregoes, data)
+            esperado.append(sum(valor * np.exp(-0.15 * (np.searchsorted(pregoes, ex) - posicao) / 252)
+                                for ex, valor in zip(datas_ex, valores) if data < ex <= vencimento))
+        calculado = Dividendos.valor_presente(pregoes, datas_ex, valores, datas, vencimento, 0.15)
+        np.testing.assert_allclose(calculado, esperado, atol=1e-12)
+        self.assertGreater(calculado[9] - calculado[10], 0.79)  # Na data ex o dividendo já saiu do preço
+
+    def test_modelos_equivalentes_no_preco(self):
+        S, VP, T = np.array([30.0, 31.0]), np.array([1.2, 0.0]), np.array([0.1, 0.1])
+        precos = []
+        for modelo in ('discreto', 'continuo'):
+            S_ajustado, q = Dividendos.ajustar(modelo, S, VP, T)
+            precos.append(BlackScholesVetorizado.preco('call', S_ajustado, 30.0, T, 0.15, 0.3, q))
+        np.testing.assert_allclose(precos[0], precos[1])
+        with self.assertRaises(ValueError):
+            Dividendos.ajustar('anual', S, VP, T)
+
+    def test_classe_igual_ao_kernel(self):
+        # Sem a tabela DIVIDENDO não há dividendos
+        simulacao = self.simulacao
+        np.testing.assert_array_equal(
+            self.dados.valor_presente_dividendos(simulacao['datas'], simulacao['vencimento'], 0.15), 0.0)
+
+        Dividendos.criar_tabela(self.conn)
+        Dividendos.gravar(self.conn, self.dados.id_ativo, [simulacao['datas'][8]], [1.5])
+        dados = DadosMercado(self.conn, 'PETR4')
+        dividendos = dados.valor_presente_dividendos(simulacao['datas'], simulacao['vencimento'], 0.15)
+        self.assertTrue(np.all(dividendos[:8] > 1.4) and np.all(dividendos[8:] == 0))
+
+        volatilidade = dados.volatilidade_anual(30)[simulacao['indices']]
+        for modelo in ('discreto', 'continuo'):
+            deltas = HedgeVetorizado.calcular_deltas(simulacao, volatilidade, dividendos=dividendos,
+                                                     modelo_dividendos=modelo)
+            delta_hedge = DeltaHedgeAjustePeloDelta(self.conn, 1, modelo_dividendos=modelo)
+            with redirect_stdout(io.StringIO()):
+                delta_hedge.processar()
+            np.testing.assert_allclose(delta_hedge.deltas, deltas)
+            self.assertTrue(np.all(deltas[:8] < HedgeVetorizado.calcular_deltas(simulacao, volatilidade)[:8]))
+
+if __name__ == '__main__':
+    unittest.main()
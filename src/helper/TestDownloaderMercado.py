@@ -0,0 +1,71 @@
+import sys
+import os
+
+# Adiciona os diretórios 'src' e 'src/benchmark' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmark')))
+
+import sqlite3
+import time
+import unittest
+import numpy as np
+from helper.DadosMercado import DadosMercado
+from helper.DownloaderMercado import DownloaderMercado, ProvedorHttp
+from GeradorDadosSinteticos import ESQUEMA
+from ServidorDadosLocal import ServidorDadosLocal
+
+INICIO, FIM = '2023-01-02', '2023-12-29'
+
+class TestDownloaderMercado(unittest.TestCase):
+    def test_lote_concorrente_com_falhas_transitorias(self):
+        # 60 tickers, 50 ms de latência e a primeira requisição de cada um falhando com 503
+        tickers = [f"ATV{i:02d}" for i in range(60)]
+        with ServidorDadosLocal(atraso=0.05, falhas_por_ticker=1) as servidor:
+            downloader = DownloaderMercado(ProvedorHttp(servidor.url), concorrencia=20, espera_inicial=0.01)
+            tempo_inicial = time.perf_counter()
+            dados, erros = downloader.baixar(tickers, INICIO, FIM)
+            tempo = time.perf_counter() - tempo_inicial
+
+        self.assertEqual(erros, {})
+        self.assertEqual(sorted(dados), tickers)
+        self.assertTrue(all(n == 2 for n in servidor.requisicoes.values()))
+        self.assertLessEqual(servidor.simultaneas_maximo, 20)
+        self.assertGreater(servidor.simultaneas_maximo, 1)
+        # Em série seriam 120 requisições x 50 ms = 6 s
+        self.assertLess(tempo, 3.0)
+        self.assertEqual(len(dados['ATV00']), np.busday_count('2023-01-02', '2023-12-30'))
+
+    def test_ticker_desconhecido_e_limite_de_taxa(self):
+        with ServidorDadosLocal(desconhecidos={'XXXX3'}) as servidor:
+            downloader = DownloaderMercado(ProvedorHttp(servidor.url), tentativas=3, requisicoes_por_segundo=50)
+            tempo_inicial = time.perf_counter()
+            dados, erros = downloader.baixar(['XXXX3'] + [f"ATV{i:02d}" for i in range(10)], INICIO, FIM)
+            tempo = time.perf_counter() - tempo_inicial
+
+        # 404 não é repetido
+        self.assertEqual(list(erros), ['XXXX3'])
+        self.assertIn('404', erros['XXXX3'])
+        self.assertEqual(servidor.requisicoes['XXXX3'], 1)
+        self.assertEqual(len(dados), 10)
+        # 11 requisições a 50 por segundo: pelo menos 10 intervalos de 20 ms
+        self.assertGreaterEqual(tempo, 0.19)
+
+    def test_gravar_banco_sem_duplicar(self):
+        conn = sqlite3.connect(':memory:')
+        for comando in ESQUEMA:
+            conn.execute(comando)
+        dados = {'PETR4': ServidorDadosLocal.gerar_pregoes('PETR4', INICIO, FIM),
+                 'VALE3': ServidorDadosLocal.gerar_pregoes('VALE3', INICIO, FIM)}
+
+        DownloaderMercado.gravar_banco(conn, dados)
+        # Atualização sobreposta: os pregões do período são substituídos
+        DownloaderMercado.gravar_banco(conn, {'PETR4': ServidorDadosLocal.gerar_pregoes('PETR4', '2023-06-01', FIM)})
+
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM ATIVO").fetchone()[0], 2)
+        mercado = DadosMercado(conn, 'PETR4')
+        self.assertEqual(len(mercado.datas), len(dados['PETR4']))
+        np.testing.assert_allclose(mercado.fechamento, dados['PETR4']['fechamento'].to_numpy())
+        conn.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import sys
+import os
+
+# Adiciona os diretórios 'src', 'src/benchmark' e 'src/delta-hedge' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmark')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'delta-hedge')))
+
+import io
+import unittest
+import numpy as np
+from contextlib import redirect_stdout
+from helper.DadosMercado import DadosMercado
+from helper.HedgeVetorizado import HedgeVetorizado
+from helper.EstimadoresVolatilidade import EstimadoresVolatilidade, ESTIMADORES, LAMBDA_RISKMETRICS
+from GeradorDadosSinteticos import GeradorDadosSinteticos
+from DeltaHedgeAjustePeloDelta import DeltaHedgeAjustePeloDelta
+
+class TestEstimadoresVolatilidade(unittest.TestCase):
+    def test_estimadores_proximos_da_volatilidade_real(self):
+        # Pregões com 390 minutos de passeio aleatório (sem salto na abertura)
+        rng = np.random.default_rng(11)
+        sigma, pregoes, minutos = 0.3, 2000, 390
+        caminho = 30 * np.exp(np.cumsum(rng.normal(0, sigma / np.sqrt(252 * minutos), pregoes * minutos)))
+        barras = caminho.reshape(pregoes, minutos)
+        abertura = np.r_[30.0, barras[:-1, -1]]
+        maximo = np.maximum(barras.max(axis=1), abertura)
+        minimo = np.minimum(barras.min(axis=1), abertura)
+        fechamento = barras[:, -1]
+        datas = np.datetime64('2020-01-01') + np.arange(pregoes)
+
+        for estimador in ESTIMADORES:
+            volatilidade = EstimadoresVolatilidade.calcular(estimador, 1000, datas, abertura, maximo,
+                                                            minimo, fechamento)
+            self.assertTrue(np.isnan(volatilidade[0]))
+            self.assertAlmostEqual(volatilidade[-1], sigma, delta=0.03, msg=estimador)
+
+    def test_ewma_igual_a_recursao(self):
+        rng = np.random.default_rng(3)
+        fechamento = 30 * np.exp(np.cumsum(rng.normal(0, 0.02, 200)))
+        pregoes = 20
+        obtido = EstimadoresVolatilidade.ewma(fechamento, pregoes)
+
+        lambda_ = 1 - 2 / (pregoes + 1)
+        quadrados = np.log(fechamento[1:] / fechamento[:-1]) ** 2
+        variancia = quadrados[:pregoes - 1].mean()
+        self.assertAlmostEqual(obtido[pregoes - 1], np.sqrt(variancia), places=14)
+        for i in range(pregoes, len(fechamento)):
+            variancia = lambda_ * variancia + (1 - lambda_) * quadrados[i - 1]
+            self.assertAlmostEqual(obtido[i], np.sqrt(variancia), places=14)
+
+        # RiskMetrics: decaimento fixo de 0,94, independente da janela
+        datas = np.datetime64('2020-01-01') + np.arange(len(fechamento))
+        riskmetrics = EstimadoresVolatilidade.calcular('ewma_riskmetrics', pregoes, datas, fechamento, fechamento,
+                                                       fechamento, fechamento)
+        esperado = EstimadoresVolatilidade.ewma(fechamento, pregoes, LAMBDA_RISKMETRICS) * np.sqrt(252)
+        np.testing.assert_allclose(riskmetrics[pregoes:], esperado[pregoes:], rtol=1e-14)
+        self.assertFalse(np.allclose(riskmetrics[pregoes:], obtido[pregoes:] * np.sqrt(252)))
+
+    def test_classe_igual_ao_kernel_com_estimador(self):
+        conn = GeradorDadosSinteticos(pregoes=300, opcoes=1).criar_banco()
+        try:
+            dados = DadosMercado(conn, 'PETR4')
+            simulacao = dados.carregar_simulacoes()[0][0]
+            volatilidade = dados.volatilidade_anual(30, 'parkinson')[simulacao['indices']]
+            self.assertFalse(np.allclose(volatilidade, dados.volatilidade_anual(30)[simulacao['indices']]))
+
+            deltas = HedgeVetorizado.calcular_deltas(simulacao, volatilidade)[None, :]
+            resultado = HedgeVetorizado.simular(deltas, simulacao, 'delta', [0.1])
+
+            delta_hedge = DeltaHedgeAjustePeloDelta(conn, simulacao['id_simulacao'], limite_delta=0.1,
+                                                    pregoes_volatilidade=30, estimador_volatilidade='parkinson')
+            with redirect_stdout(io.StringIO()) as saida:
+                delta_hedge.processar()
+                delta_hedge.imprimir_dados()
+            np.testing.assert_allclose(resultado['saldo_acumulado'][0], delta_hedge.saldo_diario, atol=1e-7)
+            self.assertIn("Estimador de volatilidade: parkinson", saida.getvalue())
+        finally:
+            conn.close()
+
+if __name__ == '__main__':
+    unittest.main()
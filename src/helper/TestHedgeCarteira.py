@@ -0,0 +1,94 @@
+import sys
+import os
+
+# Adiciona os diretórios 'src', 'src/benchmark' e 'src/delta-hedge' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmark')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'delta-hedge')))
+
+import io
+import unittest
+import numpy as np
+from contextlib import redirect_stdout
+from helper.DadosMercado import DadosMercado
+from helper.HedgeCarteira import HedgeCarteira
+from helper.HedgeVetorizado import HedgeVetorizado
+from GeradorDadosSinteticos import GeradorDadosSinteticos
+from DeltaHedgeAjustePeloDelta import DeltaHedgeAjustePeloDelta
+from DeltaHedgeCarteira import DeltaHedgeCarteira
+
+class TestHedgeCarteira(unittest.TestCase):
+    def setUp(self):
+        # Calls 1 a 3 e puts 4 a 6, com o mesmo strike por vencimento
+        self.conn = GeradorDadosSinteticos(pregoes=400, opcoes=3, dias_simulacao=80, puts=True).criar_banco()
+        self.dados = DadosMercado(self.conn, 'PETR4')
+        self.simulacoes = {s['ticker_opcao']: s for s in self.dados.carregar_simulacoes()[0]}
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_put_igual_a_classe(self):
+        simulacao = self.simulacoes['PETRQ001']
+        self.assertEqual(simulacao['tipo'], 'put')
+        volatilidade = self.dados.volatilidade_anual(30)[simulacao['indices']]
+        deltas = HedgeVetorizado.calcular_deltas(simulacao, volatilidade)
+        self.assertTrue(np.all(deltas <= 0))
+        resultado = HedgeVetorizado.simular(deltas[None, :], simulacao, 'delta', [0.1])
+
+        delta_hedge = DeltaHedgeAjustePeloDelta(self.conn, simulacao['id_simulacao'], limite_delta=0.1)
+        with redirect_stdout(io.StringIO()):
+            delta_hedge.processar()
+        np.testing.assert_allclose(resultado['qtd_acoes'][0], delta_hedge.qtd_acoes, atol=1e-9)
+        np.testing.assert_allclose(resultado['saldo_acumulado'][0], delta_hedge.saldo_diario, atol=1e-7)
+
+    def test_carteira_de_uma_opcao_igual_a_simulacao(self):
+        simulacao = self.simulacoes['PETRS002']
+        carteira = HedgeCarteira.carregar(self.dados, {2: 1000}, simulacao['datas'][0], simulacao['datas'][-1])
+        volatilidade = self.dados.volatilidade_anual(30)[simulacao['indices']]
+
+        deltas = HedgeCarteira.calcular_deltas(carteira, volatilidade)
+        np.testing.assert_allclose(deltas, HedgeVetorizado.calcular_deltas(simulacao, volatilidade))
+        individual = HedgeVetorizado.simular(deltas[None, :], simulacao, 'lote', [50])
+        livro = HedgeVetorizado.simular(deltas[None, :], carteira, 'lote', [50])
+        np.testing.assert_allclose(livro['saldo_real'], individual['saldo_real'])
+
+    def test_paridade_put_call(self):
+        # Call vendida e put comprada de mesmo strike: delta líquido de 1 por par, sem ajustes no meio
+        simulacao = self.simulacoes['PETRS003']
+        carteira = HedgeCarteira.carregar(self.dados, {3: 500, 6: -500}, simulacao['datas'][0])
+        self.assertEqual(carteira['datas'][-1], simulacao['datas'][-1])
+        volatilidade = self.dados.volatilidade_anual(30)[carteira['indices']]
+
+        deltas = HedgeCarteira.calcular_deltas(carteira, volatilidade)
+        np.testing.assert_allclose(deltas[:-1] * carteira['quantidade'], 500.0)
+        resultado = HedgeVetorizado.simular(deltas[None, :], carteira, 'lote', [1])
+        self.assertEqual(resultado['ajustou'][0, 1:-1].sum(), 0)
+
+    def test_cadeia_com_vencimentos_diferentes(self):
+        # Do início da terceira simulação, as três séries estão abertas; a primeira vence no meio
+        inicio = self.simulacoes['PETRS003']['datas'][0]
+        posicoes = DeltaHedgeCarteira.posicoes_por_ticker(self.conn, ['PETRS001=1000', 'PETRQ002=-300'])
+        self.assertEqual(posicoes, {1: 1000.0, 5: -300.0})
+
+        delta_hedge = DeltaHedgeCarteira(self.conn, posicoes, inicio, estrategia='dia', limite=1)
+        with redirect_stdout(io.StringIO()) as saida:
+            delta_hedge.processar()
+            delta_hedge.imprimir_dados()
+        self.assertIn("Total de opções: 1300", saida.getvalue())
+        ativas = delta_hedge.listar_dados()['Opções Ativas'].to_numpy()
+        self.assertEqual((ativas[0], ativas[-1]), (2, 1))
+
+        # Com ajuste diário a carteira é a soma das carteiras de cada opção
+        soma = 0.0
+        for id_opcao, quantidade in posicoes.items():
+            individual = DeltaHedgeCarteira(self.conn, {id_opcao: quantidade}, inicio,
+                                            delta_hedge.carteira['datas'][-1], estrategia='dia', limite=1)
+            individual.processar()
+            soma = soma + individual.resultado['saldo_real'][0]
+        np.testing.assert_allclose(delta_hedge.resultado['saldo_real'][0], soma, atol=1e-7)
+
+        with self.assertRaises(ValueError):
+            HedgeCarteira.carregar(self.dados, {1: 1000}, delta_hedge.carteira['datas'][-1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import sys
+import os
+
+# Adiciona os diretórios 'src' e 'src/benchmark' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmark')))
+
+import unittest
+import numpy as np
+from helper.DadosMercado import DadosMercado
+from helper.HedgeDeltaGama import HedgeDeltaGama, RAZAO_MAXIMA
+from helper.BlackScholesVetorizado import BlackScholesVetorizado
+from GeradorDadosSinteticos import GeradorDadosSinteticos
+
+class TestHedgeDeltaGama(unittest.TestCase):
+    def setUp(self):
+        # Calls 1 a 3 e puts 4 a 6, com o mesmo strike por vencimento
+        self.conn = GeradorDadosSinteticos(pregoes=400, opcoes=3, puts=True).criar_banco()
+        self.dados = DadosMercado(self.conn, 'PETR4')
+        self.simulacao = {s['ticker_opcao']: s for s in self.dados.carregar_simulacoes()[0]}['PETRS001']
+        self.volatilidade = self.dados.volatilidade_anual(30)[self.simulacao['indices']]
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_escolhe_opcao_do_mesmo_vencimento(self):
+        hedge = HedgeDeltaGama.carregar_opcao_hedge(self.dados, self.simulacao)
+        self.assertEqual((hedge['ticker_opcao'], hedge['tipo']), ('PETRQ001', 'put'))
+        self.assertEqual(hedge['strike'], self.simulacao['strike'])
+        self.assertEqual(len(hedge['opcao_fechamento']), len(self.simulacao['datas']))
+
+    def test_posicoes_zeram_delta_e_gama(self):
+        simulacao = self.simulacao
+        hedge = dict(HedgeDeltaGama.carregar_opcao_hedge(self.dados, simulacao), tipo='call',
+                     strike=simulacao['strike'] * 1.05)
+        series = np.stack([self.volatilidade, self.volatilidade * 1.5])
+        deltas, opcoes_hedge, acoes = HedgeDeltaGama.calcular_posicoes(simulacao, hedge, series)
+        self.assertEqual(opcoes_hedge.shape, series.shape)
+
+        preco = np.where(simulacao['eh_ultimo_dia'], simulacao['ativo_fechamento'], simulacao['ativo_abertura'])
+        T = simulacao['dias_uteis'] / 252
+        gama = BlackScholesVetorizado.gamma(preco, simulacao['strike'], T, 0.15, series)
+        gama_h = BlackScholesVetorizado.gamma(preco, hedge['strike'], T, 0.15, series)
+        delta_h = BlackScholesVetorizado.delta('call', preco, hedge['strike'], T, 0.15, series)
+
+        # Sem o limite de RAZAO_MAXIMA e antes do vencimento, a posição fica neutra em delta e gamma
+        dias = (T > 0) & (np.abs(opcoes_hedge) < RAZAO_MAXIMA * simulacao['quantidade'])
+        self.assertTrue(dias.any())
+        quantidade = simulacao['quantidade']
+        np.testing.assert_allclose((opcoes_hedge * gama_h)[dias], (quantidade * gama)[dias], rtol=1e-7, atol=1e-6)
+        np.testing.assert_allclose((acoes + opcoes_hedge * delta_h)[dias], (quantidade * deltas)[dias], rtol=1e-7, atol=1e-6)
+
+    def test_variancia_menor_que_so_delta(self):
+        # Preços sem o ruído do gerador: Black-Scholes com a volatilidade do próprio processo
+        simulacao = self.simulacao
+        sigma = GeradorDadosSinteticos().sigma
+        volatilidade = np.full(len(simulacao['datas']), sigma)
+        T = np.maximum(simulacao['dias_uteis'] - 0.5, 0) / 252
+        hedge = {'ticker_opcao': 'HEDGE', 'tipo': 'call', 'strike': simulacao['strike'] * 1.05}
+        for preco, campo in ((simulacao['ativo_abertura'], 'abertura'), (simulacao['ativo_fechamento'], 'fechamento')):
+            simulacao[f'opcao_{campo}'] = BlackScholesVetorizado.preco('call', preco, simulacao['strike'], T, 0.15, sigma)
+            hedge[f'opcao_{campo}'] = BlackScholesVetorizado.preco('call', preco, hedge['strike'], T, 0.15, sigma)
+
+        resultado = HedgeDeltaGama.comparar(simulacao, hedge, volatilidade, 'dia', 1)
+        self.assertEqual(resultado['ajustes_delta'], resultado['ajustes_delta_gama'])
+        self.assertLess(resultado['variancia_delta_gama'], resultado['variancia_delta'] / 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import sys
+import os
+
+# Adiciona os diretórios 'src' e 'src/delta-hedge' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'delta-hedge')))
+
+import io
+import unittest
+import sqlite3
+import numpy as np
+from contextlib import redirect_stdout
+from helper.TradeHelper import TradeHelper
+from helper.BlackScholesVetorizado import BlackScholesVetorizado
+from helper.DadosMercado import DadosMercado
+from helper.HedgeVetorizado import HedgeVetorizado
+from helper.ModeloCustos import ModeloCustos
+from DeltaHedgeAjustePeloDelta import DeltaHedgeAjustePeloDelta
+from DeltaHedgeAjustePeloDia import DeltaHedgeAjustePeloDia
+from DeltaHedgeAjustePeloLote import DeltaHedgeAjustePeloLote
+from OtimizadorParametrosHedge import OtimizadorParametrosHedge
+
+class TestHedgeVetorizado(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Conectar ao banco de dados real
+        cls.conn = sqlite3.connect('banco/mercado_opcoes.db')
+        try:
+            cls.dados = DadosMercado(cls.conn, 'PETR4')
+        except (ValueError, sqlite3.Error):
+            raise unittest.SkipTest("Banco de dados sem histórico do PETR4")
+
+        cls.simulacoes, _ = cls.dados.carregar_simulacoes()
+        if not cls.simulacoes:
+            raise unittest.SkipTest("Nenhuma simulação válida no banco para realizar o teste")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.conn.close()
+
+    def test_delta_igual_ao_calculo_escalar(self):
+        S = np.array([25.0, 30.0, 35.0])
+        deltas = BlackScholesVetorizado.delta('call', S, 30.0, 0.1, 0.15, 0.3)
+        for s, delta in zip(S, deltas):
+            self.assertAlmostEqual(delta, TradeHelper.calcular_delta('call', s, 30.0, 0.1, 0.15, 0.3), places=12)
+
+    def test_volatilidade_igual_ao_trade_helper(self):
+        volatilidade = self.dados.volatilidade_anual(30)
+        for posicao in [len(self.dados.datas) - 1, len(self.dados.datas) // 2]:
+            data = str(self.dados.datas[posicao])
+            esperado = TradeHelper.recuperaVolatilidadeAnualPara_x_Pregoes(self.conn, 30, 'PETR4', data)
+            self.assertAlmostEqual(volatilidade[posicao], esperado, places=12)
+
+        # Sem pregões suficientes no início do histórico
+        self.assertTrue(np.isnan(volatilidade[0]))
+
+    def _comparar(self, classe, estrategia, nome_parametro, limites, pregoes):
+        simulacao = self.simulacoes[0]
+        volatilidade = self.dados.volatilidade_anual(pregoes)[simulacao['indices']]
+        deltas = HedgeVetorizado.calcular_deltas(simulacao, volatilidade)
+        resultado = HedgeVetorizado.simular(np.repeat(deltas[None, :], len(limites), axis=0),
+                                            simulacao, estrategia, np.array(limites))
+
+        for i, limite in enumerate(limites):
+            delta_hedge = classe(self.conn, simulacao['id_simulacao'], **{nome_parametro: limite},
+                                 pregoes_volatilidade=pregoes)
+            with redirect_stdout(io.StringIO()):
+                delta_hedge.processar()
+
+            np.testing.assert_allclose(resultado['qtd_acoes'][i], delta_hedge.qtd_acoes, atol=1e-9)
+            np.testing.assert_allclose(resultado['saldo_acumulado'][i], delta_hedge.saldo_diario, atol=1e-7)
+            datas_ajuste = getattr(delta_hedge, 'datas_ajuste_real', delta_hedge.datas_ajuste)
+            self.assertEqual(resultado['num_ajustes'][i], len(datas_ajuste))
+
+    def test_estrategia_delta(self):
+        self._comparar(DeltaHedgeAjustePeloDelta, 'delta', 'limite_delta', [0.05, 0.1, 0.15], 30)
+
+    def test_estrategia_dia(self):
+        self._comparar(DeltaHedgeAjustePeloDia, 'dia', 'frequencia_ajuste', [1, 3, 5, 7], 60)
+
+    def test_estrategia_lote(self):
+        self._comparar(DeltaHedgeAjustePeloLote, 'lote', 'limite_lote', [50, 100, 200, 300], 120)
+
+    def test_custos_em_niveis(self):
+        simulacao = self.simulacoes[0]
+        volatilidade = self.dados.volatilidade_anual(30)[simulacao['indices']]
+        deltas = np.repeat(HedgeVetorizado.calcular_deltas(simulacao, volatilidade)[None, :], 3, axis=0)
+        limites = np.array([0.05, 0.1, 0.2])
+
+        bruto = HedgeVetorizado.simular(deltas, simulacao, 'delta', limites)
+        niveis = HedgeVetorizado.simular(deltas, simulacao, 'delta', limites,
+                                         ModeloCustos(corretagem=[0.0, 2.5, 5.0], emolumentos_bps=3.0))
+        self.assertEqual(niveis['saldo_final_liquido'].shape, (3, 3))
+
+        # Sem custo de transação o líquido é igual ao bruto; cada nível é igual à simulação isolada
+        sem_custo = HedgeVetorizado.simular(deltas, simulacao, 'delta', limites, ModeloCustos())
+        np.testing.assert_allclose(sem_custo['saldo_final_liquido'], bruto['saldo_final'])
+        for nivel, corretagem in enumerate([0.0, 2.5, 5.0]):
+            isolado = HedgeVetorizado.simular(deltas, simulacao, 'delta', limites,
+                                              ModeloCustos(corretagem=corretagem, emolumentos_bps=3.0))
+            np.testing.assert_allclose(niveis['saldo_final_liquido'][nivel], isolado['saldo_final_liquido'])
+            self.assertTrue(np.all(isolado['saldo_final_liquido'] < bruto['saldo_final']))
+
+    def test_custos_lote(self):
+        simulacao = self.simulacoes[0]
+        volatilidade = self.dados.volatilidade_anual(30)[simulacao['indices']]
+        deltas = HedgeVetorizado.calcular_deltas(simulacao, volatilidade)[None, :]
+        resultado = HedgeVetorizado.simular(deltas, simulacao, 'lote', [100], ModeloCustos(lote=100))
+
+        np.testing.assert_array_equal(resultado['qtd_acoes'] % 100, 0)
+        np.testing.assert_allclose(resultado['custo_total'], 0.0)
+
+        # Ajuste diário: nos dias em que o alvo arredondado não muda, não há negociação nem ajuste
+        diario = HedgeVetorizado.simular(deltas, simulacao, 'dia', [1], ModeloCustos(corretagem=5.0, lote=100))
+        self.assertEqual(diario['num_ajustes'][0], np.count_nonzero(diario['ajuste_acoes']))
+        self.assertLess(diario['num_ajustes'][0], diario['ajustou'].sum())
+        self.assertAlmostEqual(diario['custo_total'][0], 5.0 * diario['num_ajustes'][0])
+
+    def test_carrego_igual_ao_laco(self):
+        fluxos = np.array([[1000.0, -200.0, 0.0, 50.0, -300.0]])
+        fator = HedgeVetorizado.fator_carrego([10, 9, 8, 6, 5], 0.15)
+
+        saldo = 0.0
+        esperado = []
+        for i, fluxo in enumerate(fluxos[0]):
+            crescimento = fator[i] / fator[i - 1] if i > 0 else 1.0
+            saldo = saldo * crescimento + fluxo
+            esperado.append(saldo)
+
+        np.testing.assert_allclose(HedgeVetorizado.acumular_com_carrego(fluxos, fator)[0], esperado)
+        self.assertAlmostEqual(fator[3] / fator[2], np.exp(0.15 * 2 / 252))
+
+    def test_carrego_igual_a_classe(self):
+        simulacao = self.simulacoes[0]
+        volatilidade = self.dados.volatilidade_anual(30)[simulacao['indices']]
+        deltas = HedgeVetorizado.calcular_deltas(simulacao, volatilidade)[None, :]
+        resultado = HedgeVetorizado.simular(deltas, simulacao, 'delta', [0.1], taxa_carrego=0.15)
+
+        delta_hedge = DeltaHedgeAjustePeloDelta(self.conn, simulacao['id_simulacao'], limite_delta=0.1,
+                                                pregoes_volatilidade=30, carrego_juros=True)
+        with redirect_stdout(io.StringIO()):
+            delta_hedge.processar()
+
+        np.testing.assert_allclose(resultado['saldo_acumulado'][0], delta_hedge.saldo_diario, atol=1e-7)
+        self.assertNotAlmostEqual(resultado['juros_carrego'][0], 0.0)
+
+    def test_fronteira_pareto(self):
+        saldo = np.array([100.0, 90.0, 120.0, 120.0, 80.0])
+        ajustes = np.array([2.0, 1.0, 3.0, 3.0, 2.0])
+        fronteira = OtimizadorParametrosHedge.fronteira_pareto(saldo, ajustes)
+        np.testing.assert_array_equal(fronteira, [True, True, True, True, False])
+
+    def test_otimizador_paralelo_igual_ao_sequencial(self):
+        fronteiras = []
+        for processos in (1, 2):
+            otimizador = OtimizadorParametrosHedge(self.conn, 'delta', limites=[0.05, 0.1, 0.2],
+                                                   janelas=[10, 30], orcamento_segundos=60,
+                                                   tamanho_minimo=2, processos=processos)
+            fronteiras.append(otimizador.otimizar())
+        self.assertEqual(fronteiras[0]['Simulações Avaliadas'].iloc[0], len(otimizador.simulacoes))
+        texto = ['Estratégia', 'Estimador Vol.']
+        np.testing.assert_allclose(fronteiras[1].drop(columns=texto).to_numpy(dtype=float),
+                                   fronteiras[0].drop(columns=texto).to_numpy(dtype=float))
+
+if __name__ == '__main__':
+    unittest.main()
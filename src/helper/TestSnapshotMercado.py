@@ -0,0 +1,71 @@
+import sys
+import os
+
+# Adiciona os diretórios 'src' e 'src/benchmark' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmark')))
+
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from helper.DadosMercado import DadosMercado
+from helper.SnapshotMercado import SnapshotMercado
+from helper.Dividendos import Dividendos
+from GeradorDadosSinteticos import GeradorDadosSinteticos
+
+class TestSnapshotMercado(unittest.TestCase):
+    def setUp(self):
+        self.conn = GeradorDadosSinteticos(pregoes=400, opcoes=3).criar_banco()
+        self.diretorio = tempfile.mkdtemp()
+        SnapshotMercado.exportar(self.conn, self.diretorio, 'PETR4', janelas=[10, 30])
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.diretorio)
+
+    def test_snapshot_igual_ao_banco(self):
+        banco = DadosMercado(self.conn, 'PETR4')
+        snapshot = SnapshotMercado.carregar(self.diretorio, 'PETR4')
+        self.assertIsInstance(snapshot.fechamento, np.memmap)
+
+        np.testing.assert_array_equal(snapshot.datas, banco.datas)
+        # Janela exportada (lida do arquivo) e janela calculada sob demanda
+        for pregoes in (30, 20):
+            np.testing.assert_array_equal(snapshot.volatilidade_anual(pregoes), banco.volatilidade_anual(pregoes))
+
+        simulacoes_banco, _ = banco.carregar_simulacoes()
+        simulacoes_snapshot, _ = snapshot.carregar_simulacoes()
+        self.assertEqual(len(simulacoes_snapshot), 3)
+        for esperado, obtido in zip(simulacoes_banco, simulacoes_snapshot):
+            self.assertEqual(obtido.keys(), esperado.keys())
+            for chave, valor in esperado.items():
+                np.testing.assert_array_equal(obtido[chave], valor, err_msg=chave)
+
+        with self.assertRaises(ValueError):
+            snapshot.carregar_simulacao(999)
+
+    def test_detecta_banco_alterado(self):
+        self.assertTrue(SnapshotMercado.esta_atualizado(self.conn, self.diretorio, 'PETR4'))
+        SnapshotMercado.carregar(self.diretorio, 'PETR4', self.conn)
+        self.conn.execute("UPDATE HIST_ATIVO SET fechamento = fechamento + 0.01 WHERE data = "
+                          "(SELECT MAX(data) FROM HIST_ATIVO)")
+        self.assertFalse(SnapshotMercado.esta_atualizado(self.conn, self.diretorio, 'PETR4'))
+        # Com a conexão, a carga recusa o snapshot desatualizado
+        with self.assertRaises(ValueError):
+            SnapshotMercado.carregar(self.diretorio, 'PETR4', self.conn)
+
+    def test_detecta_maximo_minimo_e_dividendos(self):
+        self.conn.execute("UPDATE HIST_ATIVO SET maximo = maximo + 0.01 WHERE data = "
+                          "(SELECT MIN(data) FROM HIST_ATIVO)")
+        self.assertFalse(SnapshotMercado.esta_atualizado(self.conn, self.diretorio, 'PETR4'))
+
+        SnapshotMercado.exportar(self.conn, self.diretorio, 'PETR4', janelas=[10, 30])
+        dados = DadosMercado(self.conn, 'PETR4')
+        Dividendos.criar_tabela(self.conn)
+        self.assertTrue(SnapshotMercado.esta_atualizado(self.conn, self.diretorio, 'PETR4'))
+        Dividendos.gravar(self.conn, dados.id_ativo, [dados.datas[-10]], [0.5])
+        self.assertFalse(SnapshotMercado.esta_atualizado(self.conn, self.diretorio, 'PETR4'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -50,6 +50,16 @@ class TestTradeHelper(unittest.TestCase):
         with self.assertRaises(ValueError):
             TradeHelper.recuperaVolatilidadeAnual(self.conn, 'INVALID', '2023-12-31')
     
+    def test_calcular_dias_uteis_para_datas(self):
+        # Deve coincidir com calcular_dias_uteis chamado data a data (inclusive em dia sem pregão)
+        datas = ['2025-05-02', '2025-05-03', '2025-05-12', '2025-05-16', '2025-05-20']
+        vencimento = datetime(2025, 5, 16).date()
+
+        dias = TradeHelper.calcular_dias_uteis_para_datas(self.conn, 1, datas, vencimento)
+        esperado = [TradeHelper.calcular_dias_uteis(self.conn, 1, data, vencimento) for data in datas]
+
+        self.assertEqual(dias.tolist(), esperado)
+
     def test_calcular_delta_call(self):
         # Teste para opção de compra (call)
         S = 100.0  # Preço do ativo
@@ -0,0 +1,76 @@
+import sys
+import os
+
+# Adiciona os diretórios 'src' e 'src/benchmark' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmark')))
+
+import unittest
+import numpy as np
+from helper.VolatilidadeGarch import VolatilidadeGarch
+from GeradorDadosSinteticos import GeradorDadosSinteticos
+
+class TestVolatilidadeGarch(unittest.TestCase):
+    def test_estimativa_e_previsao(self):
+        # Série GARCH(1,1) simulada com parâmetros conhecidos
+        omega, alpha, beta = 2e-6, 0.08, 0.90
+        rng = np.random.default_rng(5)
+        retornos = np.empty(5000)
+        variancia = omega / (1 - alpha - beta)
+        for i in range(len(retornos)):
+            retornos[i] = np.sqrt(variancia) * rng.standard_normal()
+            variancia = omega + alpha * retornos[i] ** 2 + beta * variancia
+
+        estimado = VolatilidadeGarch.estimar(retornos)
+        self.assertAlmostEqual(estimado[1], alpha, delta=0.03)
+        self.assertAlmostEqual(estimado[2], beta, delta=0.04)
+
+        # A recursão vetorizada é igual ao laço
+        variancias = VolatilidadeGarch.variancias(*estimado[:3], retornos[:50])
+        esperado = [np.mean(retornos[:50] ** 2)]
+        for r in retornos[:50]:
+            esperado.append(estimado[0] + estimado[1] * r ** 2 + estimado[2] * esperado[-1])
+        np.testing.assert_allclose(variancias, esperado, rtol=1e-12)
+
+        # A média das variâncias previstas (forma fechada) é igual à soma termo a termo
+        previsao = VolatilidadeGarch.previsao(*estimado[:4], [1, 10, 60])
+        longo_prazo = estimado[0] / (1 - estimado[1] - estimado[2])
+        for n, obtido in zip([1, 10, 60], previsao):
+            termos = [estimado[3]]
+            for _ in range(n - 1):
+                termos.append(longo_prazo + (estimado[1] + estimado[2]) * (termos[-1] - longo_prazo))
+            self.assertAlmostEqual(obtido, np.sqrt(252 * np.mean(termos)), places=12)
+
+    def test_ajuste_diario_com_cache(self):
+        conn = GeradorDadosSinteticos(pregoes=300, opcoes=1).criar_banco()
+        try:
+            garch = VolatilidadeGarch(conn, 'PETR4', janela=150)
+            datas = garch.dados.datas
+            ajustes = garch.ajustar_periodo(datas[0], datas[-1])
+            self.assertEqual(len(ajustes), len(datas) - 100)
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM PARAMETROS_GARCH").fetchone()[0], len(ajustes))
+
+            # O ajuste com warm start chega ao mesmo máximo que o ajuste sem ponto de partida
+            ultimo = len(datas) - 1
+            direto = VolatilidadeGarch.estimar(garch.retornos[ultimo + 1 - 150:ultimo + 1])
+            np.testing.assert_allclose(ajustes[str(datas[-1])][3], direto[3], rtol=1e-3)
+
+            # Uma nova instância lê os ajustes da tabela
+            volatilidades = VolatilidadeGarch(conn, 'PETR4', janela=150).volatilidades(datas[-3:], [20, 19, 18])
+            esperado = VolatilidadeGarch.previsao(*ajustes[str(datas[-1])], 18)
+            self.assertAlmostEqual(volatilidades[-1], esperado, places=12)
+            self.assertTrue(np.isnan(garch.volatilidades(datas[:2], [5, 4])).all())
+
+            # HIST_ATIVO recarregado com outro fechamento no último pregão: só esse ajuste é refeito
+            conn.execute("UPDATE HIST_ATIVO SET fechamento = fechamento * 1.1 WHERE data = ?", (str(datas[-1]),))
+            recarregado = VolatilidadeGarch(conn, 'PETR4', janela=150)
+            novos = recarregado.ajustar_periodo(datas[-2], datas[-1])
+            self.assertEqual(novos[str(datas[-2])], ajustes[str(datas[-2])])
+            amostra = recarregado.retornos[ultimo + 1 - 150:ultimo + 1]
+            np.testing.assert_allclose(novos[str(datas[-1])][3], VolatilidadeGarch.estimar(amostra)[3], rtol=1e-3)
+            self.assertNotAlmostEqual(novos[str(datas[-1])][3], ajustes[str(datas[-1])][3])
+        finally:
+            conn.close()
+
+if __name__ == '__main__':
+    unittest.main()
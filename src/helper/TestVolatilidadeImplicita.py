@@ -0,0 +1,80 @@
+import sys
+import os
+
+# Adiciona o diretório 'src' ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import sqlite3
+import numpy as np
+from helper.BlackScholesVetorizado import BlackScholesVetorizado
+from helper.VolatilidadeImplicita import VolatilidadeImplicita
+
+class TestVolatilidadeImplicita(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.S = rng.uniform(25, 35, 500)
+        self.K = rng.uniform(25, 35, 500)
+        self.T = rng.uniform(5 / 252, 1.0, 500)
+        self.sigma = rng.uniform(0.15, 0.9, 500)
+
+    def test_recupera_volatilidade_da_call(self):
+        precos = BlackScholesVetorizado.preco('call', self.S, self.K, self.T, 0.15, self.sigma)
+        volatilidade = VolatilidadeImplicita.calcular(precos, self.S, self.K, self.T, 0.15, 'call')
+        np.testing.assert_allclose(volatilidade, self.sigma, atol=1e-5)
+
+    def test_recupera_volatilidade_da_put(self):
+        precos = BlackScholesVetorizado.preco('put', self.S, self.K, self.T, 0.15, self.sigma)
+        volatilidade = VolatilidadeImplicita.calcular(precos, self.S, self.K, self.T, 0.15, 'put')
+        np.testing.assert_allclose(volatilidade, self.sigma, atol=1e-5)
+
+    def test_bissecao_quando_newton_falha(self):
+        # Opção muito fora do dinheiro: vega quase nulo no chute inicial
+        preco = BlackScholesVetorizado.preco('call', 30.0, 45.0, 0.05, 0.15, 0.8)
+        volatilidade = VolatilidadeImplicita.calcular([preco], 30.0, 45.0, 0.05, 0.15, max_iteracoes=1)
+        self.assertAlmostEqual(volatilidade[0], 0.8, places=4)
+
+    def test_preco_fora_dos_limites(self):
+        # Abaixo do valor intrínseco, acima do preço do ativo e no vencimento
+        volatilidade = VolatilidadeImplicita.calcular([1.0, 31.0, 2.0], 30.0, [25.0, 30.0, 30.0],
+                                                      [0.1, 0.1, 0.0], 0.15)
+        self.assertTrue(np.all(np.isnan(volatilidade)))
+
+    def test_tabela_vol_implicita(self):
+        conn = sqlite3.connect(':memory:')
+        conn.executescript("""
+            CREATE TABLE OPCAO (id INTEGER PRIMARY KEY, id_ativo INTEGER, tipo VARCHAR, strike FLOAT,
+                                vencimento DATE, ticker VARCHAR);
+            CREATE TABLE HIST_OPCAO (id INTEGER PRIMARY KEY, id_opcao INTEGER, data DATE, abertura FLOAT,
+                                     fechamento FLOAT, maximo FLOAT, minimo FLOAT);
+            CREATE TABLE HIST_ATIVO (id INTEGER PRIMARY KEY, id_ativo INTEGER, data DATE, abertura FLOAT,
+                                     fechamento FLOAT, maximo FLOAT, minimo FLOAT);
+            INSERT INTO OPCAO VALUES (1, 1, 'CALL', 30.0, '2025-01-10', 'TESTE');
+        """)
+        datas = ['2025-01-06', '2025-01-07', '2025-01-08', '2025-01-09', '2025-01-10']
+        for i, data in enumerate(datas):
+            T = (len(datas) - i - 1) / 252
+            preco = float(BlackScholesVetorizado.preco('call', 30.0, 30.0, T, 0.15, 0.4))
+            conn.execute("INSERT INTO HIST_ATIVO (id_ativo, data, abertura, fechamento, maximo, minimo) "
+                         "VALUES (1, ?, 30, 30, 30, 30)", (data,))
+            conn.execute("INSERT INTO HIST_OPCAO (id_opcao, data, abertura, fechamento, maximo, minimo) "
+                         "VALUES (1, ?, ?, ?, ?, ?)", (data, preco, preco, preco, preco))
+
+        volatilidades = VolatilidadeImplicita.recuperar(conn, 1, datas[0], datas[-1], 0.15)
+        self.assertAlmostEqual(volatilidades['2025-01-06'][0], 0.4, places=5)
+        self.assertIsNone(volatilidades['2025-01-10'][1])  # vencimento: sem valor no tempo
+
+        gravadas = conn.execute("SELECT COUNT(*) FROM VOL_IMPLICITA").fetchone()[0]
+        self.assertEqual(gravadas, len(datas))
+
+        # HIST_OPCAO recarregado com outro preço: a data é recalculada em vez de vir da tabela
+        preco = float(BlackScholesVetorizado.preco('call', 30.0, 30.0, 4 / 252, 0.15, 0.5))
+        conn.execute("UPDATE HIST_OPCAO SET abertura = ? WHERE data = '2025-01-06'", (preco,))
+        volatilidades = VolatilidadeImplicita.recuperar(conn, 1, datas[0], datas[-1], 0.15)
+        self.assertAlmostEqual(volatilidades['2025-01-06'][0], 0.5, places=5)
+        self.assertAlmostEqual(volatilidades['2025-01-06'][1], 0.4, places=5)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM VOL_IMPLICITA").fetchone()[0], len(datas))
+        conn.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,12 @@ from datetime import datetime, timedelta, date
 import math
 from scipy.stats import norm
 
+try:
+    from helper.Instrumentacao import Instrumentacao
+except ModuleNotFoundError:
+    # Importado diretamente de src/helper (ex: TestTradeHelper)
+    from Instrumentacao import Instrumentacao
+
 class TradeHelper:
     @staticmethod
     def recuperaVolatilidadeAnual(conn: sqlite3.Connection, ticker: str, data_referencia: str) -> float:
@@ -73,30 +79,32 @@ class TradeHelper:
         data_inicial = data_ref - timedelta(days=pregoes*2)  # garante folga para pelo o dobro de pregões
 
         # Seleciona os últimos fechamentos antes ou igual à data de referência
-        cursor.execute('''
-            SELECT ha.data, ha.fechamento
-            FROM HIST_ATIVO ha
-            JOIN ATIVO a ON ha.id_ativo = a.id
-            WHERE a.ticker = ?
-            AND ha.data <= ?
-            AND ha.data >= ?
-            ORDER BY ha.data DESC
-            LIMIT ?
-        ''', (ticker, data_referencia, data_inicial.strftime('%Y-%m-%d'), pregoes))
+        with Instrumentacao.etapa('sql.volatilidade'):
+            cursor.execute('''
+                SELECT ha.data, ha.fechamento
+                FROM HIST_ATIVO ha
+                JOIN ATIVO a ON ha.id_ativo = a.id
+                WHERE a.ticker = ?
+                AND ha.data <= ?
+                AND ha.data >= ?
+                ORDER BY ha.data DESC
+                LIMIT ?
+            ''', (ticker, data_referencia, data_inicial.strftime('%Y-%m-%d'), pregoes))
 
-        resultados = cursor.fetchall()
+            resultados = cursor.fetchall()
 
         if len(resultados) < pregoes:
             raise ValueError(f"Dados insuficientes para calcular a volatilidade de {pregoes} pregões para {ticker}")
 
-        # Reverte para ordem cronológica
-        precos = [float(preco) for _, preco in reversed(resultados)]
+        with Instrumentacao.etapa('calculo.volatilidade'):
+            # Reverte para ordem cronológica
+            precos = [float(preco) for _, preco in reversed(resultados)]
 
-        # Retornos percentuais diários
-        retornos = np.array(precos[1:]) / np.array(precos[:-1]) - 1
+            # Retornos percentuais diários
+            retornos = np.array(precos[1:]) / np.array(precos[:-1]) - 1
 
-        # Volatilidade diária (sem anualização)
-        volatilidade_diaria = np.std(retornos)
+            # Volatilidade diária (sem anualização)
+            volatilidade_diaria = np.std(retornos)
 
         return retornos, volatilidade_diaria
 
@@ -156,18 +164,51 @@ class TradeHelper:
         cursor = conn.cursor()
         
         # Busca todos os dias úteis entre as datas
-        cursor.execute("""
-            SELECT COUNT(DISTINCT data)
-            FROM HIST_ATIVO
-            WHERE id_ativo = ?
-              AND data BETWEEN ? AND ?
-        """, (id_ativo, data_inicio, data_fim))
-        
-        total_dias = cursor.fetchone()[0]
+        with Instrumentacao.etapa('sql.dias_uteis'):
+            cursor.execute("""
+                SELECT COUNT(DISTINCT data)
+                FROM HIST_ATIVO
+                WHERE id_ativo = ?
+                  AND data BETWEEN ? AND ?
+            """, (id_ativo, data_inicio, data_fim))
+            
+            total_dias = cursor.fetchone()[0]
         
         # Subtrai 1 para excluir o último dia
         return max(0, total_dias - 1)
 
+    @staticmethod
+    def calcular_dias_uteis_para_datas(conn: sqlite3.Connection, id_ativo: int, datas, data_fim) -> np.ndarray:
+        """
+        Calcula calcular_dias_uteis(data, data_fim) para várias datas com uma única consulta.
+
+        Args:
+            conn: Conexão com o banco de dados SQLite
+            id_ativo: ID do ativo
+            datas: Datas iniciais (YYYY-MM-DD, date ou datetime64)
+            data_fim: Data final
+
+        Returns:
+            np.ndarray: Número de dias úteis de cada data até data_fim (excluindo o último dia)
+        """
+        datas = np.asarray(datas, dtype='datetime64[D]')
+        if datas.size == 0:
+            return np.zeros(0, dtype=int)
+
+        cursor = conn.cursor()
+        with Instrumentacao.etapa('sql.dias_uteis'):
+            cursor.execute("""
+                SELECT DISTINCT data
+                FROM HIST_ATIVO
+                WHERE id_ativo = ?
+                  AND data BETWEEN ? AND ?
+                ORDER BY data ASC
+            """, (id_ativo, str(datas.min()), str(data_fim)))
+            pregoes = np.array([linha[0] for linha in cursor.fetchall()], dtype='datetime64[D]')
+
+        # Pregões entre cada data e data_fim = pregões a partir da posição da data
+        return np.maximum(0, len(pregoes) - np.searchsorted(pregoes, datas, side='left') - 1)
+
     @staticmethod
     def preco_futuro(S: float, mu: float, sigma: float, dt: float, z=None,seed=None) -> float:
         """
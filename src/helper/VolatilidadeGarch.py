@@ -0,0 +1,254 @@
+import hashlib
+import sqlite3
+import numpy as np
+from scipy.optimize import minimize
+from scipy.signal import lfilter
+from helper.DadosMercado import DadosMercado
+
+# Retornos usados em cada ajuste (os últimos até a data do ajuste) e mínimo para ajustar
+JANELA_AJUSTE = 500
+RETORNOS_MINIMOS = 100
+
+# Limite de alpha + beta (abaixo de 1 a variância de longo prazo é finita)
+PERSISTENCIA_MAXIMA = 0.9999
+
+# Ponto de partida do ajuste sem ajuste anterior: (omega / variância da amostra, alpha, beta)
+PARAMETROS_INICIAIS = (0.05, 0.05, 0.90)
+
+class VolatilidadeGarch:
+    """
+    Previsão de volatilidade GARCH(1,1) ajustada por máxima verossimilhança.
+
+    O modelo usa os retornos logarítmicos de fechamento do HIST_ATIVO, com
+    média zero: sigma²_t = omega + alpha x r²_t-1 + beta x sigma²_t-1. Cada
+    ajuste usa os últimos JANELA_AJUSTE retornos até a data (inclusive) e a
+    recursão da variância é aplicada com lfilter, sem laço em Python.
+
+    Os parâmetros de cada (ativo, data do ajuste) ficam na tabela
+    PARAMETROS_GARCH, com uma impressão digital da amostra de retornos
+    usada; se o HIST_ATIVO for recarregado com outros preços, a impressão
+    não confere e o pregão é ajustado de novo. Em um reajuste diário, o ajuste da data anterior é o
+    ponto de partida do otimizador (warm start), que converge em poucas
+    iterações porque a amostra muda em um único retorno.
+
+    A previsão para h pregões é a média das variâncias previstas de 1 a h
+    pregões à frente, anualizada: a estrutura a termo da volatilidade até o
+    vencimento de cada opção.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, ticker: str = 'PETR4', janela: int = JANELA_AJUSTE,
+                 dados: DadosMercado = None):
+        """
+        Args:
+            conn: Conexão com o banco de dados SQLite
+            ticker: Ticker do ativo (padrão: PETR4)
+            janela: Retornos usados em cada ajuste (padrão: 500)
+            dados: DadosMercado do ativo já carregado (opcional)
+        """
+        self.conn = conn
+        self.dados = DadosMercado(conn, ticker) if dados is None else dados
+        self.janela = janela
+
+        # retornos[i] é o retorno do pregão i (o primeiro pregão não tem retorno)
+        self.retornos = np.r_[np.nan, np.log(self.dados.fechamento[1:] / self.dados.fechamento[:-1])]
+
+        VolatilidadeGarch.criar_tabela(conn)
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT data, omega, alpha, beta, variancia_proxima, impressao
+            FROM PARAMETROS_GARCH
+            WHERE id_ativo = ? AND janela = ?
+        """, (self.dados.id_ativo, janela))
+        linhas = cursor.fetchall()
+        # Ajuste por data: (omega, alpha, beta, variância prevista para o pregão seguinte)
+        self._ajustes = {linha[0]: tuple(linha[1:5]) for linha in linhas}
+        # Impressão digital da amostra de cada ajuste gravado
+        self._impressoes = {linha[0]: linha[5] for linha in linhas}
+
+    @staticmethod
+    def criar_tabela(conn: sqlite3.Connection):
+        """
+        Cria a tabela PARAMETROS_GARCH, se ainda não existir.
+        """
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS PARAMETROS_GARCH (
+                id_ativo INTEGER NOT NULL,
+                data DATE NOT NULL,
+                janela INTEGER NOT NULL,
+                omega FLOAT NOT NULL,
+                alpha FLOAT NOT NULL,
+                beta FLOAT NOT NULL,
+                variancia_proxima FLOAT NOT NULL,
+                log_verossimilhanca FLOAT NOT NULL,
+                impressao TEXT,
+                PRIMARY KEY (id_ativo, data, janela),
+                FOREIGN KEY (id_ativo) REFERENCES ATIVO(id)
+            )
+        """)
+        # Tabelas criadas antes da impressão digital: os ajustes antigos são refeitos
+        colunas = [coluna[1] for coluna in conn.execute("PRAGMA table_info(PARAMETROS_GARCH)")]
+        if 'impressao' not in colunas:
+            conn.execute("ALTER TABLE PARAMETROS_GARCH ADD COLUMN impressao TEXT")
+        conn.commit()
+
+    def impressao_amostra(self, posicao: int) -> str:
+        """
+        Impressão digital das datas e fechamentos que formam a amostra do ajuste no pregão `posicao`.
+        """
+        inicio = max(0, posicao - self.janela)
+        hash_amostra = hashlib.sha1(np.ascontiguousarray(self.dados.datas[inicio:posicao + 1]).tobytes())
+        hash_amostra.update(np.ascontiguousarray(self.dados.fechamento[inicio:posicao + 1], dtype=float).tobytes())
+        return hash_amostra.hexdigest()
+
+    @staticmethod
+    def variancias(omega: float, alpha: float, beta: float, retornos: np.ndarray) -> np.ndarray:
+        """
+        Variâncias condicionais da amostra e a prevista para o pregão seguinte.
+
+        A recursão começa na média dos quadrados dos retornos da amostra.
+
+        Returns:
+            np.ndarray: len(retornos) + 1 variâncias; a última é a do pregão seguinte
+        """
+        quadrados = retornos ** 2
+        inicial = quadrados.mean()
+        seguintes = lfilter([1.0], [1.0, -beta], omega + alpha * quadrados, zi=[beta * inicial])[0]
+        return np.r_[inicial, seguintes]
+
+    @staticmethod
+    def log_verossimilhanca(omega: float, alpha: float, beta: float, retornos: np.ndarray) -> float:
+        """
+        Log-verossimilhança gaussiana dos retornos.
+        """
+        variancias = VolatilidadeGarch.variancias(omega, alpha, beta, retornos)[:-1]
+        return -0.5 * float(np.sum(np.log(2 * np.pi * variancias) + retornos ** 2 / variancias))
+
+    @staticmethod
+    def estimar(retornos: np.ndarray, inicial: tuple = None) -> tuple:
+        """
+        Ajusta omega, alpha e beta por máxima verossimilhança (SLSQP).
+
+        Os retornos são divididos pelo seu desvio quadrático médio antes do
+        ajuste, para que os três parâmetros tenham a mesma ordem de grandeza.
+
+        Args:
+            retornos: Retornos logarítmicos da amostra
+            inicial: (omega, alpha, beta) de partida, ex: o ajuste do pregão anterior
+
+        Returns:
+            tuple: (omega, alpha, beta, variância prevista para o pregão seguinte, log-verossimilhança)
+        """
+        escala = float(np.mean(retornos ** 2))
+        normalizados = retornos / np.sqrt(escala)
+        if inicial is None:
+            x0 = np.array(PARAMETROS_INICIAIS)
+        else:
+            x0 = np.array([inicial[0] / escala, inicial[1], inicial[2]])
+            x0[1:] = np.clip(x0[1:], 0.0, PERSISTENCIA_MAXIMA)
+            if x0[1] + x0[2] > PERSISTENCIA_MAXIMA:
+                x0[1:] *= PERSISTENCIA_MAXIMA / (x0[1] + x0[2])
+
+        def objetivo(x):
+            variancias = VolatilidadeGarch.variancias(x[0], x[1], x[2], normalizados)[:-1]
+            return 0.5 * float(np.sum(np.log(variancias) + normalizados ** 2 / variancias))
+
+        resultado = minimize(objetivo, x0, method='SLSQP',
+                             bounds=[(1e-8, 10.0), (0.0, 1.0), (0.0, 1.0)],
+                             constraints=[{'type': 'ineq', 'fun': lambda x: PERSISTENCIA_MAXIMA - x[1] - x[2]}])
+        omega, alpha, beta = float(resultado.x[0]) * escala, float(resultado.x[1]), float(resultado.x[2])
+        variancia_proxima = float(VolatilidadeGarch.variancias(omega, alpha, beta, retornos)[-1])
+        return (omega, alpha, beta, variancia_proxima,
+                VolatilidadeGarch.log_verossimilhanca(omega, alpha, beta, retornos))
+
+    @staticmethod
+    def previsao(omega: float, alpha: float, beta: float, variancia_proxima: float, dias) -> np.ndarray:
+        """
+        Volatilidade anual média prevista para os próximos `dias` pregões.
+
+        Com persistência p = alpha + beta e variância de longo prazo
+        V = omega / (1 - p), a variância prevista h pregões à frente é
+        V + p^(h-1) x (sigma²_t+1 - V); a média de 1 a n é
+        V + (sigma²_t+1 - V) x (1 - p^n) / (n x (1 - p)).
+
+        Args:
+            dias: Pregões até o vencimento (escalar ou array; 0 usa o pregão seguinte)
+        """
+        n = np.maximum(np.asarray(dias, dtype=float), 1.0)
+        persistencia = alpha + beta
+        longo_prazo = omega / (1 - persistencia)
+        media = longo_prazo + (variancia_proxima - longo_prazo) * (1 - persistencia ** n) / (n * (1 - persistencia))
+        return np.sqrt(252 * media)
+
+    def ajustar(self, data) -> tuple:
+        """
+        Ajuste da data (do cache, ou calculado e gravado).
+
+        Args:
+            data: Data do ajuste (YYYY-MM-DD ou date); usa os retornos até ela, inclusive
+
+        Returns:
+            tuple: (omega, alpha, beta, variância prevista para o pregão seguinte);
+                   None se não houver RETORNOS_MINIMOS retornos até a data
+        """
+        return self.ajustar_periodo(data, data).get(str(data))
+
+    def ajustar_periodo(self, data_inicio, data_fim) -> dict:
+        """
+        Ajusta o modelo em cada pregão do período, do mais antigo para o mais
+        recente, partindo sempre do ajuste do pregão anterior.
+
+        Returns:
+            dict: {data (YYYY-MM-DD): (omega, alpha, beta, variância prevista)} dos
+                  pregões com retornos suficientes
+        """
+        datas = self.dados.datas
+        inicio = np.searchsorted(datas, np.datetime64(str(data_inicio), 'D'), side='left')
+        fim = np.searchsorted(datas, np.datetime64(str(data_fim), 'D'), side='right')
+
+        resultado = {}
+        novos = []
+        anterior = None
+        for posicao in range(max(inicio, RETORNOS_MINIMOS), fim):
+            data = str(datas[posicao])
+            impressao = self.impressao_amostra(posicao)
+            if self._impressoes.get(data) != impressao:
+                if anterior is None and posicao > 0:
+                    anterior = self._ajustes.get(str(datas[posicao - 1]))
+                amostra = self.retornos[max(1, posicao + 1 - self.janela):posicao + 1]
+                *ajuste, log_verossimilhanca = VolatilidadeGarch.estimar(amostra, anterior)
+                self._ajustes[data] = tuple(ajuste)
+                self._impressoes[data] = impressao
+                novos.append((self.dados.id_ativo, data, self.janela, *ajuste, log_verossimilhanca, impressao))
+            anterior = resultado[data] = self._ajustes[data]
+
+        if novos:
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO PARAMETROS_GARCH
+                    (id_ativo, data, janela, omega, alpha, beta, variancia_proxima, log_verossimilhanca, impressao)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, novos)
+            self.conn.commit()
+        return resultado
+
+    def volatilidades(self, datas, dias) -> np.ndarray:
+        """
+        Volatilidade anual prevista em cada data para o prazo correspondente.
+
+        Args:
+            datas: Datas dos ajustes (pregões do ativo, em ordem crescente)
+            dias: Pregões até o vencimento em cada data
+
+        Returns:
+            np.ndarray: Volatilidade anual; NaN nas datas sem retornos suficientes
+        """
+        datas = np.asarray(datas, dtype='datetime64[D]')
+        resultado = np.full(len(datas), np.nan)
+        if len(datas) == 0:
+            return resultado
+
+        ajustes = self.ajustar_periodo(datas[0], datas[-1])
+        parametros = np.array([ajustes.get(str(data), (np.nan,) * 4) for data in datas]).reshape(-1, 4)
+        validos = ~np.isnan(parametros[:, 0])
+        resultado[validos] = VolatilidadeGarch.previsao(*parametros[validos].T,
+                                                        np.asarray(dias)[validos])
+        return resultado
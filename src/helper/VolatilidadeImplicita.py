@@ -0,0 +1,253 @@
+import sqlite3
+import numpy as np
+from helper.BlackScholesVetorizado import BlackScholesVetorizado
+
+# Entradas guardadas com cada volatilidade implícita (conferidas antes de usar o valor gravado)
+COLUNAS_ENTRADA = ['opcao_abertura', 'opcao_fechamento', 'ativo_abertura', 'ativo_fechamento', 'dias_uteis']
+
+# Intervalo de busca da volatilidade implícita (anual, decimal)
+VOLATILIDADE_MINIMA = 1e-4
+VOLATILIDADE_MAXIMA = 5.0
+
+class VolatilidadeImplicita:
+    """
+    Volatilidade implícita de Black-Scholes calculada para arrays de preços.
+
+    O cálculo usa Newton-Raphson a partir da aproximação de Brenner-Subrahmanyam
+    e, para os elementos em que Newton não converge (vega muito pequeno, passo
+    fora do intervalo), cai para a bisseção. Todas as opções são resolvidas ao
+    mesmo tempo, sem laço por preço.
+
+    Os resultados por (opção, data) ficam na tabela VOL_IMPLICITA do banco de
+    mercado, para que as simulações não recalculem a cada execução. Cada linha
+    guarda os preços e o prazo usados; se o HIST_OPCAO ou o HIST_ATIVO forem
+    recarregados com outros valores, a data é recalculada.
+    """
+
+    @staticmethod
+    def calcular(precos, S, K, T, r: float, opcao: str = 'call', q: float = 0.0,
+                 tolerancia: float = 1e-8, max_iteracoes: int = 50) -> np.ndarray:
+        """
+        Inverte Black-Scholes para um array de preços de opção.
+
+        Args:
+            precos: Preços de mercado da opção
+            S: Preços do ativo
+            K: Preços de exercício
+            T: Tempo até o vencimento em anos
+            r: Taxa de juros livre de risco
+            opcao: 'call' ou 'put' (padrão: 'call')
+            q: Dividend yield contínuo (padrão: 0)
+            tolerancia: Erro máximo na volatilidade (padrão: 1e-8)
+            max_iteracoes: Máximo de iterações de Newton (padrão: 50)
+
+        Returns:
+            np.ndarray: Volatilidade implícita anual; NaN quando o preço está fora
+                        dos limites de não arbitragem ou T <= 0
+        """
+        precos, S, K, T = (np.array(x, dtype=float) for x in np.broadcast_arrays(precos, S, K, T))
+        volatilidade = np.full(precos.shape, np.nan)
+
+        # Limites de não arbitragem
+        desconto_r = np.exp(-r * T)
+        desconto_q = np.exp(-q * T)
+        if opcao.lower() == 'call':
+            inferior = np.maximum(S * desconto_q - K * desconto_r, 0.0)
+            superior = S * desconto_q
+        elif opcao.lower() == 'put':
+            inferior = np.maximum(K * desconto_r - S * desconto_q, 0.0)
+            superior = K * desconto_r
+        else:
+            raise ValueError("Tipo de opção inválido. Use 'call' ou 'put'.")
+
+        validos = np.isfinite(precos) & (T > 0) & (precos > inferior) & (precos < superior)
+        if not validos.any():
+            return volatilidade
+
+        # Chute inicial de Brenner-Subrahmanyam: sigma ~ sqrt(2 pi / T) * C / S
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inicial = np.sqrt(2 * np.pi / T) * precos / S
+        volatilidade[validos] = np.clip(inicial[validos], 0.05, 2.0)
+
+        # Newton-Raphson nos elementos ainda pendentes
+        pendentes = validos.copy()
+        convergidos = np.zeros(precos.shape, dtype=bool)
+        for _ in range(max_iteracoes):
+            if not pendentes.any():
+                break
+            sigma = volatilidade[pendentes]
+            diferenca = BlackScholesVetorizado.preco(opcao, S[pendentes], K[pendentes], T[pendentes],
+                                                      r, sigma, q) - precos[pendentes]
+            vega = BlackScholesVetorizado.vega(S[pendentes], K[pendentes], T[pendentes], r, sigma, q)
+
+            with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                passo = diferenca / vega
+            nova = sigma - passo
+            convergiu = (diferenca == 0) | (np.abs(passo) < tolerancia)
+            falhou = ~convergiu & (~np.isfinite(nova) | (nova < VOLATILIDADE_MINIMA) | (nova > VOLATILIDADE_MAXIMA))
+
+            volatilidade[pendentes] = np.where(falhou, sigma, nova)
+            indices = np.flatnonzero(pendentes)
+            convergidos[indices[convergiu]] = True
+            pendentes[indices[convergiu | falhou]] = False
+
+        # Bisseção para os que não convergiram (o preço é crescente na volatilidade)
+        restantes = validos & ~convergidos
+        if restantes.any():
+            volatilidade[restantes] = VolatilidadeImplicita._bissecao(
+                precos[restantes], S[restantes], K[restantes], T[restantes], r, opcao, q, tolerancia)
+
+        return volatilidade
+
+    @staticmethod
+    def _bissecao(precos, S, K, T, r, opcao, q, tolerancia, max_iteracoes: int = 200) -> np.ndarray:
+        """
+        Bisseção vetorizada no intervalo [VOLATILIDADE_MINIMA, VOLATILIDADE_MAXIMA].
+        """
+        baixa = np.full(precos.shape, VOLATILIDADE_MINIMA)
+        alta = np.full(precos.shape, VOLATILIDADE_MAXIMA)
+
+        # Preço acima do preço com a volatilidade máxima: fora do intervalo de busca
+        fora = BlackScholesVetorizado.preco(opcao, S, K, T, r, alta, q) < precos
+
+        for _ in range(max_iteracoes):
+            meio = 0.5 * (baixa + alta)
+            diferenca = BlackScholesVetorizado.preco(opcao, S, K, T, r, meio, q) - precos
+            acima = diferenca > 0
+            alta = np.where(acima, meio, alta)
+            baixa = np.where(acima, baixa, meio)
+            if np.all((diferenca == 0) | (alta - baixa < tolerancia)):
+                break
+
+        resultado = 0.5 * (baixa + alta)
+        resultado[fora] = np.nan
+        return resultado
+
+    @staticmethod
+    def criar_tabela(conn: sqlite3.Connection):
+        """
+        Cria a tabela VOL_IMPLICITA, se ainda não existir.
+        """
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS VOL_IMPLICITA (
+                id_opcao INTEGER NOT NULL,
+                data DATE NOT NULL,
+                taxa_juros FLOAT NOT NULL,
+                iv_abertura FLOAT,
+                iv_fechamento FLOAT,
+                opcao_abertura FLOAT,
+                opcao_fechamento FLOAT,
+                ativo_abertura FLOAT,
+                ativo_fechamento FLOAT,
+                dias_uteis INTEGER,
+                PRIMARY KEY (id_opcao, data, taxa_juros),
+                FOREIGN KEY (id_opcao) REFERENCES OPCAO(id)
+            )
+        """)
+        # Tabelas criadas antes das colunas de entrada: as linhas antigas são recalculadas
+        colunas = [coluna[1] for coluna in conn.execute("PRAGMA table_info(VOL_IMPLICITA)")]
+        for coluna in COLUNAS_ENTRADA:
+            if coluna not in colunas:
+                tipo = 'INTEGER' if coluna == 'dias_uteis' else 'FLOAT'
+                conn.execute(f"ALTER TABLE VOL_IMPLICITA ADD COLUMN {coluna} {tipo}")
+        conn.commit()
+
+    @staticmethod
+    def recuperar(conn: sqlite3.Connection, id_opcao: int, data_inicio, data_fim,
+                  taxa_juros: float = 0.15, recalcular: bool = False) -> dict:
+        """
+        Recupera a volatilidade implícita diária de uma opção, calculando e gravando
+        na tabela VOL_IMPLICITA as datas que ainda não estão lá ou cujos preços e
+        prazo mudaram desde o cálculo gravado.
+
+        A volatilidade de abertura usa as aberturas da opção e do ativo; a de
+        fechamento, os fechamentos. O prazo segue a convenção das simulações:
+        pregões até o vencimento (excluindo o último dia) / 252.
+
+        Args:
+            conn: Conexão com o banco de dados SQLite
+            id_opcao: ID da opção
+            data_inicio: Data inicial (YYYY-MM-DD ou date)
+            data_fim: Data final (YYYY-MM-DD ou date)
+            taxa_juros: Taxa de juros anual (padrão: 15%)
+            recalcular: Se True, recalcula também as datas já gravadas
+
+        Returns:
+            dict: {data (YYYY-MM-DD): (iv_abertura, iv_fechamento)}; None onde não há solução
+        """
+        VolatilidadeImplicita.criar_tabela(conn)
+        data_inicio, data_fim = str(data_inicio), str(data_fim)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT o.tipo, o.strike, o.vencimento, o.id_ativo
+            FROM OPCAO o
+            WHERE o.id = ?
+        """, (id_opcao,))
+        opcao = cursor.fetchone()
+        if not opcao:
+            raise ValueError(f"Opção com ID {id_opcao} não encontrada.")
+        tipo, strike, vencimento, id_ativo = opcao
+
+        cursor.execute("""
+            SELECT h.data, h.abertura, h.fechamento, a.abertura, a.fechamento
+            FROM HIST_OPCAO h
+            JOIN HIST_ATIVO a ON a.data = h.data AND a.id_ativo = ?
+            WHERE h.id_opcao = ?
+              AND h.data BETWEEN ? AND ?
+            ORDER BY h.data ASC
+        """, (id_ativo, id_opcao, data_inicio, data_fim))
+        linhas = cursor.fetchall()
+        if not linhas:
+            return {}
+
+        # Pregões até o vencimento para cada data (mesma regra de TradeHelper.calcular_dias_uteis)
+        cursor.execute("""
+            SELECT DISTINCT data
+            FROM HIST_ATIVO
+            WHERE id_ativo = ? AND data BETWEEN ? AND ?
+            ORDER BY data ASC
+        """, (id_ativo, linhas[0][0], vencimento))
+        pregoes = np.array([linha[0] for linha in cursor.fetchall()], dtype='datetime64[D]')
+        datas = np.array([linha[0] for linha in linhas], dtype='datetime64[D]')
+        dias_uteis = np.maximum(0, len(pregoes) - np.searchsorted(pregoes, datas, side='left') - 1)
+
+        # Entradas atuais de cada data: (preços da opção e do ativo, pregões até o vencimento)
+        entradas = {linha[0]: (*linha[1:], int(dias)) for linha, dias in zip(linhas, dias_uteis)}
+
+        gravadas = {}
+        if not recalcular:
+            cursor.execute(f"""
+                SELECT data, iv_abertura, iv_fechamento, {', '.join(COLUNAS_ENTRADA)}
+                FROM VOL_IMPLICITA
+                WHERE id_opcao = ? AND taxa_juros = ?
+                  AND data BETWEEN ? AND ?
+            """, (id_opcao, taxa_juros, data_inicio, data_fim))
+            gravadas = {data: (iv_abertura, iv_fechamento)
+                        for data, iv_abertura, iv_fechamento, *entrada in cursor.fetchall()
+                        if tuple(entrada) == entradas.get(data)}
+
+        faltantes = [i for i, linha in enumerate(linhas) if linha[0] not in gravadas]
+        if not faltantes:
+            return gravadas
+
+        T = dias_uteis[faltantes] / 252
+        precos = np.array([linhas[i][1:] for i in faltantes], dtype=float)
+        opcao_tipo = 'put' if str(tipo).upper() == 'PUT' else 'call'
+        iv_abertura = VolatilidadeImplicita.calcular(precos[:, 0], precos[:, 2], strike, T, taxa_juros, opcao_tipo)
+        iv_fechamento = VolatilidadeImplicita.calcular(precos[:, 1], precos[:, 3], strike, T, taxa_juros, opcao_tipo)
+
+        def valor(x):
+            return None if np.isnan(x) else float(x)
+
+        novas = [(id_opcao, linhas[i][0], taxa_juros, valor(abertura), valor(fechamento), *entradas[linhas[i][0]])
+                 for i, abertura, fechamento in zip(faltantes, iv_abertura, iv_fechamento)]
+        cursor.executemany(f"""
+            INSERT OR REPLACE INTO VOL_IMPLICITA
+                (id_opcao, data, taxa_juros, iv_abertura, iv_fechamento, {', '.join(COLUNAS_ENTRADA)})
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, novas)
+        conn.commit()
+
+        gravadas.update({linha[1]: (linha[3], linha[4]) for linha in novas})
+        return gravadas
@@ -5,13 +5,48 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import sqlite3
+import argparse
 from datetime import datetime
+import numpy as np
 import pandas as pd
 from helper.TradeHelper import TradeHelper
+from helper.DadosMercado import DadosMercado
+from helper.BlackScholesVetorizado import BlackScholesVetorizado
+from helper.ArvoreBinomial import ArvoreBinomial
+from helper.ExportadorExcel import ExportadorExcel, FORMATO_MONETARIO, FORMATO_DELTA
+from helper.FormatadorDados import FormatadorDados, TEXTO_MONETARIO, TEXTO_DELTA, TEXTO_PERCENTUAL
 
 # Constante para o ID da simulação
 ID_SIMULACAO =5
 
+# Formatos de texto das colunas de listar_dados()
+FORMATOS_TEXTO = {
+    'Preço Ação': TEXTO_MONETARIO,
+    'Preço Mercado': TEXTO_MONETARIO,
+    'Preço BS': TEXTO_MONETARIO,
+    'Delta': TEXTO_DELTA,
+    'Diferença %': TEXTO_PERCENTUAL,
+}
+
+# Formatos das colunas na planilha da comparação em lote
+FORMATOS_COLUNAS = {
+    'Strike': FORMATO_MONETARIO,
+    'Preço Ação': FORMATO_MONETARIO,
+    'Preço Mercado': FORMATO_MONETARIO,
+    'Preço BS': FORMATO_MONETARIO,
+    'Delta': FORMATO_DELTA,
+    'Preço Americano': FORMATO_MONETARIO,
+    'Delta Americano': FORMATO_DELTA,
+    'Prêmio Exercício Antecipado': FORMATO_MONETARIO,
+    'Volatilidade': '0.00%',
+    'Diferença R$': FORMATO_MONETARIO,
+    'Diferença Média R$': FORMATO_MONETARIO,
+    'Diferença %': '0.00',
+    'Diferença Média %': '0.00',
+    'Diferença Mediana %': '0.00',
+    'Diferença Absoluta Média %': '0.00',
+}
+
 class ComparadorPrecosOpcoes:
     def __init__(self, conn: sqlite3.Connection, id_simulacao: int, pregoes_volatilidade: int = 30,
                  taxa_juros: float = 0.15):
@@ -116,17 +151,21 @@ class ComparadorPrecosOpcoes:
         Processa o cálculo dos preços teóricos e compara com os preços de mercado.
         """
         self.datas = []
+        self.precos_acao = []
         self.precos_mercado = []
         self.precos_bs = []
         self.deltas = []
         self.diferenca_percentual = []
         
+        # Preço da opção por data (busca O(1) em vez de percorrer a lista a cada dia)
+        precos_opcao_por_data = dict(self.precos_opcao)
+        
         for data_str, preco_ativo in self.precos_ativo:
             # Converte a data para datetime.date
             data = datetime.strptime(data_str, "%Y-%m-%d").date()
             
             # Encontra o preço da opção correspondente
-            preco_opcao = next((row[1] for row in self.precos_opcao if row[0] == data_str), None)
+            preco_opcao = precos_opcao_por_data.get(data_str)
             if preco_opcao is None:
                 continue
             
@@ -173,6 +212,7 @@ class ComparadorPrecosOpcoes:
             
             # Armazena os resultados
             self.datas.append(data_str)
+            self.precos_acao.append(preco_ativo)
             self.precos_mercado.append(preco_opcao)
             self.precos_bs.append(preco_bs)
             self.deltas.append(delta)
@@ -191,23 +231,16 @@ class ComparadorPrecosOpcoes:
                 - Delta
                 - Diferença %
         """
-        # Cria um DataFrame com os dados
+        # Cria um DataFrame com os dados (numéricos; o texto é gerado em imprimir_dados)
         df = pd.DataFrame({
-            'Data': self.datas,
-            'Preço Ação': [row[1] for row in self.precos_ativo],
-            'Preço Mercado': self.precos_mercado,
-            'Preço BS': self.precos_bs,
-            'Delta': self.deltas,
-            'Diferença %': self.diferenca_percentual
+            'Data': pd.to_datetime(self.datas),
+            'Preço Ação': np.array(self.precos_acao, dtype=float),
+            'Preço Mercado': np.array(self.precos_mercado, dtype=float),
+            'Preço BS': np.array(self.precos_bs, dtype=float),
+            'Delta': np.array(self.deltas, dtype=float),
+            'Diferença %': np.array(self.diferenca_percentual, dtype=float)
         })
         
-        # Formata as colunas numéricas
-        df['Preço Ação'] = df['Preço Ação'].map('R$ {:.2f}'.format)
-        df['Preço Mercado'] = df['Preço Mercado'].map('R$ {:.2f}'.format)
-        df['Preço BS'] = df['Preço BS'].map('R$ {:.2f}'.format)
-        df['Delta'] = df['Delta'].map('{:.4f}'.format)
-        df['Diferença %'] = df['Diferença %'].map('{:.2f}%'.format)
-        
         return df
     
     def imprimir_dados(self):
@@ -252,49 +285,232 @@ class ComparadorPrecosOpcoes:
         print("================================================================================")
         
         df = self.listar_dados()
-        print(df.to_string(index=False))
+        print(FormatadorDados.tabela_texto(df, FORMATOS_TEXTO))
         print("================================================================================")
         
         print(f"\nTotal de dias: {len(df)}")
-        print(f"Diferença Média: {df['Diferença %'].str.rstrip('%').astype(float).mean():.2f}%")
+        print(f"Diferença Média: {df['Diferença %'].mean():.2f}%")
+
+    @staticmethod
+    def comparar_todas(conn: sqlite3.Connection, pregoes_volatilidade: int = 30, taxa_juros: float = 0.15,
+                       ticker: str = 'PETR4', americano: bool = False) -> pd.DataFrame:
+        """
+        Compara o preço de mercado com o de Black-Scholes para todas as opções da
+        tabela SIMULACAO, em todos os pregões do histórico de cada opção.
+
+        Em vez de consultar volatilidade e dias úteis dia a dia, o histórico do ativo
+        é carregado uma única vez (DadosMercado), os preços das opções são alinhados
+        a ele por busca binária nas datas e toda a cadeia é precificada de uma vez
+        com BlackScholesVetorizado. Usa os preços de abertura, como processar().
+
+        Args:
+            conn: Conexão com o banco de dados SQLite
+            pregoes_volatilidade: Número de pregões para cálculo da volatilidade (padrão: 30)
+            taxa_juros: Taxa de juros anual (padrão: 15%)
+            ticker: Ticker do ativo objeto (padrão: PETR4)
+            americano: Se True, também precifica com exercício antecipado (ArvoreBinomial,
+                       Leisen-Reimer) e acrescenta as colunas Preço Americano, Delta
+                       Americano e Prêmio Exercício Antecipado (padrão: False)
+
+        Returns:
+            pd.DataFrame: Uma linha por (opção, data) com as colunas Opção, Tipo, Strike,
+                          Vencimento, Data, Dias Úteis, Preço Ação, Volatilidade,
+                          Preço Mercado, Preço BS, Delta, Diferença R$ e Diferença %
+                          (valores numéricos).
+                          Datas sem volatilidade, fora do histórico do ativo ou no
+                          vencimento (T = 0) ficam de fora.
+        """
+        mercado = DadosMercado(conn, ticker)
+        volatilidade_anual = mercado.volatilidade_anual(pregoes_volatilidade)
+
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT o.ticker, o.tipo, o.strike, o.vencimento, h.data, h.abertura
+            FROM OPCAO o
+            JOIN HIST_OPCAO h ON h.id_opcao = o.id
+            WHERE o.id_ativo = ?
+              AND o.id IN (SELECT id_opcao FROM SIMULACAO)
+              AND h.data <= o.vencimento
+            ORDER BY o.vencimento ASC, o.strike ASC, o.ticker ASC, h.data ASC
+        """, (mercado.id_ativo,))
+        linhas = cursor.fetchall()
+        if not linhas:
+            raise ValueError("Não há preços de opções para as simulações cadastradas.")
+
+        tickers, tipos, strikes, vencimentos, datas, precos_mercado = (np.array(coluna) for coluna in zip(*linhas))
+        strikes = strikes.astype(float)
+        precos_mercado = precos_mercado.astype(float)
+        vencimentos = vencimentos.astype('datetime64[D]')
+        datas = datas.astype('datetime64[D]')
+
+        # Junção com o histórico do ativo pela posição de cada data
+        posicoes = np.searchsorted(mercado.datas, datas)
+        posicoes_validas = np.minimum(posicoes, len(mercado.datas) - 1)
+        no_historico = (posicoes < len(mercado.datas)) & (mercado.datas[posicoes_validas] == datas)
+
+        # Pregões até o vencimento, excluindo o último dia (regra de TradeHelper.calcular_dias_uteis)
+        dias_uteis = np.maximum(0, np.searchsorted(mercado.datas, vencimentos, side='right') - posicoes - 1)
+        sigma = volatilidade_anual[posicoes_validas]
+
+        validos = no_historico & (dias_uteis > 0) & np.isfinite(sigma)
+        posicoes, dias_uteis, sigma = posicoes[validos], dias_uteis[validos], sigma[validos]
+        precos_ativo = mercado.abertura[posicoes]
+        strikes, precos_mercado = strikes[validos], precos_mercado[validos]
+        eh_put = np.char.upper(tipos[validos].astype(str)) == 'PUT'
+        T = dias_uteis / 252
+
+        precos_bs = np.where(eh_put,
+                             BlackScholesVetorizado.preco('put', precos_ativo, strikes, T, taxa_juros, sigma),
+                             BlackScholesVetorizado.preco('call', precos_ativo, strikes, T, taxa_juros, sigma))
+        deltas = np.where(eh_put,
+                          BlackScholesVetorizado.delta('put', precos_ativo, strikes, T, taxa_juros, sigma),
+                          BlackScholesVetorizado.delta('call', precos_ativo, strikes, T, taxa_juros, sigma))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            diferenca_percentual = np.where(precos_bs > 0, (precos_mercado - precos_bs) / precos_bs * 100, np.nan)
+
+        comparacao = pd.DataFrame({
+            'Opção': tickers[validos],
+            'Tipo': np.where(eh_put, 'PUT', 'CALL'),
+            'Strike': strikes,
+            'Vencimento': vencimentos[validos],
+            'Data': mercado.datas[posicoes],
+            'Dias Úteis': dias_uteis,
+            'Preço Ação': precos_ativo,
+            'Volatilidade': sigma,
+            'Preço Mercado': precos_mercado,
+            'Preço BS': precos_bs,
+            'Delta': deltas,
+            'Diferença R$': precos_mercado - precos_bs,
+            'Diferença %': diferenca_percentual,
+        })
+        if americano:
+            precos_americanos, deltas_americanos = ArvoreBinomial.calcular(eh_put, precos_ativo, strikes, T,
+                                                                           taxa_juros, sigma)
+            comparacao.insert(comparacao.columns.get_loc('Delta') + 1, 'Preço Americano', precos_americanos)
+            comparacao.insert(comparacao.columns.get_loc('Preço Americano') + 1, 'Delta Americano', deltas_americanos)
+            comparacao.insert(comparacao.columns.get_loc('Delta Americano') + 1, 'Prêmio Exercício Antecipado',
+                              precos_americanos - precos_bs)
+        return comparacao
+
+    @staticmethod
+    def resumir(comparacao: pd.DataFrame) -> pd.DataFrame:
+        """
+        Resume a comparação em lote por opção.
+
+        Além da média, traz a mediana da diferença percentual: em opções muito fora
+        do dinheiro o preço BS tende a zero e a média percentual explode.
+
+        Args:
+            comparacao: DataFrame retornado por comparar_todas()
+
+        Returns:
+            pd.DataFrame: Uma linha por opção, na ordem de vencimento e strike
+        """
+        diferenca = comparacao['Diferença %']
+        return (comparacao.assign(**{'Diferença Absoluta %': diferenca.abs()})
+                .groupby(['Opção', 'Tipo', 'Strike', 'Vencimento'], sort=False)
+                .agg(**{'Dias': ('Data', 'size'),
+                        'Diferença Média R$': ('Diferença R$', 'mean'),
+                        'Diferença Média %': ('Diferença %', 'mean'),
+                        'Diferença Mediana %': ('Diferença %', 'median'),
+                        'Diferença Absoluta Média %': ('Diferença Absoluta %', 'mean')})
+                .reset_index())
+
+def comparar_todas_as_opcoes(conn: sqlite3.Connection, pregoes_volatilidade: int, taxa_juros: float,
+                             caminho_saida: str, americano: bool = False):
+    """
+    Executa a comparação em lote, imprime o resumo por opção e salva a tabela completa em Excel.
+    """
+    comparacao = ComparadorPrecosOpcoes.comparar_todas(conn, pregoes_volatilidade, taxa_juros,
+                                                       americano=americano)
+    resumo = ComparadorPrecosOpcoes.resumir(comparacao)
+
+    print("\nComparação de Preços - Todas as Opções das Simulações:")
+    print("================================================================================")
+    print(f"Pregões de Volatilidade: {pregoes_volatilidade}")
+    print(f"Taxa de Juros: {taxa_juros*100:.1f}%")
+    print("================================================================================\n")
+
+    print(FormatadorDados.tabela_texto(resumo, {
+        'Strike': TEXTO_MONETARIO,
+        'Diferença Média R$': TEXTO_MONETARIO,
+        'Diferença Média %': TEXTO_PERCENTUAL,
+        'Diferença Mediana %': TEXTO_PERCENTUAL,
+        'Diferença Absoluta Média %': TEXTO_PERCENTUAL,
+    }))
+    print("================================================================================")
+
+    print(f"\nTotal de opções: {len(resumo)}")
+    print(f"Total de pares (opção, dia): {len(comparacao)}")
+    print(f"Diferença Média: R$ {comparacao['Diferença R$'].mean():.2f}")
+    print(f"Diferença Mediana: {comparacao['Diferença %'].median():.2f}%")
+    print(f"Diferença Absoluta Mediana: {comparacao['Diferença %'].abs().median():.2f}%")
+    if americano:
+        premio = comparacao['Prêmio Exercício Antecipado']
+        print(f"Prêmio de Exercício Antecipado Médio: R$ {premio.mean():.4f} (máximo R$ {premio.max():.4f})")
+
+    ExportadorExcel.exportar(caminho_saida, {'Comparacao': comparacao, 'Resumo': resumo}, FORMATOS_COLUNAS)
+    print(f"\nComparação salva em: {caminho_saida}")
+
+def comparar_simulacao(conn: sqlite3.Connection, id_simulacao: int, pregoes_volatilidade: int, taxa_juros: float):
+    """
+    Executa a comparação de uma única simulação e imprime o resultado.
+    """
+    # Busca os dados da simulação
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT id, data_inicio, data_termino
+        FROM SIMULACAO
+        WHERE id = ?
+    """, (id_simulacao,))
+    
+    simulacao = cursor.fetchone()
+    if not simulacao:
+        raise ValueError(f"Simulação com ID {id_simulacao} não encontrada.")
+    
+    data_inicio = datetime.strptime(simulacao[1], "%Y-%m-%d").date()
+    data_termino = datetime.strptime(simulacao[2], "%Y-%m-%d").date()
+    
+    print(f"\nTestando ComparadorPrecosOpcoes com simulação ID {id_simulacao}")
+    print(f"Período: {data_inicio} até {data_termino}")
+    
+    # Cria e processa a comparação
+    comparador = ComparadorPrecosOpcoes(
+        conn=conn,
+        id_simulacao=id_simulacao,
+        pregoes_volatilidade=pregoes_volatilidade,  # x pregões para cálculo da volatilidade
+        taxa_juros=taxa_juros                       # taxa de juros anual
+    )
+    
+    # Processa os dados
+    comparador.processar()
+    
+    # Imprime os resultados
+    comparador.imprimir_dados()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara preços de mercado das opções com Black-Scholes.")
+    parser.add_argument('--todas', action='store_true',
+                        help="Compara todas as opções da tabela SIMULACAO em uma única tabela")
+    parser.add_argument('--pregoes', type=int, default=30,
+                        help="Pregões para cálculo da volatilidade (padrão: 30)")
+    parser.add_argument('--taxa-juros', type=float, default=0.15,
+                        help="Taxa de juros anual (padrão: 0.15)")
+    parser.add_argument('--saida', default='dados/ComparacaoPrecosOpcoes.xlsx',
+                        help="Planilha da comparação em lote (padrão: dados/ComparacaoPrecosOpcoes.xlsx)")
+    parser.add_argument('--americano', action='store_true',
+                        help="Na comparação em lote, também precifica com exercício antecipado (árvore binomial)")
+    args = parser.parse_args()
+
     # Conecta ao banco de dados
     caminho_banco = 'banco/mercado_opcoes.db'
     conn = sqlite3.connect(caminho_banco)
     
     try:
-        # Busca os dados da simulação
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, data_inicio, data_termino
-            FROM SIMULACAO
-            WHERE id = ?
-        """, (ID_SIMULACAO,))
-        
-        simulacao = cursor.fetchone()
-        if not simulacao:
-            raise ValueError(f"Simulação com ID {ID_SIMULACAO} não encontrada.")
-        
-        data_inicio = datetime.strptime(simulacao[1], "%Y-%m-%d").date()
-        data_termino = datetime.strptime(simulacao[2], "%Y-%m-%d").date()
-        
-        print(f"\nTestando ComparadorPrecosOpcoes com simulação ID {ID_SIMULACAO}")
-        print(f"Período: {data_inicio} até {data_termino}")
-        
-        # Cria e processa a comparação
-        comparador = ComparadorPrecosOpcoes(
-            conn=conn,
-            id_simulacao=ID_SIMULACAO,
-            pregoes_volatilidade=30,  # x pregões para cálculo da volatilidade
-            taxa_juros=0.15          # 15% ao ano
-        )
-        
-        # Processa os dados
-        comparador.processar()
-        
-        # Imprime os resultados
-        comparador.imprimir_dados()
+        if args.todas:
+            comparar_todas_as_opcoes(conn, args.pregoes, args.taxa_juros, args.saida, args.americano)
+        else:
+            comparar_simulacao(conn, ID_SIMULACAO, args.pregoes, args.taxa_juros)
         
     except Exception as e:
         print(f"\nErro durante a execução: {str(e)}")